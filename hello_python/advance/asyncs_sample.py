@@ -4,6 +4,11 @@ from concurrent.futures import ThreadPoolExecutor
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from hello_python.utils.loop_monitor import LoopMonitor
+from hello_python.utils.offload import offload_map, warm_up
+from hello_python.utils.scheduler import create_scheduler, open_store
+from hello_python.utils.task_runner import TaskRunner
+
 
 async def fetch_data(task_id, delay):
     """模拟一个异步 I/O 操作，例如从网络获取数据。"""
@@ -49,6 +54,19 @@ async def task_main():
                 print(f"Task raised an exception: {e}")
 
 
+async def runner_main():
+    # 最多同时运行 2 个任务, 每个任务单独超时并重试一次
+    # 慢任务超时只影响它自己, 其他任务的结果按完成顺序照常返回
+    runner = TaskRunner(limit=2, timeout=0.3, retries=1, backoff=0.05)
+    delays = {1: 0.2, 2: 0.4, 3: 0.1}
+
+    async for result in runner.map(lambda task_id: fetch_data(task_id, delays[task_id]), delays):
+        if result.ok:
+            print(f"Task result: {result.value}")
+        else:
+            print(f"Task {result.item} failed after {result.attempts} attempts: {result.error!r}")
+
+
 async def my_async_task():
     print("Task started")
     await asyncio.sleep(2)  # Simulate an I/O-bound operation
@@ -62,44 +80,43 @@ async def my_async_task_with_timeout(timeout):
         print("Task timed out")
 
 
-async def schedule_delay_down(scheduler):
-    await asyncio.sleep(20)
-    scheduler.shutdown(True)
-
-
-def schedule_main():
-    # Create an instance of AsyncIOScheduler
-    scheduler = AsyncIOScheduler()
-
-    # Add the asynchronous job with timeout to the scheduler
-    scheduler.add_job(
-        my_async_task_with_timeout, "interval", seconds=5, args=(1,)
-    )  # 1 second timeout
-
-    # Start the scheduler
-    scheduler.start()
+def schedule_main(database="hello_jobs.db", run_seconds=20):
+    # 任务保存在 SQLite 中, 重启后继续按计划运行; 固定 id + replace_existing 避免重复注册
+    # 默认参数: 积压的运行合并为一次 (coalesce), 同一任务不重叠执行 (max_instances=1)
+    scheduler = create_scheduler(database, AsyncIOScheduler)
+
+    async def run():
+        scheduler.start()
+        scheduler.add_job(
+            my_async_task_with_timeout,
+            "interval",
+            seconds=5,
+            args=(1,),  # 1 second timeout
+            id="timeout_task",
+            replace_existing=True,
+        )
+        try:
+            await asyncio.sleep(run_seconds)
+        finally:
+            scheduler.shutdown(wait=False)
 
     try:
-        # Schedule the delay down task
-        #
-        time.sleep(1)
-        #
-        # run the asyncio event loop utils complete
-        asyncio.get_event_loop().run_until_complete(schedule_delay_down(scheduler))
-
-        # Run the asyncio event loop
-        # asyncio.get_event_loop().run_forever()
+        asyncio.run(run())
     except (KeyboardInterrupt, SystemExit):
         pass
+    # 运行统计与任务保存在同一个数据库, hello schedule list 也能看到
+    store = open_store(database)
+    stats = store.job_stats().get("timeout_task", {})
+    store.shutdown()
+    print(f"timeout_task runs: {stats.get('runs', 0)}, skipped: {stats.get('skipped', 0)}")
 
 
-async def cpu_bound_task():
-    # 模拟 CPU 密集型任务
-    sum = 0
-    for i in range(10000000):
-        # print("i")
-        sum = sum + i
-    print("CPU task finished,sum:", sum)
+def cpu_bound_sum(numbers):
+    # 模拟 CPU 密集型任务: 普通函数, 才能交给线程池或进程池执行
+    total = 0
+    for i in numbers:
+        total = total + i
+    return total
 
 
 async def io_bound_task():
@@ -109,13 +126,50 @@ async def io_bound_task():
 
 
 async def thread_pool_task():
+    # 提交的是普通函数, 不是协程函数; 受 GIL 限制, 线程池并不能加速 CPU 密集型任务
     with ThreadPoolExecutor() as executor:
         loop = asyncio.get_running_loop()
-        future = loop.run_in_executor(executor, cpu_bound_task)
-        # future = cpu_bound_task
+        future = loop.run_in_executor(executor, cpu_bound_sum, range(10000000))
         await io_bound_task()
-        await future.result()
+        print("CPU task finished,sum:", await future)
+
+
+async def process_pool_task():
+    # 分块交给常驻进程池, 事件循环在计算期间保持响应, I/O 任务同时进行
+    numbers = range(10000000)
+    chunks = [numbers[i : i + 1000000] for i in range(0, len(numbers), 1000000)]
+    cpu = asyncio.create_task(offload_map(cpu_bound_sum, chunks))
+    await io_bound_task()
+    print("CPU task finished,sum:", sum(await cpu))
 
 
 def thread_main():
     asyncio.run(thread_pool_task())
+
+
+def process_main():
+    warm_up()
+    asyncio.run(process_pool_task())
+
+
+async def blocking_handler():
+    # 在协程中直接调用同步的阻塞函数, 整个事件循环被卡住
+    await asyncio.sleep(0.1)
+    time.sleep(0.3)
+
+
+async def monitor_task():
+    # 监控事件循环: 测量唤醒延迟, 记录超过 100ms 的慢回调及阻塞时的堆栈
+    monitor = LoopMonitor(interval=0.05, slow_callback=0.1)
+    monitor.start()
+    await asyncio.gather(blocking_handler(), io_bound_task())
+    await monitor.stop()
+    print(f"Max loop lag: {monitor.max_lag * 1000:.0f} ms")
+    for record in monitor.slow_callbacks():
+        print(f"Slow callback took {record['seconds'] * 1000:.0f} ms, blocked at:")
+        for line in record["stack"][-2:]:
+            print("   ", line)
+
+
+def monitor_main():
+    asyncio.run(monitor_task())
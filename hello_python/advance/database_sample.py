@@ -6,6 +6,9 @@ Note: Requires a running MySQL server. See database_sqlite_sample.py for a self-
 
 import pymysql
 
+from hello_python.utils.db_pool import ConnectionPool, mysql_connector
+from hello_python.utils.db_stream import iter_rows
+
 # Database configuration (replace with your actual credentials)
 DB_CONFIG = {
     "host": "127.0.0.1",
@@ -15,17 +18,20 @@ DB_CONFIG = {
     "database": "test_db",
 }
 
+# 连接池: 各操作复用已建立的连接, 不必每次都做 TCP 握手和认证
+# min_size=0 表示第一次使用时才连接
+pool = ConnectionPool(mysql_connector(**DB_CONFIG), min_size=0, max_size=5)
+
 
 def connect_sample():
     """Demonstrates MySQL connection with error handling."""
     try:
-        db = pymysql.connect(**DB_CONFIG)
-        cursor = db.cursor()
-        cursor.execute("SELECT VERSION()")
-        data = cursor.fetchone()
-        print(f"Database version: {data}")
-        cursor.close()
-        db.close()
+        with pool.connection() as db:
+            cursor = db.cursor()
+            cursor.execute("SELECT VERSION()")
+            data = cursor.fetchone()
+            print(f"Database version: {data}")
+            cursor.close()
     except pymysql.Error as e:
         print(f"MySQL connection failed (expected without a running server): {e}")
         print("Hint: Use database_sqlite_sample.py for a self-contained demo with no server required.")
@@ -34,19 +40,19 @@ def connect_sample():
 def query_sample():
     """Demonstrates basic SQL operations (placeholder, requires live DB)."""
     try:
-        db = pymysql.connect(**DB_CONFIG)
-        cursor = db.cursor()
-        cursor.execute("CREATE TABLE IF NOT EXISTS demo (id INT PRIMARY KEY, name VARCHAR(50))")
-        cursor.execute("INSERT INTO demo (id, name) VALUES (1, 'Python')")
-        db.commit()
-        cursor.execute("SELECT * FROM demo")
-        rows = cursor.fetchall()
-        for row in rows:
-            print(f"  row: {row}")
-        cursor.execute("DROP TABLE demo")
-        db.commit()
-        cursor.close()
-        db.close()
+        with pool.connection() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS demo (id INT PRIMARY KEY, name VARCHAR(50))"
+            )
+            cursor.execute("INSERT INTO demo (id, name) VALUES (1, 'Python')")
+            db.commit()
+            # 使用 SSCursor 分块读取, 大表也只占用固定内存
+            for row in iter_rows(db, "SELECT * FROM demo", chunk_size=1000):
+                print(f"  row: {row}")
+            cursor.execute("DROP TABLE demo")
+            db.commit()
+            cursor.close()
     except pymysql.Error as e:
         print(f"Query failed (expected without a running server): {e}")
 
@@ -55,3 +61,4 @@ if __name__ == "__main__":
     connect_sample()
     print("---")
     query_sample()
+    pool.close()
@@ -1,15 +1,25 @@
+"""
+SQLite Database Sample: basic CRUD and bulk loading of an employees table.
+
+Uses an in-memory database, so it runs without any server. ``insert_employees`` is the
+straightforward row-by-row path; ``bulk_load_employees`` writes large row iterators in
+batched transactions through :class:`~hello_python.utils.sqlite_loader.BulkLoader`.
+Query results are read in ``fetchmany`` chunks through :mod:`hello_python.utils.db_stream`.
+"""
+
+import random
 import sqlite3
+from typing import Iterable, Iterator, Optional, Tuple
 
-# Connect to SQLite database (creates a new file if it doesn't exist)
-# conn = sqlite3.connect("data/example.db")
-conn = sqlite3.connect(":memory:")  # connect to a database in RAM
+from hello_python.utils.db_stream import iter_dataframes, iter_rows
+from hello_python.utils.query_cache import CachedDatabase, QueryCache
+from hello_python.utils.sqlite_loader import BulkLoader, LoadResult
 
-# Create a cursor object to execute SQL commands
-cursor = conn.cursor()
+Employee = Tuple[str, str, float]
 
-# Create a table
-cursor.execute(
-    """
+EMPLOYEE_COLUMNS = ("name", "department", "salary")
+
+EMPLOYEES_SCHEMA = """
     CREATE TABLE IF NOT EXISTS employees (
         id INTEGER PRIMARY KEY,
         name TEXT NOT NULL,
@@ -17,57 +27,150 @@ cursor.execute(
         salary REAL
     )
 """
-)
 
-# Insert some sample data
-cursor.execute(
-    "INSERT INTO employees (name, department, salary) VALUES (?, ?, ?)",
-    ("John Doe", "IT", 75000.00),
-)
-cursor.execute(
-    "INSERT INTO employees (name, department, salary) VALUES (?, ?, ?)",
-    ("Jane Smith", "HR", 65000.00),
-)
-cursor.execute(
-    "INSERT INTO employees (name, department, salary) VALUES (?, ?, ?)",
-    ("Bob Johnson", "Finance", 80000.00),
+# 按部门查询用的二级索引
+EMPLOYEES_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (department)",
 )
 
-# Commit the changes
-conn.commit()
+DEPARTMENTS = ("IT", "HR", "Finance", "Sales", "Marketing", "Operations")
 
-# Query the data
-print("All employees:")
-cursor.execute("SELECT * FROM employees")
-for row in cursor.fetchall():
-    print(f"ID: {row[0]}, Name: {row[1]}, Dept: {row[2]}, Salary: {row[3]}")
 
-# Query with condition
-print("\nEmployees with salary > 70000:")
-cursor.execute("SELECT name, salary FROM employees WHERE salary > ?", (70000,))
-for row in cursor.fetchall():
-    print(f"Name: {row[0]}, Salary: {row[1]}")
+def create_employees_table(conn: sqlite3.Connection, indexes: bool = True):
+    """创建 employees 表 (和部门索引)。"""
+    conn.execute(EMPLOYEES_SCHEMA)
+    if indexes:
+        for sql in EMPLOYEES_INDEXES:
+            conn.execute(sql)
+    conn.commit()
+
+
+def insert_employees(conn: sqlite3.Connection, rows: Iterable[Employee]) -> int:
+    """逐行插入并在最后提交, 返回插入的行数。"""
+    cursor = conn.cursor()
+    count = 0
+    for row in rows:
+        cursor.execute(
+            "INSERT INTO employees (name, department, salary) VALUES (?, ?, ?)", row
+        )
+        count += 1
+    conn.commit()
+    return count
+
+
+def generate_employees(count: int, seed: Optional[int] = 0) -> Iterator[Employee]:
+    """惰性生成 ``count`` 个合成员工, 不会一次性占用内存。"""
+    rng = random.Random(seed)
+    chunk = 10_000
+    # 按块生成随机值, 比每行调用 rng.choice / rng.uniform 快得多
+    for start in range(0, count, chunk):
+        size = min(chunk, count - start)
+        departments = rng.choices(DEPARTMENTS, k=size)
+        salaries = [round(30_000 + 120_000 * rng.random(), 2) for _ in range(size)]
+        names = [f"Employee {i}" for i in range(start, start + size)]
+        yield from zip(names, departments, salaries)
+
+
+def bulk_load_employees(
+    conn: sqlite3.Connection,
+    rows: Iterable[Employee],
+    batch_size: int = 50_000,
+    defer_indexes: bool = True,
+) -> LoadResult:
+    """分批事务 + executemany 写入大量员工数据, 默认导入完成后再重建索引。"""
+    loader = BulkLoader(
+        conn,
+        "employees",
+        EMPLOYEE_COLUMNS,
+        batch_size=batch_size,
+        defer_indexes=defer_indexes,
+    )
+    return loader.load(rows)
 
-# Update data
-cursor.execute("UPDATE employees SET salary = ? WHERE name = ?", (85000.00, "John Doe"))
-conn.commit()
 
-# Delete data
-cursor.execute("DELETE FROM employees WHERE name = ?", ("Jane Smith",))
-conn.commit()
+def print_employees(rows):
+    for row in rows:
+        print(f"ID: {row[0]}, Name: {row[1]}, Dept: {row[2]}, Salary: {row[3]}")
+
+
+def main():
+    # Connect to SQLite database (creates a new file if it doesn't exist)
+    # conn = sqlite3.connect("data/example.db")
+    conn = sqlite3.connect(":memory:")  # connect to a database in RAM
+
+    # Create a table
+    create_employees_table(conn)
+
+    # Insert some sample data
+    insert_employees(
+        conn,
+        [
+            ("John Doe", "IT", 75000.00),
+            ("Jane Smith", "HR", 65000.00),
+            ("Bob Johnson", "Finance", 80000.00),
+        ],
+    )
+
+    # Create a cursor object to execute SQL commands
+    cursor = conn.cursor()
+
+    # Query the data
+    # iter_rows 按 fetchmany 分块读取, 不会像 fetchall 一样一次性载入全部结果
+    print("All employees:")
+    print_employees(iter_rows(conn, "SELECT * FROM employees"))
+
+    # Query with condition
+    # 重复的参数化查询走结果缓存; 通过同一层的写操作会使 employees 表的缓存失效
+    db = CachedDatabase(conn, QueryCache(max_bytes=16 << 20, ttl=30))
+    high_salary = "SELECT name, salary FROM employees WHERE salary > ?"
+    print("\nEmployees with salary > 70000:")
+    for row in db.query(high_salary, (70000,)):
+        print(f"Name: {row[0]}, Salary: {row[1]}")
+    db.query(high_salary, (70000,))  # 命中缓存
+
+    # Update data
+    db.execute("UPDATE employees SET salary = ? WHERE name = ?", (85000.00, "John Doe"))
+
+    # Delete data
+    db.execute("DELETE FROM employees WHERE name = ?", ("Jane Smith",))
+    db.query(high_salary, (70000,))  # 缓存已失效, 重新查询
+    stats = db.cache.stats()
+    print(f"\nQuery cache: {stats['hits']} hits, {stats['misses']} misses")
+
+    # Show final state
+    print("\nFinal employee list:")
+    print_employees(iter_rows(conn, "SELECT * FROM employees"))
+
+    # Show Some Size
+    print("\nShow Some employee list:")
+    cursor.execute("SELECT * FROM employees")
+    print_employees(cursor.fetchmany(1))
+    # 未读完的查询会锁住表, 导入前先关闭游标
+    cursor.close()
+
+    # Bulk load synthetic employees
+    result = bulk_load_employees(conn, generate_employees(100_000))
+    print(
+        f"\nBulk loaded {result.rows} employees in {result.batches} batches, "
+        f"{result.rows_per_second:,.0f} rows/s"
+    )
+    count = conn.execute(
+        "SELECT COUNT(*) FROM employees WHERE department = ?", ("IT",)
+    ).fetchone()[0]
+    print(f"IT employees: {count}")
 
-# Show final state
-print("\nFinal employee list:")
-cursor.execute("SELECT * FROM employees")
-for row in cursor.fetchall():
-    print(f"ID: {row[0]}, Name: {row[1]}, Dept: {row[2]}, Salary: {row[3]}")
+    # Aggregate a large result chunk by chunk as DataFrames
+    totals = {}
+    for frame in iter_dataframes(
+        conn, "SELECT department, salary FROM employees", chunk_size=20_000
+    ):
+        for department, salary in frame.groupby("department")["salary"].sum().items():
+            totals[department] = totals.get(department, 0.0) + salary
+    print(f"Total IT salary: {totals['IT']:,.2f}")
 
-# Show Some Size
-print("\nShow Some employee list:")
-cursor.execute("SELECT * FROM employees")
+    # Close the connection
+    conn.close()
 
-for row in cursor.fetchmany(1):
-    print(f"ID: {row[0]}, Name: {row[1]}, Dept: {row[2]}, Salary: {row[3]}")
 
-# Close the connection
-conn.close()
+if __name__ == "__main__":
+    main()
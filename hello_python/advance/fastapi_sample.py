@@ -10,6 +10,8 @@ import psutil
 import uvicorn
 from fastapi import FastAPI
 
+from hello_python.advance.fastapi_server_sample import wait_until
+
 # FastAPI 应用
 app = FastAPI()
 
@@ -25,6 +27,7 @@ PID_FILE = f"{APP_NAME}.pid"
 LOG_FILE = f"{APP_NAME}.log"
 CONFIG = {"app": app, "host": "0.0.0.0", "port": 8000}
 WORKING_DIR = "."  # 替换为项目目录
+READY_TIMEOUT = 10  # 等待服务就绪的最长时间 (秒)
 
 # 全局变量
 server = None
@@ -75,8 +78,12 @@ def start():
     pid = os.getpid()
     with open(PID_FILE, "w") as f:
         f.write(str(pid))
-    time.sleep(5)
-    if running:
+    # 服务开始接受连接 (server.started) 后立即返回, 线程提前退出则立即失败
+    wait_until(
+        lambda: (server is not None and server.started) or not worker.is_alive(),
+        READY_TIMEOUT,
+    )
+    if running and server is not None and server.started:
         print(f"{APP_NAME} started with PID {pid}")
         # 捕获信号并保持主进程运行
         # signal.signal(signal.SIGINT, signal_handler)
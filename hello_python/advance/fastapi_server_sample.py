@@ -1,19 +1,269 @@
+import asyncio
+import contextlib
+import functools
 import os
+import shutil
 import sys
 import signal
 import time
 import threading
 import logging
-from typing import Optional
+import multiprocessing
+from typing import List, Optional
 
 import click
 import psutil
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from injector import Injector, Module, inject, provider, singleton
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+
+from hello_python.advance.database_sample import DB_CONFIG
+from hello_python.utils.async_db import AsyncPool, QueryTimeout
+from hello_python.utils.db_pool import ConnectionPool, Connector, mysql_connector
+from hello_python.utils.di import CompiledInjector, RequestScopeMiddleware, request_scope
+from hello_python.utils.log_pipeline import (
+    DEFAULT_MAX_QUEUED,
+    LogPipeline,
+    flush_queue,
+    install_queue_handler,
+)
+from hello_python.utils.loop_monitor import LAG_METRIC, SLOW_CALLBACKS_METRIC, LoopMonitor
+from hello_python.utils.metrics import (
+    METRICS_DIR_ENV,
+    MetricsRegistry,
+    collect,
+    read_snapshots,
+    render_prometheus,
+    write_snapshot,
+)
+from hello_python.utils.ujson_response import UJSONResponse
+
+# --- 请求指标 ---
+
+# 每个 worker 进程一个 registry, 只在事件循环线程中更新, 无需加锁
+metrics_registry = MetricsRegistry()
+metrics_registry.describe("http_requests_total", "Total HTTP requests by route and status.")
+metrics_registry.describe("http_requests_in_progress", "HTTP requests currently in flight.")
+metrics_registry.describe(
+    "http_request_duration_seconds", "HTTP request latency in seconds."
+)
+
+# worker 把指标快照写入共享目录的间隔 (秒)
+METRICS_FLUSH_INTERVAL = 1.0
+
+# 事件循环延迟的测量间隔 (秒)
+LOOP_LAG_INTERVAL = 0.5
+# 环境变量: 慢回调阈值 (毫秒), 由看门狗线程检测, 0 表示只测量延迟
+SLOW_CALLBACK_ENV = "HELLO_SLOW_CALLBACK_MS"
+DEFAULT_SLOW_CALLBACK_MS = 100.0
+# 环境变量: 为 "1" 时开启 asyncio 调试模式 (开销很大, 只用于开发)
+ASYNCIO_DEBUG_ENV = "HELLO_ASYNCIO_DEBUG"
+
+
+class MetricsMiddleware:
+    """
+    记录每个路由的请求数、进行中请求数和延迟直方图的 ASGI 中间件。
+
+    路由标签使用路由模板 (如 ``/items/{item_id}``) 而不是原始路径, 避免标签基数爆炸;
+    没有匹配任何路由的请求记为 ``<unmatched>``。
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+        self._static_routes: Optional[dict] = None
+
+    def _route_label(self, scope) -> str:
+        router = scope["app"].router
+        if self._static_routes is None:
+            # 没有路径参数的路由直接查表, 其余按顺序匹配
+            self._static_routes = {
+                route.path: route.path
+                for route in router.routes
+                if getattr(route, "param_convertors", None) == {}
+            }
+        if (label := self._static_routes.get(scope["path"])) is not None:
+            return label
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "<unmatched>")
+        return "<unmatched>"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = {"method": scope["method"], "route": self._route_label(scope)}
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry = self.registry
+        registry.gauge_add("http_requests_in_progress", labels, 1)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.observe(
+                "http_request_duration_seconds", time.perf_counter() - start, labels
+            )
+            registry.gauge_add("http_requests_in_progress", labels, -1)
+            registry.inc("http_requests_total", {**labels, "status": str(status_code)})
+
+
+def _worker_snapshot(app: FastAPI) -> dict:
+    """本 worker 的指标快照, 附带最近的慢回调记录 (``collect`` 会忽略这个字段)。"""
+    snapshot = metrics_registry.snapshot()
+    monitor = getattr(app.state, "loop_monitor", None)
+    snapshot["slow_callbacks"] = monitor.slow_callbacks() if monitor else []
+    return snapshot
+
+
+async def _flush_metrics(app: FastAPI, directory: str):
+    """定期把本 worker 的指标快照写入共享目录, 供其他 worker 和 status 汇总。"""
+    while True:
+        await run_in_threadpool(write_snapshot, _worker_snapshot(app), directory)
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+
+
+def _loop_monitor() -> LoopMonitor:
+    slow_callback_ms = float(os.environ.get(SLOW_CALLBACK_ENV, DEFAULT_SLOW_CALLBACK_MS))
+    return LoopMonitor(
+        metrics_registry,
+        interval=LOOP_LAG_INTERVAL,
+        slow_callback=slow_callback_ms / 1000,
+        debug=os.environ.get(ASYNCIO_DEBUG_ENV) == "1",
+    )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 每次启动新建容器和连接池: 关闭后的连接池不能再用, 同一个 app 可以再次启动
+    injector = app.state.injector = app.state.create_injector()
+    # 监控事件循环延迟和阻塞循环的慢回调, 结果进入 /metrics 和 status
+    monitor = app.state.loop_monitor = _loop_monitor()
+    monitor.start()
+    directory = os.environ.get(METRICS_DIR_ENV)
+    flush_task = asyncio.create_task(_flush_metrics(app, directory)) if directory else None
+    yield
+    if flush_task:
+        flush_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flush_task
+    await monitor.stop()
+    if directory:
+        write_snapshot(_worker_snapshot(app), directory)
+    # 关闭异步 facade 和连接池, 借出中的连接在归还时关闭
+    await injector.get(AsyncPool).close()
+
+
+# --- 数据库连接池 ---
+
+# async 路由中单次查询的默认超时 (秒)
+DB_QUERY_TIMEOUT = 10.0
+
+
+class DatabaseModule(Module):
+    """
+    把 :class:`ConnectionPool` 以单例绑定到 injector, 同一进程的请求共享连接。
+
+    默认连接 ``database_sample.DB_CONFIG`` 中的 MySQL; 测试或没有 MySQL 时可传入
+    ``sqlite_connector(...)``。
+    """
+
+    def __init__(self, connector: Optional[Connector] = None, **pool_options):
+        self.connector = connector or mysql_connector(**DB_CONFIG)
+        # 默认不预先连接, 服务在数据库不可用时也能启动
+        self.pool_options = {"min_size": 0, "max_size": 10, **pool_options}
+
+    @singleton
+    @provider
+    def provide_pool(self) -> ConnectionPool:
+        return ConnectionPool(self.connector, **self.pool_options)
+
+    @singleton
+    @provider
+    def provide_async_pool(self, pool: ConnectionPool) -> AsyncPool:
+        """供 ``async def`` 路由使用: 查询在线程池中执行, 不阻塞事件循环。"""
+        return AsyncPool(pool, timeout=DB_QUERY_TIMEOUT)
+
+
+def create_injector() -> Injector:
+    """本进程的容器, 由 lifespan 在应用启动时调用; 测试可替换 ``app.state.create_injector``。"""
+    return Injector([DatabaseModule()])
+
+
+def get_connection(request: Request):
+    """FastAPI 依赖: 从连接池借出连接, 请求结束后归还 (出错时先回滚)。"""
+    pool = request.app.state.injector.get(ConnectionPool)
+    with pool.connection() as conn:
+        yield conn
+
+
+@request_scope
+class DbSession:
+    """
+    请求内共享的数据库会话: 第一次使用 ``connection`` 时才从连接池借出连接,
+    请求结束时 (:class:`RequestScopeMiddleware`) 调用 ``close`` 归还。
+    """
+
+    @inject
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self._conn = None
+
+    @property
+    def connection(self):
+        if self._conn is None:
+            self._conn = self.pool.acquire()
+        return self._conn
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self.pool.release(conn)
+
+
+def get_container(app: FastAPI) -> CompiledInjector:
+    """本进程容器的编译层, ``app.state.injector`` 被替换时重新创建。"""
+    container = getattr(app.state, "container", None)
+    if container is None or container.injector is not app.state.injector:
+        container = app.state.container = CompiledInjector(app.state.injector)
+    return container
+
+
+def resolve(interface):
+    """
+    FastAPI 依赖: 从容器获取 ``interface`` 的实例。
+
+    单例在进程内共享, ``@request_scope`` 的对象在同一个请求内共享。依赖本身是 async
+    函数, 在事件循环中执行, 省去一次线程池调度; 构造函数不应做阻塞 IO。
+    """
+
+    async def dependency(request: Request):
+        return get_container(request.app).get(interface)
+
+    return dependency
+
 
 # --- FastAPI 应用定义 ---
 # (保持不变或根据您的应用进行修改)
-app = FastAPI()
+# 响应默认用 ujson 编码, datetime 等非原生类型回退到 jsonable_encoder
+app = FastAPI(lifespan=lifespan, default_response_class=UJSONResponse)
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+# 每个请求一个作用域, 响应结束后释放请求级对象
+app.add_middleware(RequestScopeMiddleware)
+# 每个 worker 进程各自的容器和连接池 (连接不能跨进程共享), 在 lifespan 中创建
+app.state.create_injector = create_injector
 
 
 @app.get("/")
@@ -21,6 +271,420 @@ async def hello():
     return {"message": "Hello, FastAPI!"}
 
 
+@app.get("/db/ping")
+def db_ping(request: Request, conn=Depends(get_connection)):
+    """执行 ``SELECT 1`` 并返回连接池状态; 同步路由, 数据库调用在线程池中执行。"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+    return {"ok": True, "pool": request.app.state.injector.get(ConnectionPool).stats()}
+
+
+@app.get("/db/ping/async")
+async def db_ping_async(request: Request):
+    """``db_ping`` 的 async 版本, 通过 AsyncPool 在线程池中查询。"""
+    db = request.app.state.injector.get(AsyncPool)
+    row = await db.fetchone("SELECT 1")
+    return {"ok": row[0] == 1, "pool": db.pool.stats()}
+
+
+@app.get("/db/ping/session")
+def db_ping_session(request: Request, session: DbSession = Depends(resolve(DbSession))):
+    """``db_ping`` 的请求作用域版本: 连接由 DbSession 借出, 响应结束后归还。"""
+    cursor = session.connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+    return {
+        "ok": True,
+        "shared": get_container(request.app).get(DbSession) is session,
+        "pool": session.pool.stats(),
+    }
+
+
+@app.exception_handler(QueryTimeout)
+async def query_timeout_handler(request: Request, exc: QueryTimeout):
+    return JSONResponse({"detail": str(exc)}, status_code=504)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus 文本格式的指标, 多 worker 模式下汇总所有 worker。"""
+    directory = os.environ.get(METRICS_DIR_ENV)
+    if not directory:
+        return PlainTextResponse(
+            render_prometheus(metrics_registry), media_type="text/plain; version=0.0.4"
+        )
+    # 快照在事件循环线程中获取, 文件读写放到线程池, 不阻塞事件循环
+    snapshot = _worker_snapshot(request.app)
+
+    def write_and_collect():
+        write_snapshot(snapshot, directory)
+        return render_prometheus(collect(directory))
+
+    body = await run_in_threadpool(write_and_collect)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+# --- 就绪检测 ---
+
+
+def wait_until(
+    predicate,
+    timeout: float,
+    initial_interval: float = 0.005,
+    max_interval: float = 0.25,
+) -> bool:
+    """
+    以指数退避轮询 ``predicate``, 直到其返回真值或超过 ``timeout`` 秒。
+
+    初始间隔很短, 服务一旦就绪几乎立即返回; 间隔逐步加倍到 ``max_interval``, 避免忙等。
+
+    Returns:
+        在截止时间前条件满足返回 True, 否则返回 False。
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+class ReadyServer(uvicorn.Server):
+    """在 Uvicorn 完成启动 (socket 已开始 accept) 后设置就绪事件的 Server。"""
+
+    # 停止 accept 后, 等待刚 accept 的连接发来请求的时间 (秒)
+    ACCEPT_LINGER = 0.1
+
+    def __init__(self, config: uvicorn.Config, ready_event=None, on_exit=None):
+        super().__init__(config=config)
+        self.ready_event = ready_event
+        self.on_exit = on_exit
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        # startup 失败时 uvicorn 会设置 should_exit 而不是 started
+        if self.started and self.ready_event is not None:
+            self.ready_event.set()
+
+    async def shutdown(self, sockets=None):
+        # Uvicorn 会直接关闭还没收到请求的连接。共享 socket 时, 内核可能刚把连接交给这个
+        # 正在 drain 的 worker, 客户端会看到连接被断开; 先停止 accept, 给这些连接一点时间
+        # 发来请求, 它们就会作为进行中的请求被处理完。
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(self.ACCEPT_LINGER)
+        await super().shutdown(sockets=sockets)
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        # Uvicorn 退出前会重新触发收到的 SIGTERM, 进程直接被信号终止;
+        # on_exit 在此之前执行, 用于把尚未送出的日志写完
+        with super().capture_signals():
+            try:
+                yield
+            finally:
+                if self.on_exit is not None:
+                    self.on_exit()
+
+
+# --- 多进程 Worker ---
+
+# 允许通过 multiprocessing 传递监听 socket (fd passing)
+multiprocessing.allow_connection_pickling()
+_spawn = multiprocessing.get_context("spawn")
+
+
+def _serve_worker(config: uvicorn.Config, sockets: list, ready_event=None, log_queue=None):
+    """
+    Worker 进程入口: 在继承的监听 socket 上运行 Uvicorn。
+
+    使用 spawn 启动方式, 每个 worker 都是全新的解释器, 通过 ``config.app`` 的导入字符串
+    重新加载应用代码。给定 ``log_queue`` 时, 日志只放入队列, 由监督者的写线程统一写入文件。
+    """
+    config.configure_logging()
+    on_exit = None
+    if log_queue is not None:
+        install_queue_handler(log_queue)
+        on_exit = functools.partial(flush_queue, log_queue)
+    server = ReadyServer(config=config, ready_event=ready_event, on_exit=on_exit)
+    try:
+        server.run(sockets=sockets)
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerSupervisor:
+    """
+    Pre-fork 风格的 worker 进程监督者。
+
+    监督者只绑定一次监听 socket, 并把它共享给 N 个 worker 进程, 由内核在 worker 之间分发连接。
+    worker 异常退出时会被重新拉起 (带退避, 防止崩溃循环), 所有 PID 都记录在 PID 文件中。
+
+    滚动重启 (:meth:`request_reload`) 在同一个监听 socket 上启动新一代 worker, 等它们全部
+    就绪后才让旧 worker 停止接受新连接并处理完进行中的请求 (drain), 端口始终有 worker 在服务。
+    新一代 worker 未能就绪时会被回收, 旧 worker 继续服务。滚动重启在监督循环中逐步推进,
+    等待新 worker 就绪期间照常回收崩溃的 worker 并响应 shutdown。
+    """
+
+    # worker 在启动后这么短时间内退出, 视为启动失败, 重启前退避
+    MIN_UPTIME = 1.0
+    MAX_BACKOFF = 10.0
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        on_change=None,
+        logger: Optional[logging.Logger] = None,
+        poll_interval: float = 0.5,
+        drain_timeout: float = 10.0,
+        ready_timeout: float = 30.0,
+        log_queue=None,
+    ):
+        """
+        Args:
+            config: worker 使用的 Uvicorn 配置, ``app`` 必须是导入字符串。
+            workers: worker 进程数量。
+            on_change: worker 集合变化时的回调, 参数为当前 worker PID 列表。
+            logger: 日志记录器。
+            poll_interval: 检查 worker 存活状态的间隔 (秒)。
+            drain_timeout: 停止或滚动重启时, 等待旧 worker 处理完进行中请求的最长时间 (秒)。
+            ready_timeout: 滚动重启时等待新 worker 就绪的最长时间 (秒)。
+            log_queue: 多进程日志队列, worker 的日志记录放入其中。
+        """
+        if not isinstance(config.app, str):
+            raise ValueError("multi-worker mode requires the app as an import string")
+        self.config = config
+        self.workers = workers
+        self.on_change = on_change
+        self.logger = logger or logging.getLogger(__name__)
+        self.poll_interval = poll_interval
+        self.ready_timeout = ready_timeout
+        self.log_queue = log_queue
+        self._set_drain_timeout(drain_timeout)
+
+        self.processes: List[multiprocessing.process.BaseProcess] = []
+        # 正在 drain 的旧 worker: (进程, 强制终止的截止时间)
+        self.draining: List[tuple] = []
+        self._reload_requested = threading.Event()
+        # 进行中的滚动重启: 尚未接管的新一代 worker 及其就绪截止时间
+        self.next_generation: List[multiprocessing.process.BaseProcess] = []
+        self._reload_deadline = 0.0
+        self._started_at: dict = {}
+        self._ready_events: dict = {}
+        self._failures = 0
+        self._should_exit = threading.Event()
+        self._socket = None
+
+    @property
+    def pids(self) -> List[int]:
+        return [p.pid for p in self.processes if p.pid is not None]
+
+    def _set_drain_timeout(self, drain_timeout: float):
+        self.drain_timeout = drain_timeout
+        # Uvicorn 收到 SIGTERM 后停止 accept, 最多等待这么久让进行中的请求完成
+        self.config.timeout_graceful_shutdown = drain_timeout
+
+    def _spawn_worker(self) -> multiprocessing.process.BaseProcess:
+        ready_event = _spawn.Event()
+        process = _spawn.Process(
+            target=_serve_worker,
+            kwargs={
+                "config": self.config,
+                "sockets": [self._socket],
+                "ready_event": ready_event,
+                "log_queue": self.log_queue,
+            },
+            name=f"{self.config.app}-worker",
+        )
+        process.start()
+        self._started_at[process.pid] = time.monotonic()
+        self._ready_events[process.pid] = ready_event
+        self.logger.info(f"Started worker process {process.pid}")
+        return process
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(self.pids)
+
+    def startup(self):
+        """绑定监听 socket 并启动所有 worker, 就绪后由调用方 :meth:`wait_ready` 确认。"""
+        self._socket = self.config.bind_socket()
+        # 立即 listen: worker 启动或滚动重启期间到达的连接在 backlog 中排队, 而不是被拒绝
+        self._socket.listen(self.config.backlog)
+        for _ in range(self.workers):
+            self.processes.append(self._spawn_worker())
+
+    def is_ready(self, processes=None) -> bool:
+        """所有 (或指定的) worker 都已完成启动。"""
+        processes = self.processes if processes is None else processes
+        return all(self._ready_events[p.pid].is_set() for p in processes)
+
+    def wait_ready(self, timeout: float, processes=None) -> bool:
+        """
+        等待 worker 就绪, 任一 worker 在就绪前退出则立即失败。
+
+        共享的监听 socket 在 worker 启动前就已经在 listen, 探测端口无法区分 worker
+        是否就绪, 所以这里等待每个 worker 在 Uvicorn startup 完成后设置的事件。
+        """
+        processes = list(self.processes if processes is None else processes)
+
+        def settled():
+            return self.is_ready(processes) or any(
+                not p.is_alive() for p in processes
+            )
+
+        return wait_until(settled, timeout) and self.is_ready(processes)
+
+    def _reap(self) -> bool:
+        """替换已退出的 worker, 返回 worker 集合是否发生变化。"""
+        changed = False
+        for index, process in enumerate(self.processes):
+            if process.is_alive() or self._should_exit.is_set():
+                continue
+            uptime = time.monotonic() - self._started_at.pop(process.pid, 0)
+            self._ready_events.pop(process.pid, None)
+            self.logger.warning(
+                f"Worker {process.pid} exited with code {process.exitcode} "
+                f"after {uptime:.1f}s, restarting."
+            )
+            if uptime < self.MIN_UPTIME:
+                self._failures += 1
+                backoff = min(self.MAX_BACKOFF, 0.1 * 2**self._failures)
+                # 退避期间收到 shutdown 时旧进程仍留在列表中, 由 terminate 回收
+                if self._should_exit.wait(backoff):
+                    return changed
+            else:
+                self._failures = 0
+            self.processes[index] = self._spawn_worker()
+            process.close()
+            changed = True
+        return changed
+
+    def request_reload(self, drain_timeout: Optional[float] = None):
+        """请求一次滚动重启 (可在信号处理函数中调用), 由监督循环执行。"""
+        if drain_timeout is not None:
+            self._set_drain_timeout(drain_timeout)
+        self._reload_requested.set()
+
+    def _begin_reload(self):
+        """滚动重启第一步: 启动新一代 worker, 之后由 :meth:`_advance_reload` 检查是否就绪。"""
+        self.logger.info(f"Rolling reload: starting {self.workers} new workers.")
+        self.next_generation = [self._spawn_worker() for _ in range(self.workers)]
+        self._reload_deadline = time.monotonic() + self.ready_timeout
+
+    def _advance_reload(self) -> Optional[bool]:
+        """
+        推进进行中的滚动重启: 新一代全部就绪后替换当前 worker, 旧 worker 进入 drain。
+
+        Returns:
+            新一代成功接管返回 True, 有 worker 在就绪前退出或超时返回 False, 仍在等待返回 None。
+        """
+        new_processes = self.next_generation
+        if self.is_ready(new_processes):
+            self.next_generation = []
+            old_processes, self.processes = self.processes, new_processes
+            self._notify()
+            self._drain(old_processes, timeout=self.drain_timeout)
+            self.logger.info(
+                f"Rolling reload complete, draining {len(old_processes)} old workers."
+            )
+            return True
+        if time.monotonic() < self._reload_deadline and all(
+            p.is_alive() for p in new_processes
+        ):
+            return None
+        self.logger.error("New workers did not become ready, keeping old workers.")
+        self.next_generation = []
+        self._drain(new_processes, timeout=0)
+        return False
+
+    def _drain(self, processes, timeout: float):
+        """向 worker 发送 SIGTERM (Uvicorn 优雅退出), 超时仍未退出的稍后由监督循环 kill。"""
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            try:
+                alive = process.is_alive()
+            except ValueError:  # 已 close 的进程无需再回收
+                continue
+            if alive:
+                process.terminate()
+            self._started_at.pop(process.pid, None)
+            self._ready_events.pop(process.pid, None)
+            self.draining.append((process, deadline))
+
+    def _reap_draining(self, block: bool = False):
+        """回收已退出的 drain 中 worker, 强制终止超过截止时间的。"""
+        still_draining = []
+        for process, deadline in self.draining:
+            if block:
+                process.join(timeout=max(0, deadline - time.monotonic()))
+            if process.is_alive() and time.monotonic() >= deadline:
+                self.logger.warning(
+                    f"Worker {process.pid} did not finish draining, killing."
+                )
+                process.kill()
+                process.join(timeout=5)
+            if process.is_alive():
+                still_draining.append((process, deadline))
+            else:
+                self.logger.info(f"Worker {process.pid} drained.")
+                process.close()
+        self.draining = still_draining
+
+    def run(self):
+        """启动 worker 并阻塞监督, 直到 :meth:`shutdown` 被调用。"""
+        self.startup()
+        self.supervise()
+
+    def supervise(self):
+        """监督已启动的 worker, 阻塞直到 :meth:`shutdown` 被调用。"""
+        try:
+            while not self._should_exit.wait(self.poll_interval):
+                # 上一次滚动重启结束前的请求留到它结束后再执行
+                if self._reload_requested.is_set() and not self.next_generation:
+                    self._reload_requested.clear()
+                    self._begin_reload()
+                if self._reap():
+                    self._notify()
+                if self.next_generation:
+                    self._advance_reload()
+                if self.draining:
+                    self._reap_draining()
+        finally:
+            self.terminate()
+
+    def shutdown(self):
+        """请求监督者停止 (可在信号处理函数中调用)。"""
+        self._should_exit.set()
+
+    def terminate(self):
+        """
+        drain 所有 worker, 超过 ``drain_timeout`` 仍未退出的强制终止, 然后关闭监听 socket。
+
+        :meth:`supervise` 退出时会自动调用; 没有运行监督循环时 (如启动失败) 由调用方直接调用。
+        """
+        self.shutdown()
+        self._drain(self.processes + self.next_generation, timeout=self.drain_timeout)
+        self.processes, self.next_generation = [], []
+        self._reap_draining(block=True)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self.logger.info("All worker processes stopped.")
+
+
 # --- 服务管理类 ---
 
 
@@ -28,7 +692,7 @@ class ServiceManager:
     """
     管理 FastAPI/Uvicorn 服务的类。
 
-    封装了启动、停止、重启、状态检查、PID 文件管理和日志重定向的逻辑。
+    封装了启动、停止、重启、状态检查、PID 文件管理和异步日志的逻辑。
     """
 
     def __init__(
@@ -39,6 +703,15 @@ class ServiceManager:
         port: int = 8000,
         working_dir: str = ".",
         log_level: str = "info",
+        app_import: Optional[str] = None,
+        workers: int = 1,
+        ready_timeout: float = 30.0,
+        drain_timeout: float = 10.0,
+        log_max_bytes: int = 10 * 1024 * 1024,
+        log_backup_count: int = 5,
+        log_rotate_interval: Optional[float] = None,
+        slow_callback_ms: float = DEFAULT_SLOW_CALLBACK_MS,
+        asyncio_debug: bool = False,
     ):
         """
         初始化服务管理器。
@@ -50,6 +723,16 @@ class ServiceManager:
             port: Uvicorn 监听的端口。
             working_dir: 运行服务的工作目录。
             log_level: Uvicorn 的日志级别。
+            app_import: 应用的导入字符串 (如 ``"package.module:app"``), 多 worker 模式必需。
+            workers: worker 进程数量, 大于 1 时以 pre-fork 监督者模式运行。
+            ready_timeout: 等待服务开始接受连接的最长时间 (秒)。
+            drain_timeout: 停止或滚动重启时, 等待进行中请求完成的最长时间 (秒)。
+            log_max_bytes: 日志文件超过该大小时轮转, 0 表示不按大小轮转。
+            log_backup_count: 保留的轮转日志文件数量。
+            log_rotate_interval: 日志文件按时间轮转的间隔 (秒), 默认不按时间轮转。
+            slow_callback_ms: 事件循环慢回调阈值 (毫秒), 0 表示只测量循环延迟。
+            asyncio_debug: 开启 asyncio 调试模式, 慢回调记录带上 task 名称, 但所有回调都会
+                明显变慢, 只用于开发。
         """
         self.app = app_instance
         self.app_name = app_name
@@ -57,45 +740,72 @@ class ServiceManager:
         self.port = port
         self.working_dir = os.path.abspath(working_dir)  # 确保是绝对路径
         self.log_level = log_level
+        self.app_import = app_import
+        self.workers = workers
+        self.ready_timeout = ready_timeout
+        self.drain_timeout = drain_timeout
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
+        self.log_rotate_interval = log_rotate_interval
+        self.slow_callback_ms = slow_callback_ms
+        self.asyncio_debug = asyncio_debug
 
         self.pid_file = os.path.join(self.working_dir, f"{self.app_name}.pid")
         self.log_file = os.path.join(self.working_dir, f"{self.app_name}.log")
+        # 各 worker 的指标快照目录
+        self.metrics_dir = os.path.join(self.working_dir, f"{self.app_name}.metrics")
+        # 滚动重启参数, 由 restart --graceful 写入, 监督者收到 SIGHUP 时读取
+        self.reload_file = os.path.join(self.working_dir, f"{self.app_name}.reload")
+        # 运行中服务的 drain 超时, stop 按它等待服务退出, 而不是按 stop 进程自己的默认值
+        self.drain_file = os.path.join(self.working_dir, f"{self.app_name}.drain")
 
         self.uvicorn_config = uvicorn.Config(
             app=self.app,
             host=self.host,
             port=self.port,
             log_level=self.log_level,
+            # 不让 Uvicorn 安装自己的 stdout/stderr handler, 日志经根记录器进入 LogPipeline
+            log_config=None,
+            timeout_graceful_shutdown=self.drain_timeout,
             # 添加其他需要的 Uvicorn 配置, 例如:
             # reload=True, # 开发时使用
             # workers=4,   # 生产环境使用
         )
         self._server: Optional[uvicorn.Server] = None
+        self._supervisor: Optional[WorkerSupervisor] = None
         self._server_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()  # 用于优雅停止的事件
+        self._ready_event = threading.Event()  # Uvicorn 完成启动后设置
+        self._log_pipeline: Optional[LogPipeline] = None
 
-        # 配置日志记录器 (可选, Uvicorn 也有自己的日志)
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            filename=self.log_file,
-            filemode="a",
-        )
         self.logger = logging.getLogger(__name__)
 
-    def _write_pid(self):
-        """将当前进程 PID 写入 PID 文件。"""
+    def _write_pid(self, worker_pids: Optional[List[int]] = None):
+        """
+        将当前进程 PID 写入 PID 文件。
+
+        第一行是主进程 (监督者) PID, 多 worker 模式下后续每行是一个 worker PID。
+        当前的 drain 超时 (滚动重启可能修改过) 同时写入 ``drain_file``。
+        """
         pid = os.getpid()
+        lines = [str(pid)] + [str(worker_pid) for worker_pid in worker_pids or []]
+        drain_timeout = self._supervisor.drain_timeout if self._supervisor else self.drain_timeout
         try:
-            with open(self.pid_file, "w") as f:
-                f.write(str(pid))
-            self.logger.info(f"PID {pid} written to {self.pid_file}")
+            with open(self.drain_file, "w") as f:
+                f.write(str(drain_timeout))
+            tmp_file = f"{self.pid_file}.tmp"
+            with open(tmp_file, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_file, self.pid_file)  # 原子替换, status 不会读到半个文件
+            self.logger.info(f"PIDs {lines} written to {self.pid_file}")
         except IOError as e:
             self.logger.error(f"Failed to write PID file {self.pid_file}: {e}")
             sys.exit(1)  # 无法写入 PID 文件是严重错误
 
     def _remove_pid(self):
         """安全地移除 PID 文件。"""
+        with contextlib.suppress(OSError):
+            os.remove(self.drain_file)
         if os.path.exists(self.pid_file):
             try:
                 os.remove(self.pid_file)
@@ -109,7 +819,7 @@ class ServiceManager:
             return None
         try:
             with open(self.pid_file, "r") as f:
-                pid_str = f.read().strip()
+                pid_str = f.readline().strip()
                 if not pid_str:
                     return None
                 pid = int(pid_str)
@@ -138,38 +848,101 @@ class ServiceManager:
             self.logger.error(f"Error reading PID file {self.pid_file}: {e}")
             return None
 
+    def _get_drain_timeout(self) -> float:
+        """读取运行中服务的 drain 超时, 没有记录时使用本进程的配置。"""
+        try:
+            with open(self.drain_file, "r") as f:
+                return float(f.read().strip())
+        except (IOError, ValueError):
+            return self.drain_timeout
+
+    def _get_worker_pids(self) -> List[int]:
+        """从 PID 文件读取 worker PID 列表 (单进程模式下为空)。"""
+        try:
+            with open(self.pid_file, "r") as f:
+                lines = f.read().split()
+            return [int(line) for line in lines[1:]]
+        except (IOError, ValueError):
+            return []
+
+    def _start_logging(self, record_queue=None):
+        """
+        启动异步日志: 日志记录 (含 Uvicorn 访问日志) 只放入队列,
+        由后台写线程批量写入 ``log_file`` 并按大小/时间轮转, 事件循环不再等待磁盘写入。
+        """
+        self._log_pipeline = LogPipeline(
+            self.log_file,
+            record_queue=record_queue,
+            max_bytes=self.log_max_bytes,
+            backup_count=self.log_backup_count,
+            rotate_interval=self.log_rotate_interval,
+        ).start()
+        self._log_pipeline.install()
+
+    def _stop_logging(self):
+        """写完队列中剩余的日志并恢复原来的日志 handler。"""
+        if self._log_pipeline:
+            self._log_pipeline.stop()
+            self._log_pipeline = None
+
     def _run_server(self):
         """在单独的线程中运行 Uvicorn 服务器。"""
-        # 重定向该线程的标准输出/错误到日志文件
-        # 注意: 这可能不会捕获 Uvicorn 所有的内部日志，Uvicorn 自己的日志配置更可靠
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
         try:
-            with open(self.log_file, "a") as log:
-                sys.stdout = log
-                sys.stderr = log
-                self._server = uvicorn.Server(config=self.uvicorn_config)
-                self.logger.info(f"Uvicorn server starting ({self.host}:{self.port})")
-                self._server.run()  # 这个调用会阻塞直到服务器停止
-                self.logger.info("Uvicorn server stopped.")
+            self._server = ReadyServer(
+                config=self.uvicorn_config, ready_event=self._ready_event
+            )
+            self.logger.info(f"Uvicorn server starting ({self.host}:{self.port})")
+            self._server.run()  # 这个调用会阻塞直到服务器停止
+            self.logger.info("Uvicorn server stopped.")
         except Exception as e:
             self.logger.exception(
                 f"Error running Uvicorn server: {e}"
             )  # 使用 exception 记录堆栈跟踪
         finally:
-            sys.stdout = original_stdout  # 恢复标准输出/错误
-            sys.stderr = original_stderr
             self._server = None  # 标记服务器实例已停止
             self._stop_event.set()  # 通知主线程服务器已停止
 
     def _signal_handler(self, sig, frame):
         """处理 SIGINT 和 SIGTERM 信号。"""
         self.logger.warning(f"Received signal {sig}. Initiating graceful shutdown...")
-        self.stop()
-        sys.exit(0)  # 确保在处理信号后退出
+        # Uvicorn 停止 accept 并在 drain_timeout 内处理完进行中的请求,
+        # _run_server 结束后主线程的 _stop_event.wait() 返回并清理 PID 文件
+        if self._server:
+            self._server.should_exit = True
+        else:
+            self._stop_event.set()
 
-    def start(self):
-        """启动 FastAPI 服务作为后台进程。"""
+    def start(
+        self,
+        workers: Optional[int] = None,
+        ready_timeout: Optional[float] = None,
+        drain_timeout: Optional[float] = None,
+        slow_callback_ms: Optional[float] = None,
+        asyncio_debug: Optional[bool] = None,
+    ):
+        """
+        启动 FastAPI 服务作为后台进程。
+
+        服务开始接受连接后立即报告启动成功, 超过 ``ready_timeout`` 仍未就绪则视为启动失败。
+
+        Args:
+            workers: worker 进程数量, 默认使用构造时的配置。大于 1 时启动多 worker 监督者。
+            ready_timeout: 就绪等待时间 (秒), 默认使用构造时的配置。
+            drain_timeout: 停止时等待进行中请求完成的时间 (秒), 默认使用构造时的配置。
+            slow_callback_ms: 慢回调阈值 (毫秒), 默认使用构造时的配置。
+            asyncio_debug: 是否开启 asyncio 调试模式, 默认使用构造时的配置。
+        """
+        if workers is not None:
+            self.workers = workers
+        if ready_timeout is not None:
+            self.ready_timeout = ready_timeout
+        if drain_timeout is not None:
+            self.drain_timeout = drain_timeout
+            self.uvicorn_config.timeout_graceful_shutdown = drain_timeout
+        if slow_callback_ms is not None:
+            self.slow_callback_ms = slow_callback_ms
+        if asyncio_debug is not None:
+            self.asyncio_debug = asyncio_debug
         if pid := self._get_pid_from_file():
             click.echo(f"{self.app_name} is already running with PID {pid}.")
             sys.exit(1)
@@ -188,7 +961,24 @@ class ServiceManager:
 
         # 清理停止事件，以防上次未完全清理
         self._stop_event.clear()
+        self._ready_event.clear()
+        self._reset_metrics_dir()
+        # 通过环境变量传给应用的 lifespan (worker 进程继承)
+        os.environ[SLOW_CALLBACK_ENV] = str(self.slow_callback_ms)
+        os.environ[ASYNCIO_DEBUG_ENV] = "1" if self.asyncio_debug else "0"
+
+        # 多 worker 模式下 worker 通过进程间队列把日志交给监督者的写线程
+        self._start_logging(_spawn.Queue(DEFAULT_MAX_QUEUED) if self.workers > 1 else None)
+        try:
+            if self.workers > 1:
+                self._start_workers()
+            else:
+                self._start_single()
+        finally:
+            self._stop_logging()
 
+    def _start_single(self):
+        """在当前进程的线程中运行 Uvicorn, 阻塞直到服务停止。"""
         # 启动 Uvicorn 服务器线程
         # 使用 non-daemon 线程，以便主线程可以等待它
         self._server_thread = threading.Thread(
@@ -196,11 +986,13 @@ class ServiceManager:
         )
         self._server_thread.start()
 
-        # 短暂等待，检查服务器是否启动成功 (可以改进为更可靠的检查)
-        time.sleep(3)  # 等待服务器初始化
+        # 等待 Uvicorn 完成启动; 线程提前退出 (如端口被占用) 时立即失败
+        ready = wait_until(
+            lambda: self._ready_event.is_set() or not self._server_thread.is_alive(),
+            self.ready_timeout,
+        )
 
-        # 检查线程是否仍在运行，并且 _server 实例是否已创建 (表示 run() 被调用)
-        if self._server_thread.is_alive() and self._server:
+        if ready and self._ready_event.is_set() and self._server_thread.is_alive():
             self._write_pid()  # 只有在服务器看似成功启动后才写入 PID
             click.echo(f"{self.app_name} started successfully with PID {os.getpid()}.")
             self.logger.info(
@@ -221,7 +1013,8 @@ class ServiceManager:
 
         else:
             self.logger.error(
-                "Server thread did not start correctly or exited prematurely."
+                "Server thread did not become ready within "
+                f"{self.ready_timeout}s or exited prematurely."
             )
             click.echo(
                 f"Error: Failed to start {self.app_name}. Check logs at {self.log_file}",
@@ -236,6 +1029,75 @@ class ServiceManager:
             self._remove_pid()  # 清理可能意外写入的 PID
             sys.exit(1)
 
+    def _start_workers(self):
+        """以 pre-fork 监督者模式启动多个 worker 进程, 阻塞直到服务停止。"""
+        if not self.app_import:
+            click.echo(
+                "Error: multi-worker mode requires app_import (e.g. 'module:app').",
+                err=True,
+            )
+            sys.exit(1)
+
+        worker_config = uvicorn.Config(
+            app=self.app_import,
+            host=self.host,
+            port=self.port,
+            log_level=self.log_level,
+            log_config=None,
+        )
+        self._supervisor = WorkerSupervisor(
+            worker_config,
+            workers=self.workers,
+            on_change=self._write_pid,
+            logger=self.logger,
+            drain_timeout=self.drain_timeout,
+            ready_timeout=self.ready_timeout,
+            log_queue=self._log_pipeline.queue if self._log_pipeline else None,
+        )
+
+        def handle_signal(sig, frame):
+            self.logger.warning(f"Received signal {sig}. Stopping workers...")
+            self._supervisor.shutdown()
+
+        def handle_reload(sig, frame):
+            self.logger.warning(f"Received signal {sig}. Rolling reload requested.")
+            self._supervisor.request_reload(drain_timeout=self._read_reload_file())
+
+        signal.signal(signal.SIGINT, handle_signal)
+        signal.signal(signal.SIGTERM, handle_signal)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, handle_reload)
+
+        try:
+            self._supervisor.startup()
+            ready = self._supervisor.wait_ready(self.ready_timeout)
+        except (OSError, SystemExit) as e:
+            self.logger.error(f"Failed to start workers: {e}")
+            ready = False
+
+        if not ready:
+            self.logger.error(
+                f"Workers did not become ready within {self.ready_timeout}s."
+            )
+            click.echo(
+                f"Error: Failed to start {self.app_name}. Check logs at {self.log_file}",
+                err=True,
+            )
+            self._supervisor.terminate()
+            self._remove_pid()
+            sys.exit(1)
+
+        self._write_pid(self._supervisor.pids)  # worker 全部就绪后才写入 PID
+        click.echo(
+            f"{self.app_name} started with supervisor PID {os.getpid()} and "
+            f"{self.workers} workers: {self._supervisor.pids}."
+        )
+        try:
+            self._supervisor.supervise()
+        finally:
+            self._remove_pid()
+            self._stop_event.set()
+
     def stop(self, force: bool = False):
         """停止 FastAPI 服务。"""
         pid = self._get_pid_from_file()
@@ -247,6 +1109,8 @@ class ServiceManager:
 
         click.echo(f"Stopping {self.app_name} (PID {pid})...")
         self.logger.info(f"Attempting to stop process with PID {pid}")
+        worker_pids = self._get_worker_pids()
+        drain_timeout = self._get_drain_timeout()
 
         try:
             proc = psutil.Process(pid)
@@ -254,9 +1118,9 @@ class ServiceManager:
             self.logger.info(f"Sending SIGTERM to process {pid}")
             proc.terminate()  # 等同于 os.kill(pid, signal.SIGTERM)
 
-            # 等待进程终止
+            # 等待进程终止: 服务会先 drain 进行中的请求, 再留出几秒退出时间
             try:
-                proc.wait(timeout=10)  # 等待最多 10 秒
+                proc.wait(timeout=drain_timeout + 5)
                 self.logger.info(f"Process {pid} terminated gracefully.")
                 click.echo(f"{self.app_name} stopped.")
             except psutil.TimeoutExpired:
@@ -287,19 +1151,117 @@ class ServiceManager:
             # 这里强制设置，以防主线程卡住（如果 stop 是从外部调用的）
             self._stop_event.set()
             self._remove_pid()
+            # 监督者被强制杀死时, 清理可能残留的 worker 进程
+            self._kill_orphan_workers(worker_pids)
             # 确保线程资源被释放（如果线程还在）
             if self._server_thread and self._server_thread.is_alive():
                 self._server_thread.join(timeout=1)
 
-    def restart(self):
-        """重启 FastAPI 服务。"""
+    def _reset_metrics_dir(self):
+        """清空上次运行留下的指标快照, 并通过环境变量告知 (spawn 的) worker。"""
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        os.environ[METRICS_DIR_ENV] = self.metrics_dir
+
+    def _kill_orphan_workers(self, worker_pids: List[int]):
+        """终止监督者退出后仍然存活的 worker 进程。"""
+        for worker_pid in worker_pids:
+            try:
+                proc = psutil.Process(worker_pid)
+                self.logger.warning(f"Killing orphan worker {worker_pid}")
+                proc.kill()
+                proc.wait(timeout=5)
+            except (psutil.NoSuchProcess, psutil.TimeoutExpired):
+                pass
+            except psutil.AccessDenied:
+                self.logger.error(f"Permission denied to kill worker {worker_pid}.")
+
+    def restart(
+        self,
+        workers: Optional[int] = None,
+        ready_timeout: Optional[float] = None,
+        graceful: bool = False,
+        drain_timeout: Optional[float] = None,
+    ):
+        """
+        重启 FastAPI 服务。
+
+        Args:
+            workers: 新服务的 worker 数量, 默认沿用正在运行的服务的 worker 数量。
+                滚动重启不改变 worker 数量, 与 ``graceful`` 同时给出时报错。
+            ready_timeout: 就绪等待时间 (秒)。
+            graceful: 对多 worker 服务执行零停机滚动重启, 而不是 stop → start。
+            drain_timeout: 旧 worker 处理完进行中请求的最长时间 (秒)。
+        """
+        if graceful and workers is not None:
+            raise ValueError("a graceful restart keeps the worker count, drop workers")
+        worker_pids = self._get_worker_pids()
+        if graceful and worker_pids:
+            self._graceful_reload(ready_timeout=ready_timeout, drain_timeout=drain_timeout)
+            return
+
         click.echo(f"Restarting {self.app_name}...")
         if self._get_pid_from_file():
+            if workers is None:
+                # PID 文件中 worker PID 的行数即当前 worker 数量, 单进程模式下没有 worker 行
+                workers = len(worker_pids) or 1
+            if graceful:
+                click.echo(
+                    f"{self.app_name} runs without worker processes, "
+                    "falling back to stop and start."
+                )
+            # stop 会等待旧进程退出, 监听 socket 设置了 SO_REUSEADDR, 无需额外等待端口释放
             self.stop()
-            time.sleep(2)  # 等待端口释放等
         else:
             click.echo(f"{self.app_name} was not running. Starting it now.")
-        self.start()  # stop 会清理 PID, start 会重新创建
+        # stop 会清理 PID, start 会重新创建
+        self.start(workers=workers, ready_timeout=ready_timeout, drain_timeout=drain_timeout)
+
+    def _read_reload_file(self) -> Optional[float]:
+        """读取并删除 restart --graceful 写入的 drain 超时参数。"""
+        try:
+            with open(self.reload_file, "r") as f:
+                value = f.read().strip()
+            os.remove(self.reload_file)
+            return float(value) if value else None
+        except (IOError, ValueError):
+            return None
+
+    def _graceful_reload(
+        self, ready_timeout: Optional[float] = None, drain_timeout: Optional[float] = None
+    ):
+        """向监督者发送 SIGHUP 触发滚动重启, 等待新一代 worker 接管。"""
+        pid = self._get_pid_from_file()
+        old_workers = set(self._get_worker_pids())
+        ready_timeout = self.ready_timeout if ready_timeout is None else ready_timeout
+
+        click.echo(f"Reloading {self.app_name} (PID {pid}) without downtime...")
+        if drain_timeout is not None:
+            with open(self.reload_file, "w") as f:
+                f.write(str(drain_timeout))
+        try:
+            os.kill(pid, signal.SIGHUP)
+        except OSError as e:
+            self.logger.error(f"Failed to signal supervisor {pid}: {e}")
+            click.echo(f"Error: Could not signal {self.app_name}: {e}", err=True)
+            return
+
+        # 监督者在新 worker 全部就绪后才会把它们写入 PID 文件
+        def replaced():
+            current = set(self._get_worker_pids())
+            return bool(current) and not current & old_workers
+
+        if wait_until(replaced, ready_timeout + 5):
+            click.echo(
+                f"{self.app_name} reloaded, new workers: {self._get_worker_pids()}. "
+                "Old workers are draining."
+            )
+        else:
+            click.echo(
+                f"Error: New workers did not take over within {ready_timeout}s, "
+                f"old workers keep serving. Check logs at {self.log_file}",
+                err=True,
+            )
 
     def status(self):
         """检查 FastAPI 服务状态。"""
@@ -308,7 +1270,12 @@ class ServiceManager:
                 proc = psutil.Process(pid)
                 # 获取更详细的状态
                 status_info = proc.status()
-                cpu_percent = proc.cpu_percent(interval=0.1)
+                worker_procs = self._worker_processes()
+                # cpu_percent 需要两次采样: 先为所有进程建立基线, 再统一等待一次
+                for p in [proc, *worker_procs]:
+                    p.cpu_percent(interval=None)
+                time.sleep(0.1)
+                cpu_percent = proc.cpu_percent(interval=None)
                 memory_info = proc.memory_info()
                 click.echo(f"{self.app_name} is running:")
                 click.echo(f"  PID: {pid}")
@@ -317,6 +1284,10 @@ class ServiceManager:
                 click.echo(
                     f"  Memory Usage: {memory_info.rss / (1024 * 1024):.2f} MB (RSS)"
                 )
+                if worker_procs:
+                    self._echo_worker_status(worker_procs)
+                self._echo_request_metrics()
+                self._echo_loop_metrics()
                 click.echo(f"  Working Directory: {self.working_dir}")
                 click.echo(f"  Log File: {self.log_file}")
             except psutil.NoSuchProcess:
@@ -330,3 +1301,79 @@ class ServiceManager:
                 )
         else:
             click.echo(f"{self.app_name} is not running.")
+
+    def _echo_request_metrics(self):
+        """输出各路由的请求数、进行中请求数和 p50/p99 延迟 (汇总所有 worker)。"""
+        registry = collect(self.metrics_dir)
+        histograms = registry.histograms.get("http_request_duration_seconds", {})
+        if not histograms:
+            return
+        in_progress = registry.gauges.get("http_requests_in_progress", {})
+        click.echo("  Requests:")
+        for key, histogram in sorted(histograms.items()):
+            labels = dict(key)
+            click.echo(
+                f"    {labels['method']} {labels['route']}: {histogram.count} requests, "
+                f"{in_progress.get(key, 0):.0f} in flight, "
+                f"p50 {histogram.quantile(0.5) * 1000:.1f} ms, "
+                f"p99 {histogram.quantile(0.99) * 1000:.1f} ms"
+            )
+
+    def _echo_loop_metrics(self, recent: int = 3):
+        """输出事件循环延迟 (汇总所有 worker)、慢回调次数和最近几次慢回调的堆栈。"""
+        registry = collect(self.metrics_dir)
+        lag = registry.histograms.get(LAG_METRIC, {}).get(())
+        if lag is None:
+            return
+        slow_total = registry.counters.get(SLOW_CALLBACKS_METRIC, {}).get((), 0)
+        click.echo(
+            f"  Event Loop Lag: p50 {lag.quantile(0.5) * 1000:.1f} ms, "
+            f"p99 {lag.quantile(0.99) * 1000:.1f} ms over {lag.count} samples, "
+            f"{slow_total:.0f} slow callbacks"
+        )
+        records = [
+            (pid, record)
+            for pid, snapshot in read_snapshots(self.metrics_dir).items()
+            for record in snapshot.get("slow_callbacks", [])
+        ]
+        records.sort(key=lambda item: item[1]["time"])
+        for pid, record in records[-recent:]:
+            at = time.strftime("%H:%M:%S", time.localtime(record["time"]))
+            click.echo(
+                f"    {at} worker {pid}: {record['callback']} took {record['seconds'] * 1000:.0f} ms"
+            )
+            for line in record["stack"][-5:]:
+                click.echo(f"      {line}")
+
+    def _worker_processes(self) -> List[psutil.Process]:
+        procs = []
+        for worker_pid in self._get_worker_pids():
+            try:
+                procs.append(psutil.Process(worker_pid))
+            except psutil.NoSuchProcess:
+                pass
+        return procs
+
+    def _echo_worker_status(self, worker_procs: List[psutil.Process]):
+        """输出每个 worker 的 CPU 与内存占用, 以及合计。"""
+        click.echo(f"  Workers: {len(worker_procs)}")
+        total_cpu = 0.0
+        total_rss = 0
+        for p in worker_procs:
+            try:
+                with p.oneshot():
+                    cpu = p.cpu_percent(interval=None)
+                    rss = p.memory_info().rss
+                    state = p.status()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                click.echo(f"    Worker {p.pid}: unavailable")
+                continue
+            total_cpu += cpu
+            total_rss += rss
+            click.echo(
+                f"    Worker {p.pid}: {state}, CPU {cpu:.2f}%, "
+                f"RSS {rss / (1024 * 1024):.2f} MB"
+            )
+        click.echo(
+            f"  Workers Total: CPU {total_cpu:.2f}%, RSS {total_rss / (1024 * 1024):.2f} MB"
+        )
@@ -3,6 +3,8 @@ from typing import NewType
 
 from injector import Binder, Injector, Module, inject, provider, singleton
 
+from hello_python.utils.di import CompiledInjector, request_context, request_scope
+
 Name = NewType("Name", str)
 Description = NewType("Description", str)
 
@@ -52,6 +54,19 @@ class MyServiceModule(Module):
         binder.bind(ServiceB, to=ServiceB, scope=singleton)
 
 
+@request_scope
+class RequestGreeting:
+    """每个请求一个实例, 依赖的 ServiceB 是单例"""
+
+    @inject
+    def __init__(self, service_b: ServiceB, user: User):
+        self.service_b = service_b
+        self.user = user
+
+    def close(self):
+        print(f"request greeting for {self.user.name} released")
+
+
 class Greeter:
     """Greeter class"""
 
@@ -107,3 +122,26 @@ def inject_main():
     print("user is User Class", isinstance(user, User))
 
     print(f"user: {user.name},description: {user.description}")
+
+    # 编译后的解析计划: 第一次 get 时编译, 之后复用同一个闭包
+    compiled = CompiledInjector(container)
+    user = compiled.get(User)
+    print(f"compiled user: {user.name}, plans: {len(compiled)}")
+    print("compiled singleton is shared:", compiled.get(ServiceB) is service_b_instance)
+    return compiled
+
+
+def request_main():
+    """Request scope: 同一个请求内共享, 请求之间重新创建, 单例始终共享"""
+    injector = Injector([MyServiceModule(), UserModule(), UserAttributeModule()])
+    container = CompiledInjector(injector)
+    greetings = []
+    for request_id in range(2):
+        with request_context():
+            greeting = container.get(RequestGreeting)
+            shared = greeting is container.get(RequestGreeting)
+            print(f"request {request_id}: shared in request", shared)
+            greetings.append(greeting)
+    print("new per request:", greetings[0] is not greetings[1])
+    print("singleton shared:", greetings[0].service_b is greetings[1].service_b)
+    return greetings
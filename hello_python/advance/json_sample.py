@@ -154,3 +154,41 @@ print("\n复杂数据JSON字符串:\n", complex_json_string)
 complex_loaded_data = ujson.loads(complex_json_string)
 print("\n复杂数据反序列化后的Python对象:\n", complex_loaded_data)
 print("一级品价格:", complex_loaded_data["variations"][0]["price"])
+
+
+# 5. 流式读写 JSON Lines (大文件按行处理, 内存占用与文件大小无关)
+from hello_python.utils.jsonl import read_jsonl, write_jsonl
+
+products = ({**data, "id": i} for i in range(1000))
+count = write_jsonl("data/tomato.jsonl.gz", products)
+print(f"\n已写入 {count} 条记录到 tomato.jsonl.gz")
+
+total_price = sum(record["price"] for record in read_jsonl("data/tomato.jsonl.gz"))
+print("流式读取的总价:", round(total_price, 2))
+
+
+# 6. 编码器注册表: 每种类型只编译一次编码函数, 按类型字典分发, 避免逐个 isinstance 判断
+from dataclasses import dataclass
+
+from hello_python.utils.encoders import EncoderRegistry
+
+encoders = EncoderRegistry()
+encoders.register(datetime, encoder=datetime.isoformat)
+encoders.register(Product)
+encoders.register(
+    Variety,
+    fields=("name", "sugar_content"),
+    rename={"name": "variety_name", "sugar_content": "sugar"},
+)
+encoders.register(TomatoProduct, fields=("name", "varieties"), rename={"name": "product_name"})
+
+
+@encoders.register
+@dataclass(slots=True)
+class Harvest:
+    product: Product
+    weight_kg: float
+
+
+print("\n注册表编码:", encoders.dumps(product, ensure_ascii=False))
+print("slots dataclass:", encoders.dumps(Harvest(tomato, 120.5), ensure_ascii=False))
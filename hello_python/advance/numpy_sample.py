@@ -1,5 +1,10 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
 import numpy as np
 
+from hello_python.utils.profiling import timed
+
 
 # Example objective function: f(x) = (x - 3)^2
 def objective_function(x):
@@ -11,26 +16,199 @@ def gradient(x):
     return 2 * (x - 3)
 
 
-# Gradient Descent Algorithm
-def gradient_descent(learning_rate=0.1, tolerance=1e-6, max_iter=1000):
-    x = np.random.randn()  # Starting point
-    prev_value = objective_function(x)
+# N-dimensional example: Rosenbrock function, minimum f(1, 1) = 0, x has shape (batch, 2)
+def rosenbrock(x):
+    a, b = x[:, 0], x[:, 1]
+    return (1 - a) ** 2 + 100 * (b - a**2) ** 2
+
+
+def rosenbrock_gradient(x):
+    a, b = x[:, 0], x[:, 1]
+    grad = np.empty_like(x)
+    grad[:, 0] = -2 * (1 - a) - 400 * a * (b - a**2)
+    grad[:, 1] = 200 * (b - a**2)
+    return grad
+
+
+METHODS = ("sgd", "momentum", "adam")
+
+
+@dataclass
+class DescentResult:
+    """
+    Result of :func:`batch_gradient_descent`, one entry per problem.
+
+    ``x`` has the shape of the starting points; ``value``, ``converged`` and
+    ``iterations`` have shape ``(batch,)``.
+    """
+
+    x: np.ndarray
+    value: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
 
-    for i in range(max_iter):
-        grad = gradient(x)
-        x -= learning_rate * grad  # Update the variable
+    @property
+    def n_converged(self) -> int:
+        return int(np.count_nonzero(self.converged))
 
-        # Check convergence by comparing the change in the objective function value
-        curr_value = objective_function(x)
 
-        print(f"Iteration {i + 1}: x = {x:.6f}, f(x) = {curr_value:.6f}")
+@timed
+def batch_gradient_descent(
+    x0,
+    objective: Callable[[np.ndarray], np.ndarray] = objective_function,
+    grad: Callable[[np.ndarray], np.ndarray] = gradient,
+    method: str = "sgd",
+    learning_rate: float = 0.1,
+    tolerance: float = 1e-6,
+    grad_tolerance: Optional[float] = None,
+    max_iter: int = 1000,
+    momentum: float = 0.9,
+    beta1: float = 0.9,
+    beta2: float = 0.999,
+    eps: float = 1e-8,
+    log_every: int = 0,
+    log: Callable[[str], None] = print,
+) -> DescentResult:
+    """
+    Minimize many independent problems at once with NumPy array operations.
 
-        if abs(curr_value - prev_value) < tolerance:
-            print(f"Convergence achieved after {i + 1} iterations.")
+    Every row of ``x0`` is one problem: shape ``(batch,)`` for scalar problems, or
+    ``(batch, dim)`` for N-dimensional parameter vectors. ``objective`` maps the active rows
+    to their values ``(k,)``, and ``grad`` maps them to gradients of the same shape as the
+    rows. Both are called on the active rows only.
+
+    A problem converges when, in one step, its objective changes by less than ``tolerance``
+    and every gradient component is below ``grad_tolerance`` (default ``sqrt(tolerance)``).
+    Converged rows are written back and dropped from the working arrays, so the later
+    iterations only pay for the problems still running.
+
+    Args:
+        method: ``"sgd"``, ``"momentum"`` (heavy ball, coefficient ``momentum``) or
+            ``"adam"`` (``beta1``, ``beta2``, ``eps``).
+        log_every: log a progress line every N iterations, 0 disables logging.
+        log: the function receiving the log lines.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+    if grad_tolerance is None:
+        grad_tolerance = np.sqrt(tolerance)
+    x = np.array(x0, dtype=np.float64, ndmin=1)
+    batch = x.shape[0]
+    value = np.asarray(objective(x), dtype=np.float64)
+    converged = np.zeros(batch, dtype=bool)
+    iterations = np.full(batch, max_iter, dtype=np.int64)
+
+    # 工作数组只保存尚未收敛的问题, idx 记录它们在结果中的位置
+    idx = np.arange(batch)
+    xa, prev = x.copy(), value.copy()
+    velocity = np.zeros_like(xa) if method == "momentum" else None
+    m = np.zeros_like(xa) if method == "adam" else None
+    s = np.zeros_like(xa) if method == "adam" else None
+    # g * g 的临时数组: grad 返回的数组可能是调用方持有的缓冲区, 不能原地修改
+    squared = np.empty_like(xa) if method == "adam" else None
+
+    for step in range(1, max_iter + 1):
+        g = grad(xa)
+        steep = np.abs(g) if g.ndim == 1 else np.abs(g).max(axis=1)
+        if method == "sgd":
+            update = learning_rate * g
+        elif method == "momentum":
+            velocity *= momentum
+            velocity += learning_rate * g
+            update = velocity
+        else:
+            m *= beta1
+            m += (1 - beta1) * g
+            g2 = np.multiply(g, g, out=squared[: len(g)])
+            s *= beta2
+            g2 *= 1 - beta2
+            s += g2
+            # 偏差修正合并进步长, 省去 m_hat / s_hat 两个临时数组
+            step_size = learning_rate * np.sqrt(1 - beta2**step) / (1 - beta1**step)
+            update = np.sqrt(s)
+            update += eps
+            np.divide(m, update, out=update)
+            update *= step_size
+        xa -= update
+
+        curr = np.asarray(objective(xa), dtype=np.float64)
+        # 目标值的变化和梯度都足够小才算收敛: momentum / Adam 在折返点附近
+        # 目标值几乎不变, 只看目标值会误判
+        done = (np.abs(curr - prev) < tolerance) & (steep < grad_tolerance)
+        if done.any():
+            finished = idx[done]
+            x[finished] = xa[done]
+            value[finished] = curr[done]
+            converged[finished] = True
+            iterations[finished] = step
+            keep = ~done
+            idx, xa, curr = idx[keep], xa[keep], curr[keep]
+            if velocity is not None:
+                velocity = velocity[keep]
+            if m is not None:
+                m, s = m[keep], s[keep]
+        prev = curr
+
+        if log_every and (step % log_every == 0 or not len(idx)):
+            best = float(value[converged].min()) if converged.any() else float("nan")
+            log(
+                f"Iteration {step}: {batch - len(idx)}/{batch} converged, "
+                f"{len(idx)} active, best f(x) = {best:.6g}"
+            )
+        if not len(idx):
             break
 
-        prev_value = curr_value
+    # 没有收敛的问题保留最后一次迭代的结果
+    x[idx] = xa
+    value[idx] = prev
+    return DescentResult(x=x, value=value, converged=converged, iterations=iterations)
+
+
+# Gradient Descent Algorithm
+def gradient_descent(
+    learning_rate=0.1,
+    tolerance=1e-6,
+    max_iter=1000,
+    x0: Optional[float] = None,
+    log_every: int = 0,
+):
+    x0 = np.random.randn() if x0 is None else x0  # Starting point
+    result = batch_gradient_descent(
+        [x0],
+        learning_rate=learning_rate,
+        tolerance=tolerance,
+        max_iter=max_iter,
+        log_every=log_every,
+    )
+    if result.converged[0]:
+        print(f"Convergence achieved after {result.iterations[0]} iterations.")
     else:
         print("Max iterations reached without convergence.")
+    return float(result.x[0])
+
 
-    return x
+def batch_main(count=1_000_000, method="sgd"):
+    # 一次求解 count 个起点不同的问题, 每 10 次迭代输出一次进度
+    rng = np.random.default_rng(0)
+    result = batch_gradient_descent(
+        rng.normal(0, 10, count), method=method, log_every=10
+    )
+    print(
+        f"{result.n_converged}/{count} converged, "
+        f"x in [{result.x.min():.4f}, {result.x.max():.4f}], "
+        f"max iterations {result.iterations.max()}"
+    )
+    # N 维参数: 从 4 个起点用 Adam 最小化 Rosenbrock 函数
+    starts = np.array([[-1.5, 2.0], [0.0, 0.0], [2.0, 2.0], [-0.5, -1.0]])
+    result = batch_gradient_descent(
+        starts,
+        rosenbrock,
+        rosenbrock_gradient,
+        method="adam",
+        learning_rate=0.02,
+        tolerance=1e-12,
+        max_iter=20000,
+    )
+    for start, x, value in zip(starts, result.x, result.value):
+        print(f"Rosenbrock from {start}: x = {np.round(x, 3)}, f(x) = {value:.2e}")
+    return result
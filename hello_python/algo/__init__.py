@@ -0,0 +1,20 @@
+"""
+Algorithms: 常用算法, 每个都有纯 Python 和 NumPy 向量化两种实现。
+
+所有入口函数接受 ``backend=None | "python" | "numpy"`` (见 :mod:`hello_python.algo.backend`),
+``hello bench algo`` 比较它们在不同输入规模下的耗时和内存。
+"""
+
+from hello_python.algo.backend import BACKENDS, choose_backend
+from hello_python.algo.intervals import merge_intervals
+from hello_python.algo.search import (
+    binary_search,
+    equal_range,
+    first_true,
+    lower_bound,
+    search_sorted,
+    upper_bound,
+)
+from hello_python.algo.selection import introselect, quickselect, select
+from hello_python.algo.sorting import merge_sort, sort
+from hello_python.algo.topk import top_k
@@ -0,0 +1,30 @@
+"""
+Backend Module: pick the pure-Python or the NumPy implementation of an algorithm.
+
+Every function in :mod:`hello_python.algo` takes ``backend=None``. ``None`` follows the
+input: NumPy arrays use the ``"numpy"`` backend, lists and other sequences the
+``"python"`` one. Pass the name to force a backend; the input is converted (``np.asarray``
+or ``ndarray.tolist``) and the result has the backend's type (``ndarray`` or ``list``).
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+BACKENDS = ("python", "numpy")
+
+
+def choose_backend(data: Any, backend: Optional[str] = None) -> str:
+    """返回 ``data`` 使用的 backend 名称, ``backend`` 为 None 时按输入类型选择。"""
+    if backend is None:
+        return "numpy" if isinstance(data, np.ndarray) else "python"
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+    return backend
+
+
+def as_list(data: Any) -> List:
+    """Python backend 的输入: ndarray 一次性转换为 list, 避免逐个访问 numpy 标量。"""
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    return data if isinstance(data, list) else list(data)
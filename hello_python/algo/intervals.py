@@ -0,0 +1,48 @@
+"""
+Intervals Module: merge overlapping closed intervals.
+
+Intervals are ``[start, end]`` pairs with ``start <= end``. Intervals that overlap or
+touch (``[1, 3]`` and ``[3, 5]``) are merged.
+
+The ``"python"`` backend sorts by start and extends the last merged interval while the
+next one starts inside it. The ``"numpy"`` backend works on an ``(n, 2)`` array:
+after sorting by start, a new group begins wherever a start is past the running maximum
+of all previous ends (``np.maximum.accumulate``), and each group's end is reduced with
+``np.maximum.reduceat``. No Python-level loop runs over the intervals.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+from hello_python.algo.backend import as_list, choose_backend
+
+
+def merge_intervals(intervals, backend: Optional[str] = None) -> Any:
+    """
+    合并重叠或相接的区间, 结果按起点升序。
+
+    python backend 返回 ``[[start, end], ...]``, numpy backend 返回 ``(m, 2)`` 数组。
+    """
+    if choose_backend(intervals, backend) == "numpy":
+        array = np.asarray(intervals).reshape(-1, 2)
+        if not len(array):
+            return array.copy()
+        # 起点相同的区间谁先谁后不影响合并结果, 不需要稳定排序
+        array = array[np.argsort(array[:, 0])]
+        starts, ends = array[:, 0], array[:, 1]
+        reach = np.maximum.accumulate(ends)
+        first = np.empty(len(array), dtype=bool)
+        first[0] = True
+        first[1:] = starts[1:] > reach[:-1]
+        groups = np.flatnonzero(first)
+        return np.column_stack((starts[groups], np.maximum.reduceat(ends, groups)))
+
+    merged = []
+    for start, end in sorted(as_list(intervals), key=lambda interval: interval[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
@@ -0,0 +1,89 @@
+"""
+Search Module: binary search variants on sorted sequences.
+
+Scalar helpers, written out in plain Python so the loop invariants are visible:
+
+* :func:`lower_bound` / :func:`upper_bound`: first position with ``a[i] >= x`` / ``> x``;
+* :func:`equal_range`: both bounds, the slice of elements equal to ``x``;
+* :func:`binary_search`: the index of the first element equal to ``x``, or -1;
+* :func:`first_true`: the first integer in ``[lo, hi)`` where a monotone predicate
+  holds ("binary search on the answer").
+
+:func:`search_sorted` answers many queries in one call. The ``"python"`` backend runs
+:func:`lower_bound` / :func:`upper_bound` per query; ``"numpy"`` is ``np.searchsorted``,
+the same loop in C over the whole query array.
+"""
+
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hello_python.algo.backend import as_list, choose_backend
+
+SIDES = ("left", "right")
+
+
+def lower_bound(a: Sequence, x, lo: int = 0, hi: Optional[int] = None) -> int:
+    """``a[lo:hi]`` 中第一个 ``>= x`` 的位置, 都小于 ``x`` 时返回 ``hi``。"""
+    hi = len(a) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def upper_bound(a: Sequence, x, lo: int = 0, hi: Optional[int] = None) -> int:
+    """``a[lo:hi]`` 中第一个 ``> x`` 的位置, 都不大于 ``x`` 时返回 ``hi``。"""
+    hi = len(a) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < a[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def equal_range(a: Sequence, x) -> Tuple[int, int]:
+    """等于 ``x`` 的元素所在的区间 ``[lower, upper)``, 不存在时两者相等。"""
+    lower = lower_bound(a, x)
+    return lower, upper_bound(a, x, lo=lower)
+
+
+def binary_search(a: Sequence, x) -> int:
+    """等于 ``x`` 的第一个元素的下标, 不存在时返回 -1。"""
+    i = lower_bound(a, x)
+    return i if i < len(a) and a[i] == x else -1
+
+
+def first_true(lo: int, hi: int, predicate: Callable[[int], bool]) -> int:
+    """
+    ``[lo, hi)`` 中第一个使 ``predicate`` 为真的整数, 都为假时返回 ``hi``。
+
+    ``predicate`` 必须单调: 一旦为真, 之后都为真。
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if predicate(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def search_sorted(a, queries, side: str = "left", backend: Optional[str] = None) -> Any:
+    """
+    批量查询每个 ``queries[i]`` 在有序序列 ``a`` 中的插入位置。
+
+    ``side="left"`` 对应 :func:`lower_bound`, ``"right"`` 对应 :func:`upper_bound`。
+    """
+    if side not in SIDES:
+        raise ValueError(f"unknown side {side!r}, expected one of {SIDES}")
+    if choose_backend(a, backend) == "numpy":
+        return np.searchsorted(np.asarray(a), np.asarray(queries), side=side)
+    a = as_list(a)
+    bound = lower_bound if side == "left" else upper_bound
+    return [bound(a, x) for x in as_list(queries)]
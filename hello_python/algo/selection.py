@@ -0,0 +1,98 @@
+"""
+Selection Module: the k-th smallest element without sorting everything.
+
+Both pure-Python versions split the data into ``< pivot``, ``== pivot`` and ``> pivot``
+with list comprehensions (in CPython much faster than an in-place partition loop) and
+continue in the part that holds ``k``. Duplicates therefore cost nothing extra.
+
+* :func:`quickselect` picks random pivots: expected O(n), O(n^2) only with very bad luck;
+* :func:`introselect` starts with median-of-three pivots and, once the partitions stop
+  shrinking fast enough (depth above ``2 * log2(n)``), switches to median-of-medians
+  pivots, which bound the worst case to O(n).
+
+:func:`select` is the common entry point; its ``"numpy"`` backend is ``np.partition``
+(introselect in C).
+"""
+
+import random
+from typing import Any, List, Optional
+
+import numpy as np
+
+from hello_python.algo.backend import as_list, choose_backend
+
+
+def _check(n: int, k: int):
+    if not 0 <= k < n:
+        raise IndexError(f"k={k} out of range for {n} elements")
+
+
+def _split(items: List, pivot):
+    lower = [x for x in items if x < pivot]
+    upper = [x for x in items if x > pivot]
+    return lower, len(items) - len(lower) - len(upper), upper
+
+
+def quickselect(data, k: int, rng: Optional[random.Random] = None) -> Any:
+    """第 ``k`` 小 (从 0 开始) 的元素, 随机选择基准。"""
+    items = as_list(data)
+    _check(len(items), k)
+    choice = (rng or random).choice
+    while True:
+        pivot = choice(items)
+        lower, equal, upper = _split(items, pivot)
+        if k < len(lower):
+            items = lower
+        elif k < len(lower) + equal:
+            return pivot
+        else:
+            k -= len(lower) + equal
+            items = upper
+
+
+def _median_of_three(items: List):
+    a, b, c = items[0], items[len(items) // 2], items[-1]
+    if a > b:
+        a, b = b, a
+    return b if b <= c else max(a, c)
+
+
+def _lower_median(group: List):
+    group = sorted(group)
+    return group[(len(group) - 1) // 2]
+
+
+def median_of_medians(items: List):
+    """每 5 个一组取中位数, 再递归取这些中位数的中位数; 保证至少 30% 的元素在两侧。"""
+    while len(items) > 5:
+        items = [_lower_median(items[i : i + 5]) for i in range(0, len(items), 5)]
+    return _lower_median(items)
+
+
+def introselect(data, k: int) -> Any:
+    """第 ``k`` 小 (从 0 开始) 的元素, 最坏情况 O(n), 结果与输入顺序无关 (不使用随机数)。"""
+    items = as_list(data)
+    _check(len(items), k)
+    budget = 2 * max(1, len(items).bit_length())
+    while True:
+        if len(items) <= 16:
+            return sorted(items)[k]
+        pivot = _median_of_three(items) if budget > 0 else median_of_medians(items)
+        budget -= 1
+        lower, equal, upper = _split(items, pivot)
+        if k < len(lower):
+            items = lower
+        elif k < len(lower) + equal:
+            return pivot
+        else:
+            k -= len(lower) + equal
+            items = upper
+
+
+def select(data, k: int, backend: Optional[str] = None) -> Any:
+    """第 ``k`` 小 (从 0 开始) 的元素; python backend 使用 :func:`introselect`。"""
+    if choose_backend(data, backend) == "numpy":
+        array = np.asarray(data)
+        _check(len(array), k)
+        return np.partition(array, k)[k]
+    return introselect(data, k)
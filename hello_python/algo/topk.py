@@ -0,0 +1,40 @@
+"""
+Top-K Module: the k largest (or smallest) elements, in order.
+
+The ``"python"`` backend keeps a bounded heap of k elements while scanning the data once
+(``heapq.nlargest`` / ``nsmallest``): O(n log k) time and O(k) extra memory, so it also
+works on iterators that do not fit in memory. The ``"numpy"`` backend partitions the array
+around the k-th element with ``np.partition`` (O(n)) and sorts only those k.
+"""
+
+import heapq
+from typing import Any, Optional
+
+import numpy as np
+
+from hello_python.algo.backend import choose_backend
+
+
+def top_k(data, k: int, largest: bool = True, backend: Optional[str] = None) -> Any:
+    """
+    最大 (``largest=True``, 降序) 或最小 (升序) 的 ``k`` 个元素。
+
+    ``k`` 大于元素个数时返回全部元素, ``k <= 0`` 时返回空结果。python backend 接受
+    任意可迭代对象, 只遍历一次。
+    """
+    if choose_backend(data, backend) == "numpy":
+        array = np.asarray(data)
+        n = len(array)
+        k = max(0, min(k, n))
+        if k == 0:
+            return array[:0].copy()
+        if largest:
+            part = np.partition(array, n - k)[n - k :] if k < n else array
+            return np.sort(part)[::-1]
+        part = np.partition(array, k - 1)[:k] if k < n else array
+        return np.sort(part)
+    if isinstance(data, np.ndarray):
+        data = data.tolist()
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, data) if largest else heapq.nsmallest(k, data)
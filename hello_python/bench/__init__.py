@@ -0,0 +1,26 @@
+"""
+Benchmarks: 基准测试, 通过 ``hello bench <name>`` 运行。
+
+每个模块提供一个返回结果行 (dict 列表) 的 ``run_*`` 函数, 由 :func:`format_table` 输出。
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+
+def format_table(rows: List[Dict], columns: Optional[Sequence[str]] = None) -> str:
+    """把结果行格式化为左对齐的文本表格, 浮点数保留 3 位小数。"""
+    if not rows:
+        return ""
+    columns = list(columns or rows[0].keys())
+
+    def cell(value):
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    cells = [[cell(row.get(column, "")) for column in columns] for row in rows]
+    widths = [
+        max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)
+    ]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(c.ljust(w) for c, w in zip(line, widths)) for line in cells)
+    return "\n".join(lines)
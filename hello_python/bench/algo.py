@@ -0,0 +1,155 @@
+"""
+Algorithm Benchmark: time and memory of :mod:`hello_python.algo` per backend and size.
+
+Inputs are random integers in ``[0, size)`` (seeded); the ``python`` backend gets them as a
+list, ``numpy`` as an ``int64`` array, so no conversion is timed.
+
+Algorithms:
+    sort:        :func:`~hello_python.algo.sort` (``sorted`` vs ``np.sort``)
+    merge_sort:  the pure-Python merge sort (python only)
+    select:      the median with :func:`~hello_python.algo.select` (introselect vs
+                 ``np.partition``)
+    quickselect: the median with random pivots (python only)
+    top_k:       the 100 largest elements (bounded heap vs ``np.partition``)
+    search:      10,000 lower-bound queries into the sorted data
+    intervals:   merge ``size`` intervals of length 0-7 starting in ``[0, 4 * size)``
+
+``ms`` is the best of ``repeat`` runs. ``peak MB`` is the peak of memory allocated by the
+call, traced by ``tracemalloc`` in a separate run (NumPy reports its buffers to it); the
+input itself is not included. The python backend only runs up to ``python_max`` elements:
+a list of 1e8 ints alone needs several GB. At 1e8 the numpy inputs are 0.8 GB (1.6 GB for
+intervals) and each call allocates about as much again, so pick ``algorithms`` to fit.
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from hello_python import algo
+
+VARIANTS = algo.BACKENDS
+ALGORITHMS = (
+    "sort",
+    "merge_sort",
+    "select",
+    "quickselect",
+    "top_k",
+    "search",
+    "intervals",
+)
+
+TOP_K = 100
+QUERIES = 10_000
+
+
+# 每个算法使用的输入, 同一个输入只生成一次, 用完即释放 (1e8 规模时每个输入都有 GB 级)
+INPUTS = {
+    "sort": "values",
+    "merge_sort": "values",
+    "select": "values",
+    "quickselect": "values",
+    "top_k": "values",
+    "search": "sorted",
+    "intervals": "intervals",
+}
+
+
+def make_input(name: str, size: int, backend: str, seed: int = 0):
+    """
+    生成一个输入: ``values`` 随机整数, ``sorted`` 有序整数和 :data:`QUERIES` 个查询,
+    ``intervals`` 形状为 ``(size, 2)`` 的区间。
+    """
+    rng = np.random.default_rng(seed)
+    if name == "values":
+        data = rng.integers(0, size, size)
+    elif name == "sorted":
+        data = (np.sort(rng.integers(0, size, size)), rng.integers(0, size, QUERIES))
+    else:
+        starts = rng.integers(0, 4 * size, size)
+        data = np.column_stack((starts, starts + rng.integers(0, 8, size)))
+    if backend == "python":
+        data = tuple(a.tolist() for a in data) if name == "sorted" else data.tolist()
+    return data
+
+
+def _cases(backend: str) -> Dict[str, Callable[[object], object]]:
+    cases = {
+        "sort": lambda values: algo.sort(values, backend=backend),
+        "select": lambda values: algo.select(values, len(values) // 2, backend=backend),
+        "top_k": lambda values: algo.top_k(values, TOP_K, backend=backend),
+        "search": lambda data: algo.search_sorted(*data, backend=backend),
+        "intervals": lambda intervals: algo.merge_intervals(intervals, backend=backend),
+    }
+    if backend == "python":
+        cases["merge_sort"] = algo.merge_sort
+        cases["quickselect"] = lambda values: algo.quickselect(values, len(values) // 2)
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int = 1, memory: bool = True) -> Dict:
+    """``func`` 的最短耗时 (毫秒) 和一次调用期间的内存峰值 (MB, tracemalloc 已在运行时为 "-")。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    result = {"ms": best * 1000, "peak MB": "-"}
+    # 已经在跟踪 (如 HELLO_PROFILE=tracemalloc) 时不测内存: 重置峰值或关闭跟踪都会破坏外层的统计
+    if memory and not tracemalloc.is_tracing():
+        # tracemalloc 会明显拖慢纯 Python 代码, 所以与计时分开运行
+        tracemalloc.start()
+        try:
+            func()
+            result["peak MB"] = tracemalloc.get_traced_memory()[1] / (1 << 20)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmark(
+    sizes: Sequence[int] = (1_000, 10_000, 100_000, 1_000_000),
+    algorithms: Sequence[str] = ALGORITHMS,
+    variants: Sequence[str] = VARIANTS,
+    python_max: int = 1_000_000,
+    repeat: int = 1,
+    memory: bool = True,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 (algorithm, size, backend) 的结果行。
+
+    Args:
+        sizes: 输入规模, 可以到 1e8 (numpy backend)。
+        algorithms: 见 :data:`ALGORITHMS`。
+        variants: backend, 见 :data:`VARIANTS`。
+        python_max: python backend 运行的最大规模。
+        repeat: 计时的运行次数, 取最短时间。
+        memory: 是否额外运行一次测量内存峰值。
+    """
+    unknown = set(algorithms) - set(ALGORITHMS)
+    if unknown:
+        raise ValueError(f"unknown algorithms {sorted(unknown)}, expected {ALGORITHMS}")
+    timings = {}
+    for size in sizes:
+        for backend in variants:
+            if backend == "python" and size > python_max:
+                continue
+            cases = _cases(backend)
+            selected = [name for name in algorithms if name in cases]
+            for input_name in dict.fromkeys(INPUTS[name] for name in selected):
+                data = make_input(input_name, size, backend)
+                for name in selected:
+                    if INPUTS[name] == input_name:
+                        case = cases[name]
+                        timings[name, size, backend] = measure(
+                            lambda: case(data), repeat, memory
+                        )
+                del data
+    return [
+        {"algorithm": name, "size": size, "backend": backend, **result}
+        for name in algorithms
+        for size in sizes
+        for backend in variants
+        if (result := timings.get((name, size, backend))) is not None
+    ]
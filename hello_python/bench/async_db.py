@@ -0,0 +1,138 @@
+"""
+Async DB Benchmark: blocking DB calls in ``async def`` handlers vs the async facades.
+
+The benchmark app runs in its own Uvicorn process against an SQLite employees database.
+Each query calls ``sleep_ms(query_ms)``, a SQL function standing in for the round trip
+to a database server (there is no MySQL server in the benchmark), followed by an indexed
+count. Requests per second are measured at each concurrency level.
+
+Variants:
+    blocking:      the handler calls sqlite3 directly, blocking the event loop
+    sqlite-thread: :class:`AsyncSQLite`, one connection on a dedicated thread
+    pool:          :class:`AsyncPool` over a :class:`ConnectionPool` of ``POOL_SIZE``
+                   connections, the path used for PyMySQL
+"""
+
+import contextlib
+import functools
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+from fastapi import FastAPI, Request
+
+from hello_python.advance.database_sqlite_sample import (
+    bulk_load_employees,
+    create_employees_table,
+    generate_employees,
+)
+from hello_python.bench.loadgen import http_load, spawn_server
+from hello_python.utils.async_db import AsyncPool, AsyncSQLite
+from hello_python.utils.db_pool import ConnectionPool
+
+APP_IMPORT = "hello_python.bench.async_db:app"
+VARIANTS = ("blocking", "sqlite-thread", "pool")
+POOL_SIZE = 8
+QUERY_TIMEOUT = 10.0
+
+# 通过环境变量把数据库路径和查询耗时传给 spawn 出的服务进程
+DB_ENV = "HELLO_BENCH_DB"
+QUERY_MS_ENV = "HELLO_BENCH_QUERY_MS"
+
+QUERY = "SELECT sleep_ms(?), COUNT(*) FROM employees WHERE department = ?"
+
+
+def _sleep_ms(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.create_function("sleep_ms", 1, _sleep_ms)
+    return conn
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    connector = functools.partial(connect, os.environ[DB_ENV])
+    app.state.params = (float(os.environ.get(QUERY_MS_ENV, "5")), "IT")
+    app.state.blocking = connector()
+    app.state.sqlite = AsyncSQLite(connector, timeout=QUERY_TIMEOUT)
+    app.state.pool = AsyncPool(
+        ConnectionPool(connector, min_size=POOL_SIZE, max_size=POOL_SIZE),
+        timeout=QUERY_TIMEOUT,
+    )
+    yield
+    app.state.blocking.close()
+    await app.state.sqlite.close()
+    await app.state.pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/blocking")
+async def blocking(request: Request):
+    state = request.app.state
+    return {"count": state.blocking.execute(QUERY, state.params).fetchone()[1]}
+
+
+@app.get("/sqlite-thread")
+async def sqlite_thread(request: Request):
+    state = request.app.state
+    return {"count": (await state.sqlite.fetchone(QUERY, state.params))[1]}
+
+
+@app.get("/pool")
+async def pool(request: Request):
+    state = request.app.state
+    return {"count": (await state.pool.fetchone(QUERY, state.params))[1]}
+
+
+def run_benchmark(
+    duration: float = 3.0,
+    concurrency: Sequence[int] = (1, 16),
+    query_ms: float = 5.0,
+    variants: Sequence[str] = VARIANTS,
+    rows: int = 100_000,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 (variant, concurrency) 的结果行。
+
+    Args:
+        duration: 每个组合的压测时长 (秒)。
+        concurrency: 要测试的并发连接数。
+        query_ms: 每次查询模拟的数据库往返耗时 (毫秒)。
+        variants: 访问方式, 见 :data:`VARIANTS`。
+        rows: employees 表的行数。
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "employees.db")
+        conn = sqlite3.connect(path)
+        create_employees_table(conn)
+        bulk_load_employees(conn, generate_employees(rows))
+        conn.close()
+
+        env = {DB_ENV: path, QUERY_MS_ENV: str(query_ms)}
+        results = []
+        with spawn_server(APP_IMPORT, env) as (_, port):
+            for variant in variants:
+                url = f"/{variant}"
+                http_load(port, url, 0.1, 1)  # 预热
+                for clients in concurrency:
+                    started = time.perf_counter()
+                    count = http_load(port, url, duration, clients)
+                    elapsed = time.perf_counter() - started
+                    results.append(
+                        {
+                            "variant": variant,
+                            "concurrency": clients,
+                            "requests": count,
+                            "req/s": count / elapsed,
+                            "avg ms": elapsed * clients * 1000 / count if count else float("nan"),
+                        }
+                    )
+        return results
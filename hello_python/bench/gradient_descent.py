@@ -0,0 +1,86 @@
+"""
+Gradient Descent Benchmark: one Python loop per problem vs one batched NumPy run.
+
+Every problem minimizes ``f(x) = (x - 3)^2`` from a different random starting point with
+the same learning rate and tolerance.
+
+Variants:
+    loop:    the scalar algorithm, a Python ``while`` loop per problem. Only the first
+             ``sample`` problems are solved and the time is scaled up to ``problems``.
+    batched: :func:`~hello_python.advance.numpy_sample.batch_gradient_descent` on all
+             problems in one call, one array operation per step for every active problem
+
+``seconds`` is the (estimated, for ``loop``) wall time for all problems.
+"""
+
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from hello_python.advance.numpy_sample import batch_gradient_descent
+
+VARIANTS = ("loop", "batched")
+
+
+def scalar_descent(x: float, learning_rate: float, tolerance: float, max_iter: int) -> float:
+    """原来的逐个求解算法 (不输出日志)。"""
+    prev = (x - 3) ** 2
+    for _ in range(max_iter):
+        x -= learning_rate * 2 * (x - 3)
+        curr = (x - 3) ** 2
+        if abs(curr - prev) < tolerance:
+            break
+        prev = curr
+    return x
+
+
+def run_benchmark(
+    problems: int = 1_000_000,
+    sample: int = 10_000,
+    learning_rate: float = 0.1,
+    tolerance: float = 1e-6,
+    max_iter: int = 1000,
+    variants: Sequence[str] = VARIANTS,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 variant 的结果行。
+
+    Args:
+        problems: 求解的问题数。
+        sample: ``loop`` 实际求解的问题数, 耗时按比例换算到 ``problems``。
+        learning_rate: 学习率。
+        tolerance: 收敛阈值。
+        max_iter: 每个问题的最大迭代次数。
+        variants: 见 :data:`VARIANTS`。
+    """
+    starts = np.random.default_rng(0).normal(0, 10, problems)
+    results = []
+    for variant in variants:
+        started = time.perf_counter()
+        if variant == "loop":
+            solved = min(sample, problems)
+            xs = np.array(
+                [
+                    scalar_descent(float(x), learning_rate, tolerance, max_iter)
+                    for x in starts[:solved]
+                ]
+            )
+            seconds = (time.perf_counter() - started) * problems / solved
+        else:
+            solved = problems
+            xs = batch_gradient_descent(
+                starts, learning_rate=learning_rate, tolerance=tolerance, max_iter=max_iter
+            ).x
+            seconds = time.perf_counter() - started
+        results.append(
+            {
+                "variant": variant,
+                "problems": problems,
+                "solved": solved,
+                "seconds": seconds,
+                "problems/s": f"{problems / seconds:,.0f}",
+                "max |x-3|": float(np.abs(xs - 3).max()),
+            }
+        )
+    return results
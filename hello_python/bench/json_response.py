@@ -0,0 +1,125 @@
+"""
+JSON Response Benchmark: stdlib ``JSONResponse`` vs :class:`UJSONResponse`.
+
+The benchmark app runs in a separate Uvicorn process and is loaded over keep-alive
+HTTP connections. For every response variant and payload size it reports requests per
+second and the server process CPU time per response (user + system, via psutil).
+
+Variants:
+    stdlib:       FastAPI default path, ``jsonable_encoder`` + ``json.dumps``
+    ujson:        ``response_class=UJSONResponse``, ``jsonable_encoder`` + ``ujson.dumps``
+    ujson-direct: the endpoint returns ``UJSONResponse(payload)``, skipping ``jsonable_encoder``
+"""
+
+import http.client
+import json
+import time
+from typing import Dict, List, Sequence
+
+import psutil
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from hello_python.bench.loadgen import http_load, spawn_server
+from hello_python.utils.ujson_response import UJSONResponse
+
+APP_IMPORT = "hello_python.bench.json_response:app"
+VARIANTS = ("stdlib", "ujson", "ujson-direct")
+
+SMALL_PAYLOAD = {
+    "name": "辽宁串红小番茄",
+    "price": 9.99,
+    "in_stock": True,
+    "varieties": ["串红", "樱桃番茄", "黄珍珠"],
+    "supplier": {"name": "辽宁番茄种植合作社", "contact": "张先生"},
+}
+
+
+def make_payload(size: int) -> Dict:
+    """生成编码后约 ``size`` 字节的载荷: 由商品记录组成的列表。"""
+    record = {
+        "id": 0,
+        "name": "辽宁串红小番茄",
+        "price": 12.8,
+        "weight_grams": 500,
+        "in_stock": True,
+        "tags": ["生鲜", "小番茄", "串红"],
+    }
+    record_size = len(json.dumps(record, ensure_ascii=False).encode("utf-8")) + 1
+    items = [
+        {**record, "id": i, "price": round(12.8 + i % 100 / 100, 2)}
+        for i in range(size // record_size)
+    ]
+    return {"count": len(items), "items": items}
+
+
+PAYLOADS = {"small": SMALL_PAYLOAD, "1mb": make_payload(1 << 20)}
+
+app = FastAPI()
+
+
+@app.get("/stdlib/{payload}", response_class=JSONResponse)
+async def stdlib_response(payload: str):
+    return PAYLOADS[payload]
+
+
+@app.get("/ujson/{payload}", response_class=UJSONResponse)
+async def ujson_response(payload: str):
+    return PAYLOADS[payload]
+
+
+@app.get("/ujson-direct/{payload}")
+async def ujson_direct_response(payload: str):
+    return UJSONResponse(PAYLOADS[payload])
+
+
+def _cpu_seconds(process: psutil.Process) -> float:
+    times = process.cpu_times()
+    return times.user + times.system
+
+
+def run_benchmark(
+    duration: float = 3.0,
+    concurrency: int = 4,
+    payloads: Sequence[str] = ("small", "1mb"),
+    variants: Sequence[str] = VARIANTS,
+    warmup: int = 20,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 (payload, variant) 的结果行。
+
+    Args:
+        duration: 每个组合的压测时长 (秒)。
+        concurrency: 并发连接数。
+        payloads: 载荷名称, 见 :data:`PAYLOADS`。
+        variants: 响应实现, 见 :data:`VARIANTS`。
+        warmup: 每个组合正式计时前的预热请求数 (至少 1 个, 用于记录响应大小)。
+    """
+    with spawn_server(APP_IMPORT) as (server, port):
+        process = psutil.Process(server.pid)
+        rows = []
+        for payload in payloads:
+            for variant in variants:
+                path = f"/{variant}/{payload}"
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                for _ in range(max(warmup, 1)):
+                    conn.request("GET", path)
+                    body = conn.getresponse().read()
+                conn.close()
+
+                cpu_before = _cpu_seconds(process)
+                started = time.perf_counter()
+                count = http_load(port, path, duration, concurrency)
+                elapsed = time.perf_counter() - started
+                cpu = _cpu_seconds(process) - cpu_before
+                rows.append(
+                    {
+                        "payload": payload,
+                        "variant": variant,
+                        "bytes": len(body),
+                        "requests": count,
+                        "req/s": count / elapsed,
+                        "cpu ms/resp": cpu * 1000 / count if count else float("nan"),
+                    }
+                )
+        return rows
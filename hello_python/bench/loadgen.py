@@ -0,0 +1,83 @@
+"""
+Load generator shared by the HTTP benchmarks: start a Uvicorn app in its own process and
+drive it with keep-alive connections from client threads.
+"""
+
+import contextlib
+import http.client
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+import uvicorn
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_server(app_import: str, port: int, env: Dict[str, str]):
+    os.environ.update(env)
+    uvicorn.run(app_import, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+@contextlib.contextmanager
+def spawn_server(
+    app_import: str, env: Optional[Dict[str, str]] = None, timeout: float = 60
+) -> Iterator[Tuple[multiprocessing.Process, int]]:
+    """在 spawn 子进程中运行 ``app_import``, 可接受连接后产出 (进程, 端口), 退出时终止进程。"""
+    from hello_python.advance.fastapi_server_sample import wait_until
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(
+        target=_run_server, args=(app_import, port, dict(env or {})), daemon=True
+    )
+    server.start()
+    try:
+
+        def accepting():
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return True
+            except OSError:
+                return False
+
+        if not wait_until(lambda: accepting() or not server.is_alive(), timeout) or not accepting():
+            raise RuntimeError("benchmark server did not start")
+        yield server, port
+    finally:
+        server.terminate()
+        server.join(10)
+
+
+def http_load(port: int, path: str, duration: float, concurrency: int) -> int:
+    """在 ``duration`` 秒内用 ``concurrency`` 个 keep-alive 连接循环请求, 返回完成的响应数。"""
+    counts = []
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        count = 0
+        try:
+            while time.perf_counter() < deadline:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"GET {path} returned {response.status}")
+                count += 1
+        finally:
+            conn.close()
+            counts.append(count)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
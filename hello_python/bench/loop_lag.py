@@ -0,0 +1,114 @@
+"""
+Loop Lag Benchmark: event-loop responsiveness while CPU-bound work runs.
+
+A ticker coroutine sleeps ``interval`` seconds in a loop and records how late each
+wakeup is (actual minus scheduled time). The same CPU work, summing ``work`` integers in
+``chunks`` pieces, runs alongside it in three ways:
+
+Variants:
+    inline:  called directly in the coroutine, blocking the loop until it finishes
+    thread:  ``run_in_executor`` with a thread pool, the worker competes for the GIL
+    offload: :func:`~hello_python.utils.offload.offload_map` on the warm process pool
+
+Lag is reported as max / p99 / mean milliseconds over all ticks; ``ticks`` counts how
+many wakeups the loop managed during the work.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
+
+from hello_python.utils.offload import offload_map, warm_up
+
+VARIANTS = ("inline", "thread", "offload")
+
+
+def busy_sum(numbers: range) -> int:
+    total = 0
+    for i in numbers:
+        total += i
+    return total
+
+
+def split(work: int, chunks: int) -> List[range]:
+    numbers = range(work)
+    size = -(-work // chunks)
+    return [numbers[i : i + size] for i in range(0, work, size)]
+
+
+async def _inline(parts):
+    return [busy_sum(part) for part in parts]
+
+
+async def _thread(parts):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor() as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, busy_sum, part) for part in parts)
+        )
+
+
+async def _offload(parts):
+    return await offload_map(busy_sum, parts)
+
+
+_RUNNERS = {"inline": _inline, "thread": _thread, "offload": _offload}
+
+
+async def measure(coro, interval: float) -> Dict:
+    """运行 ``coro`` 的同时记录每次唤醒的延迟 (实际时间 - 计划时间)。"""
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+    done = False
+
+    async def ticker():
+        while not done:
+            scheduled = loop.time() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, loop.time() - scheduled))
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)  # 让 ticker 先开始计时
+    started = time.perf_counter()
+    value = await coro
+    elapsed = time.perf_counter() - started
+    done = True
+    await task
+    lags.sort()
+    return {
+        "value": value,
+        "seconds": elapsed,
+        "ticks": len(lags),
+        "max ms": lags[-1] * 1000,
+        "p99 ms": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+        "mean ms": statistics.fmean(lags) * 1000,
+    }
+
+
+def run_benchmark(
+    work: int = 10_000_000,
+    chunks: int = 8,
+    interval: float = 0.005,
+    variants: Sequence[str] = VARIANTS,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 variant 的结果行。
+
+    Args:
+        work: 求和的整数个数。
+        chunks: 工作拆分的块数。
+        interval: ticker 的计划唤醒间隔 (秒)。
+        variants: 执行方式, 见 :data:`VARIANTS`。
+    """
+    parts = split(work, chunks)
+    if "offload" in variants:
+        warm_up()  # 进程启动不计入测量
+    results = []
+    for variant in variants:
+        row = asyncio.run(measure(_RUNNERS[variant](parts), interval))
+        if sum(row.pop("value")) != work * (work - 1) // 2:
+            raise AssertionError(f"{variant} returned a wrong sum")
+        results.append({"variant": variant, **row})
+    return results
@@ -0,0 +1,105 @@
+"""
+Request Scope Benchmark: per-request overhead of the request-scoped container.
+
+A minimal ASGI app is called directly in a loop (no server, no sockets), so the numbers
+are the cost added by the DI layer itself. The app resolves ``resolves`` request-scoped
+objects and a singleton per request.
+
+Variants:
+    bare:     the app without the middleware and without DI
+    scope:    wrapped in :class:`~hello_python.utils.di.RequestScopeMiddleware`, resolving
+              nothing; the cost of opening and releasing a request
+    compiled: the middleware plus resolution through a compiled container; the first
+              resolution of the request builds the scoped object, the rest are cache hits
+    injector: the middleware plus resolution through ``Injector.get``
+
+``overhead us`` is the difference to ``bare``.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Sequence
+
+from injector import Injector, inject, singleton
+
+from hello_python.utils.di import CompiledInjector, RequestScopeMiddleware, request_scope
+
+VARIANTS = ("bare", "scope", "compiled", "injector")
+
+
+@singleton
+class Service:
+    pass
+
+
+@request_scope
+class Session:
+    @inject
+    def __init__(self, service: Service):
+        self.service = service
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _app(container, resolves: int):
+    async def app(scope, receive, send):
+        if container is not None:
+            for _ in range(resolves):
+                container.get(Session)
+            container.get(Service)
+        await send(scope)
+
+    return app
+
+
+async def _measure(app, repeat: int) -> float:
+    scope = {"type": "http", "path": "/"}
+
+    async def receive():
+        return {}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / repeat
+
+
+def run_benchmark(
+    repeat: int = 20_000, resolves: int = 3, variants: Sequence[str] = VARIANTS
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 variant 的结果行。
+
+    Args:
+        repeat: 每个 variant 的请求数。
+        resolves: 每个请求获取请求级对象的次数。
+        variants: 见 :data:`VARIANTS`。
+    """
+    results = []
+    bare = None
+    for variant in variants:
+        if variant == "bare":
+            app = _app(None, resolves)
+        elif variant == "scope":
+            app = RequestScopeMiddleware(_app(None, resolves))
+        else:
+            container = Injector()
+            if variant == "compiled":
+                container = CompiledInjector(container)
+            app = RequestScopeMiddleware(_app(container, resolves))
+        seconds = asyncio.run(_measure(app, repeat))
+        if variant == "bare":
+            bare = seconds
+        results.append(
+            {
+                "variant": variant,
+                "us/request": seconds * 1e6,
+                "overhead us": (seconds - bare) * 1e6 if bare is not None else "-",
+            }
+        )
+    return results
@@ -0,0 +1,90 @@
+"""
+Scheduler Tick Benchmark: cost of one scheduler wakeup as registered jobs grow.
+
+On every wakeup APScheduler asks each job store for the due jobs and then for the next
+run time. The benchmark registers ``jobs`` interval jobs in a :class:`SQLiteJobStore`, with
+``due`` of them due now and the rest spread over the next hour. It then times those two
+calls.
+
+Variants:
+    indexed:  the store as shipped, both queries are range scans on ``next_run_time``
+    no-index: the same table with the index dropped, every tick scans all jobs
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from hello_python.utils.scheduler import SQLiteJobStore
+
+VARIANTS = ("indexed", "no-index")
+
+
+def noop():
+    pass
+
+
+def _fill(store: SQLiteJobStore, jobs: int, due: int):
+    scheduler = BackgroundScheduler(jobstores={"default": store})
+    # 暂停状态下启动: add_job 直接写入 store, 但不会真的执行任务
+    scheduler.start(paused=True)
+    now = datetime.now(timezone.utc)
+    for i in range(jobs):
+        offset = -1 if i < due else 60 + 3600 * i / jobs
+        scheduler.add_job(
+            noop,
+            "interval",
+            hours=1,
+            id=f"job-{i}",
+            next_run_time=now + timedelta(seconds=offset),
+        )
+    return scheduler
+
+
+def measure_tick(store: SQLiteJobStore, repeat: int) -> float:
+    """平均每次唤醒 (查询到期任务 + 下次运行时间) 的耗时 (秒)。"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        store.get_due_jobs(datetime.now(timezone.utc))
+        store.get_next_run_time()
+    return (time.perf_counter() - started) / repeat
+
+
+def run_benchmark(
+    jobs: Sequence[int] = (100, 1_000, 10_000),
+    due: int = 10,
+    repeat: int = 200,
+    variants: Sequence[str] = VARIANTS,
+) -> List[Dict]:
+    """
+    运行基准测试, 返回每个 (variant, jobs) 的结果行。
+
+    Args:
+        jobs: 注册的任务数。
+        due: 每次唤醒时到期的任务数。
+        repeat: 每个组合测量的唤醒次数。
+        variants: 见 :data:`VARIANTS`。
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for variant in variants:
+            for count in jobs:
+                store = SQLiteJobStore(os.path.join(tmp, f"{variant}-{count}.db"))
+                scheduler = _fill(store, count, due)
+                if variant == "no-index":
+                    store.conn.execute(f"DROP INDEX ix_{store.tablename}_next_run_time")
+                seconds = measure_tick(store, repeat)
+                results.append(
+                    {
+                        "variant": variant,
+                        "jobs": count,
+                        "due": len(store.get_due_jobs(datetime.now(timezone.utc))),
+                        "tick ms": seconds * 1000,
+                    }
+                )
+                scheduler.shutdown(wait=False)
+    return results
@@ -0,0 +1,93 @@
+"""
+SQLite Load Benchmark: row-by-row inserts vs :class:`BulkLoader`.
+
+Every case loads the same synthetic employees (``generate_employees``) into a fresh
+on-disk database with the department index in place, and reports rows per second.
+
+Cases:
+    generate:      only produce the rows, the floor every other case includes
+    row-by-row:    ``insert_employees``, one ``execute`` per row, default PRAGMAs
+    bulk:          ``executemany`` batches in explicit transactions, tuned PRAGMAs
+    bulk+deferred: as ``bulk``, with the index dropped and rebuilt after the load
+"""
+
+import collections
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+from hello_python.advance.database_sqlite_sample import (
+    bulk_load_employees,
+    create_employees_table,
+    generate_employees,
+    insert_employees,
+)
+
+CASES = ("generate", "row-by-row", "bulk", "bulk+deferred")
+
+
+def _run_case(case: str, path: str, rows: int, batch_size: int) -> Dict:
+    if case == "generate":
+        started = time.perf_counter()
+        collections.deque(generate_employees(rows), maxlen=0)
+        return {"seconds": time.perf_counter() - started}
+
+    conn = sqlite3.connect(path)
+    try:
+        create_employees_table(conn)
+        started = time.perf_counter()
+        if case == "row-by-row":
+            insert_employees(conn, generate_employees(rows))
+            index_seconds = 0.0
+        else:
+            result = bulk_load_employees(
+                conn,
+                generate_employees(rows),
+                batch_size=batch_size,
+                defer_indexes=case == "bulk+deferred",
+            )
+            index_seconds = result.index_seconds
+        seconds = time.perf_counter() - started
+        loaded = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+        if loaded != rows:
+            raise AssertionError(f"{case}: loaded {loaded} rows, expected {rows}")
+    finally:
+        conn.close()
+    return {"seconds": seconds, "index s": index_seconds}
+
+
+def run_benchmark(
+    rows: int = 10_000_000,
+    batch_size: int = 50_000,
+    cases: Sequence[str] = CASES,
+) -> List[Dict]:
+    """
+    每种方式把 ``rows`` 个员工写入一个新的临时数据库文件, 返回吞吐量。
+
+    Args:
+        rows: 每种方式写入的行数。
+        batch_size: 批量方式每个事务的行数。
+        cases: 要运行的方式, 见 :data:`CASES`。
+    """
+    results = []
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in cases:
+            path = os.path.join(tmp, f"{case.replace('+', '-')}.db")
+            measured = _run_case(case, path, rows, batch_size)
+            seconds = measured["seconds"]
+            if case != "generate":
+                baseline = baseline or seconds
+            results.append(
+                {
+                    "case": case,
+                    "rows": rows,
+                    "seconds": seconds,
+                    "rows/s": rows / seconds,
+                    "index s": measured.get("index s", 0.0),
+                    "speedup": baseline / seconds if case != "generate" else 0.0,
+                }
+            )
+    return results
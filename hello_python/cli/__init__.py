@@ -1,16 +1,41 @@
 import click
 import logging
-from .commands import get_commands
+import os
+from .commands import LazyGroup
 
 logger = logging.getLogger(__name__)
 
 logger.debug("initial hello command...")
 
 
-@click.group()
-def cli():
+@click.group(cls=LazyGroup)
+@click.option(
+    "--startup-profile",
+    is_flag=True,
+    help="Print the import cost of every module loaded for the subcommand.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Profile the subcommand; HELLO_PROFILE picks the modes "
+    "(timing, cprofile, tracemalloc, sample; default timing,cprofile).",
+)
+@click.pass_context
+def cli(ctx, startup_profile, profile):
     """A Hello CLI tool"""
-    pass
+    # HELLO_PROFILE 单独设置时同样开启, 未开启时不导入 profiling 模块
+    if profile or os.environ.get("HELLO_PROFILE"):
+        from hello_python.utils.profiling import DEFAULT_MODES, ProfileSession, env_modes
+
+        try:
+            modes = env_modes()
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="HELLO_PROFILE")
+        if profile and not modes:
+            modes = DEFAULT_MODES
+        if modes:
+            # 会话在子命令结束、上下文关闭时停止并输出报告
+            ctx.with_resource(ProfileSession(modes))
 
 
 @cli.command()
@@ -29,11 +54,7 @@ def greet(name):
     click.echo(f"Hello, {name}!")
 
 
-logger.debug("dynmaically load and regester command...")
-# Dynamically load and register command
-for command in get_commands():
-    logger.debug("register command: %s", command.name)
-    cli.add_command(command)
+# 子命令由 LazyGroup 根据清单按需加载, 只有被调用的命令模块才会被导入
 
 
 def main():
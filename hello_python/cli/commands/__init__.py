@@ -1,21 +1,221 @@
 """
 Commands Module define all command and  dynamically load and register to click main command
+
+Command modules are discovered without importing them: every ``<name>.py`` file in this
+directory must define a click command (or group) called ``<name>``. The command name and
+its short help are read from the source with :mod:`ast` and kept in a cached manifest, so
+``hello greet x`` never pays for importing FastAPI, uvicorn or psutil. A command module is
+only imported when its subcommand is actually invoked (see :class:`LazyGroup`).
 """
 
+import ast
 import importlib
+import json
+import logging
 import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import click
+
+logger = logging.getLogger(__name__)
+
+COMMAND_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMAND_PACKAGE = __name__
+
+# 清单缓存文件位置, 可通过环境变量覆盖
+MANIFEST_ENV = "HELLO_CLI_MANIFEST"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class CommandEntry:
+    """A manifest entry describing one lazily loaded command."""
+
+    name: str
+    module: str
+    attr: str
+    help: str
+    mtime_ns: int
 
 
 def get_commands():
+    """Import every command module eagerly and return the command objects."""
     commands = []
-    # Define the directory where your command modules are located
-    command_dir = os.path.dirname(os.path.abspath(__file__))
-    # Iterate over all the files in the directory
-    for filename in os.listdir(command_dir):
-        if filename.endswith(".py") and filename != "__init__.py":
-            # Import the module and get the command object
-            module_name = f"hello_python.cli.commands.{filename[:-3]}"
-            module = importlib.import_module(module_name)
-            command = getattr(module, filename[:-3])
-            commands.append(command)
+    for entry in load_manifest().values():
+        module = importlib.import_module(entry.module)
+        commands.append(getattr(module, entry.attr))
     return commands
+
+
+def manifest_path() -> str:
+    """Location of the cached command manifest."""
+    if path := os.environ.get(MANIFEST_ENV):
+        return path
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "hello-python", "cli-manifest.json")
+
+
+def _command_files() -> Dict[str, int]:
+    """Map command module file names to their mtime, without importing anything."""
+    files = {}
+    for filename in os.listdir(COMMAND_DIR):
+        if filename.endswith(".py") and filename != "__init__.py":
+            files[filename] = os.stat(os.path.join(COMMAND_DIR, filename)).st_mtime_ns
+    return files
+
+
+def _read_command_help(path: str, attr: str) -> str:
+    """Read the docstring of the top-level command function ``attr`` via ast."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == attr:
+            return ast.get_docstring(node) or ""
+    return ""
+
+
+def _scan_commands(files: Dict[str, int]) -> Dict[str, CommandEntry]:
+    entries = {}
+    for filename, mtime_ns in sorted(files.items()):
+        name = filename[:-3]
+        entries[name] = CommandEntry(
+            name=name,
+            module=f"{COMMAND_PACKAGE}.{name}",
+            attr=name,
+            help=_read_command_help(os.path.join(COMMAND_DIR, filename), name),
+            mtime_ns=mtime_ns,
+        )
+    return entries
+
+
+def _load_cached_manifest(path: str) -> Optional[Dict[str, CommandEntry]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION or data.get("dir") != COMMAND_DIR:
+            return None
+        return {
+            name: CommandEntry(**entry) for name, entry in data["commands"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_manifest(path: str, entries: Dict[str, CommandEntry]):
+    data = {
+        "version": MANIFEST_VERSION,
+        "dir": COMMAND_DIR,
+        "commands": {name: asdict(entry) for name, entry in entries.items()},
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # 缓存只是优化, 写入失败时下次重新扫描即可
+        logger.debug("unable to write command manifest %s: %s", path, e)
+
+
+_manifest: Optional[Dict[str, CommandEntry]] = None
+
+
+def load_manifest(refresh: bool = False) -> Dict[str, CommandEntry]:
+    """
+    Return the command manifest, rebuilding the on-disk cache when a command file changed.
+
+    The cache is validated against the file names and mtimes in the command directory,
+    so adding, removing or editing a command module is picked up on the next run.
+    """
+    global _manifest
+    if _manifest is not None and not refresh:
+        return _manifest
+
+    files = _command_files()
+    path = manifest_path()
+    cached = None if refresh else _load_cached_manifest(path)
+    if cached is not None and {
+        f"{entry.name}.py": entry.mtime_ns for entry in cached.values()
+    } == files:
+        _manifest = cached
+    else:
+        logger.debug("rebuild command manifest: %s", path)
+        _manifest = _scan_commands(files)
+        _write_cached_manifest(path, _manifest)
+    return _manifest
+
+
+class LazyGroup(click.Group):
+    """
+    A click group that resolves subcommands from the manifest on demand.
+
+    Commands registered directly with ``@group.command()`` behave as usual. Manifest
+    commands are imported the first time :meth:`get_command` is asked for them, and the
+    help listing is rendered from the manifest so ``--help`` imports nothing either.
+    When the ``startup_profile`` parameter is set on the context, the import of the
+    command module is timed with :class:`hello_python.cli.startup.ImportProfiler`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy_commands: Dict[str, click.Command] = {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(load_manifest()))
+
+    def get_command(self, ctx, cmd_name):
+        if (command := super().get_command(ctx, cmd_name)) is not None:
+            return command
+        if (command := self._lazy_commands.get(cmd_name)) is not None:
+            return command
+        if (entry := load_manifest().get(cmd_name)) is None:
+            return None
+
+        if ctx is not None and ctx.params.get("startup_profile"):
+            from hello_python.cli.startup import ImportProfiler
+
+            profiler = ImportProfiler()
+            with profiler:
+                command = self._load(entry)
+            ctx.call_on_close(profiler.report)
+        else:
+            command = self._load(entry)
+
+        self._lazy_commands[cmd_name] = command
+        return command
+
+    def _load(self, entry: CommandEntry) -> click.Command:
+        logger.debug("load command: %s from %s", entry.name, entry.module)
+        # 使用 __import__ 以便 ImportProfiler 能记录命令模块本身
+        module = __import__(entry.module, fromlist=[entry.attr])
+        command = getattr(module, entry.attr)
+        if not isinstance(command, click.Command):
+            raise click.ClickException(
+                f"{entry.module}.{entry.attr} is not a click command"
+            )
+        return command
+
+    def format_commands(self, ctx, formatter):
+        rows = []
+        manifest = load_manifest()
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        for name in names:
+            command = super().get_command(ctx, name) or self._lazy_commands.get(name)
+            if command is not None:
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+            else:
+                help_text = manifest[name].help
+                rows.append((name, click.utils.make_default_short_help(help_text, limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
@@ -0,0 +1,202 @@
+import click
+
+
+@click.group()
+def bench():
+    """Run the performance benchmarks."""
+    pass
+
+
+@bench.command(name="json-response")
+@click.option("--duration", default=3.0, show_default=True, help="Seconds per case.")
+@click.option("--concurrency", default=4, show_default=True, help="Concurrent connections.")
+@click.option(
+    "--payload",
+    "payloads",
+    multiple=True,
+    type=click.Choice(["small", "1mb"]),
+    default=("small", "1mb"),
+    show_default=True,
+    help="Payload sizes to benchmark.",
+)
+def json_response(duration, concurrency, payloads):
+    """Compare stdlib JSONResponse with UJSONResponse: req/s and CPU per response."""
+    # 基准测试依赖较重, 只在运行时导入
+    from hello_python.bench import format_table
+    from hello_python.bench.json_response import run_benchmark
+
+    click.echo(f"Benchmarking JSON responses ({duration}s per case, {concurrency} connections)...")
+    click.echo(format_table(run_benchmark(duration, concurrency, payloads)))
+
+
+@bench.command()
+@click.option("-n", "count", default=1_000_000, show_default=True, help="Objects per list.")
+@click.option("--repeat", default=3, show_default=True, help="Runs per case, the best is kept.")
+def encoders(count, repeat):
+    """Compare json_sample.py's custom encoders with the compiled EncoderRegistry."""
+    from hello_python.bench import format_table
+    from hello_python.bench.encoders import run_benchmark
+
+    click.echo(f"Encoding {count} objects per case (best of {repeat})...")
+    click.echo(format_table(run_benchmark(count, repeat)))
+
+
+@bench.command(name="sqlite-load")
+@click.option("--rows", default=10_000_000, show_default=True, help="Employees per case.")
+@click.option("--batch-size", default=50_000, show_default=True, help="Rows per transaction.")
+def sqlite_load(rows, batch_size):
+    """Compare row-by-row SQLite inserts with the batched BulkLoader: rows/s."""
+    from hello_python.bench import format_table
+    from hello_python.bench.sqlite_load import run_benchmark
+
+    click.echo(f"Loading {rows} employees per case into a temporary SQLite file...")
+    click.echo(format_table(run_benchmark(rows, batch_size)))
+
+
+@bench.command(name="async-db")
+@click.option("--duration", default=3.0, show_default=True, help="Seconds per case.")
+@click.option(
+    "--concurrency",
+    multiple=True,
+    type=int,
+    default=(1, 16),
+    show_default=True,
+    help="Concurrent connections, repeatable.",
+)
+@click.option(
+    "--query-ms", default=5.0, show_default=True, help="Simulated database round trip."
+)
+def async_db(duration, concurrency, query_ms):
+    """Compare blocking DB calls in async handlers with the async DB facades: req/s."""
+    from hello_python.bench import format_table
+    from hello_python.bench.async_db import run_benchmark
+
+    click.echo(f"Benchmarking async DB access ({duration}s per case, {query_ms}ms queries)...")
+    click.echo(format_table(run_benchmark(duration, concurrency, query_ms)))
+
+
+@bench.command(name="loop-lag")
+@click.option("--work", default=10_000_000, show_default=True, help="Integers to sum per case.")
+@click.option("--chunks", default=8, show_default=True, help="Pieces the work is split into.")
+@click.option(
+    "--interval", default=0.005, show_default=True, help="Ticker wakeup interval in seconds."
+)
+def loop_lag(work, chunks, interval):
+    """Measure event-loop lag while CPU work runs inline, in threads or offloaded."""
+    from hello_python.bench import format_table
+    from hello_python.bench.loop_lag import run_benchmark
+
+    click.echo(f"Summing {work} integers in {chunks} chunks per case...")
+    click.echo(format_table(run_benchmark(work, chunks, interval)))
+
+
+@bench.command()
+@click.option(
+    "--jobs",
+    multiple=True,
+    type=int,
+    default=(100, 1_000, 10_000),
+    show_default=True,
+    help="Registered jobs, repeatable.",
+)
+@click.option("--due", default=10, show_default=True, help="Jobs due on every wakeup.")
+@click.option("--repeat", default=200, show_default=True, help="Wakeups timed per case.")
+def scheduler(jobs, due, repeat):
+    """Time a scheduler wakeup on the SQLite job store as registered jobs grow."""
+    from hello_python.bench import format_table
+    from hello_python.bench.scheduler_tick import run_benchmark
+
+    click.echo(f"Timing {repeat} wakeups with {due} due jobs per case...")
+    click.echo(format_table(run_benchmark(jobs, due, repeat)))
+
+
+@bench.command()
+@click.option("--problems", default=1_000_000, show_default=True, help="Problems to solve.")
+@click.option(
+    "--sample",
+    default=10_000,
+    show_default=True,
+    help="Problems the Python loop actually solves, its time is scaled up.",
+)
+def gradient(problems, sample):
+    """Solve many gradient descent problems with a Python loop and with one NumPy batch."""
+    from hello_python.bench import format_table
+    from hello_python.bench.gradient_descent import run_benchmark
+
+    click.echo(f"Minimizing (x - 3)^2 from {problems} starting points...")
+    click.echo(format_table(run_benchmark(problems, sample)))
+
+
+@bench.command()
+@click.option("--nodes", default=50, show_default=True, help="Objects in the resolved graph.")
+@click.option("--repeat", default=2_000, show_default=True, help="Resolutions timed per case.")
+def injector(nodes, repeat):
+    """Time resolving an object graph with Injector.get and with compiled plans."""
+    from hello_python.bench import format_table
+    from hello_python.bench.injector_resolve import run_benchmark
+
+    click.echo(f"Resolving a {nodes}-node graph {repeat} times per case...")
+    click.echo(format_table(run_benchmark(nodes, repeat)))
+
+
+@bench.command(name="request-scope")
+@click.option("--repeat", default=20_000, show_default=True, help="Requests per case.")
+@click.option(
+    "--resolves", default=3, show_default=True, help="Scoped resolutions per request."
+)
+def request_scope(repeat, resolves):
+    """Measure the per-request overhead of the request-scoped DI container."""
+    from hello_python.bench import format_table
+    from hello_python.bench.request_scope import run_benchmark
+
+    click.echo(f"Calling a minimal ASGI app {repeat} times per case...")
+    click.echo(format_table(run_benchmark(repeat, resolves)))
+
+
+@bench.command()
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    type=int,
+    default=(1_000, 10_000, 100_000, 1_000_000),
+    show_default=True,
+    help="Input sizes, repeatable (up to 1e8 for numpy).",
+)
+@click.option(
+    "--algorithm",
+    "algorithms",
+    multiple=True,
+    help="Algorithms to run, repeatable (default: all).",
+)
+@click.option(
+    "--backend",
+    "backends",
+    multiple=True,
+    type=click.Choice(["python", "numpy"]),
+    help="Backends to run, repeatable (default: both).",
+)
+@click.option(
+    "--python-max",
+    default=1_000_000,
+    show_default=True,
+    help="Largest size run with the python backend.",
+)
+@click.option("--repeat", default=1, show_default=True, help="Timed runs per case, best kept.")
+@click.option("--memory/--no-memory", default=True, help="Trace the peak memory of each case.")
+def algo(sizes, algorithms, backends, python_max, repeat, memory):
+    """Time hello_python.algo implementations per backend across input sizes."""
+    from hello_python.bench import format_table
+    from hello_python.bench.algo import ALGORITHMS, VARIANTS, run_benchmark
+
+    unknown = set(algorithms) - set(ALGORITHMS)
+    if unknown:
+        raise click.BadParameter(
+            f"{', '.join(sorted(unknown))} (choose from {', '.join(ALGORITHMS)})",
+            param_hint="--algorithm",
+        )
+    click.echo(f"Running {len(algorithms or ALGORITHMS)} algorithms on sizes {list(sizes)}...")
+    rows = run_benchmark(
+        sizes, algorithms or ALGORITHMS, backends or VARIANTS, python_max, repeat, memory
+    )
+    click.echo(format_table(rows))
@@ -14,14 +14,61 @@ def fastapi():
 
 # 在这里实例化管理器，传入 FastAPI 应用实例和配置
 service_manager = ServiceManager(
-    app_instance=app, app_name="my_fastapi_service", port=8080
+    app_instance=app,
+    app_name="my_fastapi_service",
+    port=8080,
+    app_import="hello_python.advance.fastapi_server_sample:app",
+)
+
+
+workers_option = click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes sharing the listening socket.",
+)
+ready_timeout_option = click.option(
+    "--ready-timeout",
+    type=click.FloatRange(min=0),
+    default=30.0,
+    show_default=True,
+    help="Seconds to wait for the service to accept connections.",
+)
+drain_timeout_option = click.option(
+    "--drain-timeout",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Seconds in-flight requests may take to finish when workers stop. [default: 10]",
 )
 
 
 @fastapi.command()
-def start():
+@workers_option
+@ready_timeout_option
+@drain_timeout_option
+@click.option(
+    "--slow-callback-ms",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Record event loop stalls longer than this with a stack sample, 0 only measures "
+    "loop lag. [default: 100]",
+)
+@click.option(
+    "--asyncio-debug",
+    is_flag=True,
+    default=None,
+    help="Enable asyncio debug mode to name the slow tasks (much slower, for development).",
+)
+def start(workers, ready_timeout, drain_timeout, slow_callback_ms, asyncio_debug):
     """Starts the FastAPI service."""
-    service_manager.start()
+    service_manager.start(
+        workers=workers,
+        ready_timeout=ready_timeout,
+        drain_timeout=drain_timeout,
+        slow_callback_ms=slow_callback_ms,
+        asyncio_debug=asyncio_debug,
+    )
 
 
 @fastapi.command()
@@ -35,9 +82,29 @@ def stop(force):
 
 
 @fastapi.command()
-def restart():
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes. [default: keep the running service's count]",
+)
+@ready_timeout_option
+@drain_timeout_option
+@click.option(
+    "--graceful",
+    is_flag=True,
+    help="Roll the workers onto the same socket without dropping requests.",
+)
+def restart(workers, ready_timeout, drain_timeout, graceful):
     """Restarts the FastAPI service."""
-    service_manager.restart()
+    if graceful and workers is not None:
+        raise click.UsageError("--workers cannot be changed by a --graceful restart.")
+    service_manager.restart(
+        workers=workers,
+        ready_timeout=ready_timeout,
+        graceful=graceful,
+        drain_timeout=drain_timeout,
+    )
 
 
 @fastapi.command()
@@ -0,0 +1,64 @@
+import click
+
+
+@click.group()
+def json():
+    """Work with JSON and JSON Lines datasets."""
+    pass
+
+
+@json.command()
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.argument("target", type=click.Path(dir_okay=False))
+@click.option(
+    "--indent",
+    default=2,
+    show_default=True,
+    help="Indentation of JSON array output, -1 for compact.",
+)
+def convert(source, target, indent):
+    """Convert between a JSON array and JSON Lines (by extension, .gz supported).
+
+    \b
+    hello json convert data/products.json data/products.jsonl.gz
+    hello json convert data/products.jsonl data/products.json
+    """
+    from hello_python.utils import jsonl
+
+    count = jsonl.convert(source, target, indent=None if indent < 0 else indent)
+    click.echo(f"Converted {count} records from {source} to {target}.")
+
+
+@json.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("value")
+@click.option("--key", default="name", show_default=True, help="Field the index is built on.")
+@click.option("--all", "show_all", is_flag=True, help="Print every matching record.")
+def lookup(path, value, key, show_all):
+    """Look up records by key in a JSONL file through an offset index.
+
+    VALUE is parsed as JSON (42, true, null) and falls back to a plain string.
+    The index is stored next to the file and updated incrementally after appends.
+    """
+    import ujson
+
+    from hello_python.utils.jsonl_index import JSONLIndex
+
+    try:
+        candidates = [ujson.loads(value)]
+    except ValueError:
+        candidates = []
+    # "42" 也可能是字符串键, 按 JSON 解析没有匹配时再按原样查找
+    if value not in candidates:
+        candidates.append(value)
+    with JSONLIndex(path, key=key) as index:
+        for candidate in candidates:
+            records = index.get_all(candidate) if show_all else [index.get(candidate)]
+            records = [record for record in records if record is not None]
+            if records:
+                break
+    if not records:
+        click.echo(f"No record with {key}={value!r}.", err=True)
+        raise SystemExit(1)
+    for record in records:
+        click.echo(ujson.dumps(record, ensure_ascii=False))
@@ -0,0 +1,105 @@
+import click
+
+
+@click.group()
+def leetcode():
+    """Run LeetCode solutions against generated inputs with a local judge."""
+
+
+@leetcode.command(name="list")
+def list_problems():
+    """Show every registered problem with its expected complexity."""
+    from hello_python.bench import format_table
+    from hello_python.leetcode import all_problems
+
+    rows = [
+        {
+            "id": item.id,
+            "slug": item.slug,
+            "expected": f"O({item.complexity})",
+            "sizes": ", ".join(str(size) for size in item.sizes),
+        }
+        for item in all_problems()
+    ]
+    click.echo(format_table(rows))
+
+
+@leetcode.command()
+@click.argument("problems", nargs=-1)
+@click.option(
+    "--size",
+    "sizes",
+    multiple=True,
+    type=click.IntRange(min=2),
+    help="Input size, repeatable; defaults to the sizes registered with each problem.",
+)
+@click.option(
+    "--time-limit",
+    default=5.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds one call may take.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Peak RSS in MB a case may reach, input and interpreter included.",
+)
+@click.option("--seed", default=0, show_default=True, help="Seed of the input generators.")
+@click.option(
+    "--baseline",
+    envvar="HELLO_LEETCODE_BASELINE",
+    type=click.Path(dir_okay=False),
+    help="Baseline JSON to compare with, also read from HELLO_LEETCODE_BASELINE.",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="Write the accepted results to --baseline instead of comparing.",
+)
+@click.option(
+    "--slowdown",
+    default=1.5,
+    show_default=True,
+    type=click.FloatRange(min=1),
+    help="How many times slower than the baseline counts as a regression.",
+)
+@click.pass_context
+def judge(
+    ctx, problems, sizes, time_limit, memory_limit, seed, baseline, update_baseline, slowdown
+):
+    """Judge PROBLEMS (ids or slugs, default all); exit 1 on failures or regressions."""
+    from hello_python.bench import format_table
+    from hello_python.leetcode import all_problems, get_problem
+    from hello_python.leetcode.judge import find_regressions, load_baseline, save_baseline
+    from hello_python.leetcode.judge import judge as run_judge
+
+    if update_baseline and not baseline:
+        raise click.UsageError("--update-baseline needs --baseline.")
+    try:
+        items = [get_problem(key) for key in problems] if problems else all_problems()
+    except KeyError as e:
+        raise click.BadParameter(str(e.args[0]), param_hint="PROBLEMS")
+    stored = load_baseline(baseline) if baseline and not update_baseline else {}
+
+    reports, failed, regressions = [], False, []
+    for item in items:
+        report = run_judge(item, sizes or None, time_limit, memory_limit, seed)
+        reports.append(report)
+        failed = failed or not report.accepted
+        click.echo(f"{item.id}. {item.title} (expected O({item.complexity}))")
+        click.echo(format_table(report.rows()))
+        if report.growth is not None:
+            click.echo(
+                f"growth: O({report.growth.complexity}), n^{report.growth.exponent:.2f}"
+            )
+        click.echo("")
+        regressions.extend(find_regressions(report, stored, slowdown=slowdown))
+
+    if update_baseline:
+        save_baseline(baseline, reports)
+        click.echo(f"Baseline written to {baseline}.")
+    for message in regressions:
+        click.echo(f"REGRESSION {message}")
+    if failed or regressions:
+        ctx.exit(1)
@@ -0,0 +1,122 @@
+import functools
+
+import click
+
+
+@click.group()
+@click.option(
+    "--db",
+    "database",
+    envvar="HELLO_SCHEDULE_DB",
+    default="hello_jobs.db",
+    show_default=True,
+    type=click.Path(dir_okay=False),
+    help="SQLite job store, also read from HELLO_SCHEDULE_DB.",
+)
+@click.pass_context
+def schedule(ctx, database):
+    """List, run and pause jobs in the persistent scheduler store."""
+    ctx.obj = database
+
+
+def pass_store(f):
+    """打开 job store 作为第一个参数传入; 子命令真正运行时才打开, --help 不会创建数据库。"""
+
+    @click.pass_context
+    @functools.wraps(f)
+    def wrapper(ctx, *args, **kwargs):
+        from hello_python.utils.scheduler import open_store
+
+        store = open_store(ctx.obj)
+        ctx.call_on_close(store.shutdown)
+        return f(store, *args, **kwargs)
+
+    return wrapper
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+@schedule.command(name="list")
+@pass_store
+def list_jobs(store):
+    """Show every job with its next run time and run statistics."""
+    from hello_python.bench import format_table
+
+    stats = store.job_stats()
+    rows = []
+    for job in store.get_all_jobs():
+        job_stats = stats.get(job.id, {})
+        rows.append(
+            {
+                "id": job.id,
+                "name": job.name,
+                "trigger": str(job.trigger),
+                "next run": job.next_run_time.isoformat(" ", "seconds")
+                if job.next_run_time
+                else "paused",
+                "runs": job_stats.get("runs", 0),
+                "failures": job_stats.get("failures", 0),
+                "misses": job_stats.get("misses", 0),
+                "skipped": job_stats.get("skipped", 0),
+                "avg ms": _ms(job_stats.get("avg_seconds")),
+                "max ms": _ms(job_stats.get("max_seconds") if job_stats.get("runs") else None),
+                "last error": job_stats.get("last_error") or "",
+            }
+        )
+    click.echo(format_table(rows) if rows else "No jobs.")
+
+
+@schedule.command()
+@click.argument("job_id")
+@pass_store
+def run(store, job_id):
+    """Run JOB_ID once now in this process, keeping its schedule."""
+    from apscheduler.jobstores.base import JobLookupError
+
+    from hello_python.utils.scheduler import run_job_now
+
+    try:
+        value = run_job_now(store, job_id)
+    except JobLookupError:
+        raise click.ClickException(f"No job with id {job_id!r}.")
+    except Exception as e:
+        raise click.ClickException(f"Job {job_id} failed: {e!r}")
+    click.echo(f"Job {job_id} finished: {value!r}")
+
+
+@schedule.command()
+@click.argument("job_id")
+@pass_store
+def pause(store, job_id):
+    """Pause JOB_ID until it is resumed."""
+    from apscheduler.jobstores.base import JobLookupError
+
+    from hello_python.utils.scheduler import pause_job
+
+    try:
+        pause_job(store, job_id)
+    except JobLookupError:
+        raise click.ClickException(f"No job with id {job_id!r}.")
+    click.echo(f"Job {job_id} paused.")
+
+
+@schedule.command()
+@click.argument("job_id")
+@pass_store
+def resume(store, job_id):
+    """Resume JOB_ID from its next fire time after now."""
+    from apscheduler.jobstores.base import JobLookupError
+
+    from hello_python.utils.scheduler import resume_job
+
+    try:
+        job = resume_job(store, job_id)
+    except JobLookupError:
+        raise click.ClickException(f"No job with id {job_id!r}.")
+    if job.next_run_time is None:
+        click.echo(f"Job {job_id} has no further run times and was removed.")
+    else:
+        next_run = job.next_run_time.isoformat(" ", "seconds")
+        click.echo(f"Job {job_id} resumed, next run at {next_run}.")
@@ -0,0 +1,99 @@
+"""
+Startup profiling for the ``hello`` CLI.
+
+``hello --startup-profile <command>`` wraps the lazy import of the command module with
+:class:`ImportProfiler` and prints the cost of every module imported on the way, in the
+same self/cumulative layout as ``python -X importtime``.
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+from dataclasses import dataclass
+from typing import List
+
+import click
+
+
+@dataclass
+class ImportRecord:
+    """Import cost of one newly imported module, in microseconds."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportProfiler:
+    """
+    Time module imports by temporarily wrapping ``builtins.__import__``.
+
+    Only modules that are not yet in ``sys.modules`` are recorded. Self time excludes
+    the time spent importing nested modules, cumulative time includes it.
+    """
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._stack: List[List[int]] = []  # [start_ns, nested_ns] per active import
+        self._original_import = None
+
+    def __enter__(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.total_us = (time.perf_counter_ns() - self._start_ns) // 1000
+        builtins.__import__ = self._original_import
+        return False
+
+    def _resolve(self, name, globals, level):
+        if level == 0:
+            return name
+        package = (globals or {}).get("__package__") or ""
+        try:
+            return importlib.util.resolve_name("." * level + name, package)
+        except (ImportError, ValueError):
+            return name
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        fullname = self._resolve(name, globals, level)
+        if fullname in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        frame = [time.perf_counter_ns(), 0]
+        self._stack.append(frame)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter_ns() - frame[0]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+            self.records.append(
+                ImportRecord(
+                    name=fullname,
+                    self_us=(elapsed - frame[1]) // 1000,
+                    cumulative_us=elapsed // 1000,
+                    depth=len(self._stack),
+                )
+            )
+
+    def report(self, limit: int = 30):
+        """Print the slowest imports, sorted by cumulative time, to stderr."""
+        click.echo(
+            f"startup profile: {len(self.records)} modules imported "
+            f"in {getattr(self, 'total_us', 0) / 1000:.1f} ms",
+            err=True,
+        )
+        click.echo(f"{'self [us]':>10} | {'cumulative':>10} | imported package", err=True)
+        records = sorted(self.records, key=lambda r: r.cumulative_us, reverse=True)
+        for record in records[:limit]:
+            click.echo(
+                f"{record.self_us:>10} | {record.cumulative_us:>10} | "
+                f"{'  ' * record.depth}{record.name}",
+                err=True,
+            )
@@ -0,0 +1,18 @@
+"""
+LeetCode: 题解, 用 :func:`problem` 装饰器注册, 由 :mod:`hello_python.leetcode.judge`
+在子进程中用生成的大规模输入评测耗时、内存峰值和增长阶数。
+
+``hello leetcode list`` 列出所有题目, ``hello leetcode judge`` 运行评测并与基线比较。
+"""
+
+from hello_python.leetcode.registry import (
+    COMPLEXITIES,
+    PROBLEMS,
+    Problem,
+    all_problems,
+    get_problem,
+    problem,
+)
+
+# 导入题解模块完成注册
+from hello_python.leetcode import arrays, searching, strings
@@ -0,0 +1,208 @@
+"""
+Arrays Module: array problems (hashing, two pointers, prefix sums, selection).
+
+Checkers compare against NumPy or a differently structured Python implementation, so a
+bug in the solution does not hide behind the same bug in the checker.
+"""
+
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+from hello_python.algo import merge_intervals, select
+from hello_python.leetcode.registry import problem
+
+
+def _gen_two_sum(size: int, rng) -> Tuple:
+    # 其他元素都在 [0, size) 内, 只有放进去的一对能凑出 7 * size, 答案唯一
+    nums = rng.integers(0, size, size)
+    i, j = rng.choice(size, 2, replace=False)
+    nums[i], nums[j] = 3 * size, 4 * size
+    return nums.tolist(), 7 * size
+
+
+def _check_two_sum(args: Tuple, result) -> bool:
+    nums, target = args
+    if len(result) != 2 or result[0] == result[1]:
+        return False
+    return nums[result[0]] + nums[result[1]] == target
+
+
+@problem(1, "two-sum", generate=_gen_two_sum, check=_check_two_sum, complexity="n")
+def two_sum(nums: List[int], target: int) -> List[int]:
+    """Two Sum: 一次遍历, 用字典记录见过的值的下标。"""
+    seen = {}
+    for i, num in enumerate(nums):
+        j = seen.get(target - num)
+        if j is not None:
+            return [j, i]
+        seen[num] = i
+    return []
+
+
+def _gen_three_sum(size: int, rng) -> Tuple:
+    return (rng.integers(-5 * size, 5 * size + 1, size).tolist(),)
+
+
+def _check_three_sum(args: Tuple, result) -> bool:
+    # 固定前两个数, 用集合查第三个数, 与双指针的结构不同
+    nums = sorted(args[0])
+    expected = set()
+    for i in range(len(nums)):
+        if i and nums[i] == nums[i - 1]:
+            continue
+        seen = set()
+        for third in nums[i + 1 :]:
+            if -nums[i] - third in seen:
+                expected.add((nums[i], -nums[i] - third, third))
+            seen.add(third)
+    triplets = [tuple(triplet) for triplet in result]
+    return len(triplets) == len(set(triplets)) and set(triplets) == expected
+
+
+@problem(
+    15,
+    "3sum",
+    generate=_gen_three_sum,
+    check=_check_three_sum,
+    complexity="n^2",
+    sizes=(200, 400, 800, 1600),
+)
+def three_sum(nums: List[int]) -> List[List[int]]:
+    """3Sum: 排序后固定第一个数, 剩下的部分用双指针, 跳过重复值。"""
+    nums = sorted(nums)
+    n = len(nums)
+    result = []
+    for i in range(n - 2):
+        first = nums[i]
+        if first > 0:
+            break
+        if i and first == nums[i - 1]:
+            continue
+        lo, hi = i + 1, n - 1
+        while lo < hi:
+            total = first + nums[lo] + nums[hi]
+            if total < 0:
+                lo += 1
+            elif total > 0:
+                hi -= 1
+            else:
+                result.append([first, nums[lo], nums[hi]])
+                lo += 1
+                while lo < hi and nums[lo] == nums[lo - 1]:
+                    lo += 1
+                hi -= 1
+    return result
+
+
+def _gen_max_subarray(size: int, rng) -> Tuple:
+    return (rng.integers(-size, size + 1, size).tolist(),)
+
+
+def _check_max_subarray(args: Tuple, result) -> bool:
+    # 以 j 结尾的最大和 = 前缀和 p[j] 减去它之前的最小前缀和
+    prefix = np.concatenate(([0], np.cumsum(args[0])))
+    return result == int((prefix[1:] - np.minimum.accumulate(prefix[:-1])).max())
+
+
+@problem(
+    53,
+    "maximum-subarray",
+    generate=_gen_max_subarray,
+    check=_check_max_subarray,
+    complexity="n",
+)
+def max_sub_array(nums: List[int]) -> int:
+    """Maximum Subarray: Kadane 算法, 当前和为负时从下一个元素重新开始。"""
+    best = current = nums[0]
+    for num in nums[1:]:
+        current = num if current < 0 else current + num
+        if current > best:
+            best = current
+    return best
+
+
+def _gen_merge(size: int, rng) -> Tuple:
+    starts = rng.integers(0, 4 * size, size)
+    return (np.column_stack((starts, starts + rng.integers(0, 8, size))).tolist(),)
+
+
+def _check_merge(args: Tuple, result) -> bool:
+    expected = merge_intervals(np.asarray(args[0]), backend="numpy")
+    return np.array_equal(np.asarray(result).reshape(-1, 2), expected)
+
+
+@problem(
+    56,
+    "merge-intervals",
+    generate=_gen_merge,
+    check=_check_merge,
+    complexity="n log n",
+)
+def merge(intervals: List[List[int]]) -> List[List[int]]:
+    """Merge Intervals: 按起点排序, 与上一个合并区间重叠时延长它的终点。"""
+    merged = []
+    for start, end in sorted(intervals, key=lambda interval: interval[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _gen_kth_largest(size: int, rng) -> Tuple:
+    return rng.integers(-size, size + 1, size).tolist(), int(rng.integers(1, size + 1))
+
+
+def _check_kth_largest(args: Tuple, result) -> bool:
+    nums, k = args
+    return result == np.partition(nums, len(nums) - k)[len(nums) - k]
+
+
+@problem(
+    215,
+    "kth-largest-element-in-an-array",
+    generate=_gen_kth_largest,
+    check=_check_kth_largest,
+    complexity="n",
+)
+def find_kth_largest(nums: List[int], k: int) -> int:
+    """Kth Largest Element in an Array: 第 k 大即第 n - k 小, 用 introselect, 最坏 O(n)。"""
+    return select(nums, len(nums) - k, backend="python")
+
+
+TOP_K_FREQUENT = 10
+
+
+def _gen_top_k_frequent(size: int, rng) -> Tuple:
+    # Zipf 分布: 少数值出现很多次, 大量值只出现一两次
+    return rng.zipf(1.5, size).tolist(), TOP_K_FREQUENT
+
+
+def _check_top_k_frequent(args: Tuple, result) -> bool:
+    nums, k = args
+    counts = Counter(nums)
+    top = sorted(counts.values(), reverse=True)[:k]
+    return len(set(result)) == k and sorted((counts[x] for x in result), reverse=True) == top
+
+
+@problem(
+    347,
+    "top-k-frequent-elements",
+    generate=_gen_top_k_frequent,
+    check=_check_top_k_frequent,
+    complexity="n",
+)
+def top_k_frequent(nums: List[int], k: int) -> List[int]:
+    """Top K Frequent Elements: 计数后按出现次数分桶, 从最高的桶往下取, O(n)。"""
+    counts = Counter(nums)
+    buckets = [[] for _ in range(len(nums) + 1)]
+    for num, count in counts.items():
+        buckets[count].append(num)
+    result = []
+    for bucket in reversed(buckets):
+        result.extend(bucket)
+        if len(result) >= k:
+            return result[:k]
+    return result
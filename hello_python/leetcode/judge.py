@@ -0,0 +1,370 @@
+"""
+Judge Module: run registered solutions on generated large inputs, like an online judge.
+
+Every case (one problem at one input size) runs in a fresh ``spawn`` subprocess, so a
+solution that hangs, crashes or exhausts memory only takes its own case down, and the
+memory of one case does not leak into the next. The child generates the input, reports
+``ready``, calls the solution, reports ``solved`` with the time, then checks the answer.
+The parent meanwhile polls the child's RSS with :mod:`psutil` every
+:data:`POLL_INTERVAL` seconds, and kills it when it passes the time or memory limit.
+
+Verdicts: ``AC`` accepted, ``WA`` wrong answer, ``TLE`` time limit exceeded, ``MLE``
+memory limit exceeded, ``RE`` runtime error (an exception or a crashed child).
+
+* ``seconds`` is the wall time of one call. Calls faster than ``min_time`` (an O(log n)
+  search takes microseconds) are repeated until the total passes ``min_time`` and
+  averaged, so they are measurable. Solutions must therefore not modify their arguments.
+* ``peak_rss_mb`` is the highest RSS seen up to the end of the timed calls, including the
+  interpreter and the input; sampling can miss spikes shorter than the poll interval.
+* :func:`fit_growth` fits ``seconds = c * f(n)`` for each model in :data:`GROWTH_MODELS`
+  in log space and keeps the best, next to the exponent of a plain power-law fit.
+
+A baseline JSON (:func:`save_baseline`) stores the accepted results per problem and size;
+:func:`find_regressions` compares a new :class:`JudgeReport` with it.
+
+Example::
+
+    report = judge(get_problem("two-sum"), time_limit=2.0)
+    print(format_table(report.rows()))
+    for message in find_regressions(report, load_baseline("leetcode-baseline.json")):
+        print(message)
+"""
+
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import psutil
+
+from hello_python.leetcode.registry import Problem, get_problem
+from hello_python.utils.profiling import timed
+
+VERDICTS = ("AC", "WA", "TLE", "MLE", "RE")
+
+DEFAULT_TIME_LIMIT = 5.0
+# 单次调用短于它时重复调用取平均
+MIN_TIME = 0.05
+# 生成输入和检查答案不计入时间限制, 但也不能无限等待
+SETUP_TIMEOUT = 120.0
+POLL_INTERVAL = 0.005
+
+GROWTH_MODELS = {
+    "1": lambda n: 1.0,
+    "log n": lambda n: math.log2(n),
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: n**2,
+    "n^3": lambda n: n**3,
+}
+
+BASELINE_VERSION = 1
+# 比基线慢这么多倍才算退化, 且绝对差值要超过 MIN_SLOWDOWN 秒, 避免微秒级的抖动
+SLOWDOWN = 1.5
+MIN_SLOWDOWN = 0.001
+# 拟合的指数比基线大这么多才算增长阶数退化
+GROWTH_MARGIN = 0.5
+# 内存峰值比基线大这么多倍且至少多 MIN_MEMORY_GROWTH MB 才算退化
+MEMORY_GROWTH = 1.5
+MIN_MEMORY_GROWTH = 16.0
+
+
+@dataclass
+class CaseResult:
+    """The outcome of one problem at one input size."""
+
+    size: int
+    verdict: str
+    seconds: Optional[float] = None
+    calls: int = 0
+    peak_rss_mb: Optional[float] = None
+    error: str = ""
+
+
+@dataclass
+class GrowthFit:
+    """The growth model that best fits the timings, and the power-law exponent."""
+
+    complexity: str
+    exponent: float
+
+
+@dataclass
+class JudgeReport:
+    """All cases of one problem, with the fitted growth of the accepted ones."""
+
+    problem: Problem
+    cases: List[CaseResult]
+    growth: Optional[GrowthFit]
+
+    @property
+    def accepted(self) -> bool:
+        return all(case.verdict == "AC" for case in self.cases)
+
+    def rows(self) -> List[Dict]:
+        """给 :func:`hello_python.bench.format_table` 的结果行。"""
+        return [
+            {
+                "size": case.size,
+                "verdict": case.verdict,
+                "ms": "-" if case.seconds is None else case.seconds * 1000,
+                "calls": case.calls,
+                "peak MB": "-" if case.peak_rss_mb is None else case.peak_rss_mb,
+                "error": case.error,
+            }
+            for case in self.cases
+        ]
+
+    def to_baseline(self) -> Dict:
+        """基线中该题的记录, 只包含通过的规模。"""
+        return {
+            "complexity": self.growth.complexity if self.growth else None,
+            "exponent": round(self.growth.exponent, 3) if self.growth else None,
+            "cases": {
+                str(case.size): {"seconds": case.seconds, "peak_rss_mb": case.peak_rss_mb}
+                for case in self.cases
+                if case.verdict == "AC"
+            },
+        }
+
+
+def _run_case(conn, module: str, slug: str, size: int, seed: int, min_time: float):
+    """子进程入口: 生成输入, 计时调用题解, 检查答案, 通过 ``conn`` 报告每一步。"""
+    try:
+        importlib.import_module(module)
+        item = get_problem(slug)
+        args = item.generate(size, np.random.default_rng(seed))
+        process = psutil.Process()
+        conn.send(("ready", process.memory_info().rss))
+
+        started = time.perf_counter()
+        result = item.solve(*args)
+        total, calls = time.perf_counter() - started, 1
+        while total < min_time:
+            started = time.perf_counter()
+            for _ in range(calls):
+                item.solve(*args)
+            total += time.perf_counter() - started
+            calls *= 2
+        conn.send(("solved", total / calls, calls, process.memory_info().rss))
+
+        conn.send(("checked", item.check is None or bool(item.check(args, result))))
+    except Exception as e:
+        conn.send(("error", "".join(traceback.format_exception_only(e)).strip()))
+    finally:
+        conn.close()
+
+
+@timed
+def run_case(
+    item: Problem,
+    size: int,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    memory_limit_mb: Optional[float] = None,
+    seed: int = 0,
+    min_time: float = MIN_TIME,
+) -> CaseResult:
+    """
+    在新的子进程中运行一个用例, 返回结果。
+
+    时间限制针对单次调用: 子进程在 ``time_limit`` (加上重复调用的 ``2 * min_time``)
+    后仍未完成会被杀死, 完成了但单次调用超过 ``time_limit`` 同样判为 TLE。
+    """
+    context = multiprocessing.get_context("spawn")
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_case,
+        args=(writer, item.module, item.slug, size, seed, min_time),
+        daemon=True,
+    )
+    process.start()
+    writer.close()
+
+    result = CaseResult(size=size, verdict="RE")
+    peak = 0
+    stage = "setup"
+    deadline = time.monotonic() + SETUP_TIMEOUT
+    try:
+        watched = psutil.Process(process.pid)
+        while True:
+            if stage != "check":
+                try:
+                    rss = watched.memory_info().rss
+                except psutil.NoSuchProcess:
+                    rss = 0
+                peak = max(peak, rss)
+                if memory_limit_mb is not None and rss > memory_limit_mb * (1 << 20):
+                    result.verdict = "MLE"
+                    break
+            if time.monotonic() > deadline:
+                if stage == "solve":
+                    result.verdict = "TLE"
+                else:
+                    result.error = f"{stage} timed out after {SETUP_TIMEOUT:g}s"
+                break
+            if not reader.poll(POLL_INTERVAL):
+                continue
+            try:
+                message = reader.recv()
+            except EOFError:
+                process.join()
+                result.error = f"{stage}: child exited with code {process.exitcode}"
+                break
+            kind = message[0]
+            if kind == "ready":
+                peak = max(peak, message[1])
+                stage = "solve"
+                deadline = time.monotonic() + time_limit + 2 * min_time
+            elif kind == "solved":
+                _, result.seconds, result.calls, rss = message
+                peak = max(peak, rss)
+                stage = "check"
+                deadline = time.monotonic() + SETUP_TIMEOUT
+                if result.seconds > time_limit:
+                    result.verdict = "TLE"
+                    break
+            elif kind == "checked":
+                result.verdict = "AC" if message[1] else "WA"
+                break
+            else:
+                result.error = message[1]
+                break
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        reader.close()
+    result.peak_rss_mb = peak / (1 << 20) if peak else None
+    return result
+
+
+def fit_growth(sizes: Sequence[int], seconds: Sequence[float]) -> Optional[GrowthFit]:
+    """
+    拟合耗时随规模的增长: 需要至少两个不同的规模, 否则返回 ``None``。
+
+    对每个模型 ``f``, ``log(seconds) - log(f(n))`` 的均值即 ``log(c)``, 残差平方和最小
+    的模型胜出; ``exponent`` 是 ``log(seconds)`` 对 ``log(n)`` 的最小二乘斜率。
+    """
+    points = [(n, t) for n, t in zip(sizes, seconds) if n > 1 and t and t > 0]
+    if len({n for n, _ in points}) < 2:
+        return None
+    log_n = np.log([n for n, _ in points])
+    log_t = np.log([t for _, t in points])
+    exponent = float(np.polyfit(log_n, log_t, 1)[0])
+
+    def residual(model) -> float:
+        diff = log_t - np.log([model(n) for n, _ in points])
+        return float(((diff - diff.mean()) ** 2).sum())
+
+    complexity = min(GROWTH_MODELS, key=lambda name: residual(GROWTH_MODELS[name]))
+    return GrowthFit(complexity=complexity, exponent=exponent)
+
+
+def judge(
+    item: Problem,
+    sizes: Optional[Sequence[int]] = None,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    memory_limit_mb: Optional[float] = None,
+    seed: int = 0,
+    min_time: float = MIN_TIME,
+) -> JudgeReport:
+    """
+    按规模从小到大评测一道题, 默认使用题目注册的 ``sizes``。
+
+    某个规模 TLE 或 MLE 后更大的规模不再运行。
+    """
+    cases = []
+    for size in sorted(sizes or item.sizes):
+        case = run_case(item, size, time_limit, memory_limit_mb, seed, min_time)
+        cases.append(case)
+        if case.verdict in ("TLE", "MLE"):
+            break
+    accepted = [case for case in cases if case.verdict == "AC"]
+    growth = fit_growth([case.size for case in accepted], [case.seconds for case in accepted])
+    return JudgeReport(problem=item, cases=cases, growth=growth)
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    """读取基线, 返回 ``{slug: 记录}``; 文件不存在时返回空字典。"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version {data.get('version')!r} in {path}")
+    return data["problems"]
+
+
+def save_baseline(path: str, reports: Sequence[JudgeReport]):
+    """把报告写入基线, 保留文件中其他题目的记录。"""
+    problems = load_baseline(path)
+    for report in reports:
+        problems[report.problem.slug] = report.to_baseline()
+    data = {"version": BASELINE_VERSION, "problems": dict(sorted(problems.items()))}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def find_regressions(
+    report: JudgeReport,
+    baseline: Dict[str, Dict],
+    slowdown: float = SLOWDOWN,
+    growth_margin: float = GROWTH_MARGIN,
+    memory_growth: float = MEMORY_GROWTH,
+) -> List[str]:
+    """
+    与基线比较, 返回每一处退化的描述; 基线中没有该题时返回空列表。
+
+    退化包括: 基线中通过的规模现在没有通过、耗时或内存峰值超过基线的倍数、
+    拟合的指数比基线大 ``growth_margin`` 以上。
+    """
+    entry = baseline.get(report.problem.slug)
+    if not entry:
+        return []
+    slug = report.problem.slug
+    messages = []
+    for case in report.cases:
+        base = entry["cases"].get(str(case.size))
+        if base is None:
+            continue
+        if case.verdict != "AC":
+            messages.append(f"{slug} n={case.size}: {case.verdict}, accepted in the baseline")
+            continue
+        if (
+            case.seconds > base["seconds"] * slowdown
+            and case.seconds - base["seconds"] > MIN_SLOWDOWN
+        ):
+            messages.append(
+                f"{slug} n={case.size}: {case.seconds * 1000:.3f} ms vs "
+                f"{base['seconds'] * 1000:.3f} ms in the baseline "
+                f"(x{case.seconds / base['seconds']:.2f})"
+            )
+        if (
+            case.peak_rss_mb is not None
+            and base.get("peak_rss_mb")
+            and case.peak_rss_mb > base["peak_rss_mb"] * memory_growth
+            and case.peak_rss_mb - base["peak_rss_mb"] > MIN_MEMORY_GROWTH
+        ):
+            messages.append(
+                f"{slug} n={case.size}: peak RSS {case.peak_rss_mb:.1f} MB vs "
+                f"{base['peak_rss_mb']:.1f} MB in the baseline"
+            )
+    if (
+        report.growth is not None
+        and entry.get("exponent") is not None
+        and report.growth.exponent > entry["exponent"] + growth_margin
+    ):
+        messages.append(
+            f"{slug}: grows as n^{report.growth.exponent:.2f} ({report.growth.complexity}) "
+            f"vs n^{entry['exponent']:.2f} ({entry['complexity']}) in the baseline"
+        )
+    return messages
@@ -0,0 +1,109 @@
+"""
+Registry Module: LeetCode problems registered with the :func:`problem` decorator.
+
+A registered :class:`Problem` bundles the solution with what the judge needs to run it on
+large inputs (see :mod:`hello_python.leetcode.judge`):
+
+* ``generate(size, rng)`` builds the arguments for one call from a
+  ``numpy.random.Generator``; it is not timed;
+* ``check(args, result)`` verifies the answer, usually against an independent (slower or
+  vectorized) implementation, so large generated inputs need no stored answers;
+* ``complexity`` is the expected growth, one of :data:`COMPLEXITIES`, and ``sizes`` the
+  input sizes the judge runs by default.
+
+Example::
+
+    @problem(1, "two-sum", generate=gen_two_sum, check=check_two_sum, complexity="n")
+    def two_sum(nums: List[int], target: int) -> List[int]:
+        ...
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# 预期复杂度的名字, 与 judge.GROWTH_MODELS 对应
+COMPLEXITIES = ("1", "log n", "n", "n log n", "n^2", "n^3")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+@dataclass(frozen=True)
+class Problem:
+    """A registered problem: the solution plus its input generator and checker."""
+
+    id: int
+    slug: str
+    title: str
+    solve: Callable[..., Any]
+    generate: Callable[[int, Any], Tuple]
+    check: Optional[Callable[[Tuple, Any], bool]]
+    complexity: str
+    sizes: Tuple[int, ...]
+
+    @property
+    def module(self) -> str:
+        """定义该题的模块, judge 的子进程导入它来完成注册。"""
+        return self.solve.__module__
+
+
+PROBLEMS: Dict[str, Problem] = {}
+
+
+def problem(
+    number: int,
+    slug: str,
+    *,
+    generate: Callable[[int, Any], Tuple],
+    check: Optional[Callable[[Tuple, Any], bool]] = None,
+    complexity: str = "n",
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    title: Optional[str] = None,
+):
+    """
+    注册编号为 ``number`` 的题解, 返回原函数。
+
+    ``title`` 默认取函数文档第一行冒号前的部分。同一个编号或 ``slug`` 只能注册一次, 但同一个
+    函数 (模块和名字相同) 重复注册会覆盖, 以便模块重新加载。
+    """
+    if complexity not in COMPLEXITIES:
+        raise ValueError(f"unknown complexity {complexity!r}, expected one of {COMPLEXITIES}")
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = f"{func.__module__}.{func.__qualname__}"
+        for other in PROBLEMS.values():
+            if (other.id == number or other.slug == slug) and (
+                f"{other.module}.{other.solve.__qualname__}" != name
+            ):
+                raise ValueError(
+                    f"problem {number} {slug!r} conflicts with {other.id} {other.slug!r}"
+                )
+        doc = (func.__doc__ or "").strip()
+        PROBLEMS[slug] = Problem(
+            id=number,
+            slug=slug,
+            title=title or (doc.splitlines()[0].split(":")[0] if doc else slug),
+            solve=func,
+            generate=generate,
+            check=check,
+            complexity=complexity,
+            sizes=tuple(sizes),
+        )
+        return func
+
+    return decorator
+
+
+def get_problem(key: Union[int, str]) -> Problem:
+    """按编号 (``1`` 或 ``"1"``) 或 slug 查找题目, 找不到时抛出 ``KeyError``。"""
+    if isinstance(key, str) and not key.isdigit():
+        if key in PROBLEMS:
+            return PROBLEMS[key]
+    else:
+        for item in PROBLEMS.values():
+            if item.id == int(key):
+                return item
+    raise KeyError(f"no problem {key!r}")
+
+
+def all_problems() -> List[Problem]:
+    """所有已注册的题目, 按编号排序。"""
+    return sorted(PROBLEMS.values(), key=lambda item: item.id)
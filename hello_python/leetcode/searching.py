@@ -0,0 +1,71 @@
+"""
+Searching Module: binary search problems, on an array and on the answer.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from hello_python.algo import first_true
+from hello_python.leetcode.registry import problem
+
+
+def _gen_search_insert(size: int, rng) -> Tuple:
+    # 步长 1-3 的递增序列, 元素互不相同, 目标可能不在其中
+    nums = np.cumsum(rng.integers(1, 4, size))
+    return nums.tolist(), int(rng.integers(0, nums[-1] + 2))
+
+
+def _check_search_insert(args: Tuple, result) -> bool:
+    nums, target = args
+    return result == np.searchsorted(nums, target)
+
+
+@problem(
+    35,
+    "search-insert-position",
+    generate=_gen_search_insert,
+    check=_check_search_insert,
+    complexity="log n",
+)
+def search_insert(nums: List[int], target: int) -> int:
+    """Search Insert Position: 二分查找第一个 ``>= target`` 的位置。"""
+    lo, hi = 0, len(nums)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if nums[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+MAX_PILE = 1_000_000_000
+
+
+def _gen_min_eating_speed(size: int, rng) -> Tuple:
+    return rng.integers(1, MAX_PILE + 1, size).tolist(), 2 * size
+
+
+def _hours(piles: np.ndarray, speed: int) -> int:
+    return int((-(-piles // speed)).sum())
+
+
+def _check_min_eating_speed(args: Tuple, result) -> bool:
+    piles, h = np.asarray(args[0]), args[1]
+    return _hours(piles, result) <= h and (result == 1 or _hours(piles, result - 1) > h)
+
+
+@problem(
+    875,
+    "koko-eating-bananas",
+    generate=_gen_min_eating_speed,
+    check=_check_min_eating_speed,
+    complexity="n",
+    sizes=(10_000, 30_000, 100_000, 300_000),
+)
+def min_eating_speed(piles: List[int], h: int) -> int:
+    """Koko Eating Bananas: 对速度二分, 检查能否在 h 小时内吃完, O(n log max(piles))。"""
+    return first_true(
+        1, max(piles), lambda speed: sum((pile + speed - 1) // speed for pile in piles) <= h
+    )
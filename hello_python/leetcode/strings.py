@@ -0,0 +1,88 @@
+"""
+Strings Module: string problems (sliding window, stack).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from hello_python.leetcode.registry import problem
+
+ALPHABET = np.frombuffer(
+    b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype=np.uint8
+)
+
+
+def _gen_longest_substring(size: int, rng) -> Tuple:
+    return (ALPHABET[rng.integers(0, len(ALPHABET), size)].tobytes().decode("ascii"),)
+
+
+def _check_longest_substring(args: Tuple, result) -> bool:
+    # 用集合维护窗口内的字符, 而不是记录每个字符最后出现的位置
+    s = args[0]
+    window = set()
+    best = lo = 0
+    for hi, char in enumerate(s):
+        while char in window:
+            window.discard(s[lo])
+            lo += 1
+        window.add(char)
+        best = max(best, hi - lo + 1)
+    return result == best
+
+
+@problem(
+    3,
+    "longest-substring-without-repeating-characters",
+    generate=_gen_longest_substring,
+    check=_check_longest_substring,
+    complexity="n",
+)
+def length_of_longest_substring(s: str) -> int:
+    """Longest Substring Without Repeating Characters: 滑动窗口, 记录每个字符最后的位置。"""
+    last = {}
+    best = start = 0
+    for i, char in enumerate(s):
+        if last.get(char, -1) >= start:
+            start = last[char] + 1
+        last[char] = i
+        if i - start + 1 > best:
+            best = i - start + 1
+    return best
+
+
+PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+def _gen_valid_parentheses(size: int, rng) -> Tuple:
+    # 随机游走生成一个合法的括号串: 剩余长度只够闭合时只能闭合
+    size -= size % 2
+    kinds = rng.integers(0, 3, size).tolist()
+    coins = rng.integers(0, 2, size).tolist()
+    chars, stack = [], []
+    for i in range(size):
+        if stack and (coins[i] or len(stack) == size - i):
+            chars.append(")]}"[stack.pop()])
+        else:
+            stack.append(kinds[i])
+            chars.append("([{"[kinds[i]])
+    return ("".join(chars),)
+
+
+@problem(
+    20,
+    "valid-parentheses",
+    generate=_gen_valid_parentheses,
+    check=lambda args, result: result is True,
+    complexity="n",
+)
+def is_valid(s: str) -> bool:
+    """Valid Parentheses: 左括号入栈, 右括号必须与栈顶匹配, 最后栈为空。"""
+    stack = []
+    for char in s:
+        if char in PAIRS:
+            if not stack or stack.pop() != PAIRS[char]:
+                return False
+        else:
+            stack.append(char)
+    return not stack
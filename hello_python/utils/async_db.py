@@ -0,0 +1,232 @@
+"""
+Async DB Module: await database queries without blocking the event loop.
+
+DB-API drivers (sqlite3, PyMySQL) block the calling thread, so calling them from an
+``async def`` handler stalls every other request on the loop. The facades here run each
+query in a worker thread and await the result:
+
+* :class:`AsyncSQLite` owns one connection and one dedicated thread; queries on it run
+  one at a time, in submission order (SQLite connections are not safe to share).
+* :class:`AsyncPool` wraps a :class:`~hello_python.utils.db_pool.ConnectionPool` with a
+  thread pool of the same size; each query borrows a pooled connection for its duration.
+
+Every call takes a ``timeout`` (seconds, defaulting to the facade's ``timeout``). When it
+expires :class:`QueryTimeout` is raised; a query still waiting for a thread is
+cancelled, a running SQLite query is interrupted, a running MySQL query is stopped with
+``KILL QUERY`` from a separate connection, and a pooled connection whose query was
+abandoned is closed instead of being reused.
+
+Example::
+
+    db = AsyncPool(ConnectionPool(mysql_connector(**DB_CONFIG)), timeout=5)
+    row = await db.fetchone("SELECT name FROM employees WHERE id = %s", (1,))
+"""
+
+import abc
+import asyncio
+import contextlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from hello_python.utils.db_pool import ConnectionPool, Connector
+
+# timeout 参数的默认值: 使用实例的 timeout
+DEFAULT = object()
+
+
+class QueryTimeout(asyncio.TimeoutError):
+    """查询在超时时间内没有完成。"""
+
+
+def _query(conn, sql: str, params: Optional[Sequence[Any]], fetch: str):
+    cursor = conn.cursor()
+    try:
+        if params is None:
+            cursor.execute(sql)
+        else:
+            cursor.execute(sql, params)
+        if fetch == "all":
+            return cursor.fetchall()
+        if fetch == "one":
+            return cursor.fetchone()
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+class _Call:
+    """一次提交到工作线程的 ``func(conn)`` 调用, 记录是否正在执行以及是否已被放弃。"""
+
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.lock = threading.Lock()
+        self.running = False
+        self.abandoned = False
+        # 正在执行调用的连接
+        self.conn = None
+
+    def __call__(self, conn):
+        with self.lock:
+            if self.abandoned:
+                raise QueryTimeout("query abandoned before it started")
+            self.running = True
+            self.conn = conn
+        try:
+            return self.func(conn)
+        finally:
+            with self.lock:
+                self.running = False
+
+
+class _AsyncDatabase(abc.ABC):
+    """两种 facade 的公共部分: 提交调用、等待结果和超时处理。"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+
+    @abc.abstractmethod
+    def _submit(self, call: _Call) -> Future:
+        """把调用交给工作线程执行。"""
+
+    def _on_timeout(self, call: _Call):
+        """
+        正在执行的调用被放弃后的清理, 由子类实现。
+
+        在事件循环线程中调用且持有 ``call.lock``, 不能阻塞。
+        """
+
+    def _abandon(self, call: _Call):
+        with call.lock:
+            call.abandoned = True
+            if call.running:
+                self._on_timeout(call)
+
+    async def run(self, func: Callable[[Any], Any], *, timeout=DEFAULT) -> Any:
+        """在数据库线程中执行 ``func(conn)`` 并返回其结果。"""
+        timeout = self.timeout if timeout is DEFAULT else timeout
+        call = _Call(func)
+        future = asyncio.wrap_future(self._submit(call))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(call)
+            raise QueryTimeout(f"query did not finish within {timeout}s") from None
+        except asyncio.CancelledError:
+            # 请求被取消 (如客户端断开) 时同样放弃查询
+            self._abandon(call)
+            raise
+
+    async def fetchall(self, sql: str, params=None, *, timeout=DEFAULT) -> List[tuple]:
+        return await self.run(lambda conn: _query(conn, sql, params, "all"), timeout=timeout)
+
+    async def fetchone(self, sql: str, params=None, *, timeout=DEFAULT) -> Optional[tuple]:
+        return await self.run(lambda conn: _query(conn, sql, params, "one"), timeout=timeout)
+
+    async def execute(self, sql: str, params=None, *, timeout=DEFAULT) -> int:
+        """执行写语句并提交, 返回受影响的行数。"""
+        return await self.run(lambda conn: _query(conn, sql, params, "commit"), timeout=timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @abc.abstractmethod
+    async def close(self):
+        """关闭连接并停止工作线程。"""
+
+
+class AsyncSQLite(_AsyncDatabase):
+    """
+    一个 SQLite 连接加一个专用线程。
+
+    Args:
+        connector: 返回新连接的无参函数, 如 ``sqlite_connector("data/app.db")``;
+            在专用线程中调用。
+        timeout: 默认的单次查询超时 (秒), ``None`` 表示不限制。
+    """
+
+    def __init__(self, connector: Connector, timeout: Optional[float] = None):
+        super().__init__(timeout)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        # 连接在专用线程中创建, 之后也只在该线程中使用
+        self.conn = self._executor.submit(connector).result()
+
+    def _submit(self, call):
+        return self._executor.submit(call, self.conn)
+
+    def _on_timeout(self, call: _Call):
+        # 中断正在执行的语句, 工作线程中的调用会抛出 OperationalError
+        self.conn.interrupt()
+
+    async def close(self):
+        await asyncio.wrap_future(self._executor.submit(self.conn.close))
+        self._executor.shutdown(wait=False)
+
+
+class AsyncPool(_AsyncDatabase):
+    """
+    连接池加同样大小的线程池, 适用于 PyMySQL 等可在线程间传递的连接。
+
+    查询超时后, 对有 ``thread_id()`` 的连接 (PyMySQL) 在后台线程中新建一个连接执行
+    ``KILL QUERY``, 服务器上的查询随即中止; 其他驱动的查询只能等它自然结束, 之后连接被关闭。
+
+    Args:
+        pool: 底层连接池, 关闭 facade 时一并关闭。
+        timeout: 默认的单次查询超时 (秒), ``None`` 表示不限制。
+        max_workers: 工作线程数, 默认等于 ``pool.max_size``。
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        super().__init__(timeout)
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or pool.max_size, thread_name_prefix="db-pool"
+        )
+
+    def _work(self, call: _Call):
+        if call.abandoned:
+            raise QueryTimeout("query abandoned before it started")
+        conn = self.pool.acquire()
+        try:
+            return call(conn)
+        finally:
+            # 归还时回滚未提交的事务; 调用方已超时放弃时连接可能还有未读完的结果, 不再复用
+            self.pool.release(conn, discard=call.abandoned)
+
+    def _submit(self, call):
+        return self._executor.submit(self._work, call)
+
+    def _on_timeout(self, call: _Call):
+        thread_id = getattr(call.conn, "thread_id", None)
+        if thread_id is None:
+            return
+        # 建立连接需要网络往返, 不能在事件循环线程中进行
+        threading.Thread(
+            target=self._kill_query, args=(thread_id(),), name="db-kill-query", daemon=True
+        ).start()
+
+    def _kill_query(self, thread_id: int):
+        """用一个不属于连接池的新连接中止服务器上仍在执行的查询。"""
+        # 尽力而为: 失败时查询仍会在结束后随连接一起被丢弃
+        with contextlib.suppress(Exception):
+            conn = self.pool.connector()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"KILL QUERY {int(thread_id)}")
+                cursor.close()
+            finally:
+                conn.close()
+
+    async def close(self):
+        executor = self._executor
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown, True)
+        self.pool.close()
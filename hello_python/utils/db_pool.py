@@ -0,0 +1,308 @@
+"""
+DB Pool Module: a thread-safe pool of DB-API connections.
+
+Opening a MySQL connection costs a TCP round trip plus authentication; the pool keeps
+connections open and hands them out again. Connections are checked on checkout
+(``ping(reconnect=True)`` for PyMySQL, ``SELECT 1`` for other drivers), recycled after
+``max_lifetime`` seconds and closed after ``max_idle`` seconds unused, while at least
+``min_size`` connections stay open. Expiry is checked whenever a connection is taken or
+returned, so the pool needs no background thread.
+
+Example::
+
+    pool = ConnectionPool(mysql_connector(**DB_CONFIG), min_size=1, max_size=10)
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT VERSION()")
+
+The connector is any zero-argument callable returning a new connection; tests and the
+self-contained samples use :func:`sqlite_connector` instead of a MySQL server.
+"""
+
+import contextlib
+import functools
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+import pymysql
+
+Connector = Callable[[], Any]
+
+
+class PoolError(Exception):
+    """连接池已关闭等错误。"""
+
+
+class PoolTimeout(PoolError):
+    """在超时时间内没有可用连接。"""
+
+
+def mysql_connector(**config) -> Connector:
+    """创建 PyMySQL 连接的工厂, 参数同 ``pymysql.connect``。"""
+    return functools.partial(pymysql.connect, **config)
+
+
+def sqlite_connector(database: str, **kwargs) -> Connector:
+    """
+    创建 SQLite 连接的工厂, 用于测试或没有 MySQL 服务器时替代。
+
+    连接会在不同线程间复用, 因此关闭 ``check_same_thread``; 连接池保证同一时间只有一个线程使用它。
+    """
+    kwargs.setdefault("check_same_thread", False)
+    return functools.partial(sqlite3.connect, database, **kwargs)
+
+
+def ping_connection(conn) -> None:
+    """检查连接是否可用, 不可用时抛出异常。"""
+    ping = getattr(conn, "ping", None)
+    if ping is not None:
+        # PyMySQL: 连接已断开时重新连接
+        ping(reconnect=True)
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _close_quietly(conn):
+    with contextlib.suppress(Exception):
+        conn.close()
+
+
+@dataclass
+class _Entry:
+    conn: Any
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """
+    线程安全的数据库连接池。
+
+    Args:
+        connector: 无参函数, 返回一个新的 DB-API 连接。
+        min_size: 创建时打开并在空闲回收后保留的连接数。
+        max_size: 最多同时打开的连接数。
+        timeout: 所有连接都在使用中时, ``acquire`` 等待的最长秒数。
+        max_idle: 空闲超过这么多秒的连接被关闭 (保留 ``min_size`` 个), ``None`` 表示不回收。
+        max_lifetime: 连接创建超过这么多秒后不再复用, ``None`` 表示不限制。
+        ping: 取出连接时的健康检查, 抛出异常表示连接不可用。
+    """
+
+    def __init__(
+        self,
+        connector: Connector,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        ping: Optional[Callable[[Any], None]] = ping_connection,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("need 0 <= min_size <= max_size and max_size >= 1")
+        self.connector = connector
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping = ping
+        self._lock = threading.Condition()
+        # 空闲连接, 最近归还的在右端 (后进先出, 让多余的连接自然空闲到期)
+        self._idle: Deque[_Entry] = deque()
+        # 借出的连接 -> 记录, 按 id 索引 (连接对象不一定可哈希)
+        self._in_use: Dict[int, _Entry] = {}
+        # 已打开 (空闲 + 借出) 及正在创建的连接数
+        self._size = 0
+        self._closed = False
+        self.connections_created = 0
+        try:
+            for _ in range(min_size):
+                self._size += 1
+                self._idle.append(self._create())
+        except BaseException:
+            self.close()
+            raise
+
+    # --- 内部工具 ---
+
+    def _create(self) -> _Entry:
+        try:
+            entry = _Entry(self.connector())
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self.connections_created += 1
+        return entry
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.max_lifetime is not None and now - entry.created >= self.max_lifetime
+
+    def _evict_locked(self, now: float) -> list:
+        """取出需要关闭的空闲连接 (调用方持有锁, 在锁外关闭)。"""
+        evicted = []
+        keep: Deque[_Entry] = deque()
+        # 从最久未使用的一端开始检查
+        while self._idle:
+            entry = self._idle.popleft()
+            idle_too_long = (
+                self.max_idle is not None
+                and now - entry.last_used >= self.max_idle
+                and self._size - len(evicted) > self.min_size
+            )
+            if idle_too_long or self._expired(entry, now):
+                evicted.append(entry)
+            else:
+                keep.append(entry)
+        self._idle = keep
+        self._size -= len(evicted)
+        return evicted
+
+    # --- 公共接口 ---
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        取出一个健康的连接, 用完后必须 :meth:`release`。
+
+        Raises:
+            PoolTimeout: 超时仍没有可用连接。
+            PoolError: 连接池已关闭。
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = None
+            evicted = []
+            try:
+                with self._lock:
+                    while True:
+                        if self._closed:
+                            raise PoolError("connection pool is closed")
+                        evicted += self._evict_locked(time.monotonic())
+                        if self._idle:
+                            entry = self._idle.pop()
+                            break
+                        if self._size < self.max_size:
+                            # 先占位, 在锁外建立连接
+                            self._size += 1
+                            break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise PoolTimeout(
+                                f"no connection available within {timeout}s "
+                                f"(max_size={self.max_size})"
+                            )
+                        self._lock.wait(remaining)
+            finally:
+                # 过期的空闲连接在锁外关闭
+                for old in evicted:
+                    _close_quietly(old.conn)
+
+            if entry is None:
+                entry = self._create()
+            elif self.ping is not None:
+                try:
+                    self.ping(entry.conn)
+                except Exception:
+                    # 连接已失效, 关闭后重新取
+                    _close_quietly(entry.conn)
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    continue
+            with self._lock:
+                self._in_use[id(entry.conn)] = entry
+            return entry.conn
+
+    def release(self, conn: Any, discard: bool = False):
+        """
+        归还连接; ``discard=True`` 或连接已超过最长寿命时直接关闭。
+
+        归还前回滚未提交的事务 (PyMySQL 默认关闭 autocommit), 下一个借用者不会看到
+        上一个借用者未提交的修改; 回滚失败的连接状态未知, 直接关闭。
+        """
+        with self._lock:
+            if id(conn) not in self._in_use:
+                raise PoolError("connection does not belong to this pool")
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        now = time.monotonic()
+        with self._lock:
+            entry = self._in_use.pop(id(conn))
+            close = discard or self._closed or self._expired(entry, now)
+            if close:
+                self._size -= 1
+                evicted = []
+            else:
+                # 其他空闲连接也在归还时回收, 不必等到下一次 acquire
+                evicted = self._evict_locked(now)
+                entry.last_used = now
+                self._idle.append(entry)
+            self._lock.notify(1 + len(evicted))
+        if close:
+            _close_quietly(conn)
+        for old in evicted:
+            _close_quietly(old.conn)
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        借出一个连接的上下文管理器。
+
+        是否提交由调用方决定, 退出时未提交的事务 (包括出现异常时) 都在归还时回滚。
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def evict_idle(self) -> int:
+        """立即关闭空闲超时或超过寿命的连接, 返回关闭的数量。"""
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+            self._lock.notify_all()
+        for entry in evicted:
+            _close_quietly(entry.conn)
+        return len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+                "created": self.connections_created,
+            }
+
+    def close(self):
+        """关闭空闲连接; 借出的连接在归还时关闭。"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for entry in idle:
+            _close_quietly(entry.conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,122 @@
+"""
+DB Stream Module: iterate query results in chunks instead of ``fetchall()``.
+
+``fetchall()`` materializes the whole result set in Python objects. The helpers here
+execute a query and yield ``fetchmany(chunk_size)`` chunks, so memory is bounded by
+the chunk size. For PyMySQL connections an unbuffered server-side cursor
+(``pymysql.cursors.SSCursor``) is used, otherwise the client library would still read
+the complete result into memory on ``execute``. Any DB-API connection works (sqlite3
+cursors already step through the result lazily).
+
+Chunks can be returned as lists of tuples, NumPy structured arrays or pandas
+DataFrames::
+
+    for frame in iter_dataframes(conn, "SELECT * FROM employees", chunk_size=100_000):
+        print(frame["salary"].mean())
+
+With an unbuffered cursor the connection is busy until the result has been read to
+the end: finish (or close) the iterator before running another query on it.
+"""
+
+from contextlib import closing
+from typing import Any, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pymysql
+import pymysql.cursors
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def streaming_cursor(conn):
+    """返回逐块读取结果的游标: PyMySQL 使用 SSCursor, 其他 DB-API 连接使用普通游标。"""
+    if isinstance(conn, pymysql.connections.Connection):
+        return conn.cursor(pymysql.cursors.SSCursor)
+    return conn.cursor()
+
+
+def column_names(cursor) -> List[str]:
+    return [column[0] for column in cursor.description or ()]
+
+
+def _execute(cursor, sql: str, params: Optional[Sequence[Any]]):
+    # pymysql 在传入参数时才做 % 格式化, 没有参数时不传, 避免 SQL 中的 % 被误解析
+    if params is None:
+        cursor.execute(sql)
+    else:
+        cursor.execute(sql, params)
+
+
+def _chunks(cursor, chunk_size: int) -> Iterator[list]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield list(rows)
+
+
+def iter_chunks(
+    conn, sql: str, params: Optional[Sequence[Any]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[tuple]]:
+    """
+    执行查询, 每次产出最多 ``chunk_size`` 行 (元组列表)。
+
+    Args:
+        conn: DB-API 连接 (sqlite3, pymysql ...)。
+        sql: 查询语句, 占位符按驱动的 paramstyle 书写。
+        params: 查询参数。
+        chunk_size: 每块的行数, 即 ``fetchmany`` 的大小。
+    """
+    with closing(streaming_cursor(conn)) as cursor:
+        _execute(cursor, sql, params)
+        yield from _chunks(cursor, chunk_size)
+
+
+def iter_rows(
+    conn, sql: str, params: Optional[Sequence[Any]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple]:
+    """逐行产出查询结果, 内部仍按 ``chunk_size`` 分块读取。"""
+    for chunk in iter_chunks(conn, sql, params, chunk_size):
+        yield from chunk
+
+
+def iter_arrays(
+    conn,
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: Optional[np.dtype] = None,
+) -> Iterator[np.ndarray]:
+    """
+    按块产出 NumPy 结构化数组, 字段名为查询的列名。
+
+    不指定 ``dtype`` 时每块单独推断类型 (字符串长度可能各块不同);
+    需要各块类型一致 (如拼接结果) 时请传入 ``dtype``。
+    """
+    with closing(streaming_cursor(conn)) as cursor:
+        _execute(cursor, sql, params)
+        names = column_names(cursor)
+        for chunk in _chunks(cursor, chunk_size):
+            if dtype is not None:
+                yield np.array(chunk, dtype=dtype)
+            else:
+                yield np.rec.fromrecords(chunk, names=names).view(np.ndarray)
+
+
+def iter_dataframes(
+    conn,
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator["pandas.DataFrame"]:  # noqa: F821
+    """按块产出 pandas DataFrame, 列名为查询的列名。"""
+    # pandas 导入较慢, 只在需要时导入
+    import pandas as pd
+
+    with closing(streaming_cursor(conn)) as cursor:
+        _execute(cursor, sql, params)
+        names = column_names(cursor)
+        for chunk in _chunks(cursor, chunk_size):
+            yield pd.DataFrame.from_records(chunk, columns=names)
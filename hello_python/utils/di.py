@@ -0,0 +1,289 @@
+"""
+DI Module: compiled resolution plans on top of an ``injector.Injector``.
+
+``Injector.get`` redoes the same work on every call for unscoped types: it looks up the
+binding and the scope, reads the ``@inject`` signature of the constructor, takes the
+global injector lock and recurses into ``get`` for every dependency. For a request
+handler that builds a graph of a few dozen objects, this bookkeeping costs far more than
+constructing the objects.
+
+:class:`CompiledInjector` resolves a type through ``Injector`` bindings once and compiles
+it into a flat closure (a *plan*), then caches the plan per type:
+
+* classes are called directly with the plans of their ``@inject`` parameters;
+  a class without injected parameters becomes the class itself;
+* ``@provider`` methods and other callables are called with their parameters' plans;
+* instance bindings and singletons become constants, the singleton is still created
+  (once) by the injector so both APIs share the same instance;
+* request-scoped bindings look up the current request's instance and build it on a miss;
+* other scopes and special providers (``ProviderOf``, multibindings...) fall back to
+  ``Injector.get``.
+
+Plans are built from the bindings present at compile time; call :meth:`invalidate` after
+changing bindings on the injector.
+
+:class:`RequestScope` (decorator :data:`request_scope`) is an injector scope with one
+instance per request. :func:`request_context` opens a request: scoped objects are created
+lazily on first use, shared for the rest of the request, and released when it ends, calling
+``close()`` on those that have one. The open request lives in a :mod:`contextvars` variable,
+so it follows the request into its tasks and ``run_in_threadpool`` calls.
+:class:`RequestScopeMiddleware` opens one for every HTTP and WebSocket request of an ASGI
+app. Compiled plans resolve request-scoped bindings with a single dict lookup.
+
+Example::
+
+    container = CompiledInjector(Injector([MyServiceModule()]))
+    service = container.get(ServiceB)  # 第一次: 编译并缓存解析计划
+    service = container.get(ServiceB)  # 之后: 直接调用缓存的闭包
+
+    with request_context():
+        session = container.get(DbSession)  # 本次请求内共享, 结束时调用 close()
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from injector import (
+    CallableProvider,
+    CircularDependency,
+    ClassProvider,
+    Error,
+    Injector,
+    InstanceProvider,
+    NoScope,
+    Provider,
+    Scope,
+    ScopeDecorator,
+    SingletonScope,
+    get_bindings,
+)
+
+T = TypeVar("T")
+
+Plan = Callable[[], Any]
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# 当前请求的实例缓存, 键为 (RequestScope 实例, 接口); 不在请求中时为 None
+_request_instances: contextvars.ContextVar[Optional[Dict[Tuple[Scope, Any], Any]]] = (
+    contextvars.ContextVar("request_instances", default=None)
+)
+
+
+class ScopeError(Error):
+    """在请求之外获取了请求作用域的对象。"""
+
+
+def _request_cache(key: Any) -> Dict[Tuple[Scope, Any], Any]:
+    cache = _request_instances.get()
+    if cache is None:
+        raise ScopeError(f"{key!r} is request scoped, but no request is active")
+    return cache
+
+
+def _release(cache: Dict[Tuple[Scope, Any], Any]):
+    for instance in reversed(cache.values()):
+        close = getattr(instance, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                logger.exception("Failed to close request scoped %r", instance)
+    cache.clear()
+
+
+@contextlib.contextmanager
+def request_context() -> Iterator[Dict[Tuple[Scope, Any], Any]]:
+    """
+    开启一个请求作用域。
+
+    作用域内第一次获取的请求级对象被缓存到退出为止; 退出时按创建的逆序调用它们的
+    ``close()`` (如果有), 单个对象关闭失败只记录日志。
+    """
+    cache: Dict[Tuple[Scope, Any], Any] = {}
+    token = _request_instances.set(cache)
+    try:
+        yield cache
+    finally:
+        _request_instances.reset(token)
+        _release(cache)
+
+
+class RequestScope(Scope):
+    """每个请求一个实例的 injector 作用域, 请求由 :func:`request_context` 开启。"""
+
+    def get(self, key: Type[T], provider: Provider[T]) -> Provider[T]:
+        cache = _request_cache(key)
+        try:
+            return InstanceProvider(cache[self, key])
+        except KeyError:
+            instance = cache[self, key] = provider.get(self.injector)
+            return InstanceProvider(instance)
+
+
+request_scope = ScopeDecorator(RequestScope)
+
+
+class RequestScopeMiddleware:
+    """为每个 HTTP / WebSocket 请求开启 :func:`request_context` 的 ASGI 中间件。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        # 与 request_context 相同, 省去生成器上下文管理器的开销;
+        # 响应发送完 (包括流式响应) 后才退出, 请求级对象在此时释放
+        cache = {}
+        token = _request_instances.set(cache)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_instances.reset(token)
+            if cache:
+                _release(cache)
+
+
+def _call_with(func: Callable, deps: List[Tuple[str, Plan]]) -> Plan:
+    """把 ``func`` 和依赖的计划组合成一个无参闭包。"""
+    if not deps:
+        return func
+    if len(deps) == 1:
+        ((name, plan),) = deps
+
+        def call_one():
+            return func(**{name: plan()})
+
+        return call_one
+    if len(deps) == 2:
+        (name1, plan1), (name2, plan2) = deps
+
+        def call_two():
+            return func(**{name1: plan1(), name2: plan2()})
+
+        return call_two
+    deps = tuple(deps)
+
+    def call():
+        return func(**{name: plan() for name, plan in deps})
+
+    return call
+
+
+def _constant(value: Any) -> Plan:
+    def constant():
+        return value
+
+    return constant
+
+
+class CompiledInjector:
+    """
+    在 ``injector.Injector`` 之上缓存每个类型的解析计划。
+
+    Args:
+        injector: 提供绑定的 injector, 单例和无法编译的绑定仍由它创建。
+    """
+
+    def __init__(self, injector: Injector):
+        self.injector = injector
+        self._plans: Dict[Any, Plan] = {}
+        self._lock = threading.RLock()
+        self._compiling: List[Any] = []
+
+    def get(self, interface: Type[T]) -> T:
+        """获取 ``interface`` 的实例, 第一次调用时编译并缓存它的解析计划。"""
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self.plan(interface)
+        return plan()
+
+    def plan(self, interface: Any) -> Plan:
+        """``interface`` 的解析计划: 每次调用返回一个实例的无参函数。"""
+        plan = self._plans.get(interface)
+        if plan is not None:
+            return plan
+        with self._lock:
+            plan = self._plans.get(interface)
+            if plan is None:
+                if interface in self._compiling:
+                    chain = " -> ".join(map(repr, [*self._compiling, interface]))
+                    raise CircularDependency(f"circular dependency detected: {chain}")
+                self._compiling.append(interface)
+                try:
+                    plan = self._compile(interface)
+                finally:
+                    self._compiling.pop()
+                self._plans[interface] = plan
+            return plan
+
+    def invalidate(self):
+        """丢弃所有已编译的计划, 修改绑定之后调用。"""
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def _compile(self, interface: Any) -> Plan:
+        binding, binder = self.injector.binder.get_binding(interface)
+        scope = binding.scope
+        if isinstance(scope, ScopeDecorator):
+            scope = scope.scope
+        provider = binding.provider
+
+        if isinstance(provider, InstanceProvider):
+            return _constant(provider.get(self.injector))
+        if scope is SingletonScope:
+            # 由 injector 创建, 与 Injector.get 返回同一个实例
+            return _constant(self.injector.get(interface))
+        build = self._compile_provider(provider)
+        if build is None:
+            return functools.partial(self.injector.get, interface)
+        if scope is NoScope:
+            return build
+        if scope is RequestScope:
+            # 与 RequestScope.get 使用同一个键, 两种方式在请求内得到同一个实例
+            scope_binding, _ = binder.get_binding(RequestScope)
+            key = (scope_binding.provider.get(self.injector), interface)
+            return self._compile_request_scoped(key, build)
+        return functools.partial(self.injector.get, interface)
+
+    def _compile_provider(self, provider: Provider) -> Optional[Plan]:
+        # ClassProvider / CallableProvider 没有公开被包装的类和函数, 只能读私有属性;
+        # injector 改名后这些属性不存在, 返回 None 退回 Injector.get
+        if type(provider) is ClassProvider:
+            cls = getattr(provider, "_cls", None)
+            return None if cls is None else self._compile_call(cls, cls.__init__)
+        if type(provider) is CallableProvider:
+            func = getattr(provider, "_callable", None)
+            return None if func is None else self._compile_call(func, func)
+        return None
+
+    def _compile_call(self, func: Callable, signature_of: Callable) -> Plan:
+        deps = [(name, self.plan(dep)) for name, dep in get_bindings(signature_of).items()]
+        return _call_with(func, deps)
+
+    @staticmethod
+    def _compile_request_scoped(key: Tuple[Scope, Any], build: Plan) -> Plan:
+        get_cache = _request_instances.get
+
+        def scoped():
+            cache = get_cache()
+            if cache is None:
+                cache = _request_cache(key[1])
+            # 每个请求第一次获取时必然未命中, 不用 try/except KeyError (异常代价高)
+            instance = cache.get(key, _MISSING)
+            if instance is _MISSING:
+                instance = cache[key] = build()
+            return instance
+
+        return scoped
@@ -0,0 +1,217 @@
+"""
+JSON Lines Module: streaming reader/writer for large datasets in bounded memory.
+
+Each line of a JSONL file is one JSON document, so a file can be processed record by
+record no matter how large it is. Files ending in ``.gz`` are (de)compressed on the fly.
+
+Example::
+
+    with JSONLWriter("data/products.jsonl.gz") as writer:
+        for product in products:
+            writer.write(product)
+
+    for product in read_jsonl("data/products.jsonl.gz"):
+        ...
+
+:func:`iter_json_array` / :func:`write_json_array` stream a regular (pretty printed)
+JSON array the same way, which is what :func:`convert` uses to translate between the
+two formats.
+"""
+
+import gzip
+import io
+import json
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+import ujson
+
+# 读写缓冲区大小
+BUFFER_SIZE = 1 << 20
+
+# JSON 数组中单个元素的最大字符数, 解析不出的元素最多向后读这么多就报错
+MAX_ELEMENT_SIZE = 64 << 20
+
+
+def is_gzip(path: str) -> bool:
+    return path.endswith(".gz")
+
+
+def open_binary(path: str, mode: str = "rb", compresslevel: int = 6) -> BinaryIO:
+    """以二进制方式打开文件, ``.gz`` 结尾的文件透明地压缩/解压。"""
+    if is_gzip(path):
+        return gzip.open(path, mode, compresslevel=compresslevel)
+    return open(path, mode, buffering=BUFFER_SIZE)
+
+
+def read_jsonl(path: str) -> Iterator[Any]:
+    """
+    逐行读取 JSONL 文件, 用 ujson 解码并逐条产出, 空行被跳过。
+
+    Raises:
+        ValueError: 某一行不是合法 JSON, 消息中包含文件名和行号。
+    """
+    with open_binary(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield ujson.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON line: {e}") from e
+
+
+class JSONLWriter:
+    """
+    缓冲的批量 JSONL 写入器。
+
+    记录先编码为字节放入缓冲区, 每 ``batch_size`` 条用一次 ``write`` 写入文件。
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, compresslevel: int = 6):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._file = open_binary(path, "wb", compresslevel)
+        self._batch = []
+
+    def write(self, record: Any):
+        self._batch.append(ujson.dumps(record, ensure_ascii=False).encode("utf-8"))
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Any]):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._batch:
+            self._batch.append(b"")
+            self._file.write(b"\n".join(self._batch))
+            self._batch.clear()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_jsonl(path: str, records: Iterable[Any], **options) -> int:
+    """把 ``records`` 写入 JSONL 文件, 返回写入的记录数。"""
+    with JSONLWriter(path, **options) as writer:
+        writer.write_many(records)
+    return writer.count
+
+
+def iter_json_array(
+    path: str, chunk_size: int = 1 << 16, max_element_size: int = MAX_ELEMENT_SIZE
+) -> Iterator[Any]:
+    """
+    流式解析顶层为数组的 JSON 文件, 逐个产出数组元素。
+
+    每次只在内存中保留一个数据块和当前正在解析的元素, 内存占用与文件大小无关。
+    元素超过 ``max_element_size`` 个字符仍解析不出时 (通常是格式错误) 抛出 ValueError,
+    而不是把文件剩余部分都读入内存。
+    """
+    decoder = json.JSONDecoder()
+    with open_binary(path) as raw:
+        f = io.TextIOWrapper(raw, encoding="utf-8")
+        # consumed: 已丢弃的字符数, 加上 pos 即在文件中的字符偏移
+        buffer, pos, eof, consumed = "", 0, False, 0
+
+        def fill():
+            # 丢弃已解析的部分, 再读入一个数据块
+            nonlocal buffer, pos, eof, consumed
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            consumed += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+        expect_value = True
+        first = True
+        while True:
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError(f"{path}: unexpected end of file")
+            char = buffer[pos]
+            if char == "]" and (first or not expect_value):
+                return
+            if not expect_value:
+                if char != ",":
+                    raise ValueError(f"{path}: expected ',' or ']' but found {char!r}")
+                pos += 1
+                expect_value = True
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                end = None
+            # 元素可能被数据块截断 (数字恰好在块末尾也可能是不完整的), 读入更多数据后重试
+            if (end is None or end == len(buffer)) and not eof:
+                if len(buffer) - pos > max_element_size:
+                    raise ValueError(
+                        f"{path}: invalid JSON array element at offset {consumed + pos} "
+                        f"(not parsed within {max_element_size} characters)"
+                    )
+                fill()
+                continue
+            if end is None:
+                raise ValueError(
+                    f"{path}: invalid JSON array element at offset {consumed + pos}"
+                )
+            yield value
+            pos = end
+            expect_value = False
+            first = False
+
+
+def write_json_array(path: str, records: Iterable[Any], indent: Optional[int] = 2) -> int:
+    """流式写出 JSON 数组 (可带缩进), 返回写入的元素数。"""
+    count = 0
+    with open_binary(path, "wb") as raw:
+        with io.TextIOWrapper(raw, encoding="utf-8") as f:
+            f.write("[")
+            for record in records:
+                text = json.dumps(record, ensure_ascii=False, indent=indent)
+                if indent is not None:
+                    text = "\n" + " " * indent + text.replace("\n", "\n" + " " * indent)
+                f.write(("," if count else "") + text)
+                count += 1
+            f.write("\n]\n" if indent is not None and count else "]\n")
+    return count
+
+
+def is_jsonl(path: str) -> bool:
+    name = path[:-3] if is_gzip(path) else path
+    return name.endswith((".jsonl", ".ndjson"))
+
+
+def convert(source: str, target: str, indent: Optional[int] = 2) -> int:
+    """
+    在 JSON 数组与 JSONL 之间转换, 格式由文件扩展名决定
+    (``.jsonl``/``.ndjson`` 为 JSONL, 其他为 JSON; 可再加 ``.gz``)。返回转换的记录数。
+    """
+    records = read_jsonl(source) if is_jsonl(source) else iter_json_array(source)
+    if is_jsonl(target):
+        return write_jsonl(target, records)
+    return write_json_array(target, records, indent=indent)
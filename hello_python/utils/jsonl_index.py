@@ -0,0 +1,317 @@
+"""
+JSONL Index Module: random access by key into large JSON Lines files.
+
+One pass over the data file records, for every line, a 64-bit hash of the key field
+and the line's byte offset. The pairs are kept sorted by hash in a compact NumPy
+sidecar file (16 bytes per record). A lookup binary-searches the hashes, then decodes
+only the matching line(s) from a memory-mapped view of the data file.
+
+When the data file has been appended to, only the new bytes are scanned and merged into
+the index; if it was rewritten or truncated the index is rebuilt. A file whose size,
+mtime and inode match the index is trusted as is; otherwise the indexed part must still
+start and end with the same bytes (hashes of the head and of the last indexed line). An
+edit in the middle that passes these checks is caught when a lookup cannot decode the
+line at an indexed offset, which rebuilds the index.
+
+Example::
+
+    with JSONLIndex("data/products.jsonl", key="name") as index:
+        product = index.get("辽宁串红小番茄")
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import ujson
+
+from hello_python.utils.jsonl import is_gzip
+
+INDEX_VERSION = 2
+INDEX_DTYPE = np.dtype([("hash", "<u8"), ("offset", "<u8")])
+
+# 用已索引部分开头和结尾各这么多字节的摘要判断数据文件是否被改写
+FINGERPRINT_BYTES = 4096
+# 归并时每次从已有索引读入的条目数
+MERGE_CHUNK = 1 << 20
+
+
+def key_hash(value: Any) -> int:
+    """键值的 64 位哈希, 与 Python 进程无关 (不受 PYTHONHASHSEED 影响)。"""
+    data = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+    digest = hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class JSONLIndex:
+    """
+    JSONL 文件按键字段的偏移量索引。
+
+    索引保存在 ``<path>.<key>.idx.npy`` (哈希与偏移量) 和 ``<path>.<key>.idx.json``
+    (已索引的字节数与文件指纹) 中, 打开时自动创建或增量更新。
+    """
+
+    def __init__(self, path: str, key: str = "name", index_path: Optional[str] = None):
+        if is_gzip(path):
+            raise ValueError("random access needs an uncompressed JSONL file")
+        self.path = path
+        self.key = key
+        self.index_path = index_path or f"{path}.{key}.idx.npy"
+        self.meta_path = self.index_path[: -len(".npy")] + ".json"
+        self.entries = np.empty(0, dtype=INDEX_DTYPE)
+        self.indexed_size = 0
+        self._saved_fingerprint = ""
+        self._saved_tail = ""
+        # 建立索引时数据文件的 size / mtime_ns / inode
+        self._saved_stat: Dict[str, int] = {}
+        # 最近一次 refresh 扫描的字节数
+        self.scanned_bytes = 0
+        self._file = None
+        self._mmap = None
+        self.refresh()
+
+    # --- 索引维护 ---
+
+    def _fingerprint(self, size: int) -> str:
+        with open(self.path, "rb") as f:
+            return hashlib.blake2b(f.read(min(size, FINGERPRINT_BYTES))).hexdigest()
+
+    def _tail_fingerprint(self, size: int) -> str:
+        """``size`` 之前最后一行 (最多 ``FINGERPRINT_BYTES`` 字节) 的摘要。"""
+        start = max(0, size - FINGERPRINT_BYTES)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(size - start)
+        # 只保留最后一个完整行, 不含它之前的换行符
+        line_start = data.rfind(b"\n", 0, len(data) - 1) + 1
+        return hashlib.blake2b(data[line_start:]).hexdigest()
+
+    @staticmethod
+    def _stat(st: os.stat_result) -> Dict[str, int]:
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+    def _load(self) -> bool:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION or meta.get("key") != self.key:
+                return False
+            entries = np.load(self.index_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+        if entries.dtype != INDEX_DTYPE or len(entries) != meta["records"]:
+            return False
+        self.entries = entries
+        self.indexed_size = meta["indexed_size"]
+        self._saved_fingerprint = meta["fingerprint"]
+        self._saved_tail = meta["tail_fingerprint"]
+        self._saved_stat = meta["stat"]
+        return True
+
+    def _is_valid_prefix(self, st: os.stat_result) -> bool:
+        """已索引部分是否仍是数据文件的前缀 (文件只被追加过)。"""
+        if st.st_size < self.indexed_size or st.st_ino != self._saved_stat.get("inode"):
+            return False
+        if self._stat(st) == self._saved_stat:
+            return True  # 建立索引之后没有被修改过
+        if self.indexed_size == 0:
+            return True
+        if self._fingerprint(self.indexed_size) != self._saved_fingerprint:
+            return False
+        if self._tail_fingerprint(self.indexed_size) != self._saved_tail:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(self.indexed_size - 1)
+            return f.read(1) == b"\n"
+
+    def _scan(self, start: int, size: int):
+        """扫描 ``[start, size)`` 中的完整行, 返回新条目和扫描到的位置。"""
+        hashes, offsets = [], []
+        position = start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            while position < size:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break  # 最后一行还没写完, 下次再索引
+                offset, position = position, position + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    value = ujson.loads(line).get(self.key)
+                except (ValueError, AttributeError):
+                    continue
+                if value is not None:
+                    hashes.append(key_hash(value))
+                    offsets.append(offset)
+        entries = np.empty(len(hashes), dtype=INDEX_DTYPE)
+        entries["hash"] = hashes
+        entries["offset"] = offsets
+        return entries, position
+
+    def _merge(self, new_entries) -> str:
+        """
+        把新条目归并进已排序的索引, 写入临时文件并返回其路径。
+
+        只对新条目排序; 已有条目按块从 mmap 读出后直接写到新文件中的最终位置,
+        索引不必整个读入内存。
+        """
+        # 稳定排序: 相同哈希的条目保持文件顺序
+        new_entries = new_entries[np.argsort(new_entries["hash"], kind="stable")]
+        new_hashes = new_entries["hash"]
+        old = self.entries
+        tmp_path = f"{self.index_path}.tmp.npy"
+        merged = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=INDEX_DTYPE, shape=(len(old) + len(new_entries),)
+        )
+        # 相同哈希的新条目排在已有条目之后: 新条目 j 前面有 (哈希 <= 它的已有条目数) + j 个条目
+        positions = np.searchsorted(old["hash"], new_hashes, side="right")
+        merged[positions + np.arange(len(new_entries))] = new_entries
+        for start in range(0, len(old), MERGE_CHUNK):
+            chunk = np.asarray(old[start : start + MERGE_CHUNK])
+            # 已有条目 i 前面多出 (哈希 < 它的新条目数) 个条目
+            shift = np.searchsorted(new_hashes, chunk["hash"], side="left")
+            merged[start + np.arange(len(chunk)) + shift] = chunk
+        merged.flush()
+        del merged
+        return tmp_path
+
+    def _save(self, tmp_path: str):
+        os.replace(tmp_path, self.index_path)
+        # 重新以 mmap 方式打开, 索引本身也不必整个读入内存
+        self.entries = np.load(self.index_path, mmap_mode="r")
+        self._save_meta()
+
+    def _save_meta(self):
+        meta = {
+            "version": INDEX_VERSION,
+            "key": self.key,
+            "records": len(self.entries),
+            "indexed_size": self.indexed_size,
+            "fingerprint": self._saved_fingerprint,
+            "tail_fingerprint": self._saved_tail,
+            "stat": self._saved_stat,
+        }
+        tmp_meta = f"{self.meta_path}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self.meta_path)
+
+    def refresh(self) -> int:
+        """
+        让索引跟上数据文件: 只扫描追加的部分, 文件被重写时完整重建。
+
+        Returns:
+            新增的索引条目数。
+        """
+        st = os.stat(self.path)
+        size = st.st_size
+        if not (self._load() and self._is_valid_prefix(st)):
+            self.entries = np.empty(0, dtype=INDEX_DTYPE)
+            self.indexed_size = 0
+        start = self.indexed_size
+        self.scanned_bytes = 0
+        if size > start or not os.path.exists(self.index_path):
+            new_entries, self.indexed_size = self._scan(start, size)
+            self.scanned_bytes = self.indexed_size - start
+            tmp_path = self._merge(new_entries)
+            self._saved_fingerprint = self._fingerprint(self.indexed_size)
+            self._saved_tail = self._tail_fingerprint(self.indexed_size)
+            self._saved_stat = self._stat(st)
+            self._save(tmp_path)
+            self._reopen()
+            return len(new_entries)
+        if self._stat(st) != self._saved_stat:
+            # 内容没变 (比如只是 touch 过), 记下新的 stat, 下次不必再算摘要
+            self._saved_stat = self._stat(st)
+            self._save_meta()
+        self._reopen()
+        return 0
+
+    def rebuild(self) -> int:
+        """丢弃现有索引并完整重建, 返回索引条目数。"""
+        for path in (self.index_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return self.refresh()
+
+    # --- 查找 ---
+
+    def _reopen(self):
+        self._close_mmap()
+        self._file = open(self.path, "rb")
+        if self.indexed_size:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), self.indexed_size, access=mmap.ACCESS_READ
+            )
+
+    def _read_line(self, offset: int) -> Dict:
+        end = self._mmap.find(b"\n", offset)
+        return ujson.loads(self._mmap[offset:end])
+
+    def _lookup(self, value: Any, target: int) -> Optional[List[Dict]]:
+        """按索引读出键等于 ``value`` 的记录; 偏移处不是索引时的那一行则返回 None。"""
+        hashes = self.entries["hash"]
+        left = int(np.searchsorted(hashes, np.uint64(target), side="left"))
+        right = int(np.searchsorted(hashes, np.uint64(target), side="right"))
+        records = []
+        for offset in self.entries["offset"][left:right]:
+            try:
+                record = self._read_line(int(offset))
+                record_value = record.get(self.key)
+            except (ValueError, AttributeError):
+                return None
+            if record_value is None or key_hash(record_value) != target:
+                return None
+            # 哈希碰撞时校验真实的键值
+            if record_value == value:
+                records.append(record)
+        return records
+
+    def get_all(self, value: Any) -> List[Dict]:
+        """
+        键等于 ``value`` 的所有记录, 按文件中的顺序。
+
+        数据文件在已索引的范围内被原地改写 (stat 和首尾摘要都没能发现) 时,
+        索引的偏移处读不出对应的记录, 此时重建索引后再查一次。
+        """
+        if self._mmap is None:
+            return []
+        target = key_hash(value)
+        records = self._lookup(value, target)
+        if records is None:
+            self.rebuild()
+            records = self._lookup(value, target) if self._mmap is not None else []
+        return records or []
+
+    def get(self, value: Any, default: Any = None) -> Any:
+        """键等于 ``value`` 的最后一条记录 (追加的新记录覆盖旧记录)。"""
+        records = self.get_all(value)
+        return records[-1] if records else default
+
+    def __contains__(self, value: Any) -> bool:
+        return bool(self.get_all(value))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_mmap()
+        self.entries = np.empty(0, dtype=INDEX_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,310 @@
+"""
+Log Pipeline Module: non-blocking logging through a queue and a background writer.
+
+Loggers only enqueue records via :class:`logging.handlers.QueueHandler`; a single
+:class:`BufferedLogWriter` thread formats them, writes them to the log file in batches
+and rotates the file by size and/or age. The event loop never waits on a disk write.
+
+The queue may be a :func:`multiprocessing.Queue`, so several worker processes can log
+through one writer running in the supervisor (see :func:`install_queue_handler`).
+
+The queue is bounded: when the writer falls behind, new records are dropped and counted
+(:attr:`DroppingQueueHandler.dropped`) instead of growing memory without limit. A failed
+write (full disk, closed stream) is reported on stderr like ``logging.Handler.handleError``
+does, and the writer reopens the file for the next batch instead of dying.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import Iterable, List, Optional
+
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Uvicorn 的日志记录器, 交给根记录器处理而不是各自输出到 stdout/stderr
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# 停止写线程的哨兵
+_STOP = None
+
+# 队列最多缓冲的日志记录数, 写线程跟不上时丢弃新记录
+DEFAULT_MAX_QUEUED = 10_000
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """队列已满时丢弃记录并计数的 :class:`~logging.handlers.QueueHandler`。"""
+
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BufferedLogWriter(threading.Thread):
+    """
+    Background thread draining a queue of log records into a rotating file.
+
+    Blocks for the first record, then takes up to ``batch_size`` more without waiting
+    and writes them with a single ``write`` call. Under load records are batched, when
+    idle each record is written right away.
+    """
+
+    def __init__(
+        self,
+        record_queue,
+        filename: str,
+        formatter: Optional[logging.Formatter] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        rotate_interval: Optional[float] = None,
+        batch_size: int = 512,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            record_queue: queue the :class:`QueueHandler` puts records into.
+            filename: log file path.
+            formatter: formatter for the file, defaults to :data:`DEFAULT_FORMAT`.
+            max_bytes: rotate when the file grows beyond this size, 0 disables it.
+            backup_count: number of rotated files (``file.1`` ... ``file.N``) to keep.
+            rotate_interval: rotate when the file is older than this many seconds.
+            batch_size: maximum number of records per write.
+            poll_interval: how often to check time-based rotation while idle.
+        """
+        super().__init__(name="BufferedLogWriter", daemon=True)
+        self.queue = record_queue
+        self.filename = os.path.abspath(filename)
+        self.formatter = formatter or logging.Formatter(DEFAULT_FORMAT)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_interval = rotate_interval
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._stream = None
+        self._opened_at = 0.0
+        self.records_written = 0
+        self.batches_written = 0
+        # 写入失败的批次数
+        self.errors = 0
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self._stream = open(self.filename, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        if self.rotate_interval and os.path.getsize(self.filename) > 0:
+            # 续写已有文件时, 以文件修改时间作为计时起点
+            self._opened_at = os.path.getmtime(self.filename)
+
+    def _should_rotate(self) -> bool:
+        if self.max_bytes and self._stream.tell() >= self.max_bytes:
+            return True
+        if self.rotate_interval and time.time() - self._opened_at >= self.rotate_interval:
+            return self._stream.tell() > 0
+        return False
+
+    def rotate(self):
+        """Shift ``file.N-1`` -> ``file.N`` ... ``file`` -> ``file.1`` and reopen."""
+        self._stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.filename}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.filename}.{index + 1}")
+            os.replace(self.filename, f"{self.filename}.1")
+        else:
+            os.truncate(self.filename, 0)
+        self._open()
+
+    def _drain(self, first) -> List[logging.LogRecord]:
+        records = [first]
+        while len(records) < self.batch_size:
+            try:
+                records.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    def _handle_error(self):
+        """
+        报告写入失败并丢弃当前文件句柄, 下一批记录重新打开文件。
+
+        与 ``logging.Handler.handleError`` 一样, 只在 ``logging.raiseExceptions`` 时输出到 stderr。
+        """
+        self.errors += 1
+        if logging.raiseExceptions and sys.stderr:
+            sys.stderr.write("--- Logging error in BufferedLogWriter ---\n")
+            traceback.print_exc(file=sys.stderr)
+        self._close()
+
+    def _close(self):
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+    def _write(self, records: List[logging.LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(f"<unformattable log record {record!r}>")
+        self._stream.write("\n".join(lines) + "\n")
+        self._stream.flush()
+        self.records_written += len(lines)
+        self.batches_written += 1
+
+    def _process(self, records: Optional[List[logging.LogRecord]]):
+        """写入一批记录 (``None`` 表示空闲时检查轮转), 任何异常都不会结束写线程。"""
+        try:
+            if self._stream is None:
+                self._open()
+            # 先轮转再写入, 按时间轮转时这批记录落在新文件中
+            if self._should_rotate():
+                self.rotate()
+            if records:
+                self._write(records)
+        except Exception:
+            self._handle_error()
+
+    def run(self):
+        try:
+            self._open()
+        except Exception:
+            self._handle_error()
+        try:
+            stopping = False
+            while not stopping:
+                try:
+                    first = self.queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    self._process(None)
+                    continue
+                if first is _STOP:
+                    break
+                records = self._drain(first)
+                if _STOP in records:
+                    records = records[: records.index(_STOP)]
+                    stopping = True
+                if records:
+                    self._process(records)
+        finally:
+            self._close()
+
+    def stop(self, timeout: float = 5.0):
+        """Write the records still queued, then stop the thread."""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self.join(timeout)
+
+
+class LogPipeline:
+    """
+    Route logging through a queue into a :class:`BufferedLogWriter`.
+
+    Example::
+
+        pipeline = LogPipeline("service.log", max_bytes=50 * 1024 * 1024)
+        pipeline.start()
+        pipeline.install()  # root and uvicorn loggers now only enqueue
+        ...
+        pipeline.stop()
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        level: int = logging.INFO,
+        fmt: str = DEFAULT_FORMAT,
+        record_queue=None,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        **writer_options,
+    ):
+        self.level = level
+        self.queue = record_queue if record_queue is not None else queue.Queue(max_queued)
+        self.writer = BufferedLogWriter(
+            self.queue, filename, logging.Formatter(fmt), **writer_options
+        )
+        self.handler: Optional[DroppingQueueHandler] = None
+        self._installed: List[tuple] = []
+
+    @property
+    def dropped(self) -> int:
+        """队列已满时被丢弃的记录数 (本进程)。"""
+        return self.handler.dropped if self.handler else 0
+
+    def start(self):
+        self.writer.start()
+        return self
+
+    def install(self, route: Iterable[str] = UVICORN_LOGGERS):
+        """
+        Replace the root handlers with a queue handler and route ``route`` loggers to it.
+
+        The previous handlers are kept and restored by :meth:`uninstall`.
+        """
+        for name in ("", *route):
+            logger = logging.getLogger(name or None)
+            self._installed.append((logger, logger.handlers[:], logger.level, logger.propagate))
+        self.handler = install_queue_handler(self.queue, self.level, route)
+
+    def uninstall(self):
+        for logger, handlers, level, propagate in reversed(self._installed):
+            logger.handlers[:] = handlers
+            logger.setLevel(level)
+            logger.propagate = propagate
+        self._installed.clear()
+
+    def stop(self):
+        """Restore the previous handlers and flush everything still queued."""
+        self.uninstall()
+        self.writer.stop()
+
+
+def install_queue_handler(
+    record_queue, level: int = logging.INFO, route: Iterable[str] = UVICORN_LOGGERS
+) -> DroppingQueueHandler:
+    """
+    Make the root logger only enqueue records, and let ``route`` loggers propagate to it.
+
+    Used directly in worker processes, where ``record_queue`` is a multiprocessing
+    queue drained by the supervisor's writer. Create that queue bounded
+    (``Queue(DEFAULT_MAX_QUEUED)``) so records are dropped rather than piling up.
+    """
+    handler = DroppingQueueHandler(record_queue)
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    for name in route:
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+    return handler
+
+
+def flush_queue(record_queue):
+    """
+    Wait until a multiprocessing queue has handed every record to the pipe.
+
+    ``multiprocessing.Queue.put`` only buffers; call this before a worker process exits
+    (especially when it is about to be terminated by a signal) so no record is lost.
+    The queue can not be used afterwards.
+    """
+    if hasattr(record_queue, "join_thread"):
+        record_queue.close()
+        record_queue.join_thread()
@@ -0,0 +1,218 @@
+"""
+Loop Monitor Module: find synchronous code that stalls an asyncio event loop.
+
+:class:`LoopMonitor` runs up to three probes on a loop:
+
+* a ticker task that sleeps ``interval`` seconds and records how late each wakeup is
+  (``event_loop_lag_seconds`` histogram in a :class:`MetricsRegistry`);
+* a watchdog thread that pings the loop with ``call_soon_threadsafe``. When a ping is
+  not answered within half the ``slow_callback`` threshold, the loop is stuck in a
+  callback right now, so the watchdog samples the loop thread's stack. A ping answered
+  later than the threshold counts as a slow callback
+  (``event_loop_slow_callbacks_total``); the most recent ones are kept with the stack
+  sample, which shows the line that blocked;
+* with ``debug=True`` only: asyncio debug mode with ``slow_callback_duration`` set to
+  ``slow_callback``. asyncio then logs every callback or task step that ran longer and
+  these log records replace the watchdog's, adding the name of the task to the stack.
+
+Debug mode makes every task and callback much slower, so it is off by default and meant
+for development. ``slow_callback=0`` keeps only the lag histogram.
+
+Example::
+
+    monitor = LoopMonitor(registry, interval=0.5, slow_callback=0.1)
+    monitor.start()
+    ...
+    for record in monitor.slow_callbacks():
+        print(record["callback"], record["seconds"], *record["stack"], sep="\\n")
+    await monitor.stop()
+"""
+
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from hello_python.utils.metrics import MetricsRegistry
+
+LAG_METRIC = "event_loop_lag_seconds"
+SLOW_CALLBACKS_METRIC = "event_loop_slow_callbacks_total"
+
+# 没有调试模式时, 看门狗发现的慢回调不知道回调名称, 记录为这个名字
+WATCHDOG_CALLBACK = "<event loop blocked>"
+
+# asyncio 在 BaseEventLoop._run_once 中记录慢回调时使用的消息
+_SLOW_CALLBACK_MSG = "Executing %s took %.3f seconds"
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """接收 asyncio 记录器的慢回调警告, 交给所属的 monitor。"""
+
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__(logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        if record.msg == _SLOW_CALLBACK_MSG and len(record.args or ()) == 2:
+            # 在事件循环线程中调用, 可以直接更新 registry
+            if threading.get_ident() == self.monitor._thread_id:
+                self.monitor._record_slow_callback(str(record.args[0]), record.args[1])
+
+
+class LoopMonitor:
+    """
+    事件循环延迟与慢回调监控。
+
+    Args:
+        registry: 写入指标的 registry, 默认新建一个。
+        interval: 测量延迟的间隔 (秒)。
+        slow_callback: 慢回调阈值 (秒), 0 表示不检测慢回调 (不启动看门狗线程)。
+        debug: 是否开启 asyncio 调试模式, 慢回调记录中会带上 task 名称; 开销很大,
+            只建议在开发时使用。
+        max_records: 保留的最近慢回调数。
+        stack_depth: 每个堆栈样本保留的栈帧数 (最内层)。
+    """
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        interval: float = 0.5,
+        slow_callback: float = 0.1,
+        debug: bool = False,
+        max_records: int = 20,
+        stack_depth: int = 12,
+    ):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self.debug = debug and slow_callback > 0
+        self.stack_depth = stack_depth
+        self.max_lag = 0.0
+        self._records = collections.deque(maxlen=max_records)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._handler = _SlowCallbackHandler(self)
+        self._saved_debug = None
+        self._stack: Optional[Tuple[float, List[str]]] = None
+        self.registry.describe(LAG_METRIC, "Event loop wakeup delay in seconds.")
+        self.registry.describe(
+            SLOW_CALLBACKS_METRIC, "Callbacks that blocked the event loop past the threshold."
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        """在事件循环中启动监控 (必须在循环线程中调用)。"""
+        if self.running:
+            return
+        loop = self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        if self.debug:
+            self._saved_debug = (loop.get_debug(), loop.slow_callback_duration)
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback
+            logging.getLogger("asyncio").addHandler(self._handler)
+        if self.slow_callback > 0:
+            self._stopping.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-monitor-watchdog", daemon=True
+            )
+            self._watchdog.start()
+        self._task = loop.create_task(self._measure_lag())
+
+    async def stop(self):
+        """停止监控并恢复事件循环原来的调试设置。"""
+        if not self.running:
+            return
+        task, self._task = self._task, None
+        self._stopping.set()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+        if self._saved_debug is not None:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._loop.set_debug(self._saved_debug[0])
+            self._loop.slow_callback_duration = self._saved_debug[1]
+            self._saved_debug = None
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self.max_lag = max(self.max_lag, lag)
+            self.registry.observe(LAG_METRIC, lag)
+
+    def _watch(self):
+        """
+        看门狗线程: 循环在阈值的一半内没有响应时, 采样循环线程的当前堆栈。
+
+        没有开启调试模式时, 响应晚于阈值的 ping 由看门狗自己记为慢回调。
+        """
+        answered = threading.Event()
+        answered_at: List[float] = []
+
+        def answer():
+            answered_at.append(time.monotonic())
+            answered.set()
+
+        patience = self.slow_callback / 2
+        while not self._stopping.is_set():
+            answered.clear()
+            answered_at.clear()
+            sent = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(answer)
+            except RuntimeError:  # 循环已关闭
+                return
+            sampled = False
+            while not answered.wait(patience / 4):
+                if self._stopping.is_set():
+                    return
+                if not sampled and time.monotonic() - sent >= patience:
+                    self._stack = (time.monotonic(), self._sample_stack())
+                    sampled = True
+            blocked = answered_at[0] - sent
+            if not self.debug and blocked >= self.slow_callback:
+                self._record_slow_callback(WATCHDOG_CALLBACK, blocked)
+            self._stopping.wait(patience / 2)
+
+    def _sample_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return []
+        frames = traceback.extract_stack(frame)[-self.stack_depth :]
+        return [
+            f"{f.filename}:{f.lineno} in {f.name}" + (f": {f.line}" if f.line else "")
+            for f in frames
+        ]
+
+    def _record_slow_callback(self, callback: str, seconds: float):
+        sample, self._stack = self._stack, None
+        # 只采用这次阻塞期间采到的样本, 更早的样本属于没有超过阈值的短暂阻塞
+        stack = sample[1] if sample and time.monotonic() - sample[0] <= seconds else []
+        self.registry.inc(SLOW_CALLBACKS_METRIC)
+        self._records.append(
+            {
+                "time": time.time(),
+                "callback": callback,
+                "seconds": seconds,
+                "stack": stack,
+            }
+        )
+
+    def slow_callbacks(self) -> List[Dict[str, Any]]:
+        """最近的慢回调, 由旧到新; 每条包含 callback、耗时 seconds 和阻塞时的 stack。"""
+        return list(self._records)
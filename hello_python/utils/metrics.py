@@ -0,0 +1,284 @@
+"""
+Metrics Module: per-worker counters, gauges and histograms with Prometheus text output.
+
+Each worker process owns one :class:`MetricsRegistry`. It is only updated from the
+worker's event loop thread, so updates are plain dict/list operations without locks.
+Workers periodically write a JSON snapshot into a shared directory (one file per PID),
+and :func:`collect` merges the snapshots so any worker can serve the aggregated view.
+"""
+
+import bisect
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psutil
+
+# 环境变量: 多进程共享的指标快照目录
+METRICS_DIR_ENV = "HELLO_METRICS_DIR"
+
+# 默认的延迟直方图桶 (秒)
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+
+class Histogram:
+    """Fixed-bucket histogram, buckets are upper bounds (the +Inf bucket is implicit)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def observe_many(self, values: Sequence[float]):
+        """Observe many values at once: sort them, then one bisect per bucket bound."""
+        values = sorted(values)
+        start = 0
+        for index, bound in enumerate(self.buckets):
+            end = bisect.bisect_right(values, bound, start)
+            self.counts[index] += end - start
+            start = end
+        self.counts[-1] += len(values) - start
+        self.sum += sum(values)
+        self.count += len(values)
+
+    def merge(self, other: "Histogram"):
+        if other.buckets != self.buckets:
+            raise ValueError("cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile by linear interpolation inside the bucket, like
+        Prometheus ``histogram_quantile``. Returns NaN for an empty histogram.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count > 0:
+                if index == len(self.buckets):
+                    # 落在 +Inf 桶, 只能返回最大的有限上界
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict:
+        return {"buckets": self.buckets, "counts": self.counts, "sum": self.sum}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls(data["buckets"])
+        histogram.counts = list(data["counts"])
+        histogram.sum = data["sum"]
+        histogram.count = sum(histogram.counts)
+        return histogram
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of one worker, keyed by name and labels.
+
+    Not thread-safe by design: update it from a single thread (the event loop).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.help: Dict[str, str] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def describe(self, name: str, help_text: str):
+        self.help[name] = help_text
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def gauge_add(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        series = self.gauges.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def gauge_set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        if (histogram := series.get(key)) is None:
+            histogram = series[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def snapshot(self) -> dict:
+        """A JSON serializable copy of all series."""
+
+        def series(metrics, encode=lambda v: v):
+            return {
+                name: [[list(map(list, key)), encode(value)] for key, value in values.items()]
+                for name, values in metrics.items()
+            }
+
+        return {
+            "help": dict(self.help),
+            "counters": series(self.counters),
+            "gauges": series(self.gauges),
+            "histograms": series(self.histograms, Histogram.to_dict),
+        }
+
+    def merge_snapshot(self, snapshot: dict, include_gauges: bool = True):
+        """Add another worker's snapshot into this registry."""
+        self.help.update(snapshot.get("help", {}))
+        for name, values in snapshot.get("counters", {}).items():
+            for key, value in values:
+                self.inc(name, dict(key), value)
+        if include_gauges:
+            for name, values in snapshot.get("gauges", {}).items():
+                for key, value in values:
+                    self.gauge_add(name, dict(key), value)
+        for name, values in snapshot.get("histograms", {}).items():
+            series = self.histograms.setdefault(name, {})
+            for key, data in values:
+                histogram = Histogram.from_dict(data)
+                label_key = _labels(dict(key))
+                if label_key in series:
+                    series[label_key].merge(histogram)
+                else:
+                    series[label_key] = histogram
+
+    def write_snapshot(self, directory: str, pid: Optional[int] = None):
+        """Atomically write this worker's snapshot to ``<directory>/<pid>.json``."""
+        write_snapshot(self.snapshot(), directory, pid)
+
+
+def write_snapshot(snapshot: dict, directory: str, pid: Optional[int] = None):
+    """
+    Atomically write a snapshot taken with :meth:`MetricsRegistry.snapshot`.
+
+    Take the snapshot on the thread that updates the registry, the file write itself
+    can then run anywhere (e.g. in a thread pool).
+    """
+    pid = pid or os.getpid()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{pid}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def read_snapshots(directory: str) -> Dict[int, dict]:
+    """Read every worker snapshot in ``directory``, keyed by PID; unreadable files are skipped."""
+    snapshots = {}
+    if not os.path.isdir(directory):
+        return snapshots
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            pid = int(filename[:-5])
+        except (OSError, ValueError):
+            continue
+        snapshots[pid] = snapshot
+    return snapshots
+
+
+def collect(directory: str) -> MetricsRegistry:
+    """
+    Merge the snapshots of every worker in ``directory``.
+
+    Counters and histograms of exited workers are kept so totals never go backwards
+    after a worker restart; gauges are only taken from live workers.
+    """
+    merged = MetricsRegistry()
+    for pid, snapshot in read_snapshots(directory).items():
+        merged.merge_snapshot(snapshot, include_gauges=psutil.pid_exists(pid))
+    return merged
+
+
+def _format_labels(key: Iterable[Tuple[str, str]], extra: Optional[Tuple[str, str]] = None):
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    # Prometheus 文本格式的特殊值写作 NaN / +Inf / -Inf
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(registry: MetricsRegistry) -> str:
+    """Render the registry in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+
+    def header(name, kind):
+        if name in registry.help:
+            lines.append(f"# HELP {name} {registry.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, series in sorted(registry.counters.items()):
+        header(name, "counter")
+        for key, value in sorted(series.items()):
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    for name, series in sorted(registry.gauges.items()):
+        header(name, "gauge")
+        for key, value in sorted(series.items()):
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    for name, series in sorted(registry.histograms.items()):
+        header(name, "histogram")
+        for key, histogram in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+            lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+    return "\n".join(lines) + "\n"
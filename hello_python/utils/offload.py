@@ -0,0 +1,154 @@
+"""
+Offload Module: run CPU-bound work in a process pool from async code.
+
+A CPU-bound loop inside ``async def`` stalls the event loop for its whole duration, and
+``run_in_executor`` with a thread pool does not help much: the worker thread holds the
+GIL, so the loop only gets to run at each switch interval. Offloading to processes
+frees the loop completely.
+
+Starting worker processes is expensive (``spawn`` re-imports the modules in every
+worker), so this module keeps one long-lived :class:`ProcessPoolExecutor` per process,
+created on first use and shut down at exit; call :func:`warm_up` at startup so the first
+request does not pay for it.
+
+* :func:`offload` runs one call in the pool and awaits the result.
+* :func:`offload_map` splits an iterable into chunks, runs ``func`` over each chunk in
+  the pool (one round trip per chunk, not per item) with a bounded number of chunks in
+  flight, and returns the results in input order.
+
+Functions and arguments are pickled to the workers, so they must be defined at module
+level (no lambdas or closures).
+
+Example::
+
+    warm_up()
+    total = await offload(sum, range(10_000_000))
+    squares = await offload_map(math.isqrt, numbers, chunk_size=10_000)
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    返回共享的进程池, 第一次调用时创建。
+
+    使用 ``spawn`` 启动工作进程: 在已有线程 (如 Uvicorn、线程池) 的进程中 fork 并不安全。
+    ``max_workers`` 只在创建时生效, 默认为 CPU 核数。
+    """
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None:
+            _pool_workers = max_workers or default_workers()
+            _pool = ProcessPoolExecutor(
+                _pool_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_pool(wait: bool = True):
+    """关闭共享的进程池, 之后的调用会重新创建。"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _ready(delay: float) -> int:
+    # 稍作停留, 让预热任务分散到不同的工作进程
+    time.sleep(delay)
+    return os.getpid()
+
+
+def warm_up(max_workers: Optional[int] = None, delay: float = 0.05) -> Set[int]:
+    """启动共享进程池的工作进程并等待它们就绪, 返回工作进程的 pid。"""
+    pool = get_pool(max_workers)
+    futures = [pool.submit(_ready, delay) for _ in range(_pool_workers)]
+    return {future.result() for future in futures}
+
+
+async def offload(
+    func: Callable[..., Any],
+    *args: Any,
+    pool: Optional[ProcessPoolExecutor] = None,
+    **kwargs: Any,
+) -> Any:
+    """在进程池中执行 ``func(*args, **kwargs)``, 等待期间事件循环照常运行。"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(pool or get_pool(), call)
+
+
+def _apply(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [func(item) for item in chunk]
+
+
+def _chunked(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def offload_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    chunk_size: int = 1,
+    pool: Optional[ProcessPoolExecutor] = None,
+    max_pending: Optional[int] = None,
+) -> List[Any]:
+    """
+    在进程池中对每个输入调用 ``func(item)``, 按输入顺序返回结果。
+
+    Args:
+        func: 模块级函数, 会被 pickle 到工作进程。
+        items: 输入, 按需读取, 每 ``chunk_size`` 个一组提交。
+        chunk_size: 每组的输入数, 单次调用很快时调大以减少进程间往返。
+        pool: 使用的进程池, 默认为共享进程池。
+        max_pending: 同时在途的组数上限, 默认为工作进程数的 2 倍。
+    """
+    pool = pool or get_pool()
+    loop = asyncio.get_running_loop()
+    max_pending = max_pending or 2 * (_pool_workers or default_workers())
+    results: Dict[int, List[Any]] = {}
+    pending: Dict[asyncio.Future, int] = {}
+
+    async def collect(return_when):
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        for future in done:
+            results[pending.pop(future)] = future.result()
+
+    try:
+        for index, chunk in enumerate(_chunked(items, chunk_size)):
+            if len(pending) >= max_pending:
+                await collect(asyncio.FIRST_COMPLETED)
+            pending[loop.run_in_executor(pool, _apply, func, chunk)] = index
+        if pending:
+            await collect(asyncio.ALL_COMPLETED)
+    finally:
+        # 出错或被取消时, 尚未开始的组不再执行
+        for future in pending:
+            future.cancel()
+    return [value for index in sorted(results) for value in results[index]]
@@ -0,0 +1,453 @@
+"""
+Profiling Module: timers, cProfile/tracemalloc and a sampling profiler behind one switch.
+
+* :func:`timed` is a decorator (sync or async functions) and a context manager. Each
+  call is observed into a per-name :class:`~hello_python.utils.metrics.Histogram` in
+  :data:`timings`, with power-of-two buckets from 1 µs to about 67 s. While timing is
+  disabled (the default) a decorated call costs one global lookup and a branch; call
+  :func:`enable_timing` or run a :class:`ProfileSession` with the ``timing`` mode.
+* :class:`SamplingProfiler` is a daemon thread that snapshots the stacks of all other
+  threads every ``interval`` seconds (``sys._current_frames``) and counts identical
+  stacks. :meth:`SamplingProfiler.dump` writes them in the collapsed format
+  (``thread;outer;inner count`` per line) read by ``flamegraph.pl`` and speedscope. It
+  measures wall clock time, so threads blocked in I/O or locks show up as well.
+* :class:`ProfileSession` starts any of :data:`MODES` together and, when stopped, prints
+  the reports and writes ``hello-<pid>.prof`` (cProfile), ``hello-<pid>.tracemalloc``
+  and ``hello-<pid>.collapsed`` into the output directory.
+
+The modes come from the ``HELLO_PROFILE`` environment variable (:func:`env_modes`), e.g.
+``HELLO_PROFILE=cprofile,tracemalloc``; ``1`` means :data:`DEFAULT_MODES` and ``all``
+every mode. The output directory comes from ``HELLO_PROFILE_DIR`` (default: the current
+directory). ``hello --profile <command>`` wraps a CLI command in a session.
+
+Example::
+
+    @timed
+    def load(path): ...
+
+    with ProfileSession(["timing", "sample"]):
+        with timed("warm up"):
+            ...
+        load("data.jsonl")
+"""
+
+import collections
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from hello_python.utils.metrics import Histogram
+
+# 环境变量: 开启的模式和输出目录
+PROFILE_ENV = "HELLO_PROFILE"
+PROFILE_DIR_ENV = "HELLO_PROFILE_DIR"
+
+MODES = ("timing", "cprofile", "tracemalloc", "sample")
+DEFAULT_MODES = ("timing", "cprofile")
+
+# 1 µs 到约 67 s, 每个桶是上一个的 2 倍
+TIMER_BUCKETS = tuple(1e-6 * 2**i for i in range(27))
+
+# 缓冲这么多个观测值后汇总一次
+FLUSH_AT = 4096
+
+DEFAULT_INTERVAL = 0.005
+
+
+class TimingRegistry:
+    """
+    Per-name timing histograms plus the slowest call of each name.
+
+    Timed code may run in any thread, so :meth:`observe` takes no lock: it appends to a
+    per-name list (``list.append`` is atomic). :meth:`flush` folds the buffered values
+    into the histograms in bulk under a lock, every ``flush_at`` values of a name and
+    before reading. It takes the first ``n`` values with one slice and deletes them with
+    one ``del``, so values appended meanwhile stay for the next flush.
+    """
+
+    def __init__(self, buckets: Sequence[float] = TIMER_BUCKETS, flush_at: int = FLUSH_AT):
+        self.buckets = tuple(buckets)
+        self.flush_at = flush_at
+        self.histograms: Dict[str, Histogram] = {}
+        self.max: Dict[str, float] = {}
+        self._pending: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        if (values := self._pending.get(name)) is None:
+            values = self._pending.setdefault(name, [])
+        values.append(seconds)
+        if len(values) >= self.flush_at:
+            self.flush()
+
+    def flush(self):
+        """把缓冲的观测值汇总进直方图。"""
+        with self._lock:
+            for name, values in list(self._pending.items()):
+                if not (count := len(values)):
+                    continue
+                batch = values[:count]
+                del values[:count]
+                if (histogram := self.histograms.get(name)) is None:
+                    histogram = self.histograms[name] = Histogram(self.buckets)
+                histogram.observe_many(batch)
+                self.max[name] = max(self.max.get(name, 0.0), max(batch))
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self.histograms.clear()
+            self.max.clear()
+
+    def rows(self) -> List[Dict]:
+        """每个名字一行, 按总耗时降序; 分位数是桶内插值的估计值。"""
+        self.flush()
+        with self._lock:
+            items = [(name, h, self.max[name]) for name, h in self.histograms.items()]
+        rows = [
+            {
+                "name": name,
+                "calls": histogram.count,
+                "total ms": histogram.sum * 1e3,
+                "mean us": histogram.sum / histogram.count * 1e6,
+                "p50 us": histogram.quantile(0.5) * 1e6,
+                "p99 us": histogram.quantile(0.99) * 1e6,
+                "max us": slowest * 1e6,
+            }
+            for name, histogram, slowest in items
+        ]
+        return sorted(rows, key=lambda row: row["total ms"], reverse=True)
+
+
+timings = TimingRegistry()
+_timing_enabled = False
+
+
+def enable_timing():
+    global _timing_enabled
+    _timing_enabled = True
+
+
+def disable_timing():
+    global _timing_enabled
+    _timing_enabled = False
+
+
+def timing_enabled() -> bool:
+    return _timing_enabled
+
+
+class Timer:
+    """
+    The object returned by :func:`timed`: a decorator and a reentrant context manager.
+
+    As a context manager, use one instance from one thread at a time (``with
+    timed("name"):`` creates a fresh one each time anyway).
+    """
+
+    __slots__ = ("name", "registry", "_starts")
+
+    def __init__(self, name: Optional[str] = None, registry: Optional[TimingRegistry] = None):
+        self.name = name
+        self.registry = registry or timings
+        self._starts: List[Optional[float]] = []
+
+    def __enter__(self) -> "Timer":
+        if self.name is None:
+            raise TypeError("timed() needs a name when used as a context manager")
+        self._starts.append(time.perf_counter() if _timing_enabled else None)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        started = self._starts.pop()
+        if started is not None:
+            self.registry.observe(self.name, time.perf_counter() - started)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name or f"{func.__module__}.{func.__qualname__}"
+        observe = self.registry.observe
+        perf_counter = time.perf_counter
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _timing_enabled:
+                    return await func(*args, **kwargs)
+                started = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(name, perf_counter() - started)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _timing_enabled:
+                return func(*args, **kwargs)
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, perf_counter() - started)
+
+        return wrapper
+
+
+def timed(name=None, registry: Optional[TimingRegistry] = None):
+    """
+    计时装饰器或上下文管理器, 结果记入 ``registry`` (默认 :data:`timings`)。
+
+    ``@timed`` 和 ``@timed()`` 使用函数的完整名字, ``@timed("name")`` 和
+    ``with timed("name"):`` 使用给定的名字。只在计时开启时记录。
+    """
+    if callable(name):
+        return Timer(None, registry)(name)
+    return Timer(name, registry)
+
+
+def _frame_label(code) -> str:
+    # 折叠格式用 ";" 分隔栈帧, 用最后一个空格分隔次数, 标签里不能有这两种字符
+    label = f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+    return label.replace(";", "_").replace(" ", "_")
+
+
+class SamplingProfiler:
+    """
+    A background thread that samples the stacks of all other threads.
+
+    Stacks are counted as tuples of code objects while sampling, and only turned into
+    text by :meth:`collapsed`, so one sample costs a walk over the frames and a dict
+    update per thread.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Dict[Tuple[str, Tuple], int] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hello-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=own)
+
+    def sample(self, skip: Optional[int] = None):
+        """采样一次所有线程 (``skip`` 除外) 的调用栈。"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            self.stacks[names.get(ident, str(ident)), tuple(codes)] += 1
+        self.samples += 1
+
+    def collapsed(self) -> List[str]:
+        """折叠格式的调用栈, 每行 ``thread;outer;...;inner count``, 按次数降序。"""
+        labels: Dict[object, str] = {}
+        lines: Dict[str, int] = collections.Counter()
+        for (thread, codes), count in self.stacks.items():
+            frames = [thread.replace(";", "_").replace(" ", "_")]
+            for code in codes:
+                if (label := labels.get(code)) is None:
+                    label = labels[code] = _frame_label(code)
+                frames.append(label)
+            lines[";".join(frames)] += count
+        return [f"{stack} {count}" for stack, count in lines.most_common()]
+
+    def dump(self, path: str) -> int:
+        """把折叠格式写入 ``path``, 返回行数。"""
+        lines = self.collapsed()
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{line}\n" for line in lines)
+        return len(lines)
+
+
+def parse_modes(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    解析 ``HELLO_PROFILE`` 的值: 空、``0``、``off`` 表示关闭, ``1``、``on`` 表示
+    :data:`DEFAULT_MODES`, ``all`` 表示所有模式, 否则是逗号分隔的模式名。
+    """
+    value = (value or "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return ()
+    if value in ("1", "on", "true", "yes"):
+        return DEFAULT_MODES
+    if value == "all":
+        return MODES
+    modes = tuple(dict.fromkeys(mode.strip() for mode in value.split(",") if mode.strip()))
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise ValueError(f"unknown profile modes {sorted(unknown)}, expected {MODES}")
+    return modes
+
+
+def env_modes() -> Tuple[str, ...]:
+    """``HELLO_PROFILE`` 环境变量开启的模式。"""
+    return parse_modes(os.environ.get(PROFILE_ENV))
+
+
+class ProfileSession:
+    """
+    Run the profilers of ``modes`` between :meth:`start` and :meth:`stop`.
+
+    ``modes`` defaults to :func:`env_modes`; reports go to ``stream`` (stderr), files to
+    ``output_dir`` (``HELLO_PROFILE_DIR`` or the current directory). cProfile only sees
+    the thread that started the session, use the ``sample`` mode for the others.
+    """
+
+    def __init__(
+        self,
+        modes: Optional[Iterable[str]] = None,
+        output_dir: Optional[str] = None,
+        stream: Optional[TextIO] = None,
+        limit: int = 20,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.modes = env_modes() if modes is None else tuple(modes)
+        unknown = set(self.modes) - set(MODES)
+        if unknown:
+            raise ValueError(f"unknown profile modes {sorted(unknown)}, expected {MODES}")
+        self.output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV) or "."
+        self.stream = stream
+        self.limit = limit
+        self.sampler = SamplingProfiler(interval) if "sample" in self.modes else None
+        self.profile = None
+        self.paths: Dict[str, str] = {}
+        self._timing_was_enabled = False
+        # 由本会话开启的 tracemalloc 才由本会话关闭
+        self._started_tracemalloc = False
+
+    def path(self, suffix: str) -> str:
+        return os.path.join(self.output_dir, f"hello-{os.getpid()}.{suffix}")
+
+    def start(self) -> "ProfileSession":
+        if "timing" in self.modes:
+            self._timing_was_enabled = _timing_enabled
+            timings.reset()
+            enable_timing()
+        if "tracemalloc" in self.modes:
+            import tracemalloc
+
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+        if self.sampler is not None:
+            self.sampler.start()
+        if "cprofile" in self.modes:
+            import cProfile
+
+            # 最后开启, 最先关闭, 不把其他 profiler 的启停算进去
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self
+
+    def stop(self):
+        """停止所有 profiler, 写出文件并输出报告。"""
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        snapshot = traced = None
+        if "tracemalloc" in self.modes:
+            import tracemalloc
+
+            # 被测代码可能自己关闭了 tracemalloc, 此时没有快照可写
+            if tracemalloc.is_tracing():
+                snapshot, traced = tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        if "timing" in self.modes and not self._timing_was_enabled:
+            disable_timing()
+
+        stream = self.stream or sys.stderr
+        if self.modes:
+            os.makedirs(self.output_dir, exist_ok=True)
+        if "timing" in self.modes:
+            self._report_timing(stream)
+        if self.profile is not None:
+            self._report_cprofile(stream)
+        if snapshot is not None:
+            self._report_tracemalloc(stream, snapshot, traced)
+        elif "tracemalloc" in self.modes:
+            print("tracemalloc: tracing was stopped before the session ended", file=stream)
+        if self.sampler is not None:
+            self.paths["sample"] = self.path("collapsed")
+            lines = self.sampler.dump(self.paths["sample"])
+            print(
+                f"sample: {self.sampler.samples} samples, {lines} stacks "
+                f"written to {self.paths['sample']}",
+                file=stream,
+            )
+
+    def __enter__(self) -> "ProfileSession":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _report_timing(self, stream: TextIO):
+        from hello_python.bench import format_table
+
+        rows = timings.rows()
+        print("timing:", file=stream)
+        print(format_table(rows[: self.limit]) if rows else "no timed calls", file=stream)
+
+    def _report_cprofile(self, stream: TextIO):
+        import pstats
+
+        self.paths["cprofile"] = self.path("prof")
+        self.profile.dump_stats(self.paths["cprofile"])
+        print(f"cprofile: stats written to {self.paths['cprofile']}", file=stream)
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.limit)
+
+    def _report_tracemalloc(self, stream: TextIO, snapshot, traced: Tuple[int, int]):
+        self.paths["tracemalloc"] = self.path("tracemalloc")
+        snapshot.dump(self.paths["tracemalloc"])
+        current, peak = traced
+        print(
+            f"tracemalloc: current {current / (1 << 20):.1f} MB, "
+            f"peak {peak / (1 << 20):.1f} MB, snapshot written to {self.paths['tracemalloc']}",
+            file=stream,
+        )
+        for statistic in snapshot.statistics("lineno")[: self.limit]:
+            print(f"  {statistic}", file=stream)
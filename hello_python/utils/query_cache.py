@@ -0,0 +1,332 @@
+"""
+Query Cache Module: cache SELECT results keyed by (SQL, params).
+
+:class:`QueryCache` is an LRU cache with a time-to-live per entry and a memory budget in
+bytes (result sizes are estimated with ``sys.getsizeof``). Every entry remembers the
+tables its query read, so a write can drop exactly the results it may have changed.
+
+:class:`CachedDatabase` puts the cache in front of a DB-API connection: ``query`` serves
+repeated SELECTs from the cache, ``execute`` runs INSERT / UPDATE / DELETE, commits and
+invalidates the tables the statement writes to; when the written table cannot be
+identified (DDL, unusual syntax) the whole cache is cleared. Writes that bypass this
+layer are not seen; use a short ``ttl`` if other writers exist. Only the table named in
+the statement is invalidated, so tables changed by triggers, or the base tables behind
+an updatable view, keep stale results unless ``execute`` is given ``tables=``.
+
+Every table has a generation counter that ``invalidate`` bumps. ``query`` reads the
+counters before running the SELECT and ``put`` drops the result if any of them changed,
+so a result read just before a concurrent write is never cached after its invalidation.
+
+Statement preparation itself is already cached by the drivers (``sqlite3.connect`` keeps
+``cached_statements=128`` compiled statements per connection), so this layer only caches
+results.
+
+Example::
+
+    db = CachedDatabase(conn, QueryCache(max_bytes=32 << 20, ttl=30))
+    rows = db.query("SELECT name, salary FROM employees WHERE salary > ?", (70000,))
+    db.execute("UPDATE employees SET salary = ? WHERE name = ?", (85000, "John Doe"))
+    print(db.cache.stats())
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+MISSING = object()
+
+# 表名, 允许 schema 前缀和引号
+_NAME = r"(?:[`\"\[]?\w+[`\"\]]?\.)?[`\"\[]?\w+[`\"\]]?"
+# UPDATE 与表名之间的修饰: SQLite 的冲突处理子句, MySQL 的 LOW_PRIORITY / IGNORE
+_UPDATE = (
+    r"UPDATE(?:\s+OR\s+(?:ROLLBACK|ABORT|REPLACE|FAIL|IGNORE))?"
+    r"(?:\s+LOW_PRIORITY)?(?:\s+IGNORE)?"
+)
+# FROM / JOIN / INTO / UPDATE 后面的表名
+_TABLE_RE = re.compile(
+    rf"\b(?:FROM|JOIN|INTO|{_UPDATE})\s+({_NAME}(?:\s+(?:AS\s+)?\w+)?"
+    rf"(?:\s*,\s*{_NAME}(?:\s+(?:AS\s+)?\w+)?)*)",
+    re.IGNORECASE,
+)
+# 写语句的目标表: INSERT / REPLACE ... INTO t, UPDATE t, DELETE ... FROM t
+_TARGET_RE = re.compile(
+    rf"^\s*(?:(?:INSERT|REPLACE)\b[^;]*?\bINTO|{_UPDATE}|DELETE\b[^;]*?\bFROM)\s+({_NAME})",
+    re.IGNORECASE,
+)
+_KEYWORDS = {"select", "where", "on", "using", "set", "values", "group", "order", "limit"}
+
+
+def _table_name(item: str) -> str:
+    return item.split()[0].split(".")[-1].strip('`"[]').lower()
+
+
+def tables_in(sql: str) -> FrozenSet[str]:
+    """
+    SQL 语句涉及的表名 (小写, 去掉 schema 前缀和引号)。
+
+    识别 ``FROM a, b`` / ``JOIN`` / ``INSERT INTO`` / ``UPDATE`` 等常见写法; 子查询中的表
+    同样会被找到。无法识别的语句可以直接给 ``query``/``execute`` 传入 ``tables``。
+    """
+    tables: Set[str] = set()
+    for match in _TABLE_RE.finditer(sql):
+        for item in match.group(1).split(","):
+            name = _table_name(item)
+            if name not in _KEYWORDS:
+                tables.add(name)
+    return frozenset(tables)
+
+
+def write_target(sql: str) -> Optional[str]:
+    """INSERT / REPLACE / UPDATE / DELETE 语句写入的表名, 无法识别时返回 ``None``。"""
+    match = _TARGET_RE.match(sql)
+    if match is None:
+        return None
+    name = _table_name(match.group(1))
+    return None if name in _KEYWORDS else name
+
+
+def estimate_size(value: Any) -> int:
+    """结果集大小的估算值 (字节): 列表、元组及其元素的 ``sys.getsizeof`` 之和。"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires: float
+    tables: FrozenSet[str]
+
+
+class QueryCache:
+    """
+    线程安全的查询结果缓存: LRU + TTL + 内存上限, 可按表失效。
+
+    Args:
+        max_entries: 最多缓存的结果数。
+        max_bytes: 所有结果估算大小之和的上限, 超过的单个结果不缓存。
+        ttl: 结果的有效期 (秒), ``None`` 表示不过期。
+        clock: 时间函数, 测试时可替换。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 << 20,
+        ttl: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        # 每个表的失效次数和 clear 次数, 用来发现查询期间发生的写入
+        self._generations: Dict[str, int] = {}
+        self._clears = 0
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _remove(self, key: Hashable) -> _Entry:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+        return entry
+
+    def _generation_locked(self, tables: FrozenSet[str]) -> tuple:
+        return (self._clears, tuple(self._generations.get(table, 0) for table in sorted(tables)))
+
+    def generation(self, tables: Iterable[str]) -> tuple:
+        """这些表当前的版本, 查询前取得并传给 ``put``。"""
+        tables = frozenset(table.lower() for table in tables)
+        with self._lock:
+            return self._generation_locked(tables)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        tables: Iterable[str] = (),
+        size: Optional[int] = None,
+        generation: Optional[tuple] = None,
+    ) -> bool:
+        """
+        缓存 ``value``, 返回是否被缓存。
+
+        超过 ``max_bytes`` 的结果不缓存; 传入 ``generation`` 时, 如果这些表在那之后
+        被失效过, 结果可能已经过时, 同样不缓存。
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes or self.max_entries <= 0:
+            return False
+        expires = self.clock() + self.ttl if self.ttl is not None else float("inf")
+        tables = frozenset(table.lower() for table in tables)
+        with self._lock:
+            if generation is not None and generation != self._generation_locked(tables):
+                return False
+            if key in self._entries:
+                self._remove(key)
+            # 从最久未使用的一端淘汰, 直到放得下
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self.bytes + size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = _Entry(value, size, expires, tables)
+            self.bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+        return True
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """删除读过这些表的所有结果, 返回删除的数量。"""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+            self._clears += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+def _params_key(params) -> Hashable:
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
+
+
+class CachedDatabase:
+    """
+    带结果缓存的数据库访问层: 读走缓存, 写操作按表失效。
+
+    Args:
+        conn: DB-API 连接。
+        cache: 使用的缓存, 默认新建一个 :class:`QueryCache`。
+    """
+
+    def __init__(self, conn, cache: Optional[QueryCache] = None):
+        self.conn = conn
+        self.cache = cache if cache is not None else QueryCache()
+
+    def _run(self, sql: str, params, many: bool = False):
+        cursor = self.conn.cursor()
+        try:
+            if many:
+                cursor.executemany(sql, params)
+            elif params is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else cursor.rowcount
+        finally:
+            cursor.close()
+
+    def query(
+        self, sql: str, params=None, tables: Optional[Iterable[str]] = None
+    ) -> List[tuple]:
+        """执行只读查询, 相同的 (SQL, 参数) 在有效期内直接返回缓存的结果。"""
+        key = (sql, _params_key(params))
+        rows = self.cache.get(key)
+        if rows is MISSING:
+            tables = tables if tables is not None else tables_in(sql)
+            # 查询期间有写入使这些表失效时, 结果不放入缓存
+            generation = self.cache.generation(tables)
+            rows = self._run(sql, params)
+            self.cache.put(key, rows, tables, generation=generation)
+        # 返回副本, 调用方修改结果不会影响缓存
+        return list(rows)
+
+    def execute(
+        self, sql: str, params=None, tables: Optional[Iterable[str]] = None, commit: bool = True
+    ) -> int:
+        """
+        执行写语句 (默认提交), 使涉及的表的缓存失效, 返回受影响的行数。
+
+        写入视图或触发器会修改其他表时, 用 ``tables`` 列出实际被修改的表。
+        """
+        return self._write(sql, params, tables, commit, many=False)
+
+    def executemany(
+        self, sql: str, seq_of_params, tables: Optional[Iterable[str]] = None, commit: bool = True
+    ) -> int:
+        return self._write(sql, seq_of_params, tables, commit, many=True)
+
+    def _write(self, sql, params, tables, commit, many) -> int:
+        if tables is None:
+            tables = tables_in(sql)
+            if write_target(sql) not in tables:
+                # 无法确定写入了哪些表 (如 DDL 或不认识的写法), 清空全部缓存
+                tables = None
+        try:
+            result = self._run(sql, params, many)
+            if commit:
+                self.conn.commit()
+        finally:
+            # 失败时也失效: 部分写入可能已生效
+            if tables is None:
+                self.cache.clear()
+            else:
+                self.cache.invalidate(tables)
+        return result if isinstance(result, int) else len(result)
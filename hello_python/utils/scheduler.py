@@ -0,0 +1,480 @@
+"""
+Scheduler Module: APScheduler backed by a persistent SQLite job store.
+
+The default ``MemoryJobStore`` loses every job on restart. :class:`SQLiteJobStore` keeps
+jobs in one SQLite table (pickled job state plus an indexed ``next_run_time`` column) using
+the stdlib ``sqlite3`` module, so no SQLAlchemy is needed. Each scheduler wakeup asks the store
+for the due jobs and the next run time. Both are index range scans, so with 10k registered
+jobs a wakeup costs about the same as with 10 (see ``hello bench scheduler``).
+
+:func:`create_scheduler` wires the store into a scheduler with safe job defaults:
+
+* ``coalesce``: runs missed while the process was down, or while a slow run was still
+  executing, are collapsed into one run instead of piling up;
+* ``max_instances=1``: a job never overlaps itself, skipped runs are counted;
+* ``misfire_grace_time``: runs later than this are skipped and counted as misses.
+
+Run statistics (runs, failures, misses, skipped overlaps, last / max / total duration,
+start delay and last error) are recorded per job in a second table. The timed executors
+measure each run from submission to completion. Because the statistics live next to the
+jobs, ``hello schedule list`` can show them from another process. Under
+``AsyncIOScheduler`` the statistics are written from a worker thread, so a busy database
+never blocks the event loop.
+
+A scheduler only sleeps until the next run time it knows of, and jobs added or resumed by
+another process (``hello schedule resume``) go straight to the database. An internal job
+in a memory job store therefore wakes the scheduler every ``poll_interval`` seconds to
+look at the database again.
+
+Example::
+
+    scheduler = create_scheduler("jobs.db", AsyncIOScheduler)
+    scheduler.start()
+    scheduler.add_job(refresh_cache, "interval", minutes=5, id="refresh", replace_existing=True)
+"""
+
+import asyncio
+import collections
+import functools
+import inspect
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor as _WriterPool
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Type
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+)
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.job import Job
+from apscheduler.jobstores.base import BaseJobStore, ConflictingIdError, JobLookupError
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
+
+# 默认的任务参数: 合并积压的运行, 不重叠执行, 延迟超过 30 秒的运行视为错过
+JOB_DEFAULTS = {"coalesce": True, "max_instances": 1, "misfire_grace_time": 30}
+
+# 定期唤醒调度器的内部任务, 放在单独的内存 job store 中, 不写入数据库也不记录统计
+POLL_JOBSTORE = "poll"
+POLL_JOB_ID = "poll_job_store"
+
+STATS_COLUMNS = (
+    "runs",
+    "failures",
+    "misses",
+    "skipped",
+    "total_seconds",
+    "max_seconds",
+    "last_seconds",
+    "last_delay",
+    "last_run_at",
+    "last_error",
+)
+
+
+class SQLiteJobStore(BaseJobStore):
+    """
+    把任务保存在 SQLite 表中的 job store, 同时记录每个任务的运行统计。
+
+    一个连接由锁保护, 调度线程、执行器线程和事件循环都可以调用。
+
+    Args:
+        database: 数据库文件路径。
+        tablename: 任务表名, 统计表为 ``<tablename>_stats``。
+        pickle_protocol: 序列化任务状态使用的 pickle 协议。
+    """
+
+    def __init__(
+        self,
+        database: str,
+        tablename: str = "apscheduler_jobs",
+        pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
+    ):
+        super().__init__()
+        self.database = database
+        self.tablename = tablename
+        self.stats_table = f"{tablename}_stats"
+        self.pickle_protocol = pickle_protocol
+        self._lock = threading.Lock()
+        self._writer: Optional[_WriterPool] = None
+        # timeout: 其他进程 (如 hello schedule) 写入时等待锁释放
+        self.conn = sqlite3.connect(database, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {tablename} "
+                "(id TEXT PRIMARY KEY, next_run_time REAL, job_state BLOB NOT NULL)"
+            )
+            # 到期查询和下次运行时间都走这个索引, 不随任务总数线性增长
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{tablename}_next_run_time "
+                f"ON {tablename} (next_run_time)"
+            )
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.stats_table} (job_id TEXT PRIMARY KEY, "
+                "runs INTEGER DEFAULT 0, failures INTEGER DEFAULT 0, "
+                "misses INTEGER DEFAULT 0, skipped INTEGER DEFAULT 0, "
+                "total_seconds REAL DEFAULT 0, max_seconds REAL DEFAULT 0, "
+                "last_seconds REAL, last_delay REAL, last_run_at REAL, last_error TEXT)"
+            )
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock, self.conn:
+            return self.conn.execute(sql, params)
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        state = pickle.loads(job_state)
+        state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _get_jobs(self, where: str = "", params=()) -> List[Job]:
+        rows = self._query(
+            f"SELECT id, job_state FROM {self.tablename} {where} ORDER BY next_run_time",
+            params,
+        )
+        jobs, failed = [], []
+        for job_id, job_state in rows:
+            try:
+                jobs.append(self._reconstitute_job(job_state))
+            except BaseException:
+                self._logger.exception('Unable to restore job "%s" -- removing it', job_id)
+                failed.append((job_id,))
+        if failed:
+            with self._lock, self.conn:
+                self.conn.executemany(f"DELETE FROM {self.tablename} WHERE id = ?", failed)
+        return jobs
+
+    def lookup_job(self, job_id: str) -> Optional[Job]:
+        rows = self._query(f"SELECT job_state FROM {self.tablename} WHERE id = ?", (job_id,))
+        return self._reconstitute_job(rows[0][0]) if rows else None
+
+    def get_due_jobs(self, now: datetime) -> List[Job]:
+        return self._get_jobs("WHERE next_run_time <= ?", (datetime_to_utc_timestamp(now),))
+
+    def get_next_run_time(self) -> Optional[datetime]:
+        rows = self._query(
+            f"SELECT next_run_time FROM {self.tablename} "
+            "WHERE next_run_time IS NOT NULL ORDER BY next_run_time LIMIT 1"
+        )
+        return utc_timestamp_to_datetime(rows[0][0]) if rows else None
+
+    def get_all_jobs(self) -> List[Job]:
+        jobs = self._get_jobs()
+        self._fix_paused_jobs_sorting(jobs)
+        return jobs
+
+    def _state(self, job: Job) -> tuple:
+        return (
+            datetime_to_utc_timestamp(job.next_run_time),
+            pickle.dumps(job.__getstate__(), self.pickle_protocol),
+        )
+
+    def add_job(self, job: Job):
+        try:
+            self._execute(
+                f"INSERT INTO {self.tablename} (id, next_run_time, job_state) VALUES (?, ?, ?)",
+                (job.id, *self._state(job)),
+            )
+        except sqlite3.IntegrityError:
+            raise ConflictingIdError(job.id)
+
+    def update_job(self, job: Job):
+        cursor = self._execute(
+            f"UPDATE {self.tablename} SET next_run_time = ?, job_state = ? WHERE id = ?",
+            (*self._state(job), job.id),
+        )
+        if cursor.rowcount == 0:
+            raise JobLookupError(job.id)
+
+    def remove_job(self, job_id: str):
+        cursor = self._execute(f"DELETE FROM {self.tablename} WHERE id = ?", (job_id,))
+        if cursor.rowcount == 0:
+            raise JobLookupError(job_id)
+        self._execute(f"DELETE FROM {self.stats_table} WHERE job_id = ?", (job_id,))
+
+    def remove_all_jobs(self):
+        self._execute(f"DELETE FROM {self.tablename}")
+        self._execute(f"DELETE FROM {self.stats_table}")
+
+    @property
+    def writer(self) -> _WriterPool:
+        """在事件循环之外写入统计的单线程执行器, 第一次使用时创建。"""
+        with self._lock:
+            if self._writer is None:
+                self._writer = _WriterPool(1, thread_name_prefix="jobstore-writer")
+            return self._writer
+
+    def shutdown(self):
+        # 先写完排队中的统计, 再关闭连接
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+        self.conn.close()
+
+    # --- 运行统计 ---
+
+    def record_run(
+        self,
+        job_id: str,
+        outcome: str,
+        seconds: Optional[float] = None,
+        delay: Optional[float] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        记录一次运行结果。
+
+        Args:
+            outcome: ``"executed"``、``"failed"``、``"missed"`` (超过 misfire grace
+                time) 或 ``"skipped"`` (上一次运行尚未结束)。
+            seconds: 运行耗时。
+            delay: 实际开始时间与计划时间之差。
+            error: 失败时的异常描述。
+        """
+        ran = outcome in ("executed", "failed")
+        counts = (
+            int(ran),
+            int(outcome == "failed"),
+            int(outcome == "missed"),
+            int(outcome == "skipped"),
+        )
+        seconds = seconds or 0.0
+        self._execute(
+            f"INSERT INTO {self.stats_table} (job_id, runs, failures, misses, skipped, "
+            "total_seconds, max_seconds, last_seconds, last_delay, last_run_at, last_error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET "
+            "runs = runs + excluded.runs, failures = failures + excluded.failures, "
+            "misses = misses + excluded.misses, skipped = skipped + excluded.skipped, "
+            "total_seconds = total_seconds + excluded.total_seconds, "
+            "max_seconds = MAX(max_seconds, excluded.max_seconds), "
+            "last_seconds = COALESCE(excluded.last_seconds, last_seconds), "
+            "last_delay = COALESCE(excluded.last_delay, last_delay), "
+            "last_run_at = COALESCE(excluded.last_run_at, last_run_at), "
+            "last_error = CASE WHEN excluded.runs = 1 THEN excluded.last_error "
+            "ELSE last_error END",
+            (
+                job_id,
+                *counts,
+                seconds if ran else 0.0,
+                seconds if ran else 0.0,
+                seconds if ran else None,
+                delay if ran else None,
+                time.time() if ran else None,
+                error,
+            ),
+        )
+
+    def job_stats(self) -> Dict[str, Dict[str, Any]]:
+        """每个任务的运行统计, 另含 ``avg_seconds``。"""
+        stats = {}
+        for job_id, *values in self._query(
+            f"SELECT job_id, {', '.join(STATS_COLUMNS)} FROM {self.stats_table}"
+        ):
+            row = dict(zip(STATS_COLUMNS, values))
+            row["avg_seconds"] = row["total_seconds"] / row["runs"] if row["runs"] else None
+            stats[job_id] = row
+        return stats
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (database={self.database})>"
+
+
+class _TimedExecutorMixin:
+    """
+    记录每次提交的开始时间, 完成时把耗时 (``duration``) 和开始延迟 (``delay``) 附加到
+    执行事件上。
+
+    开始时间在真正提交之前记录, 即使任务在提交返回前就已完成也不会丢失。
+    """
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._started = collections.defaultdict(collections.deque)
+
+    def _do_submit_job(self, job, run_times):
+        started = self._started[job.id]
+        started.append((time.perf_counter(), datetime.now(timezone.utc) - run_times[-1]))
+        try:
+            super()._do_submit_job(job, run_times)
+        except BaseException:
+            started.pop()
+            raise
+
+    def _pop_started(self, job_id):
+        started = self._started.get(job_id)
+        return started.popleft() if started else (None, None)
+
+    def _run_job_success(self, job_id, events):
+        start, delay = self._pop_started(job_id)
+        ran = [e for e in events if e.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR)]
+        if start is not None and ran:
+            # 不合并时一次提交可能包含多次运行, 平均分摊
+            duration = (time.perf_counter() - start) / len(ran)
+            for event in ran:
+                event.duration = duration
+                event.delay = delay.total_seconds()
+        super()._run_job_success(job_id, events)
+
+    def _run_job_error(self, job_id, exc, traceback=None):
+        self._pop_started(job_id)
+        super()._run_job_error(job_id, exc, traceback)
+
+
+class TimedThreadPoolExecutor(_TimedExecutorMixin, ThreadPoolExecutor):
+    """记录运行耗时的线程池执行器。"""
+
+
+class TimedAsyncIOExecutor(_TimedExecutorMixin, AsyncIOExecutor):
+    """记录运行耗时的 asyncio 执行器。"""
+
+
+def _stats_listener(store: SQLiteJobStore):
+    outcomes = {
+        EVENT_JOB_EXECUTED: "executed",
+        EVENT_JOB_ERROR: "failed",
+        EVENT_JOB_MISSED: "missed",
+        EVENT_JOB_MAX_INSTANCES: "skipped",
+    }
+
+    def listener(event):
+        if event.jobstore == POLL_JOBSTORE:
+            return
+        error = getattr(event, "exception", None)
+        record = functools.partial(
+            store.record_run,
+            event.job_id,
+            outcomes[event.code],
+            seconds=getattr(event, "duration", None),
+            delay=getattr(event, "delay", None),
+            error=repr(error) if error is not None else None,
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            record()
+        else:
+            # AsyncIOScheduler 在事件循环中分发事件: SQLite 写入可能要等其他进程释放锁,
+            # 交给写线程, 不阻塞事件循环
+            loop.run_in_executor(store.writer, record)
+
+    return listener, sum(outcomes)
+
+
+def _poll():
+    """内部任务本身什么也不做, 运行前后调度器会重新读取数据库中的任务。"""
+
+
+def create_scheduler(
+    database: str,
+    scheduler_class: Type[BaseScheduler] = BackgroundScheduler,
+    job_defaults: Optional[Dict[str, Any]] = None,
+    max_workers: int = 10,
+    poll_interval: Optional[float] = 10.0,
+    **options,
+) -> BaseScheduler:
+    """
+    创建使用 :class:`SQLiteJobStore` 的调度器, 并记录每个任务的运行统计。
+
+    Args:
+        database: 任务数据库文件路径。
+        scheduler_class: 调度器类型; ``AsyncIOScheduler`` 使用 asyncio 执行器, 其他
+            使用线程池执行器。
+        job_defaults: 覆盖 :data:`JOB_DEFAULTS` 中的默认任务参数。
+        max_workers: 线程池执行器的线程数。
+        poll_interval: 至少每隔这么多秒重新读取数据库, 发现其他进程添加或恢复的任务;
+            ``None`` 表示只在已知的下次运行时间唤醒。
+        options: 传给调度器的其他参数 (如 ``timezone``)。
+    """
+    store = SQLiteJobStore(database)
+    if issubclass(scheduler_class, AsyncIOScheduler):
+        executor = TimedAsyncIOExecutor()
+    else:
+        executor = TimedThreadPoolExecutor(max_workers)
+    scheduler = scheduler_class(
+        jobstores={"default": store},
+        executors={"default": executor},
+        job_defaults={**JOB_DEFAULTS, **(job_defaults or {})},
+        **options,
+    )
+    scheduler.add_listener(*_stats_listener(store))
+    if poll_interval is not None:
+        scheduler.add_jobstore(MemoryJobStore(), POLL_JOBSTORE)
+        scheduler.add_job(
+            _poll,
+            "interval",
+            seconds=poll_interval,
+            id=POLL_JOB_ID,
+            jobstore=POLL_JOBSTORE,
+            misfire_grace_time=None,
+        )
+    return scheduler
+
+
+# --- 离线操作: 不启动调度器, 直接读写 job store (供 hello schedule 使用) ---
+
+
+def open_store(database: str) -> SQLiteJobStore:
+    store = SQLiteJobStore(database)
+    store.start(None, "default")
+    return store
+
+
+def _get_job(store: SQLiteJobStore, job_id: str) -> Job:
+    job = store.lookup_job(job_id)
+    if job is None:
+        raise JobLookupError(job_id)
+    return job
+
+
+def run_job_now(store: SQLiteJobStore, job_id: str) -> Any:
+    """在当前进程中立即运行一次任务 (不影响计划时间), 记录统计并返回结果。"""
+    job = _get_job(store, job_id)
+    started = time.perf_counter()
+    try:
+        value = job.func(*job.args, **job.kwargs)
+        if inspect.isawaitable(value):
+            value = asyncio.run(value)
+    except Exception as e:
+        store.record_run(job_id, "failed", time.perf_counter() - started, 0.0, repr(e))
+        raise
+    store.record_run(job_id, "executed", time.perf_counter() - started, 0.0)
+    return value
+
+
+def pause_job(store: SQLiteJobStore, job_id: str) -> Job:
+    """暂停任务: 清空下次运行时间。"""
+    job = _get_job(store, job_id)
+    job.next_run_time = None
+    store.update_job(job)
+    return job
+
+
+def resume_job(store: SQLiteJobStore, job_id: str) -> Job:
+    """恢复任务: 按触发器从现在起计算下次运行时间, 没有后续时间的任务被删除。"""
+    job = _get_job(store, job_id)
+    now = datetime.now(timezone.utc)
+    job.next_run_time = job.trigger.get_next_fire_time(None, now)
+    if job.next_run_time is None:
+        store.remove_job(job_id)
+    else:
+        store.update_job(job)
+    return job
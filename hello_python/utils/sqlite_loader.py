@@ -0,0 +1,176 @@
+"""
+SQLite Loader Module: bulk-load rows from an iterator into a SQLite table.
+
+Rows are written with ``executemany`` in batches, each batch inside its own explicit
+transaction, so memory stays bounded by the batch size and a failure only rolls back
+the current batch. Optionally the table's secondary indexes are dropped before the load
+and rebuilt once at the end, which is much cheaper than updating them row by row.
+UNIQUE indexes are kept in place so that duplicate keys are still rejected per batch.
+
+Example::
+
+    loader = BulkLoader(conn, "employees", ["name", "department", "salary"])
+    result = loader.load(generate_employees(10_000_000))
+    print(f"{result.rows_per_second:,.0f} rows/s")
+"""
+
+import itertools
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# 批量导入时推荐的 PRAGMA
+TUNED_PRAGMAS: Dict[str, object] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # 负数表示 KiB: 256 MiB 页缓存
+    "cache_size": -256 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Mapping[str, object]) -> Dict[str, object]:
+    """执行 PRAGMA 设置, 返回 SQLite 报告的实际值 (如内存数据库的 journal_mode 不会是 WAL)。"""
+    applied = {}
+    for name, value in pragmas.items():
+        if not name.isidentifier():
+            raise ValueError(f"invalid pragma name {name!r}")
+        row = conn.execute(f"PRAGMA {name} = {value}").fetchone()
+        applied[name] = row[0] if row else conn.execute(f"PRAGMA {name}").fetchone()[0]
+    return applied
+
+
+class IndexRebuildError(sqlite3.DatabaseError):
+    """导入后有索引没能重建; ``failures`` 为 (索引名, 异常) 列表。"""
+
+    def __init__(self, failures: List[Tuple[str, Exception]]):
+        self.failures = failures
+        details = "; ".join(f"{name}: {error}" for name, error in failures)
+        super().__init__(f"failed to rebuild {len(failures)} index(es): {details}")
+
+
+@dataclass
+class LoadResult:
+    rows: int
+    batches: int
+    seconds: float
+    index_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class BulkLoader:
+    """
+    把行迭代器批量写入 SQLite 表。
+
+    Args:
+        conn: SQLite 连接。
+        table: 目标表名。
+        columns: 插入的列, 与每行的元素一一对应。
+        batch_size: 每个事务写入的行数。
+        pragmas: 导入前执行的 PRAGMA, ``None`` 表示不修改。
+        defer_indexes: 导入前删除表上的二级索引, 导入完成后重建。
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: Sequence[str],
+        batch_size: int = 50_000,
+        pragmas: Optional[Mapping[str, object]] = TUNED_PRAGMAS,
+        defer_indexes: bool = False,
+    ):
+        for name in (table, *columns):
+            if not name.isidentifier():
+                raise ValueError(f"invalid identifier {name!r}")
+        self.conn = conn
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.pragmas = pragmas
+        self.defer_indexes = defer_indexes
+        self.sql = (
+            f"INSERT INTO {table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * len(self.columns))})"
+        )
+
+    def _secondary_indexes(self) -> List[tuple]:
+        """
+        可以推迟重建的索引 (名称, 建索引 SQL)。
+
+        只包括 CREATE INDEX 建的非唯一索引 (origin 为 ``c``); 主键/UNIQUE 约束的自动索引
+        不能删除, 显式的 UNIQUE 索引保留下来, 重复的键在写入时就会被拒绝。
+        """
+        names = [
+            row[1]
+            for row in self.conn.execute(f'PRAGMA index_list("{self.table}")')
+            if row[3] == "c" and not row[2]
+        ]
+        sql = dict(
+            self.conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+                (self.table,),
+            )
+        )
+        return [(name, sql[name]) for name in names]
+
+    def _restore_indexes(self, deferred: List[tuple]) -> List[Tuple[str, Exception]]:
+        """逐个重建索引, 某个失败也继续重建其余的, 返回失败的 (索引名, 异常)。"""
+        failures = []
+        for name, sql in deferred:
+            try:
+                self.conn.execute(sql)
+            except sqlite3.Error as exc:
+                failures.append((name, exc))
+        self._commit_pending()
+        return failures
+
+    def _commit_pending(self):
+        # sqlite3 默认会隐式开启事务, 先提交调用方未提交的修改, 再开始显式事务
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+    def load(self, rows: Iterable[Sequence]) -> LoadResult:
+        """写入所有行, 返回行数、批次数和耗时。"""
+        if self.pragmas:
+            self._commit_pending()
+            apply_pragmas(self.conn, self.pragmas)
+
+        started = time.perf_counter()
+        deferred = self._secondary_indexes() if self.defer_indexes else []
+        self._commit_pending()
+        for name, _ in deferred:
+            self.conn.execute(f'DROP INDEX "{name}"')
+
+        count = batches = 0
+        iterator = iter(rows)
+        try:
+            while batch := list(itertools.islice(iterator, self.batch_size)):
+                self._commit_pending()
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.executemany(self.sql, batch)
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+                count += len(batch)
+                batches += 1
+        finally:
+            # 即使导入失败也要恢复索引; 重建失败时导入的异常保留在 __context__ 中
+            index_started = time.perf_counter()
+            failures = self._restore_indexes(deferred)
+            index_seconds = time.perf_counter() - index_started
+            if failures:
+                raise IndexRebuildError(failures)
+
+        return LoadResult(
+            rows=count,
+            batches=batches,
+            seconds=time.perf_counter() - started,
+            index_seconds=index_seconds if deferred else 0.0,
+        )
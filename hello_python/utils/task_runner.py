@@ -0,0 +1,256 @@
+"""
+Task Runner Module: fan out many async calls with bounded concurrency.
+
+``asyncio.gather`` starts every coroutine at once, and wrapping it in one ``wait_for``
+means a single slow call cancels all of them and loses every result. :class:`TaskRunner`
+instead:
+
+* runs at most ``limit`` calls at a time (a semaphore shared by every ``stream``/``run``
+  on the runner) and pulls new work from the input lazily, so inputs can be generators
+  of any length;
+* applies ``timeout`` to every attempt and retries failures with exponential backoff
+  and full jitter;
+* yields :class:`TaskResult` objects in completion order, failures included;
+* on an overall ``deadline`` cancels what is still running and reports it, keeping
+  everything that already finished.
+
+Example::
+
+    runner = TaskRunner(limit=50, timeout=5, retries=2)
+    async for result in runner.map(fetch, urls):
+        if result.ok:
+            print(result.item, result.value)
+
+    report = await runner.run([functools.partial(fetch, url) for url in urls], deadline=30)
+    print(len(report.succeeded), "ok,", len(report.unfinished), "unfinished")
+"""
+
+import asyncio
+import itertools
+import random
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+TaskFactory = Callable[[], Awaitable[Any]]
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """整体截止时间已到, 任务被取消或没有开始。"""
+
+
+@dataclass
+class TaskResult:
+    """一个任务的结果: 成功时 ``value`` 有值, 失败时 ``error`` 为最后一次的异常。"""
+
+    index: int
+    item: Any = None
+    value: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def timed_out(self) -> bool:
+        return isinstance(self.error, asyncio.TimeoutError)
+
+
+@dataclass
+class RunReport:
+    """:meth:`TaskRunner.run` 的汇总, ``results`` 按输入顺序排列。"""
+
+    results: List[TaskResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[TaskResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[TaskResult]:
+        return [
+            result
+            for result in self.results
+            if not result.ok and not isinstance(result.error, DeadlineExceeded)
+        ]
+
+    @property
+    def unfinished(self) -> List[TaskResult]:
+        """因截止时间被取消或没来得及开始的任务。"""
+        return [result for result in self.results if isinstance(result.error, DeadlineExceeded)]
+
+    @property
+    def values(self) -> List[Any]:
+        return [result.value for result in self.succeeded]
+
+
+class TaskRunner:
+    """
+    有并发上限、超时和重试的异步任务执行器。
+
+    Args:
+        limit: 同时执行的任务数上限。
+        timeout: 每次尝试的超时 (秒), ``None`` 表示不限制。
+        retries: 失败后的最多重试次数。
+        backoff: 第一次重试前的基础等待 (秒), 之后每次翻倍。
+        max_backoff: 单次等待的上限 (秒)。
+        retry_on: 会触发重试的异常类型, 超时 (``asyncio.TimeoutError``) 默认包含在内。
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        # 每个事件循环一个信号量: 同一循环中的所有 stream/run 共享并发上限
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """第 ``attempt`` 次失败后的等待时间: [0, min(max_backoff, backoff * 2^(attempt-1))] 内随机。"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def _attempt(self, factory: TaskFactory) -> Any:
+        async with self._get_semaphore():
+            return await asyncio.wait_for(factory(), self.timeout)
+
+    async def _run_one(self, index: int, item: Any, factory: TaskFactory) -> TaskResult:
+        result = TaskResult(index=index, item=item)
+        started = time.perf_counter()
+        while True:
+            result.attempts += 1
+            try:
+                result.value = await self._attempt(factory)
+                result.error = None
+                break
+            except Exception as e:
+                # 失败记录在结果中, 不会中断其他任务
+                result.error = e
+                if not isinstance(e, self.retry_on) or result.attempts > self.retries:
+                    break
+            await asyncio.sleep(self.backoff_delay(result.attempts))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def stream(
+        self,
+        factories: Iterable[TaskFactory],
+        deadline: Optional[float] = None,
+        items: Optional[Iterable[Any]] = None,
+    ) -> AsyncIterator[TaskResult]:
+        """
+        按完成顺序产出每个任务的结果。
+
+        Args:
+            factories: 无参函数, 每次调用返回一个新的 awaitable (重试时会再次调用)。
+            deadline: 整体截止时间 (秒); 到期时取消仍在执行的任务, 以
+                :class:`DeadlineExceeded` 结果产出, 尚未开始的任务不再开始。
+            items: 与 ``factories`` 一一对应的输入, 记录在 ``TaskResult.item`` 中。
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline if deadline is not None else None
+        pairs = zip(items, factories) if items is not None else ((None, f) for f in factories)
+        pending = enumerate(pairs)
+        running = {}
+
+        def fill():
+            # 只保持 limit 个任务在途, 输入按需读取
+            for index, (item, factory) in itertools.islice(pending, self.limit - len(running)):
+                task = asyncio.ensure_future(self._run_one(index, item, factory))
+                running[task] = (index, item)
+
+        try:
+            fill()
+            while running:
+                timeout = None if end is None else max(0.0, end - loop.time())
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    del running[task]
+                    yield task.result()
+                fill()
+            # 截止时间已到: 取消剩余任务, 报告它们而不是丢弃已有结果
+            for task, (index, item) in list(running.items()):
+                del running[task]
+                if task.done():
+                    yield task.result()
+                    continue
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                yield TaskResult(
+                    index=index,
+                    item=item,
+                    error=DeadlineExceeded(f"deadline of {deadline}s exceeded"),
+                )
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def map(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[TaskResult]:
+        """对每个输入调用 ``func(item)``, 按完成顺序产出结果。"""
+        items, keys = itertools.tee(items)
+        factories = ((lambda item=item: func(item)) for item in items)
+        return self.stream(factories, deadline=deadline, items=keys)
+
+    async def run(
+        self,
+        factories: Iterable[TaskFactory],
+        deadline: Optional[float] = None,
+        items: Optional[Iterable[Any]] = None,
+    ) -> RunReport:
+        """执行全部任务, 返回按输入顺序排列的结果; 截止时间到期时未完成的任务也在其中。"""
+        factories = list(factories)
+        items = list(items) if items is not None else [None] * len(factories)
+        results: List[Optional[TaskResult]] = [None] * len(factories)
+        async for result in self.stream(factories, deadline=deadline, items=items):
+            results[result.index] = result
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = TaskResult(
+                    index=index,
+                    item=items[index],
+                    error=DeadlineExceeded("not started before the deadline"),
+                )
+        return RunReport(results)
@@ -0,0 +1,54 @@
+"""
+UJSON Response Module: a FastAPI/Starlette JSON response encoded with ujson.
+
+Native types (dict, list, str, int, float, bool, None, Decimal) go straight through
+ujson's C encoder. Anything else — ``datetime``, plain objects like ``Product`` in
+``json_sample.py``, sets, enums, pydantic models — is handed to the ``default`` hook,
+which falls back to FastAPI's :func:`~fastapi.encoders.jsonable_encoder` for that value only.
+
+Usage::
+
+    app = FastAPI(default_response_class=UJSONResponse)
+
+    @app.get("/items")
+    async def items():
+        # 直接返回 Response 时 FastAPI 跳过 jsonable_encoder, 整个响应都走 ujson
+        return UJSONResponse(load_items())
+"""
+
+from typing import Any
+
+import ujson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def ujson_default(obj: Any) -> Any:
+    """``default`` hook for :func:`ujson.dumps`: encode a non-native value."""
+    return jsonable_encoder(obj)
+
+
+def ujson_dumps(content: Any) -> bytes:
+    """
+    Encode ``content`` like Starlette's ``JSONResponse`` does (UTF-8, compact,
+    NaN/Infinity rejected), but with ujson.
+    """
+    return ujson.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        escape_forward_slashes=False,
+        default=ujson_default,
+    ).encode("utf-8")
+
+
+class UJSONResponse(JSONResponse):
+    """
+    ``JSONResponse`` rendered by ujson, with a fallback for non-native types.
+
+    Unlike ``fastapi.responses.UJSONResponse`` it does not fail on ``datetime``
+    or arbitrary objects, so it can be used as the app-wide ``default_response_class``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return ujson_dumps(content)
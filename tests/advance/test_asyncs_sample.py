@@ -2,9 +2,12 @@
 datatype sample test
 """
 
+import os
+import tempfile
 import unittest
 import asyncio
 from hello_python.advance import asyncs_sample
+from hello_python.utils.scheduler import open_store
 
 
 class TestAsyncsSample(unittest.TestCase):
@@ -24,22 +27,41 @@ class TestAsyncsSample(unittest.TestCase):
         """
         asyncio.run(asyncs_sample.task_main())
 
-    def test_scheduler_async_sample(self):
+    def test_runner_async_sample(self):
         """
-        test Scheduler Asyncs task sample
+        test bounded task runner sample
         """
+        asyncio.run(asyncs_sample.runner_main())
 
-        try:
-            # 调用被测试的异步函数
-            asyncs_sample.schedule_main()
-
-        except Exception as e:
-            # 处理异常情况。
-            # self.fail(f"Async test failed: {e}")
-            pass
+    def test_scheduler_async_sample(self):
+        """
+        test Scheduler Asyncs task sample keeps its job in the SQLite store
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            database = os.path.join(tmp, "jobs.db")
+            asyncs_sample.schedule_main(database, run_seconds=0.2)
+            # 再次启动时替换已保存的任务, 而不是重复注册
+            asyncs_sample.schedule_main(database, run_seconds=0.2)
+            store = open_store(database)
+            try:
+                self.assertEqual([job.id for job in store.get_all_jobs()], ["timeout_task"])
+            finally:
+                store.shutdown()
 
     def test_thread_task_sample(self):
         """
         test  ThreadPool Async task sample
         """
         asyncs_sample.thread_main()
+
+    def test_process_task_sample(self):
+        """
+        test ProcessPool offload async task sample
+        """
+        asyncs_sample.process_main()
+
+    def test_monitor_task_sample(self):
+        """
+        test event loop monitor async task sample
+        """
+        asyncs_sample.monitor_main()
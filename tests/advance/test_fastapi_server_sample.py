@@ -0,0 +1,508 @@
+"""
+fastapi server sample test
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import psutil
+import uvicorn
+from click.testing import CliRunner
+from injector import Injector
+
+from hello_python.advance import fastapi_server_sample
+from hello_python.advance.fastapi_server_sample import (
+    DatabaseModule,
+    ReadyServer,
+    ServiceManager,
+    WorkerSupervisor,
+    _spawn,
+    wait_until,
+)
+from hello_python.cli.commands.fastapi import fastapi as fastapi_command
+from hello_python.utils.db_pool import ConnectionPool, PoolError, sqlite_connector
+from hello_python.utils.log_pipeline import LogPipeline
+from hello_python.utils.loop_monitor import LAG_METRIC, SLOW_CALLBACKS_METRIC
+from hello_python.utils.metrics import MetricsRegistry, write_snapshot
+
+APP_IMPORT = "hello_python.advance.fastapi_server_sample:app"
+
+
+def http_get(port, path="/"):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as resp:
+        return resp.read().decode()
+
+
+class TestFastAPIServerSample(unittest.TestCase):
+    """
+    TestFastAPIServerSample
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = ServiceManager(
+            app_instance=fastapi_server_sample.app,
+            app_name="test_service",
+            host="127.0.0.1",
+            port=0,
+            working_dir=self.tmp.name,
+            app_import=APP_IMPORT,
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pid_file_with_workers(self):
+        """
+        test PID file holds the supervisor and worker PIDs
+        """
+        self.manager._write_pid([os.getppid()])
+        self.assertEqual(self.manager._get_pid_from_file(), os.getpid())
+        self.assertEqual(self.manager._get_worker_pids(), [os.getppid()])
+        self.manager._remove_pid()
+        self.assertIsNone(self.manager._get_pid_from_file())
+        self.assertEqual(self.manager._get_worker_pids(), [])
+
+    def test_stop_waits_for_running_drain_timeout(self):
+        """
+        test stop waits as long as the running service drains, not its own default
+        """
+        running = ServiceManager(
+            app_instance=fastapi_server_sample.app,
+            app_name="test_service",
+            working_dir=self.tmp.name,
+            drain_timeout=42,
+        )
+        running._write_pid()
+        self.assertEqual(self.manager._get_drain_timeout(), 42)
+        with mock.patch.object(fastapi_server_sample.psutil, "Process") as process:
+            self.manager.stop()
+        process.return_value.wait.assert_called_once_with(timeout=47)
+        self.assertFalse(os.path.exists(self.manager.drain_file))
+        self.assertEqual(self.manager._get_drain_timeout(), self.manager.drain_timeout)
+
+    def test_restart_keeps_worker_count(self):
+        """
+        test restart without workers reuses the running count and graceful rejects a change
+        """
+        self.manager._write_pid([os.getppid()] * 3)
+        with mock.patch.object(self.manager, "stop"), mock.patch.object(
+            self.manager, "start"
+        ) as start:
+            self.manager.restart()
+            self.assertEqual(start.call_args.kwargs["workers"], 3)
+            self.manager.restart(workers=2)
+            self.assertEqual(start.call_args.kwargs["workers"], 2)
+            self.manager._write_pid()
+            self.manager.restart()
+            self.assertEqual(start.call_args.kwargs["workers"], 1)
+        with self.assertRaises(ValueError):
+            self.manager.restart(workers=2, graceful=True)
+
+        runner = CliRunner()
+        result = runner.invoke(fastapi_command, ["restart", "--workers", "2", "--graceful"])
+        self.assertEqual(result.exit_code, 2, result.output)
+        self.assertIn("--graceful", result.output)
+
+    def test_wait_until(self):
+        """
+        test wait_until returns as soon as the predicate holds, and honours the deadline
+        """
+        start = time.monotonic()
+        calls = []
+        self.assertTrue(wait_until(lambda: calls.append(1) or len(calls) > 3, timeout=5))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(wait_until(lambda: False, timeout=0.05))
+
+    def test_ready_server(self):
+        """
+        test ReadyServer sets its event once uvicorn accepts connections
+        """
+        ready = threading.Event()
+        config = uvicorn.Config(
+            app=fastapi_server_sample.app, host="127.0.0.1", port=0, log_level="warning"
+        )
+        server = ReadyServer(config, ready_event=ready)
+        thread = threading.Thread(target=server.run)
+        thread.start()
+        try:
+            self.assertTrue(ready.wait(timeout=10))
+            port = server.servers[0].sockets[0].getsockname()[1]
+            self.assertIn("Hello, FastAPI!", http_get(port))
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    def test_metrics_endpoint(self):
+        """
+        test the metrics middleware records requests and /metrics exposes them
+        """
+        ready = threading.Event()
+        config = uvicorn.Config(
+            app=fastapi_server_sample.app, host="127.0.0.1", port=0, log_level="warning"
+        )
+        server = ReadyServer(config, ready_event=ready)
+        thread = threading.Thread(target=server.run)
+        thread.start()
+        try:
+            self.assertTrue(ready.wait(timeout=10))
+            port = server.servers[0].sockets[0].getsockname()[1]
+            for _ in range(3):
+                http_get(port)
+            with self.assertRaises(urllib.error.HTTPError):
+                http_get(port, "/missing/page")
+            body = http_get(port, "/metrics")
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+        self.assertIn('http_requests_total{method="GET",route="/",status="200"}', body)
+        self.assertIn('route="<unmatched>",status="404"', body)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn('http_requests_in_progress{method="GET",route="/metrics"} 1', body)
+
+    def test_loop_lag_metrics(self):
+        """
+        test the app monitors its event loop and /metrics exposes the lag histogram
+        """
+        ready = threading.Event()
+        config = uvicorn.Config(
+            app=fastapi_server_sample.app, host="127.0.0.1", port=0, log_level="warning"
+        )
+        server = ReadyServer(config, ready_event=ready)
+        thread = threading.Thread(target=server.run)
+        with mock.patch.object(fastapi_server_sample, "LOOP_LAG_INTERVAL", 0.01):
+            thread.start()
+            try:
+                self.assertTrue(ready.wait(timeout=10))
+                port = server.servers[0].sockets[0].getsockname()[1]
+                time.sleep(0.1)
+                body = http_get(port, "/metrics")
+                monitor = fastapi_server_sample.app.state.loop_monitor
+                self.assertTrue(monitor.running)
+                # 默认不开 asyncio 调试模式, 慢回调由看门狗线程检测
+                self.assertFalse(monitor.debug)
+                self.assertIsNotNone(monitor._watchdog)
+            finally:
+                server.should_exit = True
+                thread.join(timeout=10)
+        self.assertIn(f"# TYPE {LAG_METRIC} histogram", body)
+        self.assertIn(f"{LAG_METRIC}_count", body)
+        self.assertFalse(monitor.running)
+
+    def test_status_shows_loop_metrics(self):
+        """
+        test status reports the merged loop lag and the latest slow callback stacks
+        """
+        for pid, seconds in [(101, 0.002), (102, 0.4)]:
+            registry = MetricsRegistry()
+            registry.observe(LAG_METRIC, seconds)
+            registry.inc(SLOW_CALLBACKS_METRIC)
+            snapshot = registry.snapshot()
+            snapshot["slow_callbacks"] = [
+                {
+                    "time": time.time() + pid,
+                    "callback": f"<Task worker {pid}>",
+                    "seconds": 0.4,
+                    "stack": ["app.py:10 in handler", "app.py:20 in render: time.sleep(0.4)"],
+                }
+            ]
+            write_snapshot(snapshot, self.manager.metrics_dir, pid)
+        with mock.patch("click.echo") as echo:
+            self.manager._echo_loop_metrics()
+        output = "\n".join(call.args[0] for call in echo.call_args_list)
+        self.assertIn("over 2 samples, 2 slow callbacks", output)
+        self.assertIn("worker 102: <Task worker 102> took 400 ms", output)
+        self.assertIn("app.py:20 in render: time.sleep(0.4)", output)
+
+    def use_sqlite(self, app):
+        """应用启动时改用临时目录中的 SQLite 数据库"""
+        database = os.path.join(self.tmp.name, "app.db")
+        original = app.state.create_injector
+        app.state.create_injector = lambda: Injector([DatabaseModule(sqlite_connector(database))])
+        self.addCleanup(setattr, app.state, "create_injector", original)
+
+    def test_db_ping_reuses_pooled_connection(self):
+        """
+        test sync and async handlers get connections from the injector-provided pool
+        """
+        app = fastapi_server_sample.app
+        self.use_sqlite(app)
+        ready = threading.Event()
+        config = uvicorn.Config(app=app, host="127.0.0.1", port=0, log_level="warning")
+        server = ReadyServer(config, ready_event=ready)
+        thread = threading.Thread(target=server.run)
+        thread.start()
+        try:
+            self.assertTrue(ready.wait(timeout=10))
+            pool = app.state.injector.get(ConnectionPool)
+            port = server.servers[0].sockets[0].getsockname()[1]
+            bodies = [json.loads(http_get(port, "/db/ping")) for _ in range(5)]
+            bodies.append(json.loads(http_get(port, "/db/ping/async")))
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+        self.assertTrue(all(body["ok"] for body in bodies))
+        self.assertEqual(bodies[-2]["pool"]["created"], 1)
+        self.assertEqual(bodies[-2]["pool"]["in_use"], 1)
+        # async 路由在线程池中借用同一个连接池, 返回时连接已归还
+        self.assertEqual(bodies[-1]["pool"]["created"], 1)
+        self.assertEqual(bodies[-1]["pool"]["in_use"], 0)
+        # 应用关闭时连接池随之关闭
+        with self.assertRaises(PoolError):
+            pool.acquire()
+
+    def test_db_session_is_request_scoped(self):
+        """
+        test a request-scoped session is shared within a request and released after it
+        """
+        app = fastapi_server_sample.app
+        self.use_sqlite(app)
+        ready = threading.Event()
+        config = uvicorn.Config(app=app, host="127.0.0.1", port=0, log_level="warning")
+        server = ReadyServer(config, ready_event=ready)
+        thread = threading.Thread(target=server.run)
+        thread.start()
+        try:
+            self.assertTrue(ready.wait(timeout=10))
+            pool = app.state.injector.get(ConnectionPool)
+            port = server.servers[0].sockets[0].getsockname()[1]
+            bodies, released = [], []
+            for _ in range(3):
+                bodies.append(json.loads(http_get(port, "/db/ping/session")))
+                # 响应发出后中间件才退出作用域, 连接稍后归还
+                released.append(wait_until(lambda: pool.stats()["in_use"] == 0, timeout=5))
+            stats = pool.stats()
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+        self.assertTrue(all(body["ok"] and body["shared"] for body in bodies))
+        # 请求期间借出一个连接, 响应结束后归还, 下一个请求复用同一个连接
+        self.assertEqual([body["pool"]["in_use"] for body in bodies], [1, 1, 1])
+        self.assertEqual(released, [True, True, True])
+        self.assertEqual(stats["created"], 1)
+        self.assertIs(app.state.container.injector, app.state.injector)
+
+    def test_restart_creates_new_pool(self):
+        """
+        test starting the same app again gets a new pool instead of the closed one
+        """
+        app = fastapi_server_sample.app
+        self.use_sqlite(app)
+        pools = []
+        for _ in range(2):
+            ready = threading.Event()
+            config = uvicorn.Config(app=app, host="127.0.0.1", port=0, log_level="warning")
+            server = ReadyServer(config, ready_event=ready)
+            thread = threading.Thread(target=server.run)
+            thread.start()
+            try:
+                self.assertTrue(ready.wait(timeout=10))
+                port = server.servers[0].sockets[0].getsockname()[1]
+                body = json.loads(http_get(port, "/db/ping/async"))
+                pools.append(app.state.injector.get(ConnectionPool))
+            finally:
+                server.should_exit = True
+                thread.join(timeout=10)
+            self.assertTrue(body["ok"])
+        self.assertIsNot(pools[0], pools[1])
+        for pool in pools:
+            with self.assertRaises(PoolError):
+                pool.acquire()
+
+    def test_supervisor_requires_import_string(self):
+        """
+        test multi-worker mode rejects an app instance
+        """
+        config = uvicorn.Config(app=fastapi_server_sample.app)
+        with self.assertRaises(ValueError):
+            WorkerSupervisor(config, workers=2)
+
+    def test_supervisor_restarts_crashed_worker(self):
+        """
+        test supervisor shares one socket across workers and replaces crashed ones
+        """
+        config = uvicorn.Config(app=APP_IMPORT, host="127.0.0.1", port=0, log_level="warning")
+        changes = []
+        supervisor = WorkerSupervisor(config, workers=2, on_change=changes.append)
+        supervisor.startup()
+        port = supervisor._socket.getsockname()[1]
+        thread = threading.Thread(target=supervisor.supervise)
+        thread.start()
+        try:
+            self.assertEqual(len(supervisor.pids), 2)
+            self.assertTrue(supervisor.wait_ready(timeout=30))
+            self.assertTrue(_responds(port))
+
+            crashed = supervisor.pids[0]
+            psutil.Process(crashed).kill()
+            self.assertTrue(
+                wait_until(
+                    lambda: len(changes) > 0 and crashed not in supervisor.pids, timeout=30
+                )
+            )
+            self.assertEqual(len(supervisor.pids), 2)
+            self.assertTrue(supervisor.wait_ready(timeout=30))
+            self.assertIn("Hello, FastAPI!", http_get(port))
+        finally:
+            supervisor.shutdown()
+            thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(supervisor.pids, [])
+
+    def test_supervisor_shutdown_during_backoff(self):
+        """
+        test shutdown while waiting to restart a crash-looping worker stops cleanly
+        """
+        config = uvicorn.Config(app=APP_IMPORT, host="127.0.0.1", port=0, log_level="warning")
+        supervisor = WorkerSupervisor(config, workers=1, poll_interval=0.1)
+        supervisor.MIN_UPTIME = 3600
+        supervisor.MAX_BACKOFF = 60
+        supervisor.startup()
+        thread = threading.Thread(target=supervisor.supervise)
+        thread.start()
+        try:
+            self.assertTrue(supervisor.wait_ready(timeout=30))
+            crashed = supervisor.processes[0]
+            psutil.Process(crashed.pid).kill()
+            # 失败计数增加后 _reap 正在退避等待
+            self.assertTrue(wait_until(lambda: supervisor._failures == 1, timeout=30))
+        finally:
+            supervisor.shutdown()
+            thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(supervisor.pids, [])
+        self.assertEqual(supervisor.draining, [])
+        self.assertIsNone(supervisor._socket)
+        with self.assertRaises(ValueError):
+            crashed.is_alive()
+
+    def test_supervisor_rolling_reload(self):
+        """
+        test rolling reload replaces every worker without refusing requests
+        """
+        config = uvicorn.Config(app=APP_IMPORT, host="127.0.0.1", port=0, log_level="warning")
+        changes = []
+        supervisor = WorkerSupervisor(
+            config, workers=2, on_change=changes.append, poll_interval=0.1
+        )
+        supervisor.startup()
+        port = supervisor._socket.getsockname()[1]
+        self.assertTrue(supervisor.wait_ready(timeout=30))
+        thread = threading.Thread(target=supervisor.supervise)
+        thread.start()
+
+        failures = []
+        stop_load = threading.Event()
+
+        def load():
+            while not stop_load.is_set():
+                if not _responds(port):
+                    failures.append(time.monotonic())
+
+        load_thread = threading.Thread(target=load)
+        load_thread.start()
+        try:
+            old_pids = set(supervisor.pids)
+            supervisor.request_reload(drain_timeout=5)
+            self.assertTrue(
+                wait_until(
+                    lambda: changes and not set(changes[-1]) & old_pids, timeout=60
+                )
+            )
+            self.assertTrue(wait_until(lambda: not supervisor.draining, timeout=30))
+            self.assertEqual(supervisor.drain_timeout, 5)
+        finally:
+            stop_load.set()
+            load_thread.join()
+            supervisor.shutdown()
+            thread.join(timeout=30)
+        self.assertEqual(failures, [])
+        self.assertTrue(all(not psutil.pid_exists(pid) for pid in old_pids))
+
+    def test_supervisor_keeps_supervising_during_reload(self):
+        """
+        test crashed workers are replaced and shutdown is prompt while a reload waits
+        """
+        config = uvicorn.Config(app=APP_IMPORT, host="127.0.0.1", port=0, log_level="warning")
+        supervisor = WorkerSupervisor(config, workers=1, poll_interval=0.1, ready_timeout=60)
+        supervisor.startup()
+        self.assertTrue(supervisor.wait_ready(timeout=30))
+        thread = threading.Thread(target=supervisor.supervise)
+        thread.start()
+        try:
+            old_pid = supervisor.pids[0]
+            # 新一代永远不会就绪, 滚动重启一直处于等待状态
+            with mock.patch.object(supervisor, "is_ready", return_value=False):
+                supervisor.request_reload()
+                self.assertTrue(wait_until(lambda: supervisor.next_generation, timeout=30))
+                new_pids = [p.pid for p in supervisor.next_generation]
+                psutil.Process(old_pid).kill()
+                self.assertTrue(
+                    wait_until(lambda: supervisor.pids and old_pid not in supervisor.pids, 30)
+                )
+                started = time.monotonic()
+                supervisor.shutdown()
+                thread.join(timeout=30)
+                self.assertLess(time.monotonic() - started, 15)
+        finally:
+            supervisor.shutdown()
+            thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(supervisor.next_generation, [])
+        self.assertTrue(all(not psutil.pid_exists(pid) for pid in new_pids))
+
+    def test_supervisor_routes_worker_logs_to_pipeline(self):
+        """
+        test worker access logs go through the supervisor's log writer
+        """
+        log_file = os.path.join(self.tmp.name, "workers.log")
+        pipeline = LogPipeline(log_file, record_queue=_spawn.Queue()).start()
+        config = uvicorn.Config(
+            app=APP_IMPORT, host="127.0.0.1", port=0, log_level="info", log_config=None
+        )
+        supervisor = WorkerSupervisor(config, workers=1, log_queue=pipeline.queue)
+        supervisor.startup()
+        port = supervisor._socket.getsockname()[1]
+        try:
+            self.assertTrue(supervisor.wait_ready(timeout=30))
+            http_get(port, "/?from=test")
+        finally:
+            supervisor.terminate()
+            pipeline.stop()
+        with open(log_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("uvicorn.error - INFO - Application startup complete.", content)
+        self.assertIn('uvicorn.access - INFO - 127.0.0.1:', content)
+        self.assertIn('"GET /?from=test HTTP/1.1" 200', content)
+        # 被 SIGTERM 终止前, worker 的最后几条日志也已送达
+        self.assertIn("Finished server process", content)
+
+    def test_signal_handler_requests_graceful_shutdown(self):
+        """
+        test SIGTERM in single-process mode asks uvicorn to drain instead of killing itself
+        """
+
+        class FakeServer:
+            should_exit = False
+
+        self.manager._server = FakeServer()
+        self.manager._signal_handler(15, None)
+        self.assertTrue(self.manager._server.should_exit)
+
+
+def _responds(port):
+    try:
+        return "Hello" in http_get(port)
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    unittest.main()
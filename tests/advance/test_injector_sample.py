@@ -16,3 +16,22 @@ class TestInjectorSample(unittest.TestCase):
         test object injector sample
         """
         injector_sample.inject_main()
+
+    def test_injector_compiled_sample(self):
+        """
+        test the compiled container resolves the same graph as the injector
+        """
+        compiled = injector_sample.inject_main()
+        user = compiled.get(injector_sample.User)
+        self.assertEqual(user.description, "Sherlock is a man of astounding insight")
+        self.assertIs(
+            compiled.get(injector_sample.ServiceB), compiled.injector.get(injector_sample.ServiceB)
+        )
+
+    def test_injector_request_sample(self):
+        """
+        test request-scoped objects are per request while singletons are shared
+        """
+        first, second = injector_sample.request_main()
+        self.assertIsNot(first, second)
+        self.assertIs(first.service_b, second.service_b)
@@ -3,6 +3,9 @@ datatype sample test
 """
 
 import unittest
+
+import numpy as np
+
 from hello_python.advance import numpy_sample
 
 
@@ -19,3 +22,104 @@ class TestNumpySample(unittest.TestCase):
         # Running the gradient descent to minimize the function
         final_x = numpy_sample.gradient_descent(learning_rate=0.1, tolerance=1e-6)
         print(f"Final x after convergence: {final_x:.6f}")
+        self.assertAlmostEqual(final_x, 3, delta=0.01)
+
+    def test_batch_gradient_descent_methods(self):
+        """
+        test every update method converges each problem of a batch
+        """
+        starts = np.random.default_rng(0).normal(0, 10, 1000)
+        rates = {"sgd": 0.1, "momentum": 0.05, "adam": 0.5}
+        for method in numpy_sample.METHODS:
+            with self.subTest(method=method):
+                result = numpy_sample.batch_gradient_descent(
+                    starts, method=method, learning_rate=rates[method], max_iter=5000
+                )
+                self.assertEqual(result.x.shape, starts.shape)
+                self.assertEqual(result.n_converged, len(starts))
+                self.assertTrue(np.all(result.value < 1e-3))
+                # 起点不同, 收敛所需的迭代次数也不同
+                self.assertLessEqual(result.iterations.max(), 5000)
+
+    def test_batch_gradient_descent_n_dimensional(self):
+        """
+        test rows of parameter vectors are optimized independently
+        """
+        starts = np.array([[-1.5, 2.0], [0.0, 0.0], [2.0, 2.0]])
+        result = numpy_sample.batch_gradient_descent(
+            starts,
+            numpy_sample.rosenbrock,
+            numpy_sample.rosenbrock_gradient,
+            method="adam",
+            learning_rate=0.02,
+            tolerance=1e-12,
+            max_iter=20000,
+        )
+        self.assertEqual(result.x.shape, (3, 2))
+        self.assertTrue(result.converged.all())
+        np.testing.assert_allclose(result.x, np.ones((3, 2)), atol=1e-2)
+        # 输入不会被原地修改
+        self.assertEqual(starts[0, 0], -1.5)
+
+    def test_batch_gradient_descent_keeps_gradient_buffer(self):
+        """
+        test adam does not modify the array returned by grad
+        """
+        buffer = np.empty(100)
+        returned = []
+
+        def grad(x):
+            # 梯度写入同一个缓冲区并返回它的视图
+            out = buffer[: len(x)]
+            np.multiply(x - 3, 2, out=out)
+            returned.append(out.copy())
+            return out
+
+        starts = np.random.default_rng(1).normal(0, 5, 100)
+        result = numpy_sample.batch_gradient_descent(
+            starts, lambda x: (x - 3) ** 2, grad, method="adam", learning_rate=0.5
+        )
+        self.assertTrue(result.converged.all())
+        np.testing.assert_allclose(result.x, 3, atol=1e-2)
+        np.testing.assert_array_equal(buffer[: len(returned[-1])], returned[-1])
+
+    def test_batch_gradient_descent_max_iter(self):
+        """
+        test problems still running at max_iter keep their last iterate
+        """
+        result = numpy_sample.batch_gradient_descent([0.0, 3.0], learning_rate=0.01, max_iter=5)
+        self.assertEqual(list(result.converged), [False, True])
+        self.assertEqual(list(result.iterations), [5, 1])
+        self.assertGreater(result.x[0], 0)
+        self.assertLess(result.x[0], 3)
+
+    def test_batch_gradient_descent_log_stride(self):
+        """
+        test progress is logged every log_every iterations and at the end
+        """
+        lines = []
+        result = numpy_sample.batch_gradient_descent(
+            np.linspace(-10, 10, 50), log_every=10, log=lines.append
+        )
+        last = int(result.iterations.max())
+        self.assertEqual(len(lines), last // 10 + (last % 10 != 0))
+        self.assertTrue(lines[0].startswith("Iteration 10: "))
+        self.assertTrue(lines[-1].startswith(f"Iteration {last}: 50/50 converged, 0 active"))
+
+    def test_batch_gradient_descent_unknown_method(self):
+        """
+        test an unknown update method is rejected
+        """
+        with self.assertRaises(ValueError):
+            numpy_sample.batch_gradient_descent([1.0], method="newton")
+
+    def test_batch_main(self):
+        """
+        test the batch demo solves every problem
+        """
+        result = numpy_sample.batch_main(count=1000)
+        np.testing.assert_allclose(result.x, np.ones((4, 2)), atol=1e-2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+algo backend test
+"""
+
+import unittest
+
+import numpy as np
+
+from hello_python.algo.backend import as_list, choose_backend
+
+
+class TestBackend(unittest.TestCase):
+    """
+    TestBackend
+    """
+
+    def test_choose_backend(self):
+        """
+        test the backend follows the input type unless one is given
+        """
+        self.assertEqual(choose_backend([1, 2]), "python")
+        self.assertEqual(choose_backend(np.arange(2)), "numpy")
+        self.assertEqual(choose_backend([1, 2], "numpy"), "numpy")
+        with self.assertRaises(ValueError):
+            choose_backend([1, 2], "cuda")
+
+    def test_as_list(self):
+        """
+        test arrays are converted to lists of Python scalars and lists pass through
+        """
+        items = [3, 1]
+        self.assertIs(as_list(items), items)
+        self.assertEqual(as_list((3, 1)), [3, 1])
+        converted = as_list(np.array([3, 1]))
+        self.assertEqual(converted, [3, 1])
+        self.assertIs(type(converted[0]), int)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+intervals test
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from hello_python.algo.intervals import merge_intervals
+
+
+class TestIntervals(unittest.TestCase):
+    """
+    TestIntervals
+    """
+
+    def test_merge(self):
+        """
+        test overlapping and touching intervals are merged on both backends
+        """
+        intervals = [[8, 10], [1, 3], [2, 6], [15, 18], [10, 11], [17, 20], [4, 5]]
+        expected = [[1, 6], [8, 11], [15, 20]]
+        self.assertEqual(merge_intervals(intervals), expected)
+        result = merge_intervals(np.array(intervals))
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_empty_and_single(self):
+        """
+        test empty input and a single interval
+        """
+        self.assertEqual(merge_intervals([]), [])
+        self.assertEqual(merge_intervals([], backend="numpy").shape, (0, 2))
+        self.assertEqual(merge_intervals([(1, 2)]), [[1, 2]])
+        self.assertEqual(merge_intervals([(1, 2)], backend="numpy").tolist(), [[1, 2]])
+
+    def test_backends_agree(self):
+        """
+        test both backends give the same result on random intervals
+        """
+        rng = random.Random(0)
+        starts = [rng.randint(0, 1000) for _ in range(500)]
+        intervals = [[s, s + rng.randint(0, 10)] for s in starts]
+        self.assertEqual(
+            merge_intervals(np.array(intervals)).tolist(), merge_intervals(intervals)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+search test
+"""
+
+import bisect
+import unittest
+
+import numpy as np
+
+from hello_python.algo.search import (
+    binary_search,
+    equal_range,
+    first_true,
+    lower_bound,
+    search_sorted,
+    upper_bound,
+)
+
+
+class TestSearch(unittest.TestCase):
+    """
+    TestSearch
+    """
+
+    def setUp(self):
+        self.a = [1, 2, 2, 2, 5, 7, 7, 9]
+        self.queries = [0, 1, 2, 3, 7, 9, 10]
+
+    def test_bounds_match_bisect(self):
+        """
+        test lower/upper bound agree with bisect_left/bisect_right
+        """
+        for x in self.queries:
+            with self.subTest(x=x):
+                self.assertEqual(lower_bound(self.a, x), bisect.bisect_left(self.a, x))
+                self.assertEqual(upper_bound(self.a, x), bisect.bisect_right(self.a, x))
+        self.assertEqual(lower_bound(self.a, 7, lo=6), 6)
+        self.assertEqual(upper_bound(self.a, 9, hi=4), 4)
+
+    def test_equal_range_and_binary_search(self):
+        """
+        test the range of equal elements and the first match
+        """
+        self.assertEqual(equal_range(self.a, 2), (1, 4))
+        self.assertEqual(equal_range(self.a, 3), (4, 4))
+        self.assertEqual(binary_search(self.a, 7), 5)
+        self.assertEqual(binary_search(self.a, 3), -1)
+        self.assertEqual(binary_search(self.a, 10), -1)
+        self.assertEqual(binary_search([], 1), -1)
+
+    def test_first_true(self):
+        """
+        test binary search on a monotone predicate
+        """
+        self.assertEqual(first_true(0, 100, lambda i: i * i >= 50), 8)
+        self.assertEqual(first_true(0, 10, lambda i: False), 10)
+        self.assertEqual(first_true(3, 10, lambda i: True), 3)
+
+    def test_search_sorted_backends(self):
+        """
+        test batched queries give the same positions on both backends
+        """
+        for side, reference in (("left", bisect.bisect_left), ("right", bisect.bisect_right)):
+            expected = [reference(self.a, x) for x in self.queries]
+            with self.subTest(side=side):
+                self.assertEqual(search_sorted(self.a, self.queries, side), expected)
+                result = search_sorted(np.array(self.a), self.queries, side)
+                self.assertIsInstance(result, np.ndarray)
+                self.assertEqual(result.tolist(), expected)
+        with self.assertRaises(ValueError):
+            search_sorted(self.a, self.queries, side="middle")
+
+
+if __name__ == "__main__":
+    unittest.main()
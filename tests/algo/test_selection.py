@@ -0,0 +1,85 @@
+"""
+selection test
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from hello_python.algo.selection import introselect, median_of_medians, quickselect, select
+
+
+class TestSelection(unittest.TestCase):
+    """
+    TestSelection
+    """
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.data = [rng.randint(0, 100) for _ in range(501)]
+        self.expected = sorted(self.data)
+
+    def test_select_every_k(self):
+        """
+        test every implementation returns the k-th smallest element
+        """
+        array = np.array(self.data)
+        rng = random.Random(1)
+        for k in (0, 1, 250, 499, 500):
+            with self.subTest(k=k):
+                self.assertEqual(quickselect(self.data, k, rng), self.expected[k])
+                self.assertEqual(introselect(self.data, k), self.expected[k])
+                self.assertEqual(select(self.data, k), self.expected[k])
+                self.assertEqual(select(array, k), self.expected[k])
+
+    def test_input_unchanged(self):
+        """
+        test selection does not reorder the input
+        """
+        original = list(self.data)
+        introselect(self.data, 10)
+        quickselect(self.data, 10)
+        self.assertEqual(self.data, original)
+
+    def test_out_of_range(self):
+        """
+        test k outside the data raises IndexError
+        """
+        for func in (quickselect, introselect, select):
+            with self.subTest(func=func.__name__):
+                with self.assertRaises(IndexError):
+                    func([1, 2, 3], 3)
+                with self.assertRaises(IndexError):
+                    func([], 0)
+        with self.assertRaises(IndexError):
+            select(np.array([1, 2]), -1)
+
+    def test_median_of_medians(self):
+        """
+        test the median-of-medians pivot splits off at least 30% on each side
+        """
+        data = list(range(1000))
+        random.Random(2).shuffle(data)
+        pivot = median_of_medians(data)
+        self.assertGreaterEqual(pivot, 300)
+        self.assertLessEqual(pivot, 700)
+
+    def test_introselect_adversarial(self):
+        """
+        test inputs that defeat median-of-three pivots still finish quickly
+        """
+        # 已排序、逆序、全部相同和"风琴管"形状
+        n = 20_000
+        cases = [
+            list(range(n)),
+            list(range(n, 0, -1)),
+            [7] * n,
+            list(range(n // 2)) + list(range(n // 2, 0, -1)),
+        ]
+        for data in cases:
+            self.assertEqual(introselect(data, n // 2), sorted(data)[n // 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
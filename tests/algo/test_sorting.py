@@ -0,0 +1,76 @@
+"""
+sorting test
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from hello_python.algo.sorting import insertion_sort, merge_sort, sort
+
+
+class TestSorting(unittest.TestCase):
+    """
+    TestSorting
+    """
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.data = [rng.randint(0, 50) for _ in range(1000)]
+
+    def test_insertion_sort(self):
+        """
+        test insertion sort sorts only the given range in place
+        """
+        items = [5, 4, 3, 2, 1]
+        insertion_sort(items, 1, 4)
+        self.assertEqual(items, [5, 2, 3, 4, 1])
+
+    def test_merge_sort(self):
+        """
+        test merge sort matches sorted and leaves the input unchanged
+        """
+        original = list(self.data)
+        self.assertEqual(merge_sort(self.data), sorted(original))
+        self.assertEqual(self.data, original)
+        for n in (0, 1, 31, 32, 33, 65):
+            self.assertEqual(merge_sort(self.data[:n]), sorted(self.data[:n]))
+
+    def test_merge_sort_stable(self):
+        """
+        test merge sort keeps equal elements in their original order
+        """
+
+        class Item:
+            def __init__(self, key, index):
+                self.key, self.index = key, index
+
+            def __le__(self, other):
+                return self.key <= other.key
+
+            def __gt__(self, other):
+                return self.key > other.key
+
+        items = [Item(x % 7, i) for i, x in enumerate(self.data)]
+        result = merge_sort(items)
+        pairs = [(item.key, item.index) for item in result]
+        self.assertEqual(pairs, sorted(pairs))
+
+    def test_sort_backends(self):
+        """
+        test both backends sort ascending and descending with the backend's result type
+        """
+        expected = sorted(self.data)
+        self.assertEqual(sort(self.data), expected)
+        self.assertEqual(sort(self.data, reverse=True), expected[::-1])
+        result = sort(np.array(self.data))
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(sort(self.data, reverse=True, backend="numpy").tolist(), expected[::-1])
+        self.assertEqual(sort(np.array(self.data), backend="python"), expected)
+        self.assertEqual(sort(np.array(["b", "a", "c"])).tolist(), ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+top-k test
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from hello_python.algo.topk import top_k
+
+
+class TestTopK(unittest.TestCase):
+    """
+    TestTopK
+    """
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.data = [rng.randint(0, 1000) for _ in range(2000)]
+
+    def test_largest_and_smallest(self):
+        """
+        test both backends return the k extreme elements in order
+        """
+        expected = sorted(self.data)
+        for data in (self.data, np.array(self.data)):
+            with self.subTest(backend=type(data).__name__):
+                self.assertEqual(list(top_k(data, 10)), expected[::-1][:10])
+                self.assertEqual(list(top_k(data, 10, largest=False)), expected[:10])
+
+    def test_k_bounds(self):
+        """
+        test k larger than the data returns everything and k <= 0 returns nothing
+        """
+        data = [3, 1, 2]
+        for backend in ("python", "numpy"):
+            with self.subTest(backend=backend):
+                self.assertEqual(list(top_k(data, 5, backend=backend)), [3, 2, 1])
+                self.assertEqual(list(top_k(data, 3, largest=False, backend=backend)), [1, 2, 3])
+                self.assertEqual(len(top_k(data, 0, backend=backend)), 0)
+                self.assertEqual(len(top_k(data, -1, backend=backend)), 0)
+
+    def test_iterator(self):
+        """
+        test the python backend consumes an iterator in one pass
+        """
+        self.assertEqual(top_k(iter(range(100)), 3), [99, 98, 97])
+
+
+if __name__ == "__main__":
+    unittest.main()
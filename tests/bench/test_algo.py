@@ -0,0 +1,60 @@
+"""
+algorithm benchmark test
+"""
+
+import tracemalloc
+import unittest
+
+from hello_python.bench.algo import ALGORITHMS, make_input, measure, run_benchmark
+
+
+class TestAlgoBench(unittest.TestCase):
+    """
+    TestAlgoBench
+    """
+
+    def test_make_input(self):
+        """
+        test inputs are lists for python and arrays for numpy
+        """
+        self.assertIsInstance(make_input("values", 10, "python"), list)
+        values, queries = make_input("sorted", 10, "numpy")
+        self.assertEqual(values.tolist(), sorted(values.tolist()))
+        self.assertEqual(make_input("intervals", 10, "numpy").shape, (10, 2))
+
+    def test_run_benchmark(self):
+        """
+        test every algorithm reports time and memory, python stops at python_max
+        """
+        rows = run_benchmark(sizes=(1_000, 5_000), python_max=1_000)
+        cases = {(row["algorithm"], row["size"], row["backend"]) for row in rows}
+        self.assertEqual({row["algorithm"] for row in rows}, set(ALGORITHMS))
+        self.assertIn(("sort", 5_000, "numpy"), cases)
+        self.assertNotIn(("sort", 5_000, "python"), cases)
+        self.assertNotIn(("merge_sort", 1_000, "numpy"), cases)
+        self.assertTrue(all(row["ms"] > 0 and row["peak MB"] > 0 for row in rows))
+
+    def test_measure_leaves_running_trace(self):
+        """
+        test memory is not measured while tracemalloc is already tracing
+        """
+        tracemalloc.start()
+        try:
+            result = measure(lambda: [0] * 1000)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(result["peak MB"], "-")
+        self.assertGreater(measure(lambda: [0] * 1000)["peak MB"], 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_unknown_algorithm(self):
+        """
+        test an unknown algorithm name is rejected
+        """
+        with self.assertRaises(ValueError):
+            run_benchmark(sizes=(10,), algorithms=("bogosort",))
+
+
+if __name__ == "__main__":
+    unittest.main()
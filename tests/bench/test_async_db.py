@@ -0,0 +1,30 @@
+"""
+async db benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.async_db import VARIANTS, run_benchmark
+
+
+class TestAsyncDBBench(unittest.TestCase):
+    """
+    TestAsyncDBBench
+    """
+
+    def test_run_benchmark(self):
+        """
+        test every variant answers and is measured per concurrency level
+        """
+        rows = run_benchmark(duration=0.3, concurrency=(1, 4), query_ms=1, rows=1000)
+        self.assertEqual(
+            [(row["variant"], row["concurrency"]) for row in rows],
+            [(variant, clients) for variant in VARIANTS for clients in (1, 4)],
+        )
+        for row in rows:
+            self.assertGreater(row["requests"], 0)
+            self.assertGreater(row["req/s"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
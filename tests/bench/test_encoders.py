@@ -0,0 +1,30 @@
+"""
+encoders benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.encoders import run_benchmark
+
+
+class TestEncodersBench(unittest.TestCase):
+    """
+    TestEncodersBench
+    """
+
+    def test_run_benchmark(self):
+        """
+        test every case produces the baseline output and is timed
+        """
+        rows = run_benchmark(n=200, repeat=1)
+        self.assertEqual(
+            [(row["objects"], row["encoder"]) for row in rows][:2],
+            [("Variety", "variety_encoder"), ("Variety", "registry")],
+        )
+        self.assertEqual(len(rows), 11)
+        self.assertTrue(all(row["seconds"] > 0 for row in rows))
+        self.assertEqual(rows[0]["speedup"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+gradient descent benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.gradient_descent import VARIANTS, run_benchmark, scalar_descent
+
+
+class TestGradientDescentBench(unittest.TestCase):
+    """
+    TestGradientDescentBench
+    """
+
+    def test_scalar_descent(self):
+        """
+        test the scalar baseline converges to the minimum
+        """
+        self.assertAlmostEqual(scalar_descent(-20.0, 0.1, 1e-6, 1000), 3, delta=0.01)
+
+    def test_run_benchmark(self):
+        """
+        test the batched run solves every problem faster than the Python loop
+        """
+        rows = {row["variant"]: row for row in run_benchmark(problems=20_000, sample=2_000)}
+        self.assertEqual(list(rows), list(VARIANTS))
+        self.assertEqual(rows["loop"]["solved"], 2_000)
+        self.assertEqual(rows["batched"]["solved"], 20_000)
+        for row in rows.values():
+            self.assertLess(row["max |x-3|"], 0.01)
+        self.assertLess(rows["batched"]["seconds"], rows["loop"]["seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
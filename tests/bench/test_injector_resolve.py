@@ -0,0 +1,37 @@
+"""
+injector resolve benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.injector_resolve import VARIANTS, build_graph, run_benchmark
+
+
+class TestInjectorResolveBench(unittest.TestCase):
+    """
+    TestInjectorResolveBench
+    """
+
+    def test_build_graph(self):
+        """
+        test the graph is a binary tree of injectable classes
+        """
+        classes = build_graph(5)
+        self.assertEqual([cls.__name__ for cls in classes], [f"Node{i}" for i in range(5)])
+        self.assertEqual(
+            classes[1].__init__.__annotations__, {"child3": classes[3], "child4": classes[4]}
+        )
+
+    def test_run_benchmark(self):
+        """
+        test compiled plans build the same graph for less than Injector.get
+        """
+        rows = {row["variant"]: row for row in run_benchmark(nodes=20, repeat=50)}
+        self.assertEqual(list(rows), list(VARIANTS))
+        self.assertEqual(rows["injector"]["nodes"], 20)
+        self.assertEqual(rows["compiled"]["nodes"], 20)
+        self.assertLess(rows["compiled"]["us/request"], rows["injector"]["us/request"])
+
+
+if __name__ == "__main__":
+    unittest.main()
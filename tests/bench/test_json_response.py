@@ -0,0 +1,41 @@
+"""
+json response benchmark test
+"""
+
+import json
+import unittest
+
+from hello_python.bench import format_table
+from hello_python.bench.json_response import VARIANTS, make_payload, run_benchmark
+
+
+class TestJSONResponseBench(unittest.TestCase):
+    """
+    TestJSONResponseBench
+    """
+
+    def test_make_payload(self):
+        """
+        test the generated payload is close to the requested size
+        """
+        size = len(json.dumps(make_payload(1 << 16), ensure_ascii=False).encode("utf-8"))
+        self.assertGreater(size, (1 << 16) * 0.9)
+        self.assertLess(size, (1 << 16) * 1.1)
+
+    def test_run_benchmark(self):
+        """
+        test every variant serves the same payload and reports req/s and cpu
+        """
+        rows = run_benchmark(duration=0.2, concurrency=1, payloads=("small",), warmup=1)
+        self.assertEqual([row["variant"] for row in rows], list(VARIANTS))
+        self.assertEqual(len({row["bytes"] for row in rows}), 1)
+        for row in rows:
+            self.assertGreater(row["requests"], 0)
+            self.assertGreater(row["req/s"], 0)
+        table = format_table(rows)
+        self.assertIn("cpu ms/resp", table.splitlines()[0])
+        self.assertEqual(len(table.splitlines()), len(rows) + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+loop lag benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.loop_lag import VARIANTS, run_benchmark, split
+
+
+class TestLoopLagBench(unittest.TestCase):
+    """
+    TestLoopLagBench
+    """
+
+    def test_split(self):
+        """
+        test the work is split into contiguous chunks covering every integer
+        """
+        parts = split(10, 3)
+        self.assertEqual([list(part) for part in parts], [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_run_benchmark(self):
+        """
+        test offloading keeps the loop far more responsive than running inline
+        """
+        rows = {row["variant"]: row for row in run_benchmark(work=3_000_000, chunks=6)}
+        self.assertEqual(list(rows), list(VARIANTS))
+        self.assertLessEqual(rows["inline"]["ticks"], 2)
+        self.assertGreater(rows["offload"]["ticks"], rows["inline"]["ticks"])
+        self.assertLess(rows["offload"]["max ms"], rows["inline"]["max ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
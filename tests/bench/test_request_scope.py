@@ -0,0 +1,26 @@
+"""
+request scope benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.request_scope import VARIANTS, run_benchmark
+
+
+class TestRequestScopeBench(unittest.TestCase):
+    """
+    TestRequestScopeBench
+    """
+
+    def test_run_benchmark(self):
+        """
+        test the compiled request scope adds far less per request than Injector.get
+        """
+        rows = {row["variant"]: row for row in run_benchmark(repeat=500)}
+        self.assertEqual(list(rows), list(VARIANTS))
+        self.assertEqual(rows["bare"]["overhead us"], 0.0)
+        self.assertLess(rows["compiled"]["us/request"], rows["injector"]["us/request"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+"""
+scheduler tick benchmark test
+"""
+
+import unittest
+
+from hello_python.bench.scheduler_tick import VARIANTS, run_benchmark
+
+
+class TestSchedulerTickBench(unittest.TestCase):
+    """
+    TestSchedulerTickBench
+    """
+
+    def test_run_benchmark(self):
+        """
+        test every variant finds exactly the due jobs at every size
+        """
+        rows = run_benchmark(jobs=(20, 200), due=3, repeat=5)
+        self.assertEqual(
+            [(row["variant"], row["jobs"]) for row in rows],
+            [(variant, jobs) for variant in VARIANTS for jobs in (20, 200)],
+        )
+        for row in rows:
+            self.assertEqual(row["due"], 3)
+            self.assertGreater(row["tick ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+sqlite load benchmark test
+"""
+
+import unittest
+
+from click.testing import CliRunner
+
+from hello_python.bench.sqlite_load import CASES, run_benchmark
+from hello_python.cli import cli
+
+
+class TestSQLiteLoadBench(unittest.TestCase):
+    """
+    TestSQLiteLoadBench
+    """
+
+    def test_run_benchmark(self):
+        """
+        test every case loads all rows and is timed against row-by-row
+        """
+        rows = run_benchmark(rows=2000, batch_size=500)
+        self.assertEqual([row["case"] for row in rows], list(CASES))
+        self.assertTrue(all(row["rows/s"] > 0 for row in rows))
+        self.assertEqual(rows[1]["speedup"], 1.0)
+        self.assertGreater(rows[3]["index s"], 0)
+
+    def test_cli(self):
+        """
+        test hello bench sqlite-load
+        """
+        result = CliRunner().invoke(cli, ["bench", "sqlite-load", "--rows", "1000"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("bulk+deferred", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
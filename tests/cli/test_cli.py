@@ -1,13 +1,38 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 
 # import coverage
 
 from hello_python.cli import cli
+from hello_python.cli import commands
+from hello_python.cli.startup import ImportProfiler
 from click.testing import CliRunner
 from unittest.mock import patch
 import click
 
 
+def run_hello(*args, env=None):
+    """Run the hello CLI in a fresh interpreter, so sys.modules starts clean."""
+    code = (
+        "import sys\n"
+        "from hello_python.cli import cli\n"
+        "try:\n"
+        "    cli.main(sys.argv[1:], prog_name='hello')\n"
+        "finally:\n"
+        "    print(','.join(sorted(m for m in sys.modules if m.startswith('hello_python'))),"
+        " file=sys.stderr)\n"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+
+
 class TestCliCase(unittest.TestCase):
     """
     TestCliExample
@@ -20,6 +45,97 @@ class TestCliCase(unittest.TestCase):
         result = runner.invoke(cli, ["greet", "Alice"])
         # self.assertEqual(result.return_value, "ok", "not equal message")
 
+    def test_list_commands(self):
+        """lazy commands are listed from the manifest"""
+        names = cli.list_commands(click.Context(cli))
+        self.assertIn("greet", names)
+        self.assertIn("fastapi", names)
+        self.assertIn("agent", names)
+        self.assertIn("bench", names)
+        self.assertIn("json", names)
+        self.assertIn("leetcode", names)
+
+    def test_greet_does_not_import_commands(self):
+        """a short command does not import the command modules"""
+        result = run_hello("greet", "Alice")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Hello, Alice!", result.stdout)
+        self.assertNotIn("hello_python.cli.commands.fastapi", result.stderr)
+        self.assertNotIn("hello_python.advance.fastapi_server_sample", result.stderr)
+
+    def test_help_does_not_import_commands(self):
+        """--help renders lazy command help from the manifest"""
+        result = run_hello("--help")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("A command-line tool to manage the FastAPI service.", result.stdout)
+        self.assertNotIn("hello_python.cli.commands.fastapi", result.stderr)
+
+    def test_lazy_command_is_loaded_on_invoke(self):
+        """invoking a lazy command imports its module"""
+        result = run_hello("fastapi", "--help")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Starts the FastAPI service.", result.stdout)
+        self.assertIn("hello_python.cli.commands.fastapi", result.stderr)
+
+    def test_startup_profile(self):
+        """--startup-profile prints per-module import cost"""
+        result = run_hello("--startup-profile", "agent", "--help")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("startup profile:", result.stderr)
+        self.assertIn("hello_python.cli.commands.agent", result.stderr)
+
+    def test_manifest_cache(self):
+        """the manifest is written to and read back from the cache file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            with patch.dict(os.environ, {commands.MANIFEST_ENV: path}):
+                manifest = commands.load_manifest(refresh=True)
+                self.assertTrue(os.path.exists(path))
+                self.assertEqual(commands._load_cached_manifest(path), manifest)
+            commands.load_manifest(refresh=True)
+
+    def test_schedule_commands(self):
+        """hello schedule lists, pauses, resumes and runs jobs in the SQLite store"""
+        from hello_python.utils.scheduler import create_scheduler
+
+        with tempfile.TemporaryDirectory() as tmp:
+            database = os.path.join(tmp, "jobs.db")
+            scheduler = create_scheduler(database)
+            scheduler.start(paused=True)
+            scheduler.add_job(sorted, "interval", minutes=1, args=([3, 1, 2],), id="sort")
+            scheduler.shutdown()
+
+            runner = CliRunner()
+            # --help 不打开也不创建数据库
+            missing = os.path.join(tmp, "missing.db")
+            result = runner.invoke(cli, ["schedule", "--db", missing, "list", "--help"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertFalse(os.path.exists(missing))
+
+            def invoke(*args):
+                result = runner.invoke(cli, ["schedule", "--db", database, *args])
+                self.assertEqual(result.exit_code, 0, result.output)
+                return result.output
+
+            self.assertIn("Job sort finished: [1, 2, 3]", invoke("run", "sort"))
+            self.assertIn("Job sort paused.", invoke("pause", "sort"))
+            listing = invoke("list")
+            self.assertIn("paused", listing)
+            self.assertRegex(listing, r"sort\s+sorted\s+interval\[0:01:00\]\s+paused\s+1\s+0")
+            self.assertIn("Job sort resumed", invoke("resume", "sort"))
+            result = runner.invoke(cli, ["schedule", "--db", database, "pause", "missing"])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("No job with id 'missing'", result.output)
+
+    def test_import_profiler(self):
+        """ImportProfiler records only newly imported modules"""
+        sys.modules.pop("colorsys", None)
+        with ImportProfiler() as profiler:
+            import colorsys  # noqa: F401
+            import os  # noqa: F401
+        names = [record.name for record in profiler.records]
+        self.assertEqual(names, ["colorsys"])
+
 
 if __name__ == "__main__":
     unittest.main()
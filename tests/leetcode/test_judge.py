@@ -0,0 +1,227 @@
+"""
+judge test
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from click.testing import CliRunner
+
+from hello_python.cli import cli
+from hello_python.leetcode import PROBLEMS, get_problem, problem
+from hello_python.leetcode.judge import (
+    CaseResult,
+    GrowthFit,
+    JudgeReport,
+    find_regressions,
+    fit_growth,
+    judge,
+    load_baseline,
+    run_case,
+    save_baseline,
+)
+
+
+# 评测的子进程导入本模块完成这些题目的注册
+def _gen(size, rng):
+    return (size,)
+
+
+@problem(9101, "judge-sum", generate=_gen, check=lambda args, result: result == args[0] * 7)
+def judge_sum(n):
+    """Judge Sum: adds n seven times."""
+    return sum([n] * 7)
+
+
+@problem(9102, "judge-wrong", generate=_gen, check=lambda args, result: False)
+def judge_wrong(n):
+    """Judge Wrong: always wrong."""
+    return n
+
+
+@problem(9103, "judge-raise", generate=_gen)
+def judge_raise(n):
+    """Judge Raise: raises."""
+    raise ValueError(f"bad input {n}")
+
+
+@problem(9104, "judge-sleep", generate=_gen)
+def judge_sleep(n):
+    """Judge Sleep: never finishes in time."""
+    time.sleep(30)
+
+
+@problem(9105, "judge-memory", generate=_gen)
+def judge_memory(n):
+    """Judge Memory: holds n bytes for a while."""
+    data = b"x" * n
+    time.sleep(2)
+    return len(data)
+
+
+def tearDownModule():
+    for slug in ("judge-sum", "judge-wrong", "judge-raise", "judge-sleep", "judge-memory"):
+        PROBLEMS.pop(slug, None)
+
+
+class TestJudge(unittest.TestCase):
+    """
+    TestJudge
+    """
+
+    def test_verdicts(self):
+        """
+        test each case runs in a subprocess and gets AC, WA, RE, TLE or MLE
+        """
+        accepted = run_case(get_problem("judge-sum"), 1000)
+        self.assertEqual(accepted.verdict, "AC")
+        self.assertGreater(accepted.seconds, 0)
+        self.assertGreater(accepted.calls, 1)
+        self.assertGreater(accepted.peak_rss_mb, 1)
+
+        self.assertEqual(run_case(get_problem("judge-wrong"), 10).verdict, "WA")
+
+        error = run_case(get_problem("judge-raise"), 10)
+        self.assertEqual(error.verdict, "RE")
+        self.assertIn("ValueError: bad input 10", error.error)
+
+        started = time.monotonic()
+        timeout = run_case(get_problem("judge-sleep"), 10, time_limit=0.2)
+        self.assertEqual(timeout.verdict, "TLE")
+        self.assertLess(time.monotonic() - started, 20)
+
+        memory = run_case(get_problem("judge-memory"), 300 << 20, memory_limit_mb=200)
+        self.assertEqual(memory.verdict, "MLE")
+        self.assertGreater(memory.peak_rss_mb, 200)
+
+    def test_judge_stops_after_time_limit(self):
+        """
+        test larger sizes are skipped once a size exceeds the time limit
+        """
+        report = judge(get_problem("judge-sleep"), sizes=(100, 10), time_limit=0.2)
+        self.assertEqual([case.size for case in report.cases], [10])
+        self.assertFalse(report.accepted)
+        self.assertIsNone(report.growth)
+
+    def test_fit_growth(self):
+        """
+        test the fitted model and exponent on synthetic timings
+        """
+        sizes = [1_000, 10_000, 100_000, 1_000_000]
+        cases = {
+            "1": [2e-6] * 4,
+            "n": [n * 1e-8 for n in sizes],
+            "n log n": [n * (n.bit_length()) * 1e-9 for n in sizes],
+            "n^2": [n * n * 1e-12 for n in sizes],
+        }
+        for complexity, seconds in cases.items():
+            with self.subTest(complexity=complexity):
+                fit = fit_growth(sizes, seconds)
+                self.assertEqual(fit.complexity, complexity)
+        self.assertAlmostEqual(fit_growth(sizes, cases["n^2"]).exponent, 2.0)
+        self.assertIsNone(fit_growth([1_000], [1e-3]))
+        self.assertIsNone(fit_growth([1_000, 1_000], [1e-3, 2e-3]))
+
+
+class TestBaseline(unittest.TestCase):
+    """
+    TestBaseline
+    """
+
+    def setUp(self):
+        self.item = get_problem("judge-sum")
+        self.path = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        self.baseline = JudgeReport(
+            problem=self.item,
+            cases=[
+                CaseResult(1_000, "AC", 0.001, 1, 40.0),
+                CaseResult(10_000, "AC", 0.01, 1, 40.0),
+            ],
+            growth=GrowthFit("n", 1.0),
+        )
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def test_save_and_load(self):
+        """
+        test the baseline keeps the accepted cases and other problems in the file
+        """
+        self.assertEqual(load_baseline(self.path), {})
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "problems": {"other": {"cases": {}}}}, f)
+        self.baseline.cases.append(CaseResult(100_000, "TLE"))
+        save_baseline(self.path, [self.baseline])
+        stored = load_baseline(self.path)
+        self.assertEqual(set(stored), {"other", "judge-sum"})
+        self.assertEqual(set(stored["judge-sum"]["cases"]), {"1000", "10000"})
+        self.assertEqual(stored["judge-sum"]["exponent"], 1.0)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 99, "problems": {}}, f)
+        with self.assertRaises(ValueError):
+            load_baseline(self.path)
+
+    def test_find_regressions(self):
+        """
+        test slower, larger, failing and faster-growing results are flagged
+        """
+        save_baseline(self.path, [self.baseline])
+        baseline = load_baseline(self.path)
+        self.assertEqual(find_regressions(self.baseline, baseline), [])
+        self.assertEqual(find_regressions(self.baseline, {}), [])
+
+        report = JudgeReport(
+            problem=self.item,
+            cases=[
+                CaseResult(1_000, "AC", 0.0012, 1, 100.0),
+                CaseResult(10_000, "AC", 0.1, 1, 40.0),
+                CaseResult(100_000, "TLE"),
+            ],
+            growth=GrowthFit("n^2", 1.9),
+        )
+        messages = find_regressions(report, baseline)
+        self.assertEqual(len(messages), 3)
+        self.assertIn("n=1000: peak RSS", messages[0])
+        self.assertIn("n=10000: 100.000 ms vs 10.000 ms", messages[1])
+        self.assertIn("grows as n^1.90", messages[2])
+
+        report.cases[1] = CaseResult(10_000, "WA", 0.01, 1, 40.0)
+        self.assertIn("n=10000: WA", find_regressions(report, baseline)[1])
+
+    def test_cli(self):
+        """
+        test hello leetcode judge writes a baseline and exits 1 on regressions
+        """
+        runner = CliRunner()
+        args = ["leetcode", "judge", "judge-sum", "--size", "10", "--size", "100000"]
+        result = runner.invoke(cli, [*args, "--baseline", self.path, "--update-baseline"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("9101. Judge Sum", result.output)
+        self.assertIn("growth: O(", result.output)
+        self.assertEqual(set(load_baseline(self.path)["judge-sum"]["cases"]), {"10", "100000"})
+
+        result = runner.invoke(cli, [*args, "--baseline", self.path])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["problems"]["judge-sum"]["exponent"] = -1.0
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        result = runner.invoke(cli, [*args, "--baseline", self.path])
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertIn("REGRESSION judge-sum: grows as", result.output)
+
+        result = runner.invoke(cli, ["leetcode", "judge", "judge-wrong", "--size", "10"])
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertIn("WA", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+registry test
+"""
+
+import unittest
+
+from hello_python.leetcode import PROBLEMS, all_problems, get_problem, problem
+
+
+def _gen(size, rng):
+    return (size,)
+
+
+class TestRegistry(unittest.TestCase):
+    """
+    TestRegistry
+    """
+
+    def tearDown(self):
+        PROBLEMS.pop("registry-test", None)
+
+    def test_problem_decorator(self):
+        """
+        test the decorator registers the problem and returns the function unchanged
+        """
+
+        def solve(n):
+            """Registry Test: returns n."""
+            return n
+
+        self.assertIs(problem(9001, "registry-test", generate=_gen)(solve), solve)
+        item = get_problem("registry-test")
+        self.assertEqual(item.id, 9001)
+        self.assertEqual(item.title, "Registry Test")
+        self.assertEqual(item.module, __name__)
+        self.assertIs(get_problem(9001), item)
+        self.assertIs(get_problem("9001"), item)
+
+    def test_conflicts_are_rejected(self):
+        """
+        test another function can not reuse a registered id or slug
+        """
+        with self.assertRaises(ValueError):
+            problem(1, "registry-test", generate=_gen)(lambda n: n)
+        with self.assertRaises(ValueError):
+            problem(9001, "two-sum", generate=_gen)(lambda n: n)
+        with self.assertRaises(ValueError):
+            problem(9001, "registry-test", generate=_gen, complexity="2^n")
+
+    def test_get_problem(self):
+        """
+        test unknown problems raise KeyError and the listing is sorted by id
+        """
+        with self.assertRaises(KeyError):
+            get_problem("no-such-problem")
+        with self.assertRaises(KeyError):
+            get_problem(0)
+        ids = [item.id for item in all_problems()]
+        self.assertEqual(ids, sorted(ids))
+        self.assertIn(1, ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
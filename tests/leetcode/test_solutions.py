@@ -0,0 +1,79 @@
+"""
+leetcode solutions test
+"""
+
+import unittest
+
+import numpy as np
+
+from hello_python.leetcode import all_problems
+from hello_python.leetcode.arrays import (
+    find_kth_largest,
+    max_sub_array,
+    merge,
+    three_sum,
+    top_k_frequent,
+    two_sum,
+)
+from hello_python.leetcode.searching import min_eating_speed, search_insert
+from hello_python.leetcode.strings import is_valid, length_of_longest_substring
+
+
+class TestSolutions(unittest.TestCase):
+    """
+    TestSolutions
+    """
+
+    def test_examples(self):
+        """
+        test the examples from the problem statements
+        """
+        self.assertEqual(two_sum([2, 7, 11, 15], 9), [0, 1])
+        self.assertEqual(length_of_longest_substring("abcabcbb"), 3)
+        self.assertEqual(length_of_longest_substring("pwwkew"), 3)
+        self.assertEqual(length_of_longest_substring(""), 0)
+        self.assertEqual(three_sum([-1, 0, 1, 2, -1, -4]), [[-1, -1, 2], [-1, 0, 1]])
+        self.assertEqual(three_sum([0, 0, 0, 0]), [[0, 0, 0]])
+        self.assertTrue(is_valid("()[]{}"))
+        self.assertFalse(is_valid("(]"))
+        self.assertFalse(is_valid("(("))
+        self.assertEqual(search_insert([1, 3, 5, 6], 5), 2)
+        self.assertEqual(search_insert([1, 3, 5, 6], 7), 4)
+        self.assertEqual(max_sub_array([-2, 1, -3, 4, -1, 2, 1, -5, 4]), 6)
+        self.assertEqual(max_sub_array([-3, -1]), -1)
+        self.assertEqual(merge([[1, 3], [2, 6], [8, 10], [15, 18]]), [[1, 6], [8, 10], [15, 18]])
+        self.assertEqual(merge([[1, 4], [4, 5]]), [[1, 5]])
+        self.assertEqual(find_kth_largest([3, 2, 1, 5, 6, 4], 2), 5)
+        self.assertEqual(sorted(top_k_frequent([1, 1, 1, 2, 2, 3], 2)), [1, 2])
+        self.assertEqual(min_eating_speed([3, 6, 7, 11], 8), 4)
+        self.assertEqual(min_eating_speed([30, 11, 23, 4, 20], 5), 30)
+
+    def test_generated_inputs_pass_their_checks(self):
+        """
+        test every registered solution passes its checker on a small generated input
+        """
+        for item in all_problems():
+            with self.subTest(problem=item.slug):
+                args = item.generate(500, np.random.default_rng(1))
+                self.assertTrue(item.check(args, item.solve(*args)))
+
+    def test_checks_reject_wrong_answers(self):
+        """
+        test the checkers are not trivially true
+        """
+        rng = np.random.default_rng(2)
+        for item in all_problems():
+            if item.slug == "valid-parentheses":
+                continue
+            with self.subTest(problem=item.slug):
+                args = item.generate(500, rng)
+                answer = item.solve(*args)
+                if isinstance(answer, int):
+                    wrong = answer + 1
+                else:
+                    wrong = answer[:-1]
+                self.assertFalse(item.check(args, wrong))
+
+
+if __name__ == "__main__":
+    unittest.main()
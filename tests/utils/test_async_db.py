@@ -0,0 +1,234 @@
+"""
+async_db test
+"""
+
+import asyncio
+import functools
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from hello_python.utils.async_db import AsyncPool, AsyncSQLite, QueryTimeout
+from hello_python.utils.db_pool import ConnectionPool
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+    return conn
+
+
+# 不会自然结束的查询, 只能被 interrupt 或超时放弃
+ENDLESS = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT COUNT(*) FROM n"
+)
+
+
+async def ticks_during(coro, interval=0.01):
+    """运行 coro 的同时计数事件循环能调度多少次 ticker。"""
+    ticks = 0
+    done = False
+
+    async def ticker():
+        nonlocal ticks
+        while not done:
+            await asyncio.sleep(interval)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        return await coro, ticks
+    finally:
+        done = True
+        await task
+
+
+class FakeMySQL:
+    """PyMySQL 风格的连接: 有 thread_id(), 执行 KILL QUERY 中止另一个连接上的查询。"""
+
+    connections = {}
+
+    def __init__(self):
+        self.id = len(FakeMySQL.connections) + 1
+        self.killed = threading.Event()
+        FakeMySQL.connections[self.id] = self
+
+    def thread_id(self):
+        return self.id
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if sql.startswith("KILL QUERY "):
+            FakeMySQL.connections[int(sql.split()[-1])].killed.set()
+        elif "SLEEP" in sql and self.conn.killed.wait(5):
+            raise RuntimeError("Query execution was interrupted")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class TestAsyncDB(unittest.TestCase):
+    """
+    TestAsyncDB
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.connector = functools.partial(connect, os.path.join(self.tmp.name, "async.db"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sqlite_queries(self):
+        """
+        test AsyncSQLite runs every query on its one dedicated thread
+        """
+
+        async def main():
+            async with AsyncSQLite(self.connector) as db:
+                await db.execute("CREATE TABLE items (name TEXT)")
+                inserted = await db.execute(
+                    "INSERT INTO items VALUES (?), (?)", ("apple", "tomato")
+                )
+                rows = await db.fetchall("SELECT name FROM items ORDER BY name")
+                one = await db.fetchone("SELECT COUNT(*) FROM items")
+                threads = {await db.run(lambda conn: threading.get_ident()) for _ in range(5)}
+            return inserted, rows, one, threads
+
+        inserted, rows, one, threads = asyncio.run(main())
+        self.assertEqual((inserted, rows, one), (2, [("apple",), ("tomato",)], (2,)))
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_event_loop_not_blocked(self):
+        """
+        test the loop keeps running other coroutines while a query is in flight
+        """
+
+        async def main():
+            async with AsyncSQLite(self.connector) as db:
+                return await ticks_during(db.fetchone("SELECT sleep_ms(300)"))
+
+        row, ticks = asyncio.run(main())
+        self.assertEqual(row, (300,))
+        self.assertGreater(ticks, 10)
+
+    def test_sqlite_timeout_interrupts(self):
+        """
+        test a timed out SQLite query is interrupted, queued ones are cancelled
+        """
+
+        async def main():
+            async with AsyncSQLite(self.connector, timeout=5) as db:
+                started = time.perf_counter()
+                with self.assertRaises(QueryTimeout):
+                    await db.fetchone(ENDLESS, timeout=0.1)
+                elapsed = time.perf_counter() - started
+                # 被中断后连接仍可用
+                self.assertEqual(await db.fetchone("SELECT 1"), (1,))
+                ran = []
+                slow = asyncio.create_task(db.fetchone("SELECT sleep_ms(200)"))
+                await asyncio.sleep(0.02)
+                with self.assertRaises(QueryTimeout):
+                    await db.run(lambda conn: ran.append(1), timeout=0.05)
+                self.assertEqual(await slow, (200,))
+                await db.fetchone("SELECT 1")
+                return elapsed, ran
+
+        elapsed, ran = asyncio.run(main())
+        self.assertLess(elapsed, 2)
+        self.assertEqual(ran, [])
+
+    def test_pool_concurrency(self):
+        """
+        test AsyncPool runs queries in parallel on pooled connections
+        """
+
+        async def main():
+            pool = ConnectionPool(self.connector, min_size=0, max_size=4)
+            async with AsyncPool(pool) as db:
+                started = time.perf_counter()
+                rows = await asyncio.gather(
+                    *(db.fetchone("SELECT sleep_ms(200)") for _ in range(4))
+                )
+                elapsed = time.perf_counter() - started
+                stats = pool.stats()
+            return rows, elapsed, stats
+
+        rows, elapsed, stats = asyncio.run(main())
+        self.assertEqual(rows, [(200,)] * 4)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual((stats["created"], stats["in_use"]), (4, 0))
+
+    def test_pool_errors_and_timeout(self):
+        """
+        test errors return the connection, an abandoned query's connection is discarded
+        """
+
+        async def main():
+            pool = ConnectionPool(self.connector, min_size=1, max_size=2)
+            async with AsyncPool(pool, timeout=0.1) as db:
+                with self.assertRaises(sqlite3.OperationalError):
+                    await db.fetchall("SELECT * FROM missing")
+                self.assertEqual(pool.stats()["idle"], 1)
+                with self.assertRaises(QueryTimeout):
+                    await db.fetchone("SELECT sleep_ms(300)")
+                await asyncio.sleep(0.4)
+                after_timeout = pool.stats()
+                self.assertEqual(await db.fetchone("SELECT 1", timeout=None), (1,))
+            return after_timeout, pool.stats()
+
+        after_timeout, closed = asyncio.run(main())
+        self.assertEqual(after_timeout["size"], 0)
+        self.assertEqual(closed["size"], 0)
+
+    def test_pool_timeout_kills_mysql_query(self):
+        """
+        test a timed-out query on a MySQL-style connection is killed from a side connection
+        """
+
+        async def main():
+            pool = ConnectionPool(FakeMySQL, min_size=1, max_size=1)
+            async with AsyncPool(pool, timeout=0.1) as db:
+                started = time.monotonic()
+                with self.assertRaises(QueryTimeout):
+                    await db.fetchone("SELECT SLEEP(60)")
+                conn = FakeMySQL.connections[1]
+                self.assertTrue(await asyncio.to_thread(conn.killed.wait, 5))
+                # 被中止的查询很快结束, 线程和连接池都可以继续使用
+                self.assertEqual(await db.fetchone("SELECT 1", timeout=5), (1,))
+                return time.monotonic() - started
+
+        FakeMySQL.connections.clear()
+        self.assertLess(asyncio.run(main()), 4)
+        self.assertEqual(len(FakeMySQL.connections), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,276 @@
+"""
+db_pool test
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from hello_python.utils.db_pool import (
+    ConnectionPool,
+    PoolError,
+    PoolTimeout,
+    sqlite_connector,
+)
+
+
+class FakeConnection:
+    """PyMySQL 风格的连接: 有 ping(reconnect=...)"""
+
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.closed = False
+        self.pings = []
+        self.rollbacks = 0
+        self.rollback_fails = False
+
+    def ping(self, reconnect=False):
+        self.pings.append(reconnect)
+        if not self.healthy:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        if self.rollback_fails:
+            raise ConnectionError("lost connection")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    def __init__(self):
+        self.connections = []
+
+    def __call__(self):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    TestConnectionPool
+    """
+
+    def setUp(self):
+        self.connector = FakeConnector()
+
+    def test_reuse(self):
+        """
+        test connections are reused and health-checked with ping(reconnect=True)
+        """
+        with ConnectionPool(self.connector, min_size=1) as pool:
+            self.assertEqual(len(self.connector.connections), 1)
+            for _ in range(5):
+                with pool.connection() as conn:
+                    self.assertIs(conn, self.connector.connections[0])
+            self.assertEqual(conn.pings, [True] * 5)
+            self.assertEqual(pool.stats()["created"], 1)
+        self.assertTrue(conn.closed)
+
+    def test_broken_connection_replaced(self):
+        """
+        test a connection failing the health check is closed and replaced
+        """
+        pool = ConnectionPool(self.connector, min_size=1)
+        broken = self.connector.connections[0]
+        broken.healthy = False
+        with pool.connection() as conn:
+            self.assertIsNot(conn, broken)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_max_size_and_timeout(self):
+        """
+        test acquire waits for a release and times out when the pool is exhausted
+        """
+        pool = ConnectionPool(self.connector, min_size=0, max_size=2)
+        first, second = pool.acquire(), pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(timeout=0.05)
+        threading.Timer(0.05, pool.release, args=(first,)).start()
+        self.assertIs(pool.acquire(timeout=5), first)
+        self.assertEqual(len(self.connector.connections), 2)
+        pool.release(first)
+        pool.release(second)
+
+    def test_threads(self):
+        """
+        test concurrent use never opens more than max_size connections
+        """
+        pool = ConnectionPool(self.connector, min_size=0, max_size=3)
+        in_use = set()
+        errors = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(50):
+                with pool.connection() as conn:
+                    with lock:
+                        if id(conn) in in_use:
+                            errors.append("connection handed out twice")
+                        in_use.add(id(conn))
+                    time.sleep(0.0005)
+                    with lock:
+                        in_use.discard(id(conn))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        stats = pool.stats()
+        self.assertLessEqual(stats["created"], 3)
+        self.assertEqual((stats["in_use"], stats["idle"]), (0, stats["size"]))
+
+    def test_idle_eviction(self):
+        """
+        test idle connections beyond min_size are closed after max_idle
+        """
+        pool = ConnectionPool(self.connector, min_size=1, max_size=5, max_idle=0.05)
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+        time.sleep(0.1)
+        self.assertEqual(pool.evict_idle(), 2)
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual(sum(conn.closed for conn in conns), 2)
+
+        # 归还连接时也回收其他空闲超时的连接
+        conns = [pool.acquire() for _ in range(3)]
+        pool.release(conns[0])
+        pool.release(conns[1])
+        time.sleep(0.1)
+        pool.release(conns[2])
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual([conn.closed for conn in conns], [True, True, False])
+
+    def test_max_lifetime(self):
+        """
+        test connections older than max_lifetime are recycled
+        """
+        pool = ConnectionPool(self.connector, min_size=0, max_lifetime=0.05)
+        with pool.connection() as old:
+            pass
+        time.sleep(0.1)
+        with pool.connection() as new:
+            self.assertIsNot(new, old)
+        self.assertTrue(old.closed)
+        # 借出期间过期的连接在归还时关闭
+        conn = pool.acquire()
+        time.sleep(0.1)
+        pool.release(conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_rollback_on_error(self):
+        """
+        test an exception rolls back, and a failing rollback discards the connection
+        """
+        pool = ConnectionPool(self.connector, min_size=1)
+        with self.assertRaises(KeyError):
+            with pool.connection() as conn:
+                raise KeyError("boom")
+        self.assertEqual((conn.rollbacks, conn.closed), (1, False))
+        conn.rollback_fails = True
+        with self.assertRaises(KeyError):
+            with pool.connection() as conn:
+                raise KeyError("boom")
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_release_rolls_back_uncommitted_work(self):
+        """
+        test uncommitted work is rolled back on release, a failing rollback closes the connection
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = ConnectionPool(sqlite_connector(os.path.join(tmp, "pool.db")), max_size=1)
+            with pool.connection() as conn:
+                conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+                conn.commit()
+            with pool.connection() as first:
+                first.execute("INSERT INTO items DEFAULT VALUES")
+                self.assertTrue(first.in_transaction)
+            with pool.connection() as second:
+                self.assertIs(second, first)
+                self.assertFalse(second.in_transaction)
+                self.assertEqual(second.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0)
+            pool.close()
+
+        pool = ConnectionPool(self.connector, min_size=1)
+        conn = pool.acquire()
+        conn.rollback_fails = True
+        pool.release(conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_close(self):
+        """
+        test a closed pool rejects acquire and closes connections on release
+        """
+        pool = ConnectionPool(self.connector, min_size=2)
+        conn = pool.acquire()
+        pool.close()
+        idle = [c for c in self.connector.connections if c is not conn]
+        self.assertTrue(idle[0].closed)
+        self.assertFalse(conn.closed)
+        with self.assertRaises(PoolError):
+            pool.acquire()
+        pool.release(conn)
+        self.assertTrue(conn.closed)
+        with self.assertRaises(PoolError):
+            pool.release(FakeConnection())
+
+    def test_connect_error(self):
+        """
+        test a failing connect frees its slot
+        """
+
+        def refuse():
+            raise ConnectionRefusedError("no server")
+
+        pool = ConnectionPool(refuse, min_size=0, max_size=1)
+        for _ in range(2):
+            with self.assertRaises(ConnectionRefusedError):
+                pool.acquire(timeout=0.05)
+        self.assertEqual(pool.stats()["size"], 0)
+        with self.assertRaises(ConnectionRefusedError):
+            ConnectionPool(refuse, min_size=1)
+
+    def test_sqlite_adapter(self):
+        """
+        test the SQLite adapter: SELECT 1 health check, use from several threads
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = ConnectionPool(sqlite_connector(os.path.join(tmp, "pool.db")), max_size=2)
+            with pool.connection() as conn:
+                conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+                conn.commit()
+
+            def insert():
+                with pool.connection() as conn:
+                    conn.execute("INSERT INTO items DEFAULT VALUES")
+                    conn.commit()
+
+            threads = [threading.Thread(target=insert) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with pool.connection() as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 4)
+                conn.close()
+                self.assertRaises(sqlite3.ProgrammingError, conn.execute, "SELECT 1")
+            # 已关闭的连接通不过健康检查, 自动换新
+            with pool.connection() as fresh:
+                self.assertIsNot(fresh, conn)
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+db_stream test
+"""
+
+import sqlite3
+import tracemalloc
+import unittest
+
+import numpy as np
+import pymysql
+import pymysql.cursors
+
+from hello_python.advance.database_sqlite_sample import (
+    bulk_load_employees,
+    create_employees_table,
+    generate_employees,
+)
+from hello_python.utils.db_stream import (
+    iter_arrays,
+    iter_chunks,
+    iter_dataframes,
+    iter_rows,
+    streaming_cursor,
+)
+
+QUERY = "SELECT id, name, department, salary FROM employees ORDER BY id"
+
+
+class TestDBStream(unittest.TestCase):
+    """
+    TestDBStream
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = sqlite3.connect(":memory:")
+        create_employees_table(cls.conn)
+        bulk_load_employees(cls.conn, generate_employees(2500))
+        cls.expected = cls.conn.execute(QUERY).fetchall()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def test_iter_chunks(self):
+        """
+        test rows come in fetchmany chunks of chunk_size
+        """
+        chunks = list(iter_chunks(self.conn, QUERY, chunk_size=1000))
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+        self.assertEqual([row for chunk in chunks for row in chunk], self.expected)
+        with self.assertRaises(ValueError):
+            list(iter_chunks(self.conn, QUERY, chunk_size=0))
+
+    def test_iter_rows_params(self):
+        """
+        test iter_rows with query parameters and an empty result
+        """
+        rows = list(iter_rows(self.conn, "SELECT name FROM employees WHERE id <= ?", (3,)))
+        self.assertEqual(rows, [("Employee 0",), ("Employee 1",), ("Employee 2",)])
+        self.assertEqual(list(iter_rows(self.conn, "SELECT * FROM employees WHERE 0")), [])
+
+    def test_iter_arrays(self):
+        """
+        test chunks as NumPy structured arrays, inferred or with a fixed dtype
+        """
+        arrays = list(iter_arrays(self.conn, QUERY, chunk_size=1000))
+        self.assertEqual(arrays[0].dtype.names, ("id", "name", "department", "salary"))
+        self.assertEqual(sum(len(array) for array in arrays), 2500)
+        dtype = np.dtype([("id", "i8"), ("name", "U32"), ("department", "U16"), ("salary", "f8")])
+        merged = np.concatenate(list(iter_arrays(self.conn, QUERY, chunk_size=700, dtype=dtype)))
+        self.assertEqual(merged.dtype, dtype)
+        self.assertEqual(merged["salary"].sum(), sum(row[3] for row in self.expected))
+
+    def test_iter_dataframes(self):
+        """
+        test chunks as pandas DataFrames named after the columns
+        """
+        frames = list(iter_dataframes(self.conn, QUERY, chunk_size=1000))
+        self.assertEqual([len(frame) for frame in frames], [1000, 1000, 500])
+        self.assertEqual(list(frames[0].columns), ["id", "name", "department", "salary"])
+        self.assertEqual(frames[2]["id"].iloc[-1], 2500)
+
+    def test_constant_memory(self):
+        """
+        test streaming keeps far less in memory than fetchall
+        """
+        query = "SELECT e.name, f.name FROM employees e, employees f WHERE f.id <= 80"
+
+        tracemalloc.start()
+        rows = self.conn.execute(query).fetchall()
+        fetchall_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del rows
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_rows(self.conn, query, chunk_size=1000))
+        stream_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertEqual(count, 200_000)
+        self.assertLess(stream_peak * 10, fetchall_peak)
+
+    def test_pymysql_uses_sscursor(self):
+        """
+        test PyMySQL connections get an unbuffered server-side cursor
+        """
+        conn = pymysql.connections.Connection(defer_connect=True)
+        self.assertIsInstance(streaming_cursor(conn), pymysql.cursors.SSCursor)
+        self.assertIsInstance(streaming_cursor(self.conn), sqlite3.Cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,301 @@
+"""
+di test
+"""
+
+import asyncio
+import functools
+import threading
+import unittest
+from typing import NewType
+
+from injector import (
+    CircularDependency,
+    ClassProvider,
+    Injector,
+    Module,
+    ThreadLocalScope,
+    UnsatisfiedRequirement,
+    inject,
+    provider,
+    singleton,
+)
+
+from hello_python.utils.di import (
+    CompiledInjector,
+    RequestScopeMiddleware,
+    ScopeError,
+    request_context,
+    request_scope,
+)
+
+Port = NewType("Port", int)
+Url = NewType("Url", str)
+
+
+class Config:
+    def __init__(self):
+        self.host = "localhost"
+
+
+class Client:
+    @inject
+    def __init__(self, config: Config, url: Url):
+        self.config = config
+        self.url = url
+
+
+class Handler:
+    @inject
+    def __init__(self, client: Client, port: Port, config: Config):
+        self.client = client
+        self.port = port
+        self.config = config
+
+
+class ServiceModule(Module):
+    def configure(self, binder):
+        binder.bind(Port, to=8080)
+        binder.bind(Config, scope=singleton)
+
+    @provider
+    def provide_url(self, config: Config, port: Port) -> Url:
+        return f"http://{config.host}:{port}"
+
+
+class Chicken:
+    @inject
+    def __init__(self, egg: "Egg"):
+        self.egg = egg
+
+
+class Egg:
+    @inject
+    def __init__(self, chicken: Chicken):
+        self.chicken = chicken
+
+
+@request_scope
+class Session:
+    @inject
+    def __init__(self, config: Config):
+        self.config = config
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Repository:
+    @inject
+    def __init__(self, session: Session):
+        self.session = session
+
+
+class Broken:
+    def close(self):
+        raise RuntimeError("boom")
+
+
+class TestCompiledInjector(unittest.TestCase):
+    """
+    TestCompiledInjector
+    """
+
+    def setUp(self):
+        self.injector = Injector([ServiceModule()])
+        self.container = CompiledInjector(self.injector)
+
+    def test_get(self):
+        """
+        test classes, provider methods and instance bindings are resolved
+        """
+        handler = self.container.get(Handler)
+        self.assertIsInstance(handler, Handler)
+        self.assertEqual(handler.port, 8080)
+        self.assertEqual(handler.client.url, "http://localhost:8080")
+        self.assertEqual(len(self.container), 5)
+
+    def test_plans_are_reused(self):
+        """
+        test the plan is compiled once and unscoped objects are new on every call
+        """
+        plan = self.container.plan(Handler)
+        first, second = self.container.get(Handler), self.container.get(Handler)
+        self.assertIs(self.container.plan(Handler), plan)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.client, second.client)
+
+    def test_singleton_shared_with_injector(self):
+        """
+        test singletons are the injector's instance, shared by every request
+        """
+        first, second = self.container.get(Handler), self.container.get(Handler)
+        self.assertIs(first.config, second.config)
+        self.assertIs(first.config, first.client.config)
+        self.assertIs(first.config, self.injector.get(Config))
+
+    def test_other_scopes_fall_back(self):
+        """
+        test scopes that are not compiled are still resolved by the injector
+        """
+        self.injector.binder.bind(Client, scope=ThreadLocalScope)
+        here = self.container.get(Handler).client
+        self.assertIs(self.container.get(Handler).client, here)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.container.get(Client)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], here)
+
+    def test_private_attributes_missing(self):
+        """
+        test a provider without the private attributes read by the compiler falls back
+        """
+        provider = ClassProvider(Client)
+        # 模拟 injector 改名了私有属性: 编译器读不到, injector 自己仍能创建
+        provider.get = ClassProvider(Client).get
+        del provider._cls
+        self.injector.binder.bind(Client, to=provider)
+        self.assertIsInstance(self.container.plan(Client), functools.partial)
+        self.assertEqual(self.container.get(Handler).client.url, "http://localhost:8080")
+
+    def test_invalidate(self):
+        """
+        test plans compiled before a binding change are dropped by invalidate
+        """
+        self.assertEqual(self.container.get(Port), 8080)
+        self.injector.binder.bind(Port, to=9090)
+        self.assertEqual(self.container.get(Port), 8080)
+        self.container.invalidate()
+        self.assertEqual(len(self.container), 0)
+        self.assertEqual(self.container.get(Handler).client.url, "http://localhost:9090")
+
+    def test_circular_dependency(self):
+        """
+        test a dependency cycle is reported instead of recursing forever
+        """
+        with self.assertRaises(CircularDependency):
+            self.container.get(Chicken)
+        self.assertEqual(len(self.container), 0)
+
+    def test_unsatisfied(self):
+        """
+        test missing bindings raise the injector's error
+        """
+        container = CompiledInjector(Injector(auto_bind=False))
+        with self.assertRaises(UnsatisfiedRequirement):
+            container.get(Config)
+
+
+class TestRequestScope(unittest.TestCase):
+    """
+    TestRequestScope
+    """
+
+    def setUp(self):
+        self.injector = Injector([ServiceModule()])
+        self.container = CompiledInjector(self.injector)
+
+    def test_shared_within_request(self):
+        """
+        test scoped objects are created lazily and shared for the rest of the request
+        """
+        for container in (self.injector, self.container):
+            with self.subTest(container=type(container).__name__):
+                with request_context() as cache:
+                    self.assertEqual(len(cache), 0)
+                    first = container.get(Repository)
+                    second = container.get(Repository)
+                    self.assertIsNot(first, second)
+                    self.assertIs(first.session, second.session)
+                    self.assertIs(container.get(Session), first.session)
+                    self.assertEqual(len(cache), 1)
+                with request_context():
+                    self.assertIsNot(container.get(Session), first.session)
+                # 单例在请求之间共享
+                self.assertIs(first.session.config, self.injector.get(Config))
+
+    def test_compiled_and_injector_share_instance(self):
+        """
+        test both resolution paths return the same instance within a request
+        """
+        with request_context():
+            self.assertIs(self.container.get(Session), self.injector.get(Session))
+
+    def test_released_at_end(self):
+        """
+        test scoped objects are closed when the request ends, a failing close is logged
+        """
+        self.injector.binder.bind(Broken, scope=request_scope)
+        with self.assertLogs("hello_python.utils.di", "ERROR"):
+            with request_context():
+                session = self.container.get(Session)
+                self.container.get(Broken)
+                self.assertFalse(session.closed)
+        self.assertTrue(session.closed)
+
+    def test_outside_request(self):
+        """
+        test resolving a scoped object without an active request raises ScopeError
+        """
+        for container in (self.injector, self.container):
+            with self.subTest(container=type(container).__name__):
+                with self.assertRaises(ScopeError):
+                    container.get(Repository)
+
+    def test_follows_threads_and_tasks(self):
+        """
+        test the request follows its tasks and thread pool calls, concurrent requests are isolated
+        """
+
+        async def handler():
+            session = self.container.get(Session)
+            await asyncio.sleep(0)
+            in_thread = await asyncio.to_thread(self.container.get, Session)
+            return session, in_thread
+
+        async def main():
+            async def request():
+                with request_context():
+                    return await handler()
+
+            return await asyncio.gather(request(), request())
+
+        (a, a_thread), (b, b_thread) = asyncio.run(main())
+        self.assertIs(a, a_thread)
+        self.assertIs(b, b_thread)
+        self.assertIsNot(a, b)
+
+    def test_middleware(self):
+        """
+        test the ASGI middleware opens a request per HTTP call and releases it after the response
+        """
+        sessions = []
+
+        async def app(scope, receive, send):
+            if scope["type"] == "http":
+                sessions.append(self.container.get(Session))
+                self.assertIs(self.container.get(Session), sessions[-1])
+            await send({"type": scope["type"]})
+
+        async def receive():
+            return {}
+
+        async def send(message):
+            pass
+
+        middleware = RequestScopeMiddleware(app)
+
+        async def main():
+            await middleware({"type": "http"}, receive, send)
+            await middleware({"type": "http"}, receive, send)
+            await middleware({"type": "lifespan"}, receive, send)
+
+        asyncio.run(main())
+        self.assertEqual(len(sessions), 2)
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertTrue(all(session.closed for session in sessions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+encoders test
+"""
+
+import json
+import unittest
+from dataclasses import dataclass
+from datetime import datetime
+
+import ujson
+
+from hello_python.utils.encoders import EncoderRegistry, compile_encoder, object_fields
+
+
+class Product:
+    def __init__(self, name, expiry_date):
+        self.name = name
+        self.expiry_date = expiry_date
+
+
+@dataclass(slots=True)
+class Variety:
+    name: str
+    sugar_content: float
+
+
+@dataclass(slots=True)
+class GiftVariety(Variety):
+    box: str
+
+
+class Slotted:
+    __slots__ = ("a", "b")
+
+    def __init__(self):
+        self.a, self.b = 1, 2
+
+
+class TestEncoders(unittest.TestCase):
+    """
+    TestEncoders
+    """
+
+    def setUp(self):
+        self.encoders = EncoderRegistry()
+        self.encoders.register(datetime, encoder=datetime.isoformat)
+        self.encoders.register(Product)
+        self.encoders.register(Variety, rename={"name": "variety_name", "sugar_content": "sugar"})
+
+    def test_object_fields(self):
+        """
+        test fields come from dataclasses, __slots__, or the instance dict
+        """
+        self.assertEqual(object_fields(Variety), ["name", "sugar_content"])
+        self.assertEqual(object_fields(GiftVariety), ["name", "sugar_content", "box"])
+        self.assertEqual(object_fields(Slotted), ["a", "b"])
+        self.assertIsNone(object_fields(Product))
+
+    def test_compile_encoder(self):
+        """
+        test the generated encoder builds the renamed dict
+        """
+        encode = compile_encoder(Variety, rename={"name": "variety_name"})
+        self.assertEqual(encode(Variety("串红", 8.5)), {"variety_name": "串红", "sugar_content": 8.5})
+        self.assertEqual(compile_encoder(Slotted)(Slotted()), {"a": 1, "b": 2})
+        self.assertIs(compile_encoder(Product), vars)
+        with self.assertRaises(ValueError):
+            compile_encoder(Product, fields=["bad field"])
+
+    def test_dumps(self):
+        """
+        test nested custom objects encode like CustomEncoder / variety_encoder
+        """
+        data = {"product": Product("辽宁串红番茄", datetime(2023, 12, 31)), "v": [Variety("串红", 8.5)]}
+        expected = {
+            "product": {"name": "辽宁串红番茄", "expiry_date": "2023-12-31T00:00:00"},
+            "v": [{"variety_name": "串红", "sugar": 8.5}],
+        }
+        self.assertEqual(json.loads(self.encoders.dumps(data)), expected)
+        self.assertEqual(json.loads(json.dumps(data, cls=self.encoders.json_encoder())), expected)
+        self.assertEqual(ujson.loads(ujson.dumps(data, default=self.encoders.default)), expected)
+
+    def test_subclass_is_compiled_once(self):
+        """
+        test subclasses use their own fields and are cached per type
+        """
+        gift = GiftVariety("串红", 8.5, "礼盒")
+        self.assertEqual(
+            self.encoders.default(gift), {"variety_name": "串红", "sugar": 8.5, "box": "礼盒"}
+        )
+        encoder = self.encoders.encoder_for(GiftVariety)
+        self.assertIs(self.encoders.encoder_for(GiftVariety), encoder)
+        self.assertIn(GiftVariety, self.encoders._cache)
+
+    def test_decorator_and_unregistered(self):
+        """
+        test register works as a decorator and unknown types raise TypeError
+        """
+
+        @self.encoders.register(fields=["a"])
+        class Point:
+            def __init__(self):
+                self.a, self.b = 1, 2
+
+        self.assertEqual(self.encoders.dumps(Point()), '{"a": 1}')
+        with self.assertRaises(TypeError):
+            self.encoders.dumps(object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+jsonl test
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from click.testing import CliRunner
+
+from hello_python.cli import cli
+from hello_python.utils.jsonl import (
+    JSONLWriter,
+    convert,
+    iter_json_array,
+    read_jsonl,
+    write_json_array,
+    write_jsonl,
+)
+
+RECORDS = [
+    {"name": "辽宁串红小番茄", "price": 9.99, "varieties": ["串红", "黄珍珠"]},
+    {"name": "圣女果", "price": 12345, "in_stock": False, "supplier": None},
+    [1, 2.5, "]", {"nested": "a,b"}],
+    123456789,
+    "text with \"quotes\" and [brackets]",
+]
+
+
+class TestJSONL(unittest.TestCase):
+    """
+    TestJSONL
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_roundtrip(self):
+        """
+        test writing and reading JSONL, plain and gzip
+        """
+        for name in ("products.jsonl", "products.jsonl.gz"):
+            self.assertEqual(write_jsonl(self.path(name), RECORDS, batch_size=2), len(RECORDS))
+            self.assertEqual(list(read_jsonl(self.path(name))), RECORDS)
+        with gzip.open(self.path("products.jsonl.gz"), "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), len(RECORDS))
+
+    def test_writer_batches(self):
+        """
+        test records are buffered until the batch is full
+        """
+        path = self.path("batched.jsonl")
+        with JSONLWriter(path, batch_size=3) as writer:
+            writer.write_many(RECORDS[:2])
+            self.assertEqual(os.path.getsize(path), 0)
+            writer.write(RECORDS[2])
+            writer._file.flush()
+            self.assertEqual(len(open(path, encoding="utf-8").read().splitlines()), 3)
+        self.assertEqual(writer.count, 3)
+
+    def test_invalid_line(self):
+        """
+        test blank lines are skipped and invalid lines report the line number
+        """
+        path = self.path("broken.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"a": 1}\n\n{"a": \n')
+        records = read_jsonl(path)
+        self.assertEqual(next(records), {"a": 1})
+        with self.assertRaisesRegex(ValueError, "broken.jsonl:3"):
+            next(records)
+
+    def test_iter_json_array(self):
+        """
+        test streaming a JSON array with chunk boundaries anywhere
+        """
+        path = self.path("products.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(RECORDS, f, ensure_ascii=False, indent=2)
+        for chunk_size in (1, 3, 7, 1 << 16):
+            self.assertEqual(list(iter_json_array(path, chunk_size=chunk_size)), RECORDS)
+
+        for content, expected in (("[]", []), (" [ 1 , 2 ] ", [1, 2])):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.assertEqual(list(iter_json_array(path, chunk_size=1)), expected)
+        for content in ("{}", "[1, 2", "[1 2]", "[1,]"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                list(iter_json_array(path, chunk_size=2))
+
+    def test_malformed_element_stops_early(self):
+        """
+        test a broken element fails with its offset once the lookahead limit is passed
+        """
+        path = self.path("broken.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('[1, {"a": oops}, ' + "2, " * 100_000 + "3]")
+        items = iter_json_array(path, chunk_size=16, max_element_size=100)
+        self.assertEqual(next(items), 1)
+        with self.assertRaisesRegex(ValueError, "at offset 4 .*within 100 characters"):
+            next(items)
+
+    def test_write_json_array(self):
+        """
+        test the streamed JSON array matches json.dumps output
+        """
+        path = self.path("products.json")
+        write_json_array(path, iter(RECORDS), indent=2)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(RECORDS, ensure_ascii=False, indent=2) + "\n")
+        write_json_array(path, iter([]), indent=2)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+
+    def test_bounded_memory(self):
+        """
+        test reading is independent of file size
+        """
+        path = self.path("large.json")
+        record = {"name": "辽宁串红小番茄", "price": 9.99, "tags": ["生鲜"] * 10}
+        write_json_array(path, (record for _ in range(50_000)))
+        self.assertGreater(os.path.getsize(path), 10 << 20)
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_json_array(path))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 50_000)
+        self.assertLess(peak, 2 << 20)
+
+    def test_convert_cli(self):
+        """
+        test hello json convert between JSON arrays and JSONL
+        """
+        source = self.path("products.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(RECORDS, f, ensure_ascii=False, indent=4)
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["json", "convert", source, self.path("products.jsonl.gz")]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(f"Converted {len(RECORDS)} records", result.output)
+        self.assertEqual(list(read_jsonl(self.path("products.jsonl.gz"))), RECORDS)
+
+        convert(self.path("products.jsonl.gz"), self.path("back.json"), indent=None)
+        with open(self.path("back.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), RECORDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
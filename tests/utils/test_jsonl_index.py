@@ -0,0 +1,178 @@
+"""
+jsonl index test
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from click.testing import CliRunner
+
+from hello_python.cli import cli
+from hello_python.utils.jsonl import write_jsonl
+from hello_python.utils.jsonl_index import JSONLIndex
+
+PRODUCTS = [
+    {"name": "辽宁串红小番茄", "variety": "串红", "price": 9.99},
+    {"name": "圣女果", "variety": "樱桃番茄", "price": 12.8},
+    {"name": "千禧果", "variety": "黄珍珠", "price": 15.0},
+    {"variety": "无名"},
+]
+
+
+class TestJSONLIndex(unittest.TestCase):
+    """
+    TestJSONLIndex
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "products.jsonl")
+        write_jsonl(self.path, PRODUCTS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append(self, text):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_lookup(self):
+        """
+        test records are found by key and the index is stored next to the file
+        """
+        with JSONLIndex(self.path) as index:
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index.get("圣女果"), PRODUCTS[1])
+            self.assertIsNone(index.get("不存在"))
+            self.assertNotIn("不存在", index)
+        self.assertTrue(os.path.exists(self.path + ".name.idx.npy"))
+
+        with JSONLIndex(self.path, key="variety") as index:
+            self.assertEqual(index.get("黄珍珠"), PRODUCTS[2])
+            self.assertEqual(index.get("无名"), PRODUCTS[3])
+
+    def test_reopen_does_not_scan(self):
+        """
+        test an up-to-date index is loaded without scanning the data file
+        """
+        JSONLIndex(self.path).close()
+        with JSONLIndex(self.path) as index:
+            self.assertEqual(index.scanned_bytes, 0)
+            self.assertEqual(index.get("千禧果"), PRODUCTS[2])
+
+    def test_incremental_append(self):
+        """
+        test only appended lines are scanned and newer records win
+        """
+        size = os.path.getsize(self.path)
+        JSONLIndex(self.path).close()
+        self.append('{"name": "圣女果", "price": 11.0}\n{"name": "半行')
+        with JSONLIndex(self.path) as index:
+            self.assertEqual(index.scanned_bytes, len('{"name": "圣女果", "price": 11.0}\n'.encode()))
+            self.assertEqual(index.get("圣女果")["price"], 11.0)
+            self.assertEqual([r["price"] for r in index.get_all("圣女果")], [12.8, 11.0])
+            self.assertIsNone(index.get("半行"))
+
+            # 写完最后一行后增量索引
+            self.append('"}\n')
+            self.assertEqual(index.refresh(), 1)
+            self.assertEqual(index.get("半行"), {"name": "半行"})
+            self.assertEqual(index.indexed_size, os.path.getsize(self.path))
+        self.assertGreater(index.indexed_size, size)
+
+    def test_appends_merge_into_sorted_index(self):
+        """
+        test repeated appends are merged in hash order, equal keys keeping file order
+        """
+        JSONLIndex(self.path).close()
+        with JSONLIndex(self.path) as index:
+            for round_ in range(3):
+                lines = [f'{{"name": "p{i % 7}", "round": {round_}}}\n' for i in range(20)]
+                self.append("".join(lines))
+                self.assertEqual(index.refresh(), 20)
+                hashes = np.asarray(index.entries["hash"])
+                self.assertTrue(np.all(hashes[:-1] <= hashes[1:]))
+            self.assertEqual(len(index), 63)
+            rounds = [r["round"] for r in index.get_all("p3")]
+            self.assertEqual(rounds, [0] * 3 + [1] * 3 + [2] * 3)
+            self.assertEqual(index.get("圣女果"), PRODUCTS[1])
+
+    def test_rewrite_rebuilds(self):
+        """
+        test a rewritten or truncated file gets a full rebuild
+        """
+        JSONLIndex(self.path).close()
+        write_jsonl(self.path, [{"name": "新品", "price": 1}])
+        with JSONLIndex(self.path) as index:
+            self.assertEqual(len(index), 1)
+            self.assertIsNone(index.get("圣女果"))
+            self.assertEqual(index.get("新品"), {"name": "新品", "price": 1})
+
+    def rewrite_in_place(self, old, new):
+        """原地改写数据文件中的一段, 文件大小不变"""
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(old.encode()))
+            f.write(new.encode())
+
+    def test_same_size_rewrite_rebuilds(self):
+        """
+        test a same-size rewrite after the fingerprinted head is detected on refresh
+        """
+        self.append("".join(f'{{"name": "p{i:04d}", "pad": "{"x" * 40}"}}\n' for i in range(200)))
+        JSONLIndex(self.path).close()
+        # 只改最后一行: 大小、开头都不变, 尾部摘要不同
+        self.rewrite_in_place('"p0199"', '"q0199"')
+        with JSONLIndex(self.path) as index:
+            self.assertGreater(index.scanned_bytes, 0)
+            self.assertIsNone(index.get("p0199"))
+            self.assertEqual(index.get("q0199")["name"], "q0199")
+
+    def test_stale_offset_rebuilds(self):
+        """
+        test a lookup that can not decode the line at an indexed offset rebuilds the index
+        """
+        self.append("".join(f'{{"name": "p{i:04d}", "pad": "{"x" * 40}"}}\n' for i in range(200)))
+        JSONLIndex(self.path).close()
+        with JSONLIndex(self.path) as index:
+            # 中间的行被原地改写, refresh 的检查发现不了
+            self.rewrite_in_place('{"name": "p0100"', "#" * len('{"name": "p0100"'))
+            self.rewrite_in_place('"p0101"', '"q0101"')
+            self.assertIsNone(index.get("p0100"))
+            self.assertIsNone(index.get("p0101"))
+            self.assertEqual(index.get("q0101")["name"], "q0101")
+            self.assertEqual(len(index), 202)
+            self.assertEqual(index.get("p0199")["name"], "p0199")
+
+    def test_rejects_gzip(self):
+        """
+        test compressed files can not be indexed
+        """
+        with self.assertRaises(ValueError):
+            JSONLIndex(self.path + ".gz")
+
+    def test_lookup_cli(self):
+        """
+        test hello json lookup
+        """
+        runner = CliRunner()
+        result = runner.invoke(cli, ["json", "lookup", self.path, "圣女果"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('"price":12.8', result.output)
+        result = runner.invoke(cli, ["json", "lookup", self.path, "黄珍珠", "--key", "variety"])
+        self.assertIn("千禧果", result.output)
+        result = runner.invoke(cli, ["json", "lookup", self.path, "不存在"])
+        self.assertEqual(result.exit_code, 1)
+
+        # 值先按 JSON 解析, 数字键和字符串键都能找到
+        self.append('{"name": 42, "price": 1}\n{"name": "7", "price": 2}\n')
+        result = runner.invoke(cli, ["json", "lookup", self.path, "42"])
+        self.assertIn('"price":1', result.output)
+        result = runner.invoke(cli, ["json", "lookup", self.path, "7"])
+        self.assertIn('"price":2', result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+log pipeline test
+"""
+
+import io
+import logging
+import os
+import queue
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from hello_python.utils.log_pipeline import BufferedLogWriter, LogPipeline
+
+
+def wait_until(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+class TestLogPipeline(unittest.TestCase):
+    """
+    TestLogPipeline
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp.name, "service.log")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writer_batches_queued_records(self):
+        """
+        test records queued before the writer runs are written in one batch
+        """
+        records = queue.SimpleQueue()
+        writer = BufferedLogWriter(records, self.log_file, logging.Formatter("%(message)s"))
+        for i in range(100):
+            records.put(logging.makeLogRecord({"msg": f"line {i}"}))
+        writer.start()
+        writer.stop()
+        self.assertEqual(read_lines(self.log_file), [f"line {i}" for i in range(100)])
+        self.assertEqual(writer.records_written, 100)
+        self.assertEqual(writer.batches_written, 1)
+
+    def test_writer_survives_write_errors(self):
+        """
+        test a failed batch is reported and the writer reopens the file for the next one
+        """
+        records = queue.SimpleQueue()
+        writer = BufferedLogWriter(records, self.log_file, logging.Formatter("%(message)s"))
+        writer.start()
+        stderr = io.StringIO()
+        with mock.patch("sys.stderr", stderr):
+            records.put(logging.makeLogRecord({"msg": "before"}))
+            self.assertTrue(wait_until(lambda: writer.records_written == 1, timeout=5))
+            writer._stream.close()  # 模拟流被关闭
+            records.put(logging.makeLogRecord({"msg": "lost"}))
+            self.assertTrue(wait_until(lambda: writer.errors == 1, timeout=5))
+            records.put(logging.makeLogRecord({"msg": "after"}))
+            writer.stop()
+        self.assertEqual(read_lines(self.log_file), ["before", "after"])
+        self.assertIn("Logging error", stderr.getvalue())
+
+    def test_full_queue_drops_records(self):
+        """
+        test records beyond the queue bound are dropped and counted
+        """
+        pipeline = LogPipeline(self.log_file, max_queued=2)
+        pipeline.install(route=())
+        try:
+            for i in range(5):
+                logging.getLogger("test.drop").warning("record %d", i)
+        finally:
+            pipeline.uninstall()
+        self.assertEqual(pipeline.dropped, 3)
+        pipeline.start().stop()
+        self.assertEqual(len(read_lines(self.log_file)), 2)
+
+    def test_size_rotation(self):
+        """
+        test the file is rotated by size and only backup_count files are kept
+        """
+        records = queue.SimpleQueue()
+        writer = BufferedLogWriter(
+            records,
+            self.log_file,
+            logging.Formatter("%(message)s"),
+            max_bytes=30,
+            backup_count=2,
+            batch_size=1,
+        )
+        writer.start()
+        for i in range(10):
+            records.put(logging.makeLogRecord({"msg": f"{i}" * 30}))
+        writer.stop()
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)),
+            ["service.log", "service.log.1", "service.log.2"],
+        )
+        self.assertEqual(read_lines(self.log_file), ["9" * 30])
+        self.assertEqual(read_lines(self.log_file + ".1"), ["8" * 30])
+        self.assertEqual(read_lines(self.log_file + ".2"), ["7" * 30])
+
+    def test_time_rotation(self):
+        """
+        test the file is rotated once it is older than rotate_interval
+        """
+        records = queue.SimpleQueue()
+        writer = BufferedLogWriter(
+            records,
+            self.log_file,
+            logging.Formatter("%(message)s"),
+            rotate_interval=0.05,
+            poll_interval=0.01,
+        )
+        writer.start()
+        records.put(logging.makeLogRecord({"msg": "old"}))
+        time.sleep(0.2)
+        records.put(logging.makeLogRecord({"msg": "new"}))
+        writer.stop()
+        self.assertEqual(read_lines(self.log_file + ".1"), ["old"])
+        self.assertEqual(read_lines(self.log_file), ["new"])
+
+    def test_install_routes_uvicorn_access_log(self):
+        """
+        test uvicorn's access log goes through the queue and handlers are restored
+        """
+        root = logging.getLogger()
+        access = logging.getLogger("uvicorn.access")
+        stream_handler = logging.StreamHandler()
+        access.addHandler(stream_handler)
+        root_handlers, access_handlers = root.handlers[:], access.handlers[:]
+        access_propagate, access.propagate = access.propagate, False
+
+        pipeline = LogPipeline(self.log_file, fmt="%(name)s %(message)s").start()
+        pipeline.install()
+        try:
+            access.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:1", "GET", "/", "1.1", 200)
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                logging.getLogger("hello").exception("failed")
+        finally:
+            pipeline.stop()
+
+        lines = read_lines(self.log_file)
+        self.assertEqual(lines[0], 'uvicorn.access 127.0.0.1:1 - "GET / HTTP/1.1" 200')
+        self.assertEqual(lines[1], "hello failed")
+        self.assertIn("RuntimeError: boom", lines[-1])
+        self.assertEqual(root.handlers, root_handlers)
+        self.assertEqual(access.handlers, access_handlers)
+        self.assertFalse(access.propagate)
+        access.removeHandler(stream_handler)
+        access.propagate = access_propagate
+
+
+if __name__ == "__main__":
+    unittest.main()
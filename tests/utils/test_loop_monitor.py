@@ -0,0 +1,130 @@
+"""
+loop_monitor test
+"""
+
+import asyncio
+import time
+import unittest
+
+from hello_python.utils.loop_monitor import (
+    LAG_METRIC,
+    SLOW_CALLBACKS_METRIC,
+    WATCHDOG_CALLBACK,
+    LoopMonitor,
+)
+from hello_python.utils.metrics import MetricsRegistry, render_prometheus
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+async def stalling_handler():
+    await asyncio.sleep(0.05)
+    blocking_call(0.3)
+
+
+class TestLoopMonitor(unittest.TestCase):
+    """
+    TestLoopMonitor
+    """
+
+    def test_lag_and_slow_callback(self):
+        """
+        test in debug mode a blocking call shows up as lag and as a slow callback with its stack
+        """
+        registry = MetricsRegistry()
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            monitor = LoopMonitor(registry, interval=0.02, slow_callback=0.1, debug=True)
+            monitor.start()
+            self.assertTrue(loop.get_debug())
+            await asyncio.sleep(0.1)
+            await stalling_handler()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+            return monitor, loop.get_debug(), loop.slow_callback_duration
+
+        monitor, debug, duration = asyncio.run(main())
+        # 停止后恢复原来的调试设置
+        self.assertEqual((debug, duration), (False, 0.1))
+        lag = registry.histograms[LAG_METRIC][()]
+        self.assertGreater(lag.count, 5)
+        self.assertGreater(monitor.max_lag, 0.2)
+        self.assertEqual(registry.counters[SLOW_CALLBACKS_METRIC][()], 1)
+        (record,) = monitor.slow_callbacks()
+        self.assertGreaterEqual(record["seconds"], 0.3)
+        # asyncio 只报告外层的 task, 阻塞的位置要看堆栈样本
+        self.assertIn("main()", record["callback"])
+        self.assertIn("in blocking_call", record["stack"][-1])
+        self.assertIn("in stalling_handler", record["stack"][-2])
+        body = render_prometheus(registry)
+        self.assertIn(f"# TYPE {LAG_METRIC} histogram", body)
+        self.assertIn(f"{SLOW_CALLBACKS_METRIC} 1", body)
+
+    def test_short_callbacks_ignored(self):
+        """
+        test callbacks under the threshold are not recorded
+        """
+
+        async def main():
+            monitor = LoopMonitor(interval=0.02, slow_callback=0.2)
+            monitor.start()
+            for _ in range(3):
+                blocking_call(0.05)
+                await asyncio.sleep(0.02)
+            await monitor.stop()
+            return monitor
+
+        monitor = asyncio.run(main())
+        self.assertEqual(monitor.slow_callbacks(), [])
+        self.assertNotIn(SLOW_CALLBACKS_METRIC, monitor.registry.counters)
+
+    def test_watchdog_without_debug(self):
+        """
+        test by default the watchdog records slow callbacks and debug mode stays off
+        """
+
+        async def main():
+            monitor = LoopMonitor(interval=0.02, slow_callback=0.1)
+            monitor.start()
+            debug = asyncio.get_running_loop().get_debug()
+            await stalling_handler()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+            return monitor, debug
+
+        monitor, debug = asyncio.run(main())
+        self.assertFalse(debug)
+        self.assertEqual(monitor.registry.counters[SLOW_CALLBACKS_METRIC][()], 1)
+        (record,) = monitor.slow_callbacks()
+        self.assertEqual(record["callback"], WATCHDOG_CALLBACK)
+        self.assertGreaterEqual(record["seconds"], 0.25)
+        self.assertIn("in blocking_call", record["stack"][-1])
+        self.assertIn("in stalling_handler", record["stack"][-2])
+
+    def test_lag_only(self):
+        """
+        test slow_callback=0 only measures lag
+        """
+
+        async def main():
+            monitor = LoopMonitor(interval=0.02, slow_callback=0, debug=True)
+            monitor.start()
+            debug = asyncio.get_running_loop().get_debug()
+            await asyncio.sleep(0.05)
+            blocking_call(0.2)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return monitor, debug
+
+        monitor, debug = asyncio.run(main())
+        self.assertFalse(debug)
+        self.assertIsNone(monitor._watchdog)
+        self.assertEqual(monitor.slow_callbacks(), [])
+        self.assertGreater(monitor.max_lag, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+metrics test
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+from hello_python.utils.metrics import (
+    Histogram,
+    MetricsRegistry,
+    collect,
+    render_prometheus,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    TestMetrics
+    """
+
+    def test_histogram_quantile(self):
+        """
+        test histogram buckets and quantile estimation
+        """
+        histogram = Histogram(buckets=(0.1, 0.2, 0.5))
+        for value in (0.05, 0.1, 0.15, 0.3, 1.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.sum, 1.6)
+        self.assertAlmostEqual(histogram.quantile(0.4), 0.1)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.15)
+        self.assertEqual(histogram.quantile(0.99), 0.5)
+        self.assertTrue(math.isnan(Histogram().quantile(0.5)))
+
+    def test_histogram_observe_many(self):
+        """
+        test bulk observation matches one observe per value, bucket bounds included
+        """
+        values = [1.0, 0.3, 0.1, 0.05, 0.5, 0.15, 0.2, 0.7]
+        one_by_one = Histogram(buckets=(0.1, 0.2, 0.5))
+        for value in values:
+            one_by_one.observe(value)
+        bulk = Histogram(buckets=(0.1, 0.2, 0.5))
+        bulk.observe_many(values[:3])
+        bulk.observe_many(values[3:])
+        bulk.observe_many([])
+        self.assertEqual(bulk.counts, one_by_one.counts)
+        self.assertEqual(bulk.count, one_by_one.count)
+        self.assertAlmostEqual(bulk.sum, one_by_one.sum)
+
+    def test_registry_render(self):
+        """
+        test Prometheus text rendering
+        """
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.describe("requests_total", "Total requests.")
+        registry.inc("requests_total", {"route": "/"})
+        registry.inc("requests_total", {"route": "/"})
+        registry.gauge_set("in_flight", 3)
+        registry.observe("latency_seconds", 0.05, {"route": "/"})
+        text = render_prometheus(registry)
+        self.assertIn("# HELP requests_total Total requests.", text)
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/"} 2', text)
+        self.assertIn("in_flight 3", text)
+        self.assertIn('latency_seconds_bucket{route="/",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/",le="+Inf"} 1', text)
+        self.assertIn('latency_seconds_count{route="/"} 1', text)
+
+    def test_render_special_values(self):
+        """
+        test NaN and infinities use the exposition format spelling
+        """
+        registry = MetricsRegistry()
+        registry.gauge_set("ratio", math.nan)
+        registry.gauge_set("low", -math.inf)
+        registry.gauge_set("high", math.inf)
+        lines = render_prometheus(registry).splitlines()
+        self.assertIn("ratio NaN", lines)
+        self.assertIn("low -Inf", lines)
+        self.assertIn("high +Inf", lines)
+
+    def test_collect_across_workers(self):
+        """
+        test snapshots of several workers are merged, gauges only from live ones
+        """
+        dead_pid = 2**22 + 12345  # 超过 Linux 默认 pid_max, 不会是存活进程
+        with tempfile.TemporaryDirectory() as directory:
+            for pid in (os.getpid(), dead_pid):
+                registry = MetricsRegistry()
+                registry.inc("requests_total", {"route": "/"}, 5)
+                registry.gauge_add("in_flight", {"route": "/"}, 2)
+                registry.observe("latency_seconds", 0.01, {"route": "/"})
+                registry.write_snapshot(directory, pid=pid)
+
+            merged = collect(directory)
+        key = (("route", "/"),)
+        self.assertEqual(merged.counters["requests_total"][key], 10)
+        self.assertEqual(merged.gauges["in_flight"][key], 2)
+        self.assertEqual(merged.histograms["latency_seconds"][key].count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+offload test
+"""
+
+import asyncio
+import math
+import os
+import unittest
+
+from hello_python.utils.offload import offload, offload_map, warm_up
+
+
+class TestOffload(unittest.TestCase):
+    """
+    TestOffload
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workers = warm_up()
+
+    def test_workers_are_reused(self):
+        """
+        test calls run in the long-lived worker processes, not the caller
+        """
+        self.assertNotIn(os.getpid(), self.workers)
+
+        async def pids():
+            return {await offload(os.getpid) for _ in range(4)}
+
+        self.assertTrue(asyncio.run(pids()) <= self.workers)
+
+    def test_offload(self):
+        """
+        test positional and keyword arguments reach the worker
+        """
+        self.assertEqual(asyncio.run(offload(sum, range(100))), 4950)
+        self.assertEqual(asyncio.run(offload(int, "ff", base=16)), 255)
+
+    def test_offload_map_keeps_order(self):
+        """
+        test chunked results come back in input order
+        """
+        items = range(1000)
+        for chunk_size in (1, 7, 1000):
+            results = asyncio.run(
+                offload_map(math.isqrt, items, chunk_size=chunk_size, max_pending=2)
+            )
+            self.assertEqual(results, [math.isqrt(i) for i in items])
+        self.assertEqual(asyncio.run(offload_map(math.isqrt, [])), [])
+        with self.assertRaises(ValueError):
+            asyncio.run(offload_map(math.isqrt, items, chunk_size=0))
+
+    def test_errors_propagate(self):
+        """
+        test an exception in a worker is raised in the caller
+        """
+        with self.assertRaises(ValueError):
+            asyncio.run(offload_map(math.isqrt, [4, -1, 9]))
+
+    def test_loop_stays_responsive(self):
+        """
+        test the loop keeps ticking while offloaded CPU work runs
+        """
+        numbers = range(30_000_000)
+        parts = [numbers[i : i + 5_000_000] for i in range(0, len(numbers), 5_000_000)]
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        async def main():
+            nonlocal done
+            task = asyncio.create_task(ticker())
+            try:
+                return await offload_map(sum, parts)
+            finally:
+                done = True
+                await task
+
+        self.assertEqual(sum(asyncio.run(main())), sum(numbers))
+        self.assertGreater(ticks, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
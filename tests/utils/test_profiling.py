@@ -0,0 +1,280 @@
+"""
+profiling test
+"""
+
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from hello_python.cli import cli
+from hello_python.utils import profiling
+from hello_python.utils.profiling import (
+    DEFAULT_MODES,
+    MODES,
+    ProfileSession,
+    SamplingProfiler,
+    TimingRegistry,
+    disable_timing,
+    enable_timing,
+    parse_modes,
+    timed,
+    timing_enabled,
+)
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestTimed(unittest.TestCase):
+    """
+    TestTimed
+    """
+
+    def setUp(self):
+        self.registry = TimingRegistry()
+        enable_timing()
+
+    def tearDown(self):
+        disable_timing()
+
+    def test_decorator(self):
+        """
+        test sync and async functions are timed under their qualified or given name
+        """
+
+        @timed(registry=self.registry)
+        def add(a, b):
+            return a + b
+
+        @timed("sleep", registry=self.registry)
+        async def sleep():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(add.__name__, "add")
+        self.assertEqual(asyncio.run(sleep()), "done")
+        rows = {row["name"]: row for row in self.registry.rows()}
+        name = f"{__name__}.TestTimed.test_decorator.<locals>.add"
+        self.assertEqual(rows[name]["calls"], 1)
+        self.assertGreaterEqual(rows["sleep"]["max us"], 10_000)
+        self.assertEqual(self.registry.rows()[0]["name"], "sleep")
+
+    def test_bare_decorator_uses_global_registry(self):
+        """
+        test @timed without arguments records into the module registry
+        """
+
+        @timed
+        def work():
+            return 1
+
+        work()
+        names = [row["name"] for row in profiling.timings.rows()]
+        self.assertIn(f"{__name__}.{work.__qualname__}", names)
+
+    def test_context_manager(self):
+        """
+        test the context manager is reentrant, records exceptions and needs a name
+        """
+        timer = timed("block", registry=self.registry)
+        with timer:
+            with timer:
+                busy_wait(0.001)
+        with self.assertRaises(KeyError):
+            with timed("block", registry=self.registry):
+                raise KeyError("x")
+        row = self.registry.rows()[0]
+        self.assertEqual(row["calls"], 3)
+        self.assertGreater(row["p50 us"], 0)
+        with self.assertRaises(TypeError):
+            with timed():
+                pass
+
+    def test_flush_in_batches(self):
+        """
+        test observations are folded into the histogram every flush_at values
+        """
+        registry = TimingRegistry(flush_at=3)
+        for seconds in (1e-6, 2e-6):
+            registry.observe("x", seconds)
+        self.assertEqual(registry.histograms, {})
+        registry.observe("x", 3e-6)
+        self.assertEqual(registry.histograms["x"].count, 3)
+        registry.observe("x", 1e-3)
+        row = registry.rows()[0]
+        self.assertEqual(row["calls"], 4)
+        self.assertAlmostEqual(row["max us"], 1000)
+        registry.reset()
+        self.assertEqual(registry.rows(), [])
+
+    def test_disabled(self):
+        """
+        test nothing is recorded while timing is disabled
+        """
+        disable_timing()
+        self.assertFalse(timing_enabled())
+
+        @timed(registry=self.registry)
+        def noop():
+            return None
+
+        noop()
+        with timed("block", registry=self.registry):
+            pass
+        self.assertEqual(self.registry.rows(), [])
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """
+    TestSamplingProfiler
+    """
+
+    def test_collapsed_stacks(self):
+        """
+        test the sampler sees the busy function of the main thread
+        """
+        path = os.path.join(tempfile.mkdtemp(), "stacks.collapsed")
+        try:
+            with SamplingProfiler(interval=0.001) as sampler:
+                self.assertTrue(sampler.running)
+                busy_wait(0.2)
+            self.assertFalse(sampler.running)
+            self.assertGreater(sampler.samples, 5)
+            lines = sampler.collapsed()
+            hot = [line for line in lines if "busy_wait" in line]
+            self.assertTrue(hot)
+            stack, count = hot[0].rsplit(" ", 1)
+            self.assertTrue(stack.startswith("MainThread;"))
+            self.assertTrue(stack.split(";")[-1].startswith("test_profiling.py:busy_wait"))
+            self.assertGreater(int(count), 0)
+            self.assertEqual(sampler.dump(path), len(lines))
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read().splitlines(), lines)
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+
+class TestProfileSession(unittest.TestCase):
+    """
+    TestProfileSession
+    """
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_parse_modes(self):
+        """
+        test the HELLO_PROFILE values
+        """
+        self.assertEqual(parse_modes(None), ())
+        self.assertEqual(parse_modes("0"), ())
+        self.assertEqual(parse_modes("1"), DEFAULT_MODES)
+        self.assertEqual(parse_modes("all"), MODES)
+        self.assertEqual(parse_modes(" sample, cprofile,sample"), ("sample", "cprofile"))
+        with self.assertRaises(ValueError):
+            parse_modes("timing,perf")
+        with self.assertRaises(ValueError):
+            ProfileSession(["perf"])
+
+    def test_all_modes(self):
+        """
+        test a session runs every profiler, writes its files and prints the reports
+        """
+        stream = io.StringIO()
+
+        @timed("session work")
+        def work():
+            busy_wait(0.05)
+            return [bytearray(1024) for _ in range(100)]
+
+        self.assertFalse(timing_enabled())
+        with ProfileSession(MODES, self.output_dir, stream, limit=5, interval=0.001) as session:
+            self.assertTrue(timing_enabled())
+            work()
+        self.assertFalse(timing_enabled())
+
+        report = stream.getvalue()
+        self.assertIn("session work", report)
+        self.assertIn("cprofile: stats written to", report)
+        self.assertIn("tracemalloc: current", report)
+        self.assertIn("sample:", report)
+        self.assertEqual(set(session.paths), {"cprofile", "tracemalloc", "sample"})
+        for path in session.paths.values():
+            self.assertTrue(os.path.exists(path))
+
+    def test_tracemalloc_owned_elsewhere(self):
+        """
+        test the session keeps a trace it did not start and survives code stopping it
+        """
+        stream = io.StringIO()
+        tracemalloc.start()
+        try:
+            with ProfileSession(["tracemalloc"], self.output_dir, stream):
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertIn("tracemalloc: current", stream.getvalue())
+
+        stream = io.StringIO()
+        with ProfileSession(["tracemalloc"], self.output_dir, stream) as session:
+            tracemalloc.stop()
+        self.assertIn("tracing was stopped", stream.getvalue())
+        self.assertNotIn("tracemalloc", session.paths)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_env_modes(self):
+        """
+        test the session reads its modes and output directory from the environment
+        """
+        env = {"HELLO_PROFILE": "cprofile", "HELLO_PROFILE_DIR": self.output_dir}
+        with patch.dict(os.environ, env):
+            session = ProfileSession(stream=io.StringIO())
+        self.assertEqual(session.modes, ("cprofile",))
+        with session:
+            busy_wait(0.01)
+        self.assertEqual(os.path.dirname(session.paths["cprofile"]), self.output_dir)
+
+    def test_cli_profile_flag(self):
+        """
+        test hello --profile wraps the subcommand and HELLO_PROFILE picks the modes
+        """
+        runner = CliRunner()
+        env = {"HELLO_PROFILE_DIR": self.output_dir, "HELLO_PROFILE": ""}
+        result = runner.invoke(cli, ["--profile", "greet", "Alice"], env=env)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Hello, Alice!", result.output)
+        self.assertIn("timing:", result.output)
+        self.assertIn("cprofile: stats written to", result.output)
+
+        env["HELLO_PROFILE"] = "sample"
+        result = runner.invoke(cli, ["greet", "Bob"], env=env)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("sample:", result.output)
+        self.assertNotIn("cprofile", result.output)
+
+        env["HELLO_PROFILE"] = "bogus"
+        result = runner.invoke(cli, ["greet", "Bob"], env=env)
+        self.assertEqual(result.exit_code, 2, result.output)
+
+        result = runner.invoke(cli, ["greet", "Carol"], env={"HELLO_PROFILE": ""})
+        self.assertEqual(result.output, "Hello, Carol!\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+"""
+query_cache test
+"""
+
+import sqlite3
+import unittest
+
+from hello_python.advance.database_sqlite_sample import (
+    create_employees_table,
+    insert_employees,
+)
+from hello_python.utils.query_cache import (
+    MISSING,
+    CachedDatabase,
+    QueryCache,
+    estimate_size,
+    tables_in,
+    write_target,
+)
+
+HIGH_SALARY = "SELECT name, salary FROM employees WHERE salary > ?"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryCache(unittest.TestCase):
+    """
+    TestQueryCache
+    """
+
+    def test_lru(self):
+        """
+        test the least recently used entry is evicted first
+        """
+        cache = QueryCache(max_entries=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        self.assertEqual(cache.get("a"), [1])
+        cache.put("c", [3])
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual((cache.get("a"), cache.get("c")), ([1], [3]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        """
+        test entries expire after ttl seconds
+        """
+        clock = FakeClock()
+        cache = QueryCache(ttl=10, clock=clock)
+        cache.put("a", [1])
+        clock.now = 9.9
+        self.assertEqual(cache.get("a"), [1])
+        clock.now = 10
+        self.assertIsNone(cache.get("a", None))
+        stats = cache.stats()
+        self.assertEqual((stats["expirations"], stats["entries"], stats["bytes"]), (1, 0, 0))
+
+    def test_memory_budget(self):
+        """
+        test the byte budget evicts old entries and rejects oversized results
+        """
+        row = [("x" * 100,)]
+        size = estimate_size(list(row))
+        cache = QueryCache(max_bytes=size * 3)
+        for key in range(4):
+            self.assertTrue(cache.put(key, list(row)))
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.bytes, size * 3)
+        self.assertIs(cache.get(0), MISSING)
+        self.assertFalse(cache.put("big", [("x" * 1000,)] * 10))
+        self.assertIs(cache.get("big"), MISSING)
+
+    def test_invalidate_by_table(self):
+        """
+        test invalidation removes only the entries that read the table
+        """
+        cache = QueryCache()
+        cache.put("employees", [1], tables=["employees"])
+        cache.put("join", [2], tables=["Employees", "departments"])
+        cache.put("departments", [3], tables=["departments"])
+        self.assertEqual(cache.invalidate(["EMPLOYEES"]), 2)
+        self.assertEqual(cache.get("departments"), [3])
+        self.assertIs(cache.get("join"), MISSING)
+        self.assertEqual(cache.invalidate(["departments"]), 1)
+        self.assertEqual(cache.stats()["invalidations"], 3)
+
+    def test_stale_generation_not_cached(self):
+        """
+        test a result is dropped if its tables were invalidated after the generation was read
+        """
+        cache = QueryCache()
+        generation = cache.generation(["employees"])
+        cache.invalidate(["departments"])
+        self.assertTrue(cache.put("a", [1], tables=["employees"], generation=generation))
+        cache.invalidate(["Employees"])
+        self.assertFalse(cache.put("b", [2], tables=["employees"], generation=generation))
+        generation = cache.generation(["employees"])
+        cache.clear()
+        self.assertFalse(cache.put("c", [3], tables=["employees"], generation=generation))
+        self.assertEqual(len(cache), 0)
+
+    def test_tables_in(self):
+        """
+        test table names are found in common statement forms
+        """
+        self.assertEqual(tables_in(HIGH_SALARY), {"employees"})
+        self.assertEqual(
+            tables_in("SELECT * FROM a AS x JOIN `db`.b ON x.id = b.id WHERE 1"), {"a", "b"}
+        )
+        self.assertEqual(tables_in("SELECT * FROM a x, c WHERE x.id = c.id"), {"a", "c"})
+        self.assertEqual(tables_in("select * from a where id in (select id from d)"), {"a", "d"})
+        self.assertEqual(tables_in("INSERT INTO employees (name) VALUES (?)"), {"employees"})
+        self.assertEqual(tables_in("UPDATE employees SET salary = 1"), {"employees"})
+        self.assertEqual(tables_in("DELETE FROM employees WHERE id = 1"), {"employees"})
+        self.assertEqual(tables_in("SELECT 1"), set())
+
+    def test_write_conflict_clauses(self):
+        """
+        test SQLite OR <conflict> clauses and MySQL modifiers before the written table
+        """
+        statements = [
+            "UPDATE OR IGNORE employees SET salary = 1",
+            "UPDATE OR ROLLBACK employees SET salary = 1",
+            "UPDATE LOW_PRIORITY IGNORE `hr`.employees SET salary = 1",
+            "INSERT OR REPLACE INTO employees (name) VALUES (?)",
+            "INSERT IGNORE INTO employees (name) VALUES (?)",
+            "REPLACE INTO employees (name) VALUES (?)",
+        ]
+        for sql in statements:
+            with self.subTest(sql=sql):
+                self.assertEqual(tables_in(sql), {"employees"})
+                self.assertEqual(write_target(sql), "employees")
+        self.assertEqual(write_target("UPDATE ignored SET a = 1"), "ignored")
+        self.assertEqual(write_target("DELETE FROM a WHERE id IN (SELECT id FROM b)"), "a")
+        self.assertIsNone(write_target("WITH c AS (SELECT 1) UPDATE a SET x = 1"))
+        self.assertIsNone(write_target("DROP TABLE a"))
+
+
+class TestCachedDatabase(unittest.TestCase):
+    """
+    TestCachedDatabase
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_employees_table(self.conn)
+        insert_employees(
+            self.conn,
+            [("John Doe", "IT", 75000.0), ("Jane Smith", "HR", 65000.0)],
+        )
+        self.db = CachedDatabase(self.conn, QueryCache())
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_repeated_query_hits(self):
+        """
+        test identical (SQL, params) are served from the cache
+        """
+        first = self.db.query(HIGH_SALARY, (70000,))
+        # 绕过缓存层的写入不会被看到
+        self.conn.execute("DELETE FROM employees")
+        self.assertEqual(self.db.query(HIGH_SALARY, (70000,)), first)
+        self.assertEqual(self.db.query(HIGH_SALARY, (60000,)), [])
+        stats = self.db.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_ratio"], 1 / 3)
+
+    def test_writes_invalidate(self):
+        """
+        test INSERT / UPDATE / DELETE through the layer invalidate the table
+        """
+        self.assertEqual(len(self.db.query(HIGH_SALARY, (70000,))), 1)
+        self.db.execute(
+            "INSERT INTO employees (name, department, salary) VALUES (?, ?, ?)",
+            ("Bob Johnson", "Finance", 80000.0),
+        )
+        self.assertEqual(len(self.db.query(HIGH_SALARY, (70000,))), 2)
+        changed = self.db.execute(
+            "UPDATE employees SET salary = ? WHERE name = ?", (85000.0, "John Doe")
+        )
+        self.assertEqual(changed, 1)
+        self.assertIn(("John Doe", 85000.0), self.db.query(HIGH_SALARY, (70000,)))
+        self.db.execute("DELETE FROM employees WHERE name = ?", ("John Doe",))
+        self.assertEqual(self.db.query(HIGH_SALARY, (70000,)), [("Bob Johnson", 80000.0)])
+        self.assertEqual(self.db.cache.stats()["hits"], 0)
+        self.assertFalse(self.conn.in_transaction)
+
+    def test_other_tables_kept(self):
+        """
+        test writes to another table leave cached results alone, DDL clears everything
+        """
+        self.db.execute("CREATE TABLE departments (name TEXT)")
+        self.db.query(HIGH_SALARY, (70000,))
+        self.db.executemany("INSERT INTO departments VALUES (?)", [("IT",), ("HR",)])
+        self.db.query(HIGH_SALARY, (70000,))
+        self.assertEqual(self.db.cache.stats()["hits"], 1)
+        self.db.execute("DROP TABLE departments")
+        self.assertEqual(len(self.db.cache), 0)
+
+    def test_write_during_query_not_cached(self):
+        """
+        test a result read before a concurrent write is not cached after the invalidation
+        """
+        run = self.db._run
+
+        def run_then_write(sql, params, many=False):
+            rows = run(sql, params, many)
+            if sql == HIGH_SALARY:
+                # 模拟另一个线程在 SELECT 之后、put 之前提交了写入
+                self.db._run = run
+                self.db.execute("DELETE FROM employees")
+            return rows
+
+        self.db._run = run_then_write
+        self.assertEqual(len(self.db.query(HIGH_SALARY, (70000,))), 1)
+        self.assertEqual(len(self.db.cache), 0)
+        self.assertEqual(self.db.query(HIGH_SALARY, (70000,)), [])
+
+    def test_conflict_clause_invalidates(self):
+        """
+        test UPDATE OR IGNORE invalidates its table and unrecognised writes clear the cache
+        """
+        self.db.query(HIGH_SALARY, (70000,))
+        self.db.execute("UPDATE OR IGNORE employees SET salary = ?", (90000.0,))
+        self.assertEqual(len(self.db.query(HIGH_SALARY, (70000,))), 2)
+        self.db.execute(
+            "WITH raise AS (SELECT 1000.0 AS amount) "
+            "UPDATE employees SET salary = salary + (SELECT amount FROM raise)"
+        )
+        self.assertEqual(len(self.db.cache), 0)
+        self.assertIn(("John Doe", 91000.0), self.db.query(HIGH_SALARY, (70000,)))
+
+    def test_results_are_copies(self):
+        """
+        test callers mutating a result do not corrupt the cache
+        """
+        rows = self.db.query(HIGH_SALARY, (70000,))
+        rows.clear()
+        self.assertEqual(len(self.db.query(HIGH_SALARY, (70000,))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+scheduler test
+"""
+
+import asyncio
+import math
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from hello_python.utils.scheduler import (
+    SQLiteJobStore,
+    create_scheduler,
+    open_store,
+    pause_job,
+    resume_job,
+    run_job_now,
+)
+
+
+class TestSQLiteJobStore(unittest.TestCase):
+    """
+    TestSQLiteJobStore
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.tmp.name, "jobs.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def paused_scheduler(self):
+        scheduler = BackgroundScheduler(jobstores={"default": SQLiteJobStore(self.database)})
+        scheduler.start(paused=True)
+        return scheduler
+
+    def test_jobs_survive_restart(self):
+        """
+        test jobs are persisted and read back sorted, paused jobs last
+        """
+        scheduler = self.paused_scheduler()
+        now = datetime.now(timezone.utc)
+        for job_id, minutes in [("later", 2), ("sooner", 1), ("paused", 3)]:
+            scheduler.add_job(
+                time.sleep,
+                "interval",
+                minutes=5,
+                args=(0,),
+                id=job_id,
+                next_run_time=now + timedelta(minutes=minutes),
+            )
+        scheduler.pause_job("paused")
+        with self.assertRaises(ConflictingIdError):
+            scheduler.add_job(time.sleep, "interval", minutes=5, args=(0,), id="later")
+        scheduler.shutdown()
+
+        store = open_store(self.database)
+        try:
+            jobs = store.get_all_jobs()
+            self.assertEqual([job.id for job in jobs], ["sooner", "later", "paused"])
+            self.assertEqual(store.lookup_job("later").args, (0,))
+            self.assertIsNone(store.lookup_job("missing"))
+            self.assertAlmostEqual(
+                store.get_next_run_time().timestamp(), (now + timedelta(minutes=1)).timestamp(), 3
+            )
+            self.assertEqual(store.get_due_jobs(now + timedelta(seconds=90))[0].id, "sooner")
+            store.remove_job("sooner")
+            with self.assertRaises(JobLookupError):
+                store.remove_job("sooner")
+        finally:
+            store.shutdown()
+
+    def test_wakeup_queries_use_index(self):
+        """
+        test the due-jobs and next-run-time queries are index range scans
+        """
+        store = SQLiteJobStore(self.database)
+        try:
+            for sql in [
+                "SELECT id, job_state FROM apscheduler_jobs WHERE next_run_time <= 0 "
+                "ORDER BY next_run_time",
+                "SELECT next_run_time FROM apscheduler_jobs WHERE next_run_time IS NOT NULL "
+                "ORDER BY next_run_time LIMIT 1",
+            ]:
+                plan = " ".join(row[-1] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+                self.assertIn("INDEX ix_apscheduler_jobs_next_run_time", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+        finally:
+            store.shutdown()
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    TestScheduler
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.tmp.name, "jobs.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def stats(self):
+        store = open_store(self.database)
+        try:
+            return store.job_stats()
+        finally:
+            store.shutdown()
+
+    def test_no_overlap_and_run_stats(self):
+        """
+        test a slow job never overlaps itself and runs, skips, durations and errors are recorded
+        """
+        scheduler = create_scheduler(self.database)
+        scheduler.start()
+        scheduler.add_job(time.sleep, "interval", seconds=0.1, args=(0.35,), id="slow")
+        scheduler.add_job(math.sqrt, "interval", seconds=0.1, args=(-1,), id="broken")
+        time.sleep(1)
+        scheduler.shutdown()
+        stats = self.stats()
+        slow, broken = stats["slow"], stats["broken"]
+        self.assertGreaterEqual(slow["runs"], 2)
+        self.assertGreaterEqual(slow["skipped"], 1)
+        self.assertEqual(slow["failures"], 0)
+        self.assertGreaterEqual(slow["max_seconds"], 0.35)
+        self.assertGreaterEqual(slow["avg_seconds"], 0.35)
+        self.assertIsNotNone(slow["last_run_at"])
+        self.assertGreaterEqual(broken["failures"], 1)
+        self.assertIn("ValueError", broken["last_error"])
+
+    def test_missed_runs_are_coalesced_and_counted(self):
+        """
+        test runs missed while the scheduler was down are collapsed and counted as a miss
+        """
+        scheduler = create_scheduler(self.database, job_defaults={"misfire_grace_time": 1})
+        scheduler.start(paused=True)
+        scheduler.add_job(
+            time.sleep,
+            "interval",
+            seconds=2,
+            args=(0,),
+            id="late",
+            next_run_time=datetime.now(timezone.utc) - timedelta(seconds=7),
+        )
+        scheduler.resume()
+        time.sleep(0.3)
+        scheduler.shutdown()
+        stats = self.stats()["late"]
+        # 错过的 4 次运行被合并为一次, 超过宽限时间而被跳过
+        self.assertEqual((stats["misses"], stats["runs"]), (1, 0))
+
+    def test_polls_store_for_jobs_from_other_processes(self):
+        """
+        test a running scheduler picks up a job another process wrote to the database
+        """
+        scheduler = create_scheduler(self.database, poll_interval=0.1)
+        scheduler.start()
+        try:
+            # 另一个调度器 (相当于 hello schedule 或另一个进程) 直接写入数据库
+            other = create_scheduler(self.database, poll_interval=None)
+            other.start(paused=True)
+            other.add_job(
+                sorted,
+                "interval",
+                minutes=1,
+                args=([2, 1],),
+                id="external",
+                next_run_time=datetime.now(timezone.utc),
+            )
+            other.shutdown()
+            time.sleep(0.5)
+        finally:
+            scheduler.shutdown()
+        self.assertEqual(self.stats()["external"]["runs"], 1)
+        self.assertNotIn("poll_job_store", self.stats())
+
+    def test_async_stats_written_off_the_loop(self):
+        """
+        test under AsyncIOScheduler the statistics are written from the writer thread
+        """
+        threads = []
+        record_run = SQLiteJobStore.record_run
+
+        def record(store, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return record_run(store, *args, **kwargs)
+
+        async def main():
+            scheduler = create_scheduler(self.database, AsyncIOScheduler)
+            scheduler.start()
+            scheduler.add_job(
+                asyncio.sleep,
+                "interval",
+                minutes=1,
+                args=(0,),
+                id="job",
+                next_run_time=datetime.now(timezone.utc),
+            )
+            await asyncio.sleep(0.3)
+            scheduler.shutdown()
+
+        with mock.patch.object(SQLiteJobStore, "record_run", record):
+            asyncio.run(main())
+        self.assertEqual(self.stats()["job"]["runs"], 1)
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("jobstore-writer") for name in threads))
+
+    def test_offline_pause_resume_run(self):
+        """
+        test pausing, resuming and running a job directly on the store
+        """
+        scheduler = create_scheduler(self.database)
+        scheduler.start(paused=True)
+        scheduler.add_job(time.sleep, "interval", minutes=1, args=(0.01,), id="job")
+        scheduler.shutdown()
+
+        store = open_store(self.database)
+        try:
+            pause_job(store, "job")
+            self.assertIsNone(store.lookup_job("job").next_run_time)
+            self.assertIsNone(store.get_next_run_time())
+            job = resume_job(store, "job")
+            self.assertGreater(job.next_run_time, datetime.now(timezone.utc))
+            self.assertEqual(store.get_next_run_time(), job.next_run_time)
+            self.assertIsNone(run_job_now(store, "job"))
+            with self.assertRaises(JobLookupError):
+                pause_job(store, "missing")
+            stats = store.job_stats()["job"]
+        finally:
+            store.shutdown()
+        self.assertEqual(stats["runs"], 1)
+        self.assertGreaterEqual(stats["last_seconds"], 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
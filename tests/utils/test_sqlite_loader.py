@@ -0,0 +1,162 @@
+"""
+sqlite_loader test
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from hello_python.advance.database_sqlite_sample import (
+    EMPLOYEE_COLUMNS,
+    bulk_load_employees,
+    create_employees_table,
+    generate_employees,
+    insert_employees,
+)
+from hello_python.utils.sqlite_loader import BulkLoader, IndexRebuildError, apply_pragmas
+
+
+class TestSQLiteLoader(unittest.TestCase):
+    """
+    TestSQLiteLoader
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmp.name, "employees.db"))
+        create_employees_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def indexes(self):
+        return self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'employees'"
+        ).fetchall()
+
+    def test_load_in_batches(self):
+        """
+        test rows are written in batch_size transactions
+        """
+        loader = BulkLoader(self.conn, "employees", EMPLOYEE_COLUMNS, batch_size=300)
+        result = loader.load(generate_employees(1000))
+        self.assertEqual((result.rows, result.batches), (1000, 4))
+        self.assertGreater(result.rows_per_second, 0)
+        self.assertFalse(self.conn.in_transaction)
+        rows = self.conn.execute("SELECT name, department, salary FROM employees").fetchall()
+        self.assertEqual(rows, list(generate_employees(1000)))
+
+    def test_same_rows_as_row_by_row(self):
+        """
+        test the bulk path stores exactly what insert_employees stores
+        """
+        bulk_load_employees(self.conn, generate_employees(500), batch_size=64)
+        other = sqlite3.connect(":memory:")
+        create_employees_table(other)
+        self.assertEqual(insert_employees(other, generate_employees(500)), 500)
+        query = "SELECT * FROM employees ORDER BY id"
+        self.assertEqual(self.conn.execute(query).fetchall(), other.execute(query).fetchall())
+        other.close()
+
+    def test_pragmas(self):
+        """
+        test the tuned pragmas are applied to the connection
+        """
+        BulkLoader(self.conn, "employees", EMPLOYEE_COLUMNS).load([])
+        self.assertEqual(self.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        # NORMAL = 1
+        self.assertEqual(self.conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertEqual(self.conn.execute("PRAGMA cache_size").fetchone()[0], -262144)
+        applied = apply_pragmas(sqlite3.connect(":memory:"), {"journal_mode": "WAL"})
+        self.assertEqual(applied, {"journal_mode": "memory"})
+
+    def test_defer_indexes(self):
+        """
+        test secondary indexes are dropped during the load and rebuilt afterwards
+        """
+        before = self.indexes()
+        self.assertEqual(before, [("idx_employees_department",)])
+        result = bulk_load_employees(self.conn, generate_employees(1000), batch_size=100)
+        self.assertEqual(self.indexes(), before)
+        self.assertGreater(result.index_seconds, 0)
+        plan = self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM employees WHERE department = 'IT'"
+        ).fetchall()
+        self.assertIn("idx_employees_department", str(plan))
+
+    def test_failed_batch_rolls_back(self):
+        """
+        test a failing batch is rolled back, earlier batches and the indexes are kept
+        """
+        rows = list(generate_employees(250))
+        rows[220] = (None, "IT", 1.0)  # name NOT NULL
+        loader = BulkLoader(
+            self.conn, "employees", EMPLOYEE_COLUMNS, batch_size=100, defer_indexes=True
+        )
+        with self.assertRaises(sqlite3.IntegrityError):
+            loader.load(rows)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0], 200)
+        self.assertEqual(self.indexes(), [("idx_employees_department",)])
+
+    def test_unique_index_kept(self):
+        """
+        test a UNIQUE index stays in place and rejects duplicate keys during the load
+        """
+        self.conn.execute("CREATE UNIQUE INDEX idx_employees_name ON employees (name)")
+        self.conn.commit()
+        rows = [(f"Employee {i}", "IT", 1.0) for i in range(150)]
+        rows.append(("Employee 7", "HR", 2.0))
+        loader = BulkLoader(
+            self.conn, "employees", EMPLOYEE_COLUMNS, batch_size=100, defer_indexes=True
+        )
+        deferred = [name for name, _ in loader._secondary_indexes()]
+        self.assertEqual(deferred, ["idx_employees_department"])
+        with self.assertRaises(sqlite3.IntegrityError):
+            loader.load(rows)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0], 100)
+        self.assertEqual(
+            sorted(self.indexes()), [("idx_employees_department",), ("idx_employees_name",)]
+        )
+
+    def test_rebuild_failures_collected(self):
+        """
+        test every deferred index is rebuilt even if an earlier one fails
+        """
+        # 表达式索引在重建时才发现 name 不是 JSON
+        self.conn.execute(
+            "CREATE INDEX idx_employees_json ON employees (json_extract(name, '$.a'))"
+        )
+        self.conn.execute("CREATE INDEX idx_employees_salary ON employees (salary)")
+        self.conn.commit()
+        loader = BulkLoader(self.conn, "employees", EMPLOYEE_COLUMNS, defer_indexes=True)
+        with self.assertRaises(IndexRebuildError) as context:
+            loader.load(generate_employees(10))
+        self.assertEqual([name for name, _ in context.exception.failures], ["idx_employees_json"])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0], 10)
+        self.assertEqual(
+            sorted(self.indexes()), [("idx_employees_department",), ("idx_employees_salary",)]
+        )
+
+    def test_commits_pending_changes(self):
+        """
+        test uncommitted changes of the caller are committed before the load
+        """
+        self.conn.execute("INSERT INTO employees (name) VALUES ('Pending')")
+        self.assertTrue(self.conn.in_transaction)
+        BulkLoader(self.conn, "employees", EMPLOYEE_COLUMNS).load(generate_employees(10))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0], 11)
+
+    def test_invalid_identifier(self):
+        """
+        test table and column names are validated
+        """
+        with self.assertRaises(ValueError):
+            BulkLoader(self.conn, "employees; DROP TABLE x", EMPLOYEE_COLUMNS)
+        with self.assertRaises(ValueError):
+            BulkLoader(self.conn, "employees", ["name", "salary)"])
+
+
+if __name__ == "__main__":
+    unittest.main()
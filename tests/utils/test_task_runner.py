@@ -0,0 +1,190 @@
+"""
+task_runner test
+"""
+
+import asyncio
+import functools
+import itertools
+import time
+import unittest
+
+from hello_python.utils.task_runner import DeadlineExceeded, TaskRunner
+
+
+async def sleep_value(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def collect(stream):
+    return [result async for result in stream]
+
+
+class TestTaskRunner(unittest.TestCase):
+    """
+    TestTaskRunner
+    """
+
+    def test_concurrency_limit(self):
+        """
+        test no more than limit calls run at once
+        """
+        active = peak = 0
+
+        async def call(i):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return i * 2
+
+        runner = TaskRunner(limit=5)
+        results = asyncio.run(collect(runner.map(call, range(50))))
+        self.assertEqual(peak, 5)
+        self.assertEqual(sorted(result.value for result in results), list(range(0, 100, 2)))
+        self.assertTrue(all(result.value == result.item * 2 for result in results))
+
+    def test_limit_shared_between_streams(self):
+        """
+        test the limit holds across concurrent streams on the same runner
+        """
+        active = peak = 0
+
+        async def call(i):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        async def main():
+            runner = TaskRunner(limit=3)
+            await asyncio.gather(
+                collect(runner.map(call, range(10))), collect(runner.map(call, range(10)))
+            )
+
+        asyncio.run(main())
+        self.assertEqual(peak, 3)
+
+    def test_completion_order(self):
+        """
+        test results stream in completion order, not input order
+        """
+        delays = [0.15, 0.05, 0.1]
+        runner = TaskRunner(limit=3)
+        results = asyncio.run(
+            collect(runner.map(lambda i: sleep_value(i, delays[i]), range(3)))
+        )
+        self.assertEqual([result.index for result in results], [1, 2, 0])
+
+    def test_lazy_input(self):
+        """
+        test the input is consumed lazily, so an endless generator works
+        """
+
+        async def main():
+            runner = TaskRunner(limit=4)
+            seen = []
+            stream = runner.map(lambda i: sleep_value(i, 0), itertools.count())
+            async for result in stream:
+                seen.append(result.value)
+                if len(seen) == 10:
+                    break
+            await stream.aclose()
+            return seen
+
+        self.assertEqual(len(asyncio.run(main())), 10)
+
+    def test_timeout_is_per_task(self):
+        """
+        test a slow task times out alone and the others keep their results
+        """
+        runner = TaskRunner(limit=3, timeout=0.1)
+        started = time.perf_counter()
+        report = asyncio.run(
+            runner.run(
+                [
+                    functools.partial(sleep_value, "a", 0.01),
+                    functools.partial(sleep_value, "slow", 5),
+                    functools.partial(sleep_value, "c", 0.02),
+                ]
+            )
+        )
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(report.values, ["a", "c"])
+        self.assertTrue(report.results[1].timed_out)
+        self.assertEqual(report.failed, [report.results[1]])
+
+    def test_retry_with_backoff(self):
+        """
+        test failures are retried, then reported with the last error
+        """
+        calls = {"flaky": 0, "broken": 0}
+
+        async def call(name):
+            calls[name] += 1
+            if name == "broken" or calls[name] < 3:
+                raise ConnectionError(name)
+            return name
+
+        runner = TaskRunner(retries=2, backoff=0.01)
+        results = {r.item: r for r in asyncio.run(collect(runner.map(call, ["flaky", "broken"])))}
+        self.assertEqual((results["flaky"].value, results["flaky"].attempts), ("flaky", 3))
+        self.assertIsInstance(results["broken"].error, ConnectionError)
+        self.assertEqual(results["broken"].attempts, 3)
+        self.assertEqual(calls, {"flaky": 3, "broken": 3})
+
+    def test_no_retry_for_other_errors(self):
+        """
+        test errors outside retry_on are reported without retrying
+        """
+
+        async def call(_):
+            raise ValueError("bad input")
+
+        runner = TaskRunner(retries=3, backoff=0.01, retry_on=(ConnectionError,))
+        (result,) = asyncio.run(collect(runner.map(call, [1])))
+        self.assertEqual(result.attempts, 1)
+        self.assertIsInstance(result.error, ValueError)
+
+    def test_backoff_delay(self):
+        """
+        test jittered exponential backoff stays within its bounds
+        """
+        runner = TaskRunner(backoff=0.1, max_backoff=0.5)
+        for attempt, bound in [(1, 0.1), (2, 0.2), (3, 0.4), (10, 0.5)]:
+            delays = [runner.backoff_delay(attempt) for _ in range(100)]
+            self.assertTrue(all(0 <= delay <= bound for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+
+    def test_deadline_keeps_partial_results(self):
+        """
+        test the overall deadline reports finished, cancelled and unstarted tasks
+        """
+        delays = [0.01, 0.02, 5, 5, 0.01]
+        runner = TaskRunner(limit=4)
+        started = time.perf_counter()
+        report = asyncio.run(
+            runner.run(
+                [functools.partial(sleep_value, i, delay) for i, delay in enumerate(delays)],
+                deadline=0.3,
+            )
+        )
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(report.values, [0, 1, 4])
+        self.assertEqual([result.index for result in report.unfinished], [2, 3])
+        self.assertIsInstance(report.results[2].error, DeadlineExceeded)
+        self.assertEqual(report.failed, [])
+        # 并发已满时, 没来得及开始的任务同样报告为未完成
+        report = asyncio.run(
+            TaskRunner(limit=1).run(
+                [functools.partial(sleep_value, i, 5) for i in range(3)], deadline=0.05
+            )
+        )
+        self.assertEqual(len(report.unfinished), 3)
+        self.assertEqual([result.attempts for result in report.results], [0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+ujson response test
+"""
+
+import json
+import unittest
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+
+from hello_python.advance import fastapi_server_sample
+from hello_python.utils.ujson_response import UJSONResponse
+
+
+class Product:
+    def __init__(self, name: str, expiry_date: datetime):
+        self.name = name
+        self.expiry_date = expiry_date
+
+
+class TestUJSONResponse(unittest.TestCase):
+    """
+    TestUJSONResponse
+    """
+
+    def test_matches_json_response(self):
+        """
+        test native content decodes to the same value as the stdlib JSONResponse
+        """
+        content = {"name": "辽宁串红小番茄", "price": 9.99, "tags": ["a/b"], "n": None}
+        body = UJSONResponse(content).body
+        self.assertEqual(json.loads(body), json.loads(JSONResponse(content).body))
+        self.assertIn("辽宁".encode("utf-8"), body)
+        self.assertIn(b'"a/b"', body)
+
+    def test_fallback_for_non_native_types(self):
+        """
+        test datetime and plain objects fall back to jsonable_encoder
+        """
+        tomato = Product("辽宁串红番茄", datetime(2023, 12, 31))
+        body = UJSONResponse({"product": tomato, "ids": {1}}).body
+        self.assertEqual(
+            json.loads(body),
+            {
+                "product": {"name": "辽宁串红番茄", "expiry_date": "2023-12-31T00:00:00"},
+                "ids": [1],
+            },
+        )
+
+    def test_rejects_nan(self):
+        """
+        test NaN is rejected like the stdlib JSONResponse
+        """
+        with self.assertRaises((ValueError, OverflowError)):
+            UJSONResponse({"value": float("nan")})
+
+    def test_app_default_response_class(self):
+        """
+        test the service app encodes responses with ujson by default
+        """
+        route = next(r for r in fastapi_server_sample.app.routes if getattr(r, "path", "") == "/")
+        self.assertIs(route.response_class, UJSONResponse)
+
+
+if __name__ == "__main__":
+    unittest.main()